@@ -4,6 +4,7 @@ from datetime import datetime
 
 from agents import Agent
 
+from api.agents.temporal_context import resolved_time_instructions
 from api.models.conversation import AgentTurnResponse
 
 CLARIFYING_AGENT_INSTRUCTIONS_TEMPLATE = """You are a friendly event discovery assistant for Calendar Club.
@@ -165,13 +166,13 @@ def get_clarifying_instructions(context: object, agent: object) -> str:
     """Generate clarifying agent instructions with current date.
 
     Args:
-        context: RunContextWrapper from agents library (unused)
+        context: RunContextWrapper from agents library (may carry a resolved time)
         agent: Agent instance (unused)
     """
     today = datetime.now().strftime("%A, %B %d, %Y")
     return f"""Today's date is {today}.
 
-{CLARIFYING_AGENT_INSTRUCTIONS_TEMPLATE}"""
+{CLARIFYING_AGENT_INSTRUCTIONS_TEMPLATE}{resolved_time_instructions(context)}"""
 
 
 clarifying_agent = Agent(
@@ -5,17 +5,20 @@ The orchestrator is the top-level coordinator for event discovery. It:
 1. Gathers user preferences and clarifies when needed
 2. Calls search_events when ready to search (ALWAYS searches all sources)
 3. Calls refine_results when filtering existing results
-4. Calls find_similar when finding events similar to a reference
+4. Calls page_results when the user wants more of the same results
+5. Calls find_similar when finding events similar to a reference
 
-Tool outputs are automatically preserved in SQLiteSession, so the orchestrator
-can reference previous search results in subsequent turns.
+Result sets are kept server-side in the result store. Tools exchange short
+result handles instead of full event payloads, so the model never has to
+re-emit events as tool arguments or in its final output. Handles are
+scoped to the chat session (TurnContext.session_id).
 """
 
 import logging
 from datetime import datetime, timedelta
 from typing import Literal
 
-from agents import Agent, function_tool
+from agents import Agent, RunContextWrapper, function_tool
 from pydantic import BaseModel, Field
 
 from api.models import EventResult, SearchResult
@@ -25,6 +28,10 @@ from api.agents.search import (
     search_events as _search_events,
     _deduplicate_events,
 )
+from api.agents.temporal_context import TurnContext, resolved_time_instructions
+from api.services.background_tasks import start_search_discovery
+from api.services.result_filter import ResultColumns, compile_filter
+from api.services.result_store import DEFAULT_PAGE_SIZE, clamp_page_limit, get_result_store
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +71,19 @@ class RefineResult(BaseModel):
     original_count: int = Field(description="How many events before filtering")
     filtered_count: int = Field(description="How many events after filtering")
     explanation: str = Field(description="What filtering was applied")
+    result_handle: str | None = Field(
+        default=None, description="Handle for the filtered result set"
+    )
+
+
+class PageResult(BaseModel):
+    """Result from page_results tool."""
+
+    events: list[EventResult] = Field(description="Events in this page")
+    result_handle: str = Field(description="Handle of the paged result set")
+    offset: int = Field(description="Index of the first event in this page")
+    total_count: int = Field(description="Total events in the result set")
+    has_more: bool = Field(description="Whether more events follow this page")
 
 
 class SimilarInput(BaseModel):
@@ -72,8 +92,17 @@ class SimilarInput(BaseModel):
     reference_event_id: str = Field(
         description="ID of the event to find similar ones to"
     )
-    reference_title: str = Field(description="Title of the reference event")
-    reference_category: str = Field(description="Category of the reference event")
+    result_handle: str | None = Field(
+        default=None,
+        description="Handle of the result set containing the reference event. "
+        "Reference details are looked up server-side and all events in the set are excluded.",
+    )
+    reference_title: str | None = Field(
+        default=None, description="Title of the reference event (not needed with result_handle)"
+    )
+    reference_category: str | None = Field(
+        default=None, description="Category of the reference event (not needed with result_handle)"
+    )
     reference_url: str | None = Field(
         default=None, description="URL of the reference event (for Exa find_similar)"
     )
@@ -89,6 +118,9 @@ class SimilarResult(BaseModel):
     events: list[EventResult] = Field(description="Similar events found")
     reference_event_id: str = Field(description="ID of the reference event")
     similarity_basis: str = Field(description="What similarity criteria were used")
+    result_handle: str | None = Field(
+        default=None, description="Handle for the similar events result set"
+    )
 
 
 # ============================================================================
@@ -96,8 +128,15 @@ class SimilarResult(BaseModel):
 # ============================================================================
 
 
+def _session_id(ctx: RunContextWrapper[TurnContext]) -> str | None:
+    """Session the current run belongs to (None outside a chat session)."""
+    return getattr(ctx.context, "session_id", None)
+
+
 @function_tool
-async def search_events(profile: SearchProfile) -> SearchResult:
+async def search_events(
+    ctx: RunContextWrapper[TurnContext], profile: SearchProfile
+) -> SearchResult:
     """
     Search for events matching the profile.
 
@@ -121,48 +160,67 @@ async def search_events(profile: SearchProfile) -> SearchResult:
             - source: Attribution string like "eventbrite+meetup+exa"
             - message: Optional user-facing message
     """
-    return await _search_events(profile)
+    result = await _search_events(profile)
+    if result.result_handle:
+        get_result_store().claim(result.result_handle, _session_id(ctx))
+    await start_search_discovery(_session_id(ctx), profile)
+    return result
+
+
+def _apply_refinement(
+    events: list[EventResult],
+    refinement: RefineInput,
+    columns: ResultColumns | None = None,
+) -> tuple[list[EventResult], list[str]]:
+    """Apply refinement filters to events, returning (filtered, explanations)."""
+    compiled = compile_filter(
+        free_only=refinement.free_only,
+        categories=refinement.categories,
+        after_time=refinement.after_time,
+        before_time=refinement.before_time,
+        custom_criteria=refinement.custom_criteria,
+    )
+    return compiled.apply(events, columns), list(compiled.explanations)
 
 
 @function_tool
 async def refine_results(
-    events_to_filter: list[EventResult],
+    ctx: RunContextWrapper[TurnContext],
+    result_handle: str,
     refinement: RefineInput,
 ) -> RefineResult:
     """
-    Filter events based on criteria.
+    Filter a previous result set based on criteria.
 
-    The orchestrator should pass the events from the previous search_events
-    call. The events are in the conversation history as a tool output.
+    Pass the result_handle from a previous search_events, refine_results,
+    or find_similar call. Do NOT pass the events themselves - they are
+    looked up server-side.
 
     Args:
-        events_to_filter: Events to filter (from previous search)
+        result_handle: Handle of the result set to filter (e.g. "rs-3f9a1c2b")
         refinement: Filter criteria
 
     Returns:
-        RefineResult with filtered events
+        RefineResult with filtered events and a handle for the filtered set
     """
-    original_count = len(events_to_filter)
-    filtered = list(events_to_filter)
-    explanations: list[str] = []
-
-    # Apply filters
-    if refinement.free_only:
-        filtered = [e for e in filtered if e.is_free]
-        explanations.append("free events only")
-
-    if refinement.categories:
-        cats = set(c.lower() for c in refinement.categories)
-        filtered = [e for e in filtered if e.category.lower() in cats]
-        explanations.append(f"categories: {', '.join(refinement.categories)}")
-
-    if refinement.after_time:
-        filtered = [e for e in filtered if e.date >= refinement.after_time]
-        explanations.append(f"after {refinement.after_time}")
-
-    if refinement.before_time:
-        filtered = [e for e in filtered if e.date <= refinement.before_time]
-        explanations.append(f"before {refinement.before_time}")
+    store = get_result_store()
+    session_id = _session_id(ctx)
+    result_set = store.get(result_handle, session_id)
+    if result_set is None:
+        logger.warning("⚠️ [Refine] Unknown result handle | handle=%s", result_handle)
+        return RefineResult(
+            events=[],
+            original_count=0,
+            filtered_count=0,
+            explanation=(
+                f"Result set {result_handle} is no longer available. "
+                "Run search_events again."
+            ),
+        )
+
+    filtered, explanations = _apply_refinement(
+        result_set.events, refinement, result_set.columns
+    )
 
     explanation = (
         f"Filtered to {', '.join(explanations)}"
@@ -170,21 +228,75 @@ async def refine_results(
         else "No filters applied"
     )
 
+    refined_handle = store.put(
+        filtered,
+        source=result_set.source,
+        parent_handle=result_handle,
+        session_id=session_id,
+    )
+
     return RefineResult(
-        events=filtered,
-        original_count=original_count,
+        events=filtered[:DEFAULT_PAGE_SIZE],
+        original_count=len(result_set.events),
         filtered_count=len(filtered),
         explanation=explanation,
+        result_handle=refined_handle,
+    )
+
+
+@function_tool
+async def page_results(
+    ctx: RunContextWrapper[TurnContext],
+    result_handle: str,
+    offset: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> PageResult:
+    """
+    Get another page of a previous result set.
+
+    Use this when the user asks to see more results from the same search
+    ("show me more", "what else is there?"). Return the same result_handle
+    with result_offset set to this page's offset so the page is displayed.
+
+    Args:
+        result_handle: Handle of the result set to page through
+        offset: Index of the first event to return
+        limit: Maximum number of events to return (at most 50)
+
+    Returns:
+        PageResult with the events in the requested page
+    """
+    result_set = get_result_store().get(result_handle, _session_id(ctx))
+    if result_set is None:
+        return PageResult(
+            events=[],
+            result_handle=result_handle,
+            offset=offset,
+            total_count=0,
+            has_more=False,
+        )
+
+    offset = max(offset, 0)
+    page = result_set.events[offset : offset + clamp_page_limit(limit)]
+    return PageResult(
+        events=page,
+        result_handle=result_handle,
+        offset=offset,
+        total_count=len(result_set.events),
+        has_more=offset + len(page) < len(result_set.events),
     )
 
 
 @function_tool
-async def find_similar(input_data: SimilarInput) -> SimilarResult:
+async def find_similar(
+    ctx: RunContextWrapper[TurnContext], input_data: SimilarInput
+) -> SimilarResult:
     """
     Find events similar to a reference event.
 
     Use this when the user says something like "show me more like the first one"
-    or "find similar events to the AI meetup".
+    or "find similar events to the AI meetup". Pass the result_handle of the
+    set the reference event came from instead of copying its details.
 
     This performs a new search using the reference event's attributes
     (category, keywords extracted from title) and excludes already-shown events.
@@ -196,10 +308,26 @@ async def find_similar(input_data: SimilarInput) -> SimilarResult:
         SimilarResult with new similar events
     """
     all_events: list[EventResult] = []
+    store = get_result_store()
+    session_id = _session_id(ctx)
+
+    reference_title = input_data.reference_title or ""
+    reference_category = input_data.reference_category
+    exclude_set = set(input_data.exclude_ids)
+
+    # Resolve reference details from the stored result set
+    if input_data.result_handle:
+        result_set = store.get(input_data.result_handle, session_id)
+        if result_set is not None:
+            exclude_set |= result_set.event_ids
+            reference = result_set.get_event(input_data.reference_event_id)
+            if reference is not None:
+                reference_title = reference_title or reference.title
+                reference_category = reference_category or reference.category
 
     # Build a search profile based on reference event
     # Use category and extract keywords from title
-    keywords = input_data.reference_title.lower().split()[:3]
+    keywords = reference_title.lower().split()[:3]
 
     # Default to next 30 days
     now = datetime.now()
@@ -208,7 +336,7 @@ async def find_similar(input_data: SimilarInput) -> SimilarResult:
             start=now,
             end=now + timedelta(days=30),
         ),
-        categories=[input_data.reference_category],
+        categories=[reference_category] if reference_category else [],
         keywords=keywords,
     )
 
@@ -220,7 +348,6 @@ async def find_similar(input_data: SimilarInput) -> SimilarResult:
     unique_events = _deduplicate_events(all_events)
 
     # Exclude already-shown events
-    exclude_set = set(input_data.exclude_ids)
     filtered = [e for e in unique_events if e.id not in exclude_set]
 
     # Limit
@@ -229,7 +356,13 @@ async def find_similar(input_data: SimilarInput) -> SimilarResult:
     return SimilarResult(
         events=filtered,
         reference_event_id=input_data.reference_event_id,
-        similarity_basis=f"category:{input_data.reference_category}, keywords:{keywords}",
+        similarity_basis=f"category:{reference_category}, keywords:{keywords}",
+        result_handle=store.put(
+            filtered,
+            source=search_result.source,
+            parent_handle=input_data.result_handle,
+            session_id=session_id,
+        ),
     )
 
 
@@ -279,7 +412,8 @@ Generate 2-4 quick picks to help the user respond faster.
 
 ### Phase 2: Search
 When you have at least a time range, call `search_events` with a SearchProfile.
-The tool returns deduplicated results filtered to your time range.
+The tool returns deduplicated results filtered to your time range, plus a
+`result_handle` (e.g. "rs-3f9a1c2b") that refers to the full result set.
 
 Your message should be brief like:
 - "Here's what I found for this weekend!"
@@ -289,12 +423,19 @@ Your message should be brief like:
 DO NOT list the events in your message - they appear separately in the UI.
 
 ### Phase 3: Refinement
+Result sets live on the server. NEVER copy events into tool arguments -
+always pass the most recent `result_handle` instead.
+
 If the user asks to filter results ("only free", "only AI events", "evening only"):
-- Call `refine_results` with current events and filter criteria
+- Call `refine_results` with the current result_handle and filter criteria
 - Brief message: "Here are the free events." (events shown separately)
 
+If the user asks to see more of the same results ("show me more"):
+- Call `page_results` with the current result_handle and the next offset
+- Respond with that result_handle and `result_offset` set to the page's offset
+
 If the user asks for similar events ("more like the first one"):
-- Call `find_similar` with the reference event's details
+- Call `find_similar` with the reference event's ID and the result_handle it came from
 - Brief message: "Found some similar events." (events shown separately)
 
 ### Handling No Results
@@ -306,7 +447,12 @@ If search returns no events:
 
 Your response should always include:
 - message: A brief conversational message (DO NOT list events here - they show separately)
-- events: Array of events from search results (empty if no results or still clarifying)
+- result_handle: Handle of the result set to display (from the last tool call). The server
+  expands it into events - prefer this over copying events.
+- result_offset: Offset of the page to display (from page_results); 0 otherwise
+- events: Leave empty when result_handle is set. Only list events if you have no handle.
+- search_profile: Criteria gathered so far (categories, keywords, free_only, distance).
+  Keep it filled in while clarifying so a follow-up time answer searches with it.
 - quick_picks: Suggested quick picks [{label, value}] to help user respond
 - placeholder: Placeholder text for the chat input
 - phase: Current phase (clarifying, searching, presenting, refining)
@@ -322,7 +468,7 @@ User: "I want to do something fun"
    Quick picks: ["This weekend", "Tonight", "Next week"]
 
 User: "Only show me free events"
--> Call refine_results with free_only=True on the previous results.
+-> Call refine_results with the previous result_handle and free_only=True.
 -> Message: "Here are the free options!" (filtered events shown separately)
 
 User: "Find more events like the AI meetup"
@@ -332,11 +478,11 @@ User: "Find more events like the AI meetup"
 
 
 def get_orchestrator_instructions(context: object, agent: object) -> str:
-    """Generate orchestrator instructions with current date."""
+    """Generate orchestrator instructions with current date and any resolved time."""
     today = datetime.now().strftime("%A, %B %d, %Y")
     return f"""Today's date is {today}.
 
-{ORCHESTRATOR_INSTRUCTIONS_TEMPLATE}"""
+{ORCHESTRATOR_INSTRUCTIONS_TEMPLATE}{resolved_time_instructions(context)}"""
 
 
 # ============================================================================
@@ -347,6 +493,6 @@ orchestrator_agent = Agent(
     name="orchestrator",
     instructions=get_orchestrator_instructions,
     model="gpt-4o",
-    tools=[search_events, refine_results, find_similar],
+    tools=[search_events, refine_results, page_results, find_similar],
     output_type=OrchestratorResponse,
 )
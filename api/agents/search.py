@@ -25,14 +25,22 @@ from api.models import (
 )
 from api.services import (
     EventbriteEvent,
+    EventSource,
     ExaSearchResult,
     ScrapedEvent,
+    get_event_cache,
     get_event_source_registry,
 )
+from api.services.date_parsing import parse_event_datetime, parse_iso_datetime, to_aware
+from api.services.hot_windows import get_hot_window_store
 from api.services.meetup import MeetupEvent
+from api.services.result_store import DEFAULT_PAGE_SIZE, get_result_store
 
 logger = logging.getLogger(__name__)
 
+# Event cache source for materialized hot window events
+HOT_WINDOW_CACHE_SOURCE = "hot-window"
+
 
 def _convert_eventbrite_event(event: EventbriteEvent) -> EventResult:
     """Convert EventbriteEvent to EventResult format."""
@@ -72,14 +80,11 @@ def _convert_exa_result(result: ExaSearchResult) -> EventResult | None:
             return None
 
         # Parse date string like "January 15, 2026" to ISO format with timezone
-        try:
-            from dateutil import parser as date_parser
-            parsed_date = date_parser.parse(start_date_str)
-            # Add UTC timezone if naive (required for downstream validation)
-            if parsed_date.tzinfo is None:
-                parsed_date = parsed_date.replace(tzinfo=timezone.utc)
-            date_str = parsed_date.isoformat()
-        except Exception:
+        parsed_date = parse_event_datetime(start_date_str, extracted.get('start_time'))
+        if parsed_date is not None:
+            # Naive times are local Columbus time, as in validation and filtering
+            date_str = to_aware(parsed_date).isoformat()
+        else:
             # Fall back to using the string as-is
             date_str = start_date_str
 
@@ -274,27 +279,24 @@ def _validate_event(event: EventResult) -> EventResult | None:
         return None
 
     # Date must be parseable and include year
-    try:
-        parsed = datetime.fromisoformat(event.date.replace("Z", "+00:00"))
-
-        # Date should be in the future (or at least today)
-        now = datetime.now(timezone.utc)
-        if parsed < now - timedelta(days=1):  # Allow 1 day buffer
-            logger.debug(
-                "Filtered event: date in past | id=%s title=%s date=%s",
-                event.id,
-                event.title,
-                event.date,
-            )
-            return None
-
-    except Exception as e:
+    parsed = parse_iso_datetime(event.date)
+    if parsed is None:
         logger.warning(
-            "Filtered event: unparseable date | id=%s title=%s date=%s error=%s",
+            "Filtered event: unparseable date | id=%s title=%s date=%s",
+            event.id,
+            event.title,
+            event.date,
+        )
+        return None
+
+    # Date should be in the future (or at least today)
+    now = datetime.now(timezone.utc)
+    if to_aware(parsed) < now - timedelta(days=1):  # Allow 1 day buffer
+        logger.debug(
+            "Filtered event: date in past | id=%s title=%s date=%s",
             event.id,
             event.title,
             event.date,
-            str(e),
         )
         return None
 
@@ -380,8 +382,10 @@ def _filter_by_time_range(
             continue
 
         try:
-            # Parse event date (ISO 8601 format)
-            event_dt = datetime.fromisoformat(event.date.replace("Z", "+00:00"))
+            # Parse event date (ISO 8601 format, cached from validation)
+            event_dt = parse_iso_datetime(event.date)
+            if event_dt is None:
+                raise ValueError("invalid ISO 8601 date")
 
             # Make naive if comparing with naive datetime
             if event_dt.tzinfo is not None and start_bound.tzinfo is None:
@@ -473,12 +477,210 @@ def _convert_source_results(
     return events
 
 
+async def _fetch_from_sources(
+    profile: SearchProfile, enabled_sources: list[EventSource]
+) -> tuple[list[EventResult], list[str]]:
+    """
+    Query all enabled sources in parallel and convert their results.
+
+    Args:
+        profile: SearchProfile passed to each source
+        enabled_sources: Sources to query
+
+    Returns:
+        Tuple of (converted events, names of sources that returned events)
+    """
+    # Build list of fetch tasks from enabled sources
+    tasks = []
+    source_names = []
+
+    for event_source in enabled_sources:
+        tasks.append(event_source.search_fn(profile))
+        source_names.append(event_source.name)
+
+    # Query API sources in parallel
+    logger.debug(
+        "🔍 [Search] Starting parallel fetch | sources=%s",
+        ", ".join(source_names),
+    )
+    start_time = time.perf_counter()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    fetch_elapsed = time.perf_counter() - start_time
+    logger.debug(
+        "📊 [Search] Parallel fetch complete | duration=%.2fs",
+        fetch_elapsed,
+    )
+
+    # Collect events from successful fetches
+    all_events: list[EventResult] = []
+    successful_sources: list[str] = []
+
+    for i, result in enumerate(results):
+        source_name = source_names[i]
+        if isinstance(result, BaseException):
+            logger.debug(
+                "❌ [Search] Source failed | source=%s error=%s",
+                source_name,
+                str(result)[:100],
+            )
+            logger.warning("%s fetch failed: %s", source_name, result)
+        elif isinstance(result, list):
+            # Convert source-specific results to EventResult
+            converted = _convert_source_results(source_name, result)
+            if converted:
+                all_events.extend(converted)
+                successful_sources.append(source_name)
+                logger.debug(
+                    "✅ [Search] Source complete | source=%s events=%d",
+                    source_name,
+                    len(converted),
+                )
+                # Log individual events at DEBUG level
+                if logger.isEnabledFor(logging.DEBUG):
+                    for event in converted:
+                        logger.debug(
+                            "📋 [Search] Event from source | source=%s id=%s title=%s",
+                            source_name,
+                            event.id[:20] if event.id else "none",
+                            event.title[:50] if event.title else "untitled",
+                        )
+            else:
+                logger.debug(
+                    "📭 [Search] Source empty | source=%s",
+                    source_name,
+                )
+
+    return all_events, successful_sources
+
+
+def _merge_events(all_events: list[EventResult]) -> list[EventResult]:
+    """Deduplicate, validate and sort merged events by date."""
+    unique_events = _deduplicate_events(all_events)
+    logger.debug(
+        "📊 [Search] Deduplication | before=%d after=%d removed=%d",
+        len(all_events),
+        len(unique_events),
+        len(all_events) - len(unique_events),
+    )
+
+    # Validate all events (filter out invalid dates, missing titles, etc.)
+    validated_events = _validate_events(unique_events)
+
+    return sorted(validated_events, key=lambda e: e.date if e.date else "")
+
+
+def _build_search_result(sorted_events: list[EventResult], source: str) -> SearchResult:
+    """Store the full result set and return its first page."""
+    final_events = sorted_events[:DEFAULT_PAGE_SIZE]
+
+    # Keep the full set server-side so tools can refer to it by handle
+    result_handle = get_result_store().put(sorted_events, source=source)
+
+    # Log truncation if events were cut
+    if len(final_events) < len(sorted_events):
+        truncated_count = len(sorted_events) - len(final_events)
+        logger.debug(
+            "📋 [Search] Truncated results | kept=%d removed=%d",
+            len(final_events),
+            truncated_count,
+        )
+        # Log which events were truncated
+        if logger.isEnabledFor(logging.DEBUG):
+            for event in sorted_events[DEFAULT_PAGE_SIZE:]:
+                logger.debug(
+                    "📋 [Search] Truncated event | id=%s title=%s date=%s",
+                    event.id[:20] if event.id else "none",
+                    event.title[:40] if event.title else "untitled",
+                    event.date[:20] if event.date else "no-date",
+                )
+
+    return SearchResult(
+        events=final_events,
+        source=source,
+        message=None,
+        result_handle=result_handle,
+        total_count=len(sorted_events),
+    )
+
+
+def _search_hot_window(profile: SearchProfile) -> SearchResult | None:
+    """Answer a profile from a materialized hot window, if one matches."""
+    materialized = get_hot_window_store().match(profile)
+    if materialized is None:
+        return None
+
+    # Sources return events outside the requested window; always trim
+    events = _filter_by_time_range(materialized.events, profile)
+    if profile.free_only:
+        events = [e for e in events if e.is_free]
+
+    logger.debug(
+        "🔥 [Search] Hot window hit | window=%s category=%s events=%d",
+        materialized.window,
+        materialized.category,
+        len(events),
+    )
+    if not events:
+        return SearchResult(
+            events=[],
+            source=materialized.source or "unavailable",
+            message="No events found matching your criteria. Try broadening your search.",
+        )
+    return _build_search_result(events, materialized.source)
+
+
+async def materialize_events(profile: SearchProfile) -> tuple[list[EventResult], str]:
+    """
+    Run every enabled source for a profile and persist the merged events.
+
+    Used by the hot window refresher. Events are also written to the
+    event cache so other workers and later lookups can reuse them.
+
+    Args:
+        profile: SearchProfile for one hot window and category
+
+    Returns:
+        Tuple of (sorted events, source attribution)
+    """
+    enabled_sources = get_event_source_registry().get_enabled()
+    if not enabled_sources:
+        return [], ""
+
+    all_events, successful_sources = await _fetch_from_sources(profile, enabled_sources)
+    sorted_events = _merge_events(_filter_by_time_range(all_events, profile))
+
+    if sorted_events:
+        # The cache client blocks (SQLite or Redis socket); keep it off the loop
+        await asyncio.to_thread(
+            get_event_cache().put_many,
+            HOT_WINDOW_CACHE_SOURCE,
+            [
+                {
+                    "event_id": e.id,
+                    "title": e.title,
+                    "date": e.date,
+                    "location": e.location,
+                    "category": e.category,
+                    "description": e.description,
+                    "is_free": e.is_free,
+                    "price_amount": e.price_amount,
+                    "url": e.url,
+                }
+                for e in sorted_events
+            ],
+        )
+    return sorted_events, "+".join(successful_sources)
+
+
 async def search_events(profile: SearchProfile) -> SearchResult:
     """
     Search for events matching the profile from multiple sources.
 
-    Uses the event source registry to query all enabled sources in parallel,
-    then deduplicates results.
+    Profiles matching a materialized hot window (e.g. "this weekend")
+    are answered locally. Otherwise the event source registry is used to
+    query all enabled sources in parallel, then results are deduplicated.
 
     Args:
         profile: SearchProfile with location, date_window, categories, constraints
@@ -486,6 +688,10 @@ async def search_events(profile: SearchProfile) -> SearchResult:
     Returns:
         SearchResult with events list and source attribution
     """
+    hot_result = _search_hot_window(profile)
+    if hot_result is not None:
+        return hot_result
+
     registry = get_event_source_registry()
     enabled_sources = registry.get_enabled()
 
@@ -501,74 +707,14 @@ async def search_events(profile: SearchProfile) -> SearchResult:
             )
 
     try:
-        # Build list of fetch tasks from enabled sources
-        tasks = []
-        source_names = []
-
-        for event_source in enabled_sources:
-            tasks.append(event_source.search_fn(profile))
-            source_names.append(event_source.name)
-
-        if not tasks:
+        if not enabled_sources:
             return SearchResult(
                 events=[],
                 source="unavailable",
                 message="No event sources are currently enabled.",
             )
 
-        # Query API sources in parallel
-        logger.debug(
-            "🔍 [Search] Starting parallel fetch | sources=%s",
-            ", ".join(source_names),
-        )
-        start_time = time.perf_counter()
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        fetch_elapsed = time.perf_counter() - start_time
-        logger.debug(
-            "📊 [Search] Parallel fetch complete | duration=%.2fs",
-            fetch_elapsed,
-        )
-
-        # Collect events from successful fetches
-        all_events: list[EventResult] = []
-        successful_sources: list[str] = []
-
-        for i, result in enumerate(results):
-            source_name = source_names[i]
-            if isinstance(result, BaseException):
-                logger.debug(
-                    "❌ [Search] Source failed | source=%s error=%s",
-                    source_name,
-                    str(result)[:100],
-                )
-                logger.warning("%s fetch failed: %s", source_name, result)
-            elif isinstance(result, list):
-                # Convert source-specific results to EventResult
-                converted = _convert_source_results(source_name, result)
-                if converted:
-                    all_events.extend(converted)
-                    successful_sources.append(source_name)
-                    logger.debug(
-                        "✅ [Search] Source complete | source=%s events=%d",
-                        source_name,
-                        len(converted),
-                    )
-                    # Log individual events at DEBUG level
-                    if logger.isEnabledFor(logging.DEBUG):
-                        for event in converted:
-                            logger.debug(
-                                "📋 [Search] Event from source | source=%s id=%s title=%s",
-                                source_name,
-                                event.id[:20] if event.id else "none",
-                                event.title[:50] if event.title else "untitled",
-                            )
-                else:
-                    logger.debug(
-                        "📭 [Search] Source empty | source=%s",
-                        source_name,
-                    )
+        all_events, successful_sources = await _fetch_from_sources(profile, enabled_sources)
 
         # HARD FILTER: Remove events outside time range
         # This is a guardrail - we NEVER return events outside the user's criteria
@@ -583,45 +729,8 @@ async def search_events(profile: SearchProfile) -> SearchResult:
                 message="No events found matching your criteria. Try broadening your search.",
             )
 
-        # Deduplicate merged results
-        unique_events = _deduplicate_events(all_events)
-        logger.debug(
-            "📊 [Search] Deduplication | before=%d after=%d removed=%d",
-            len(all_events),
-            len(unique_events),
-            len(all_events) - len(unique_events),
-        )
-
-        # Validate all events (filter out invalid dates, missing titles, etc.)
-        validated_events = _validate_events(unique_events)
-
-        # Sort by date and limit
-        sorted_events = sorted(validated_events, key=lambda e: e.date if e.date else "")
-        final_events = sorted_events[:15]
-
-        # Log truncation if events were cut
-        if len(final_events) < len(sorted_events):
-            truncated_count = len(sorted_events) - len(final_events)
-            logger.debug(
-                "📋 [Search] Truncated results | kept=%d removed=%d",
-                len(final_events),
-                truncated_count,
-            )
-            # Log which events were truncated
-            if logger.isEnabledFor(logging.DEBUG):
-                for event in sorted_events[15:]:
-                    logger.debug(
-                        "📋 [Search] Truncated event | id=%s title=%s date=%s",
-                        event.id[:20] if event.id else "none",
-                        event.title[:40] if event.title else "untitled",
-                        event.date[:20] if event.date else "no-date",
-                    )
-
-        return SearchResult(
-            events=final_events,
-            source="+".join(successful_sources),
-            message=None,
-        )
+        sorted_events = _merge_events(all_events)
+        return _build_search_result(sorted_events, "+".join(successful_sources))
 
     except Exception as e:
         logger.error("API source fetch error: %s", e, exc_info=True)
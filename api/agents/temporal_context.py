@@ -0,0 +1,298 @@
+"""
+Deterministic temporal resolution ahead of the agents.
+
+Relative phrases like "this weekend", "tonight" and "next Friday" are
+resolved with TemporalParser before the model runs. The resolved window
+is injected into the agent instructions so the model doesn't have to do
+date arithmetic, and a message that is nothing but a time answer to a
+clarifying question is searched directly, without a model round trip.
+The direct search keeps the criteria gathered in earlier turns and only
+replaces the time window.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from agents import ItemHelpers
+from agents.models.fake_id import FAKE_RESPONSES_ID
+from openai.types.responses import ResponseOutputMessage, ResponseOutputText
+
+from api.agents.search import search_events
+from api.models.orchestrator import OrchestratorResponse, QuickPick
+from api.models.search import SearchProfile, TimeWindow
+from api.services.background_tasks import start_search_discovery
+from api.services.result_store import get_result_store
+from api.services.temporal_parser import TemporalParser
+
+logger = logging.getLogger(__name__)
+
+# Words that can surround the time phrase in a pure time answer
+# ("this weekend please", "how about tonight?")
+_FILLER_WORDS = frozenset({
+    "a", "about", "any", "anything", "around", "at", "do", "during", "events",
+    "for", "go", "how", "i", "i'm", "im", "is", "it", "let's", "lets",
+    "looking", "maybe", "me", "ok", "okay", "on", "please", "probably",
+    "something", "sure", "thanks", "the", "then", "um", "what", "what's",
+    "whats", "yeah", "yes",
+})
+
+_WORD_RE = re.compile(r"[a-z']+")
+
+# Session items scanned for the last assistant turn
+_HISTORY_LOOKBACK_ITEMS = 10
+
+# Session items scanned for the latest search criteria
+_INTENT_LOOKBACK_ITEMS = 50
+
+_parser: TemporalParser | None = None
+
+
+def _get_parser() -> TemporalParser:
+    """Get the shared temporal parser."""
+    global _parser
+    if _parser is None:
+        _parser = TemporalParser()
+    return _parser
+
+
+@dataclass(frozen=True)
+class ResolvedTime:
+    """A relative time phrase resolved to a concrete window."""
+
+    phrase: str
+    window: TimeWindow
+    explanation: str
+    is_time_only: bool  # Message has nothing but the time phrase and filler
+
+
+@dataclass
+class TurnContext:
+    """Per-turn context passed to the agent run."""
+
+    resolved_time: ResolvedTime | None = None
+    session_id: str | None = None  # Scopes result handles created this turn
+
+
+def resolve_message_time(message: str, parser: TemporalParser | None = None) -> ResolvedTime | None:
+    """
+    Resolve a relative time phrase in a user message.
+
+    Windows are returned as naive local datetimes, the same form the
+    agents put in a SearchProfile.
+
+    Args:
+        message: User chat message
+        parser: Temporal parser (defaults to the shared America/New_York parser)
+
+    Returns:
+        ResolvedTime, or None if the message has no known time phrase
+    """
+    result = (parser or _get_parser()).match(message)
+    if result is None or not result.start or not result.end:
+        return None
+
+    window = TimeWindow(
+        start=datetime.fromisoformat(result.start).replace(tzinfo=None),
+        end=datetime.fromisoformat(result.end).replace(tzinfo=None),
+    )
+    remainder = message.lower().replace(result.matched_text or "", " ")
+    is_time_only = all(word in _FILLER_WORDS for word in _WORD_RE.findall(remainder))
+
+    return ResolvedTime(
+        phrase=result.original_phrase,
+        window=window,
+        explanation=result.explanation,
+        is_time_only=is_time_only,
+    )
+
+
+def resolved_time_instructions(context: Any) -> str:
+    """
+    Render the resolved time window for an agent's instructions.
+
+    Args:
+        context: RunContextWrapper passed to dynamic instructions
+
+    Returns:
+        Instruction section, or "" when no time was resolved this turn
+    """
+    turn = getattr(context, "context", None)
+    resolved = getattr(turn, "resolved_time", None)
+    if resolved is None:
+        return ""
+
+    return f"""
+
+## Resolved Time (this turn)
+The user's message says "{resolved.phrase}". This is already resolved to
+start={resolved.window.start.isoformat()} end={resolved.window.end.isoformat()}
+({resolved.explanation}). Use exactly this time_window; do not recompute it."""
+
+
+def _item_text(item: Any) -> str | None:
+    """Extract the text of an assistant message session item."""
+    if not isinstance(item, dict) or item.get("role") != "assistant":
+        return None
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part.get("text", "") for part in content if isinstance(part, dict)
+        )
+    return None
+
+
+async def last_assistant_phase(session: Any) -> str | None:
+    """
+    Get the phase of the orchestrator's last reply in a session.
+
+    Args:
+        session: Agent session
+
+    Returns:
+        Phase (e.g. "clarifying"), or None if there is no parseable reply
+    """
+    items = await session.get_items(limit=_HISTORY_LOOKBACK_ITEMS)
+    for item in reversed(items):
+        text = _item_text(item)
+        if text is None:
+            continue
+        try:
+            return json.loads(text).get("phase")
+        except (ValueError, AttributeError):
+            return None
+    return None
+
+
+def _item_profile(item: Any) -> SearchProfile | None:
+    """Extract search criteria from a search_events call or an assistant reply."""
+    if not isinstance(item, dict):
+        return None
+    try:
+        if item.get("type") == "function_call" and item.get("name") == "search_events":
+            return SearchProfile.model_validate(json.loads(item["arguments"])["profile"])
+        text = _item_text(item)
+        if text is not None:
+            profile = json.loads(text).get("search_profile")
+            return SearchProfile.model_validate(profile) if profile else None
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+    return None
+
+
+async def accumulated_profile(session: Any) -> SearchProfile | None:
+    """
+    Get the latest search criteria recorded in a session.
+
+    The orchestrator records criteria in its replies (search_profile) and
+    in its search_events calls; the most recent one wins.
+
+    Args:
+        session: Agent session
+
+    Returns:
+        SearchProfile, or None if no criteria have been recorded
+    """
+    items = await session.get_items(limit=_INTENT_LOOKBACK_ITEMS)
+    for item in reversed(items):
+        profile = _item_profile(item)
+        if profile is not None:
+            return profile
+    return None
+
+
+def _assistant_item(response: OrchestratorResponse) -> dict[str, Any]:
+    """Session item for an orchestrator reply, in the form the SDK stores."""
+    message = ResponseOutputMessage(
+        id=FAKE_RESPONSES_ID,
+        type="message",
+        role="assistant",
+        status="completed",
+        content=[
+            ResponseOutputText(
+                type="output_text", text=response.model_dump_json(), annotations=[]
+            )
+        ],
+    )
+    return message.model_dump(exclude_unset=True)
+
+
+async def should_search_directly(resolved: ResolvedTime, session: Any) -> bool:
+    """
+    Check if a message is a pure time answer to a clarifying question.
+
+    Args:
+        resolved: Resolved time for the message
+        session: Agent session
+
+    Returns:
+        True if the search can start without a model call
+    """
+    if not resolved.is_time_only:
+        return False
+    return await last_assistant_phase(session) == "clarifying"
+
+
+async def search_resolved_time(
+    message: str,
+    resolved: ResolvedTime,
+    session: Any,
+    session_id: str | None = None,
+) -> OrchestratorResponse:
+    """
+    Search a resolved time window and record the turn in the session.
+
+    Categories, keywords and constraints from earlier turns are kept;
+    only the time window is replaced.
+
+    Args:
+        message: User message (stored in history)
+        resolved: Resolved time window
+        session: Agent session
+        session_id: Session the result handle is scoped to
+
+    Returns:
+        OrchestratorResponse presenting the result set
+    """
+    base = await accumulated_profile(session) or SearchProfile()
+    profile = base.model_copy(update={"time_window": resolved.window})
+    result = await search_events(profile)
+    if result.result_handle:
+        get_result_store().claim(result.result_handle, session_id)
+    await start_search_discovery(session_id, profile)
+    logger.debug(
+        "⚡ [Temporal] Direct search | phrase=%s categories=%s events=%d",
+        resolved.phrase,
+        profile.categories,
+        len(result.events),
+    )
+
+    if result.events:
+        reply = f"Here's what I found for {resolved.phrase}!"
+        quick_picks = [
+            QuickPick(label="Free only", value="Only show free events"),
+            QuickPick(label="Show more", value="Show me more"),
+        ]
+    else:
+        reply = f"I didn't find any events for {resolved.phrase}. Want to try a wider time range?"
+        quick_picks = [
+            QuickPick(label="Next week", value="Next week"),
+            QuickPick(label="This weekend", value="This weekend"),
+        ]
+
+    response = OrchestratorResponse(
+        message=reply,
+        quick_picks=quick_picks,
+        result_handle=result.result_handle,
+        search_profile=profile,
+        phase="presenting",
+    )
+    await session.add_items(
+        [*ItemHelpers.input_to_new_input_list(message), _assistant_item(response)]
+    )
+    return response
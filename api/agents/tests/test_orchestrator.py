@@ -3,6 +3,7 @@
 from api.agents.orchestrator import (
     ORCHESTRATOR_INSTRUCTIONS_TEMPLATE,
     RefineInput,
+    _apply_refinement,
     RefineResult,
     SimilarInput,
     SimilarResult,
@@ -23,8 +24,18 @@ class TestOrchestratorAgent:
         tool_names = [tool.name for tool in orchestrator_agent.tools]
         assert "search_events" in tool_names
         assert "refine_results" in tool_names
+        assert "page_results" in tool_names
         assert "find_similar" in tool_names
 
+    def test_refine_tool_takes_handle_not_events(self):
+        """refine_results should accept a result handle, not an event payload."""
+        refine_tool = next(
+            tool for tool in orchestrator_agent.tools if tool.name == "refine_results"
+        )
+        properties = refine_tool.params_json_schema["properties"]
+        assert "result_handle" in properties
+        assert "events_to_filter" not in properties
+
     def test_agent_has_output_type(self):
         """Agent should have OrchestratorResponse output type."""
         assert orchestrator_agent.output_type is not None
@@ -98,6 +109,34 @@ class TestRefineInputModel:
         assert input_data.after_time == "2026-01-15T18:00:00"
 
 
+class TestApplyRefinement:
+    """Test refinement filters applied to stored events."""
+
+    def test_free_only_and_category(self):
+        """Filters combine and explain themselves."""
+        events = [
+            EventResult(
+                id=f"evt-{i}",
+                title=f"Event {i}",
+                date="2026-01-10T18:00:00",
+                location="Test Venue",
+                category="ai" if i < 2 else "music",
+                description="Test description",
+                is_free=i % 2 == 0,
+                distance_miles=2.5,
+            )
+            for i in range(4)
+        ]
+        refinement = RefineInput(
+            filter_type="category", free_only=True, categories=["AI"]
+        )
+
+        filtered, explanations = _apply_refinement(events, refinement)
+
+        assert [e.id for e in filtered] == ["evt-0"]
+        assert "free events only" in explanations
+
+
 class TestRefineResultModel:
     """Test RefineResult model validation."""
 
@@ -142,6 +181,15 @@ class TestSimilarInputModel:
         assert input_data.reference_category == "ai"
         assert len(input_data.exclude_ids) == 2
 
+    def test_similar_input_with_handle_only(self):
+        """Reference details are optional when a result handle is given."""
+        input_data = SimilarInput(
+            reference_event_id="evt-001",
+            result_handle="rs-3f9a1c2b",
+        )
+        assert input_data.result_handle == "rs-3f9a1c2b"
+        assert input_data.reference_title is None
+
     def test_similar_input_with_url(self):
         """Test SimilarInput with reference URL."""
         input_data = SimilarInput(
@@ -9,6 +9,8 @@ from unittest.mock import patch
 import pytest
 
 from api.agents.search import (
+    _convert_exa_result,
+    _validate_event,
     refine_results,
     search_events,
 )
@@ -22,6 +24,7 @@ from api.models import (
     SearchResult,
 )
 from api.services.event_cache import CachedEvent, EventCacheService
+from api.services.exa_client import ExaSearchResult
 
 
 def _clear_settings_cache() -> None:
@@ -290,3 +293,39 @@ class TestMultiSourceSearch:
         assert "+" in result.source
         assert "luma" in result.source
         assert "eventbrite" in result.source
+
+
+class TestValidateEvent:
+    """Test event validation."""
+
+    def _event(self, date: str) -> EventResult:
+        return EventResult(
+            id="e1",
+            title="Hack night",
+            date=date,
+            location="Columbus, OH",
+            category="ai",
+            description="",
+            is_free=True,
+            distance_miles=1.0,
+        )
+
+    def test_naive_future_date_is_kept(self):
+        """Naive dates (scraped without a zone) are read as local time."""
+        date = (datetime.now() + timedelta(days=2)).replace(microsecond=0).isoformat()
+        assert _validate_event(self._event(date)) is not None
+
+    def test_past_and_unparseable_dates_are_dropped(self):
+        """Past or non-ISO dates are filtered."""
+        assert _validate_event(self._event("2020-01-01T19:00:00+00:00")) is None
+        assert _validate_event(self._event("January 15")) is None
+
+    def test_exa_naive_time_is_local(self):
+        """Extracted times without a zone are Columbus time, as in validation."""
+        result = ExaSearchResult(
+            id="x1",
+            title="Hack night",
+            url="https://example.com/hack",
+            extracted_event={"start_date": "January 15, 2026", "start_time": "7:00 PM"},
+        )
+        assert _convert_exa_result(result).date == "2026-01-15T19:00:00-05:00"
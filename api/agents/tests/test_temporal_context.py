@@ -0,0 +1,159 @@
+"""Tests for deterministic temporal resolution before the agents."""
+
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from api.agents.temporal_context import (
+    TurnContext,
+    accumulated_profile,
+    last_assistant_phase,
+    resolve_message_time,
+    resolved_time_instructions,
+    search_resolved_time,
+    should_search_directly,
+)
+from api.models import EventResult, SearchResult
+from api.models.orchestrator import OrchestratorResponse
+from api.models.search import SearchProfile
+from api.services.session import InMemorySession
+
+
+def _session(*replies: OrchestratorResponse) -> InMemorySession:
+    session = InMemorySession(f"test-{uuid.uuid4()}")
+    for reply in replies:
+        session._storage.extend(
+            session.session_id,
+            [
+                {"role": "user", "content": "hi"},
+                {
+                    "type": "message",
+                    "role": "assistant",
+                    "content": [{"type": "output_text", "text": reply.model_dump_json()}],
+                },
+            ],
+        )
+    return session
+
+
+class TestResolveMessageTime:
+    """Test resolving time phrases in chat messages."""
+
+    def test_pure_time_answer(self) -> None:
+        """A bare phrase (plus filler) is a time-only answer."""
+        resolved = resolve_message_time("How about this weekend?")
+
+        assert resolved is not None
+        assert resolved.phrase == "this weekend"
+        assert resolved.is_time_only
+        assert resolved.window.start is not None and resolved.window.start.tzinfo is None
+        assert resolved.window.start.weekday() == 4
+
+    def test_phrase_with_other_criteria(self) -> None:
+        """Extra criteria still resolve the window but need the model."""
+        resolved = resolve_message_time("free AI events tonight")
+
+        assert resolved is not None
+        assert resolved.phrase == "tonight"
+        assert not resolved.is_time_only
+
+    def test_no_phrase(self) -> None:
+        """Messages without a known phrase are left to the model."""
+        assert resolve_message_time("I want to do something fun") is None
+
+    def test_instructions(self) -> None:
+        """The resolved window is rendered into agent instructions."""
+        resolved = resolve_message_time("tomorrow night")
+        context = SimpleNamespace(context=TurnContext(resolved_time=resolved))
+
+        text = resolved_time_instructions(context)
+        assert "tomorrow night" in text
+        assert resolved.window.start.isoformat() in text
+        assert resolved_time_instructions(SimpleNamespace(context=TurnContext())) == ""
+        assert resolved_time_instructions(None) == ""
+
+
+class TestDirectSearch:
+    """Test skipping the model for pure time answers."""
+
+    async def test_only_after_clarifying_question(self) -> None:
+        """Direct search needs a time-only answer to a clarifying reply."""
+        resolved = resolve_message_time("tonight")
+        clarifying = OrchestratorResponse(message="When?", phase="clarifying")
+        presenting = OrchestratorResponse(message="Here!", phase="presenting")
+
+        assert await last_assistant_phase(_session(presenting, clarifying)) == "clarifying"
+        assert await should_search_directly(resolved, _session(clarifying))
+        assert not await should_search_directly(resolved, _session(presenting))
+        assert not await should_search_directly(resolved, _session())
+        assert not await should_search_directly(
+            resolve_message_time("jazz tonight"), _session(clarifying)
+        )
+
+    async def test_search_records_turn(self) -> None:
+        """The resolved window is searched and the turn saved to history."""
+        resolved = resolve_message_time("this weekend")
+        session = _session(OrchestratorResponse(message="When?", phase="clarifying"))
+        event = EventResult(
+            id="e1",
+            title="Hack night",
+            date="2030-01-01T19:00:00",
+            location="Columbus",
+            category="ai",
+            description="",
+            is_free=True,
+            distance_miles=1.0,
+        )
+        search = AsyncMock(
+            return_value=SearchResult(events=[event], source="exa", result_handle="rs-1")
+        )
+
+        with patch("api.agents.temporal_context.search_events", search):
+            response = await search_resolved_time("this weekend", resolved, session)
+
+        profile = search.await_args.args[0]
+        assert profile.time_window == resolved.window
+        assert response.result_handle == "rs-1"
+        assert response.phase == "presenting"
+
+        items = await session.get_items()
+        assert items[-2] == {"role": "user", "content": "this weekend"}
+        assert items[-1]["type"] == "message"
+        assert json.loads(items[-1]["content"][0]["text"])["result_handle"] == "rs-1"
+        assert await last_assistant_phase(session) == "presenting"
+
+    async def test_search_keeps_earlier_criteria(self) -> None:
+        """Categories and keywords from earlier turns survive; only the window changes."""
+        resolved = resolve_message_time("this weekend")
+        earlier = SearchProfile(categories=["ai"], keywords=["python"], free_only=True)
+        session = _session(
+            OrchestratorResponse(message="When?", phase="clarifying", search_profile=earlier)
+        )
+        search = AsyncMock(return_value=SearchResult(events=[], source="exa"))
+
+        with patch("api.agents.temporal_context.search_events", search):
+            response = await search_resolved_time("this weekend", resolved, session)
+
+        profile = search.await_args.args[0]
+        assert profile.categories == ["ai"]
+        assert profile.keywords == ["python"]
+        assert profile.free_only
+        assert profile.time_window == resolved.window
+        assert await accumulated_profile(session) == response.search_profile
+
+    async def test_profile_from_search_call(self) -> None:
+        """A previous search_events call also records criteria."""
+        session = _session()
+        await session.add_items(
+            [
+                {
+                    "type": "function_call",
+                    "name": "search_events",
+                    "call_id": "c1",
+                    "arguments": json.dumps({"profile": {"categories": ["startup"]}}),
+                }
+            ]
+        )
+        profile = await accumulated_profile(session)
+        assert profile is not None and profile.categories == ["startup"]
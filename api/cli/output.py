@@ -0,0 +1,97 @@
+"""
+Streaming JSON Lines output for CLI commands.
+
+Writes one compact JSON object per line as records arrive, so memory
+use stays flat for large crawls and consumers can start reading right
+away. File output goes to a temporary file next to the target and is
+renamed into place only when writing completes, so readers never see a
+partial file. Gzip is used when requested or when the path ends in .gz.
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any
+
+
+class JsonLinesWriter:
+    """
+    JSON Lines writer with optional gzip and atomic rename.
+
+    Usage:
+        with JsonLinesWriter("events.jsonl.gz") as out:
+            for event in events:
+                out.write(event_dict)
+    """
+
+    def __init__(self, path: str | Path | None = None, compress: bool | None = None):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Output file path (None = stdout)
+            compress: Gzip the output. Defaults to True for paths ending in .gz
+        """
+        self.path = Path(path) if path else None
+        if compress is None:
+            compress = bool(self.path and self.path.suffix == ".gz")
+        if compress and self.path is None:
+            raise ValueError("gzip output requires a file path")
+        self.compress = compress
+        self.count = 0
+        self._tmp_path: Path | None = None
+        self._fp: IO[str] | None = None
+
+    def __enter__(self) -> "JsonLinesWriter":
+        if self.path is None:
+            self._fp = sys.stdout
+            return self
+
+        fd, tmp = tempfile.mkstemp(
+            prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent or "."
+        )
+        os.close(fd)
+        # mkstemp creates 0600 files; output is meant to be shared
+        os.chmod(tmp, 0o644)
+        self._tmp_path = Path(tmp)
+        if self.compress:
+            self._fp = gzip.open(tmp, "wt", encoding="utf-8")
+        else:
+            self._fp = open(tmp, "w", encoding="utf-8")
+        return self
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Write one record as a compact JSON line."""
+        assert self._fp is not None, "writer is not open"
+        self._fp.write(json.dumps(record, separators=(",", ":"), default=str))
+        self._fp.write("\n")
+        self.count += 1
+
+    def flush(self) -> None:
+        """Flush buffered lines (lets stdout consumers see them immediately)."""
+        if self._fp is not None:
+            self._fp.flush()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        fp, self._fp = self._fp, None
+        if fp is None or fp is sys.stdout:
+            if fp is not None:
+                fp.flush()
+            return
+
+        fp.close()
+        assert self._tmp_path is not None and self.path is not None
+        if exc_type is None:
+            os.replace(self._tmp_path, self.path)
+        else:
+            # Leave any previous output untouched
+            self._tmp_path.unlink(missing_ok=True)
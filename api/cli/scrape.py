@@ -11,6 +11,15 @@ Usage:
 
     # Scrape and cache events
     python -m api.cli.scrape posh-discover columbus --cache
+
+    # Nightly refresh: only re-extract new or changed pages
+    python -m api.cli.scrape posh-discover columbus --cache --incremental
+
+    # Stream events as JSON Lines while the crawl runs (gzip from the .gz suffix)
+    python -m api.cli.scrape posh-discover columbus --jsonl -o events.jsonl.gz
+
+    # Pre-warm the cache for a metro from several sources at once
+    python -m api.cli.scrape batch --sources luma,posh,partiful --cities columbus,cleveland --cache -o events.jsonl
 """
 
 import argparse
@@ -18,9 +27,24 @@ import asyncio
 import json
 import logging
 import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
 
+from api.cli.output import JsonLinesWriter
+from api.services.crawl_state import CrawlState, CrawlStateStore
 from api.services.event_cache import get_event_cache
-from api.services.firecrawl import ScrapedEvent, get_posh_extractor
+from api.services.firecrawl import (
+    BaseExtractor,
+    PoshExtractor,
+    ScrapedEvent,
+    get_facebook_extractor,
+    get_luma_extractor,
+    get_meetup_extractor,
+    get_partiful_extractor,
+    get_posh_extractor,
+    get_river_extractor,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +52,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Extractors available to batch ingest: name -> (getter, discover_events location argument)
+BATCH_EXTRACTORS: dict[str, tuple[Callable[[], BaseExtractor], str]] = {
+    "posh": (get_posh_extractor, "city"),
+    "luma": (get_luma_extractor, "city"),
+    "partiful": (get_partiful_extractor, "city"),
+    "meetup_scraper": (get_meetup_extractor, "location"),
+    "facebook": (get_facebook_extractor, "query"),
+    "river": (get_river_extractor, "city_filter"),
+}
+
+# Streaming mode writes to the cache in chunks of this many events
+CACHE_WRITE_BATCH_SIZE = 200
+
+# Batch ingest concurrency defaults
+DEFAULT_BATCH_CONCURRENCY = 6  # discover jobs in flight across all sources
+DEFAULT_PER_SOURCE_CONCURRENCY = 2  # discover jobs in flight per source
+
 
 def event_to_dict(event: ScrapedEvent) -> dict:
     """Convert ScrapedEvent to JSON-serializable dict."""
@@ -40,6 +81,23 @@ def event_to_dict(event: ScrapedEvent) -> dict:
     return data
 
 
+def event_to_cache_dict(event: ScrapedEvent) -> dict:
+    """Convert ScrapedEvent to the dict format accepted by put_many."""
+    return {
+        "event_id": event.event_id,
+        "title": event.title,
+        "date": event.start_time.isoformat() if event.start_time else "",
+        "location": event.venue_address or event.venue_name or "TBD",
+        "category": event.category,
+        "description": event.description,
+        "is_free": event.is_free,
+        "price_amount": event.price_amount,
+        "url": event.url,
+        "logo_url": event.logo_url,
+        "raw_data": event.raw_data,
+    }
+
+
 async def scrape_posh_event(url: str, cache: bool = False) -> None:
     """Scrape a single Posh event."""
     extractor = get_posh_extractor()
@@ -83,13 +141,34 @@ async def discover_posh_events(
     limit: int = 20,
     cache: bool = False,
     output_file: str | None = None,
+    incremental: bool = False,
+    state_db: str | None = None,
+    jsonl: bool = False,
+    compress: bool = False,
 ) -> None:
-    """Discover Posh events for a city."""
+    """
+    Discover Posh events for a city.
+
+    In incremental mode, pages whose content is unchanged since the last
+    crawl are not re-extracted; their stored events are reused.
+
+    In JSON Lines mode, each event is written as soon as it is extracted
+    instead of building the whole array in memory.
+    """
     extractor = get_posh_extractor()
+    state_store = CrawlStateStore(state_db) if incremental else None
+    crawl_state = state_store.load("posh") if state_store else None
 
     try:
         logger.info("Discovering Posh events for %s (limit: %d)", city, limit)
-        events = await extractor.discover_events(city=city, limit=limit)
+        if jsonl:
+            await _stream_posh_events(extractor, city, limit, cache, output_file, compress, crawl_state)
+            if state_store and crawl_state:
+                state_store.save_many(crawl_state)
+                logger.info("Crawl changes: %s", crawl_state.summary())
+            return
+
+        events = await extractor.discover_events(city=city, limit=limit, crawl_state=crawl_state)
 
         if not events:
             logger.warning("No events found for %s", city)
@@ -109,33 +188,185 @@ async def discover_posh_events(
         else:
             print(output)
 
-        # Cache if requested
+        # Cache if requested (one transaction; unchanged events refresh their TTL)
         if cache:
-            event_cache = get_event_cache()
-            cached_count = 0
-            for event in events:
-                if event.start_time:
-                    event_cache.put(
-                        source=event.source,
-                        event_id=event.event_id,
-                        title=event.title,
-                        date=event.start_time.isoformat(),
-                        location=event.venue_address or event.venue_name or "TBD",
-                        category=event.category,
-                        description=event.description,
-                        is_free=event.is_free,
-                        price_amount=event.price_amount,
-                        url=event.url,
-                        logo_url=event.logo_url,
-                        raw_data=event.raw_data,
-                    )
-                    cached_count += 1
+            cached_count = get_event_cache().put_many(
+                "posh",
+                [event_to_cache_dict(e) for e in events if e.start_time],
+            )
             logger.info("Cached %d events", cached_count)
 
+        # Record crawl state only after results are committed
+        if state_store and crawl_state:
+            state_store.save_many(crawl_state)
+            logger.info("Crawl changes: %s", crawl_state.summary())
+
     finally:
         await extractor.close()
 
 
+async def _stream_posh_events(
+    extractor: PoshExtractor,
+    city: str,
+    limit: int,
+    cache: bool,
+    output_file: str | None,
+    compress: bool,
+    crawl_state: CrawlState | None,
+) -> None:
+    """Write Posh events as JSON Lines while they are extracted."""
+    event_cache = get_event_cache() if cache else None
+    pending: list[dict] = []
+    cached_count = 0
+
+    with JsonLinesWriter(output_file, compress=compress or None) as out:
+        async for event in extractor.iter_events(city=city, limit=limit, crawl_state=crawl_state):
+            out.write(event_to_dict(event))
+            out.flush()
+            if event_cache is not None and event.start_time:
+                pending.append(event_to_cache_dict(event))
+                if len(pending) >= CACHE_WRITE_BATCH_SIZE:
+                    cached_count += event_cache.put_many("posh", pending)
+                    pending = []
+
+    if event_cache is not None and pending:
+        cached_count += event_cache.put_many("posh", pending)
+
+    if out.count == 0:
+        logger.warning("No events found for %s", city)
+    else:
+        logger.info("Wrote %d events to %s", out.count, output_file or "stdout")
+    if cache:
+        logger.info("Cached %d events", cached_count)
+
+
+@dataclass
+class BatchJobResult:
+    """Outcome of one (source, city) discover job."""
+
+    source: str
+    city: str
+    events: list[ScrapedEvent] = field(default_factory=list)
+    cached: int = 0
+    error: str | None = None
+    elapsed: float = 0.0
+
+
+async def _run_batch_job(
+    source: str,
+    city: str,
+    limit: int,
+    global_limit: asyncio.Semaphore,
+    source_limit: asyncio.Semaphore,
+    cache: bool,
+) -> BatchJobResult:
+    """Discover one source for one city under the concurrency caps."""
+    getter, location_arg = BATCH_EXTRACTORS[source]
+    result = BatchJobResult(source=source, city=city)
+
+    async with source_limit, global_limit:
+        start = time.perf_counter()
+        try:
+            extractor = getter()
+            result.events = await extractor.discover_events(**{location_arg: city, "limit": limit})
+            # One transaction per job
+            if cache and result.events:
+                result.cached = get_event_cache().put_many(
+                    extractor.SOURCE_NAME,
+                    [event_to_cache_dict(e) for e in result.events if e.start_time],
+                )
+        except Exception as e:
+            result.error = str(e)
+        result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _write_jsonl(out: JsonLinesWriter, result: BatchJobResult) -> None:
+    """Write a job's events as JSON Lines, tagged with the batch city."""
+    for event in result.events:
+        out.write({**event_to_dict(event), "city": result.city})
+    out.flush()
+
+
+async def batch_ingest(
+    sources: list[str],
+    cities: list[str],
+    limit: int = 20,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    per_source_concurrency: int = DEFAULT_PER_SOURCE_CONCURRENCY,
+    cache: bool = False,
+    out: JsonLinesWriter | None = None,
+) -> list[BatchJobResult]:
+    """
+    Discover events from several sources across several cities concurrently.
+
+    Each (source, city) pair is one job. Jobs run under a global cap and a
+    per-source cap so no single site is hammered. Events are streamed as
+    JSON Lines as each job finishes, and cached with one put_many per job.
+
+    Args:
+        sources: Extractor names (keys of BATCH_EXTRACTORS)
+        cities: City slugs, locations or queries passed to each extractor
+        limit: Maximum events per job
+        concurrency: Maximum jobs running at once
+        per_source_concurrency: Maximum jobs running at once per source
+        cache: Write discovered events to the event cache
+        out: Open JSON Lines writer (None = no event output)
+
+    Returns:
+        Results for every job, in completion order
+    """
+    unknown = [s for s in sources if s not in BATCH_EXTRACTORS]
+    if unknown:
+        raise ValueError(f"Unknown sources: {', '.join(unknown)}")
+
+    # A source listed twice is scraped (and its shared extractor closed) once
+    sources = list(dict.fromkeys(sources))
+    global_limit = asyncio.Semaphore(concurrency)
+    source_limits = {s: asyncio.Semaphore(per_source_concurrency) for s in sources}
+    jobs = [
+        asyncio.create_task(
+            _run_batch_job(source, city, limit, global_limit, source_limits[source], cache)
+        )
+        for source in sources
+        for city in cities
+    ]
+
+    results: list[BatchJobResult] = []
+    start = time.perf_counter()
+    try:
+        for done in asyncio.as_completed(jobs):
+            result = await done
+            results.append(result)
+            if result.error:
+                logger.warning(
+                    "[%d/%d] %s/%s failed after %.1fs: %s",
+                    len(results), len(jobs), result.source, result.city,
+                    result.elapsed, result.error,
+                )
+            else:
+                logger.info(
+                    "[%d/%d] %s/%s: %d events (%d cached) in %.1fs",
+                    len(results), len(jobs), result.source, result.city,
+                    len(result.events), result.cached, result.elapsed,
+                )
+            if out is not None:
+                _write_jsonl(out, result)
+    finally:
+        for job in jobs:
+            job.cancel()
+        for source in sources:
+            await BATCH_EXTRACTORS[source][0]().close()
+
+    total_events = sum(len(r.events) for r in results)
+    failed = sum(1 for r in results if r.error)
+    logger.info(
+        "Batch complete: %d events from %d jobs (%d failed) in %.1fs",
+        total_events, len(jobs), failed, time.perf_counter() - start,
+    )
+    return results
+
+
 async def clear_cache(source: str | None = None) -> None:
     """Clear the event cache."""
     event_cache = get_event_cache()
@@ -148,6 +379,12 @@ async def clear_cache(source: str | None = None) -> None:
         logger.info("Cleared %d events from cache", count)
 
 
+async def clear_crawl_state(source: str | None = None, state_db: str | None = None) -> None:
+    """Clear incremental crawl state so the next crawl re-extracts everything."""
+    count = CrawlStateStore(state_db).clear(source)
+    logger.info("Cleared crawl state for %d pages", count)
+
+
 async def cache_stats() -> None:
     """Show cache statistics."""
     event_cache = get_event_cache()
@@ -214,6 +451,25 @@ def main() -> None:
         "-o", "--output",
         help="Output file path (default: stdout)",
     )
+    posh_discover.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-extract pages that are new or changed since the last crawl",
+    )
+    posh_discover.add_argument(
+        "--state-db",
+        help="Crawl state database path (default: api/crawl_state.db)",
+    )
+    posh_discover.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Stream one compact JSON object per line as events are extracted",
+    )
+    posh_discover.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Gzip JSON Lines output (implied by a .gz output path)",
+    )
 
     # cache-clear command
     cache_clear = subparsers.add_parser(
@@ -225,6 +481,68 @@ def main() -> None:
         help="Only clear events from this source",
     )
 
+    # crawl-clear command
+    crawl_clear = subparsers.add_parser(
+        "crawl-clear",
+        help="Clear incremental crawl state",
+    )
+    crawl_clear.add_argument(
+        "--source",
+        help="Only clear state for this source",
+    )
+    crawl_clear.add_argument(
+        "--state-db",
+        help="Crawl state database path (default: api/crawl_state.db)",
+    )
+
+    # batch command
+    batch = subparsers.add_parser(
+        "batch",
+        help="Discover events from several sources and cities concurrently",
+    )
+    batch.add_argument(
+        "--sources",
+        default=",".join(BATCH_EXTRACTORS),
+        help=f"Comma-separated sources (default: all of {', '.join(BATCH_EXTRACTORS)})",
+    )
+    batch.add_argument(
+        "--cities",
+        required=True,
+        help="Comma-separated cities (slug, location or query, as each source expects)",
+    )
+    batch.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum events per source and city (default: 20)",
+    )
+    batch.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_BATCH_CONCURRENCY,
+        help=f"Maximum jobs in flight (default: {DEFAULT_BATCH_CONCURRENCY})",
+    )
+    batch.add_argument(
+        "--per-source",
+        type=int,
+        default=DEFAULT_PER_SOURCE_CONCURRENCY,
+        help=f"Maximum jobs in flight per source (default: {DEFAULT_PER_SOURCE_CONCURRENCY})",
+    )
+    batch.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache discovered events",
+    )
+    batch.add_argument(
+        "-o", "--output",
+        help="JSON Lines output file (default: stdout)",
+    )
+    batch.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Gzip output (implied by a .gz output path)",
+    )
+
     # cache-stats command
     subparsers.add_parser(
         "cache-stats",
@@ -247,10 +565,40 @@ def main() -> None:
                 limit=args.limit,
                 cache=args.cache,
                 output_file=args.output,
+                incremental=args.incremental,
+                state_db=args.state_db,
+                jsonl=args.jsonl,
+                compress=args.gzip,
             )
         )
     elif args.command == "cache-clear":
         asyncio.run(clear_cache(source=args.source))
+    elif args.command == "batch":
+        sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+        cities = [c.strip() for c in args.cities.split(",") if c.strip()]
+        unknown = [s for s in sources if s not in BATCH_EXTRACTORS]
+        if unknown:
+            parser.error(f"unknown sources: {', '.join(unknown)}")
+
+        if args.gzip and not args.output:
+            parser.error("--gzip requires --output")
+
+        with JsonLinesWriter(args.output, compress=args.gzip or None) as out:
+            results = asyncio.run(
+                batch_ingest(
+                    sources=sources,
+                    cities=cities,
+                    limit=args.limit,
+                    concurrency=args.concurrency,
+                    per_source_concurrency=args.per_source,
+                    cache=args.cache,
+                    out=out,
+                )
+            )
+        if results and all(r.error for r in results):
+            sys.exit(1)
+    elif args.command == "crawl-clear":
+        asyncio.run(clear_crawl_state(source=args.source, state_db=args.state_db))
     elif args.command == "cache-stats":
         asyncio.run(cache_stats())
 
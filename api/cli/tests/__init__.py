@@ -0,0 +1 @@
+"""Tests for Calendar Club CLI."""
@@ -0,0 +1,212 @@
+"""Tests for the scrape CLI batch ingest and JSON Lines output."""
+
+import asyncio
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+
+from api.cli import scrape
+from api.cli.output import JsonLinesWriter
+from api.services.event_cache import InMemoryEventCache
+from api.services.firecrawl import PoshExtractor, ScrapedEvent
+
+
+class FakeExtractor:
+    """Extractor returning one event per call and tracking concurrency."""
+
+    def __init__(self, source: str, location_arg: str, stats: dict) -> None:
+        self.SOURCE_NAME = source
+        self.location_arg = location_arg
+        self.stats = stats
+
+    async def discover_events(self, limit: int = 20, **kwargs) -> list[ScrapedEvent]:
+        location = kwargs[self.location_arg]
+        if location == "fail":
+            raise RuntimeError("site down")
+
+        self.stats["running"] += 1
+        self.stats["peak"] = max(self.stats["peak"], self.stats["running"])
+        per_source = self.stats.setdefault(self.SOURCE_NAME, {"running": 0, "peak": 0})
+        per_source["running"] += 1
+        per_source["peak"] = max(per_source["peak"], per_source["running"])
+        await asyncio.sleep(0.01)
+        self.stats["running"] -= 1
+        per_source["running"] -= 1
+
+        return [
+            ScrapedEvent(
+                source=self.SOURCE_NAME,
+                event_id=f"{self.SOURCE_NAME}-{location}",
+                title=f"{self.SOURCE_NAME} in {location}",
+                description="",
+                url=f"https://example.com/{location}",
+                start_time=datetime(2030, 1, 15, 19, 0),
+            )
+        ]
+
+    async def close(self) -> None:
+        self.stats["closed"] += 1
+
+
+@pytest.fixture
+def fakes(monkeypatch: pytest.MonkeyPatch) -> tuple[dict, InMemoryEventCache]:
+    stats = {"running": 0, "peak": 0, "closed": 0}
+    extractors = {
+        "posh": FakeExtractor("posh", "city", stats),
+        "meetup_scraper": FakeExtractor("meetup", "location", stats),
+    }
+    monkeypatch.setattr(
+        scrape,
+        "BATCH_EXTRACTORS",
+        {name: (lambda e=e: e, e.location_arg) for name, e in extractors.items()},
+    )
+    cache = InMemoryEventCache()
+    monkeypatch.setattr(scrape, "get_event_cache", lambda: cache)
+    return stats, cache
+
+
+class TestBatchIngest:
+    """Test concurrent multi-source ingest."""
+
+    async def test_streams_and_caches_every_job(self, fakes, tmp_path) -> None:
+        """Each source/city job is streamed as JSON Lines and cached."""
+        stats, cache = fakes
+        path = tmp_path / "events.jsonl"
+
+        with JsonLinesWriter(path) as out:
+            results = await scrape.batch_ingest(
+                ["posh", "meetup_scraper"], ["columbus", "dayton"], cache=True, out=out
+            )
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(results) == 4
+        assert {(line["source"], line["city"]) for line in lines} == {
+            ("posh", "columbus"),
+            ("posh", "dayton"),
+            ("meetup", "columbus"),
+            ("meetup", "dayton"),
+        }
+        assert cache.count("posh") == 2
+        assert cache.count("meetup") == 2
+        assert stats["closed"] == 2
+
+    async def test_concurrency_caps(self, fakes) -> None:
+        """Global and per-source caps bound jobs in flight."""
+        stats, _ = fakes
+        cities = [f"c{i}" for i in range(6)]
+
+        await scrape.batch_ingest(
+            ["posh", "meetup_scraper"], cities, concurrency=3, per_source_concurrency=2
+        )
+
+        assert stats["peak"] <= 3
+        assert stats["posh"]["peak"] <= 2
+        assert stats["meetup"]["peak"] <= 2
+
+    async def test_failures_are_reported(self, fakes) -> None:
+        """A failing job doesn't stop the batch."""
+        results = await scrape.batch_ingest(["posh"], ["columbus", "fail"])
+
+        errors = {r.city: r.error for r in results}
+        assert errors == {"columbus": None, "fail": "site down"}
+
+    async def test_repeated_source_runs_and_closes_once(self, fakes) -> None:
+        """A source listed twice is scraped once per city and closed once."""
+        stats, _ = fakes
+
+        results = await scrape.batch_ingest(["posh", "posh"], ["columbus"])
+
+        assert len(results) == 1
+        assert stats["closed"] == 1
+
+    async def test_unknown_source(self, fakes) -> None:
+        """Unknown sources are rejected up front."""
+        with pytest.raises(ValueError, match="eventbrite"):
+            await scrape.batch_ingest(["eventbrite"], ["columbus"])
+
+
+class TestJsonLinesWriter:
+    """Test streaming output files."""
+
+    def test_gzip_from_suffix(self, tmp_path) -> None:
+        """A .gz path is gzipped and holds one compact object per line."""
+        path = tmp_path / "events.jsonl.gz"
+        with JsonLinesWriter(path) as out:
+            out.write({"id": "a", "start": datetime(2030, 1, 15, 19, 0)})
+            out.write({"id": "b"})
+
+        with gzip.open(path, "rt") as f:
+            lines = f.read().splitlines()
+        assert lines == ['{"id":"a","start":"2030-01-15 19:00:00"}', '{"id":"b"}']
+        assert out.count == 2
+
+    def test_failure_keeps_previous_file(self, tmp_path) -> None:
+        """An aborted write leaves the old output and no temp file behind."""
+        path = tmp_path / "events.jsonl"
+        path.write_text("old\n")
+
+        with pytest.raises(RuntimeError):
+            with JsonLinesWriter(path) as out:
+                out.write({"id": "a"})
+                raise RuntimeError("crawl failed")
+
+        assert path.read_text() == "old\n"
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_gzip_requires_path(self) -> None:
+        """Stdout output can't be gzipped."""
+        with pytest.raises(ValueError):
+            JsonLinesWriter(compress=True)
+
+
+class FakeFirecrawlClient:
+    """Firecrawl client serving one crawl page per event."""
+
+    def __init__(self, titles: list[str]) -> None:
+        self.titles = titles
+
+    async def crawl(self, url: str, limit: int = 10, include_patterns=None) -> list[dict]:
+        return [{"url": f"https://posh.vip/e/{i}", "markdown": t} for i, t in enumerate(self.titles)]
+
+    async def scrape(self, url: str, formats=None, extract_schema=None) -> dict:
+        index = int(url.rsplit("/", 1)[1])
+        return {
+            "extract": {
+                "title": self.titles[index],
+                "start_date": "January 15, 2030",
+                "start_time": "7:00 PM",
+            }
+        }
+
+    async def close(self) -> None:
+        pass
+
+
+class TestStreamingDiscover:
+    """Test posh-discover in JSON Lines mode."""
+
+    async def test_streams_events_and_caches_in_chunks(self, monkeypatch, tmp_path) -> None:
+        """Events are written one per line and cached in bounded chunks."""
+        extractor = PoshExtractor(client=FakeFirecrawlClient(["A", "B", "C"]))
+        cache = InMemoryEventCache()
+        batches: list[int] = []
+        put_many = cache.put_many
+
+        def record_put_many(source: str, events: list[dict]) -> int:
+            batches.append(len(events))
+            return put_many(source, events)
+
+        monkeypatch.setattr(cache, "put_many", record_put_many)
+        monkeypatch.setattr(scrape, "get_posh_extractor", lambda: extractor)
+        monkeypatch.setattr(scrape, "get_event_cache", lambda: cache)
+        monkeypatch.setattr(scrape, "CACHE_WRITE_BATCH_SIZE", 2)
+        path = tmp_path / "posh.jsonl"
+
+        await scrape.discover_posh_events("columbus", cache=True, output_file=str(path), jsonl=True)
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["title"] for line in lines] == ["A", "B", "C"]
+        assert batches == [2, 1]
+        assert cache.count("posh") == 3
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,9 +22,68 @@ class Settings(BaseSettings):
         description="Database connection URL. Empty = in-memory mode (no persistence)",
     )
 
+    # Shared state (optional - empty means process-local state, one worker)
+    redis_url: str = Field(
+        default="",
+        description="Redis-protocol URL for sessions, SSE fan-out and cache shared across workers",
+    )
+
+    # SSE push queues
+    sse_queue_size: int = Field(
+        default=100,
+        description="Maximum undelivered background events buffered per SSE connection",
+    )
+    sse_overflow_policy: Literal["drop_oldest", "coalesce", "disconnect"] = Field(
+        default="drop_oldest",
+        description="SSE queue overflow policy: drop_oldest, coalesce or disconnect",
+    )
+
+    sse_heartbeat_seconds: float = Field(
+        default=15.0,
+        description="Seconds between SSE heartbeat comments while a stream is idle",
+    )
+    sse_linger_seconds: float = Field(
+        default=60.0,
+        description="Max seconds a chat stream stays open for pending background results",
+    )
+
+    # Conversation history compaction (0 disables compaction)
+    session_token_budget: int = Field(
+        default=12_000,
+        description="Approximate token budget for conversation history sent to the model",
+    )
+    session_keep_recent_turns: int = Field(
+        default=2,
+        description="Recent turns whose tool outputs are kept verbatim",
+    )
+
+    # In-memory sessions (used when no database is configured)
+    memory_session_idle_timeout: int = Field(
+        default=3600,
+        description="Seconds before an idle in-memory session is evicted",
+    )
+    memory_session_max_items: int = Field(
+        default=200,
+        description="Maximum history items kept per in-memory session",
+    )
+    memory_session_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Approximate cap on total in-memory session storage (bytes)",
+    )
+
+    # Hot window materialization (0 disables the refresh worker)
+    hot_window_refresh_seconds: int = Field(
+        default=0,
+        description="Seconds between hot window refreshes (tonight, this weekend, next week)",
+    )
+
     # Event sources
     eventbrite_api_key: str = Field(default="", description="Eventbrite API key")
     exa_api_key: str = Field(default="", description="Exa API key for web search")
+    webset_discovery: bool = Field(
+        default=False,
+        description="Start a paid Websets deep discovery after each chat search (needs an Exa key)",
+    )
     firecrawl_api_key: str = Field(default="", description="Firecrawl API key for web scraping")
 
     # Google Calendar OAuth
@@ -68,6 +128,11 @@ class Settings(BaseSettings):
         """Check if database persistence is configured."""
         return bool(self.database_url)
 
+    @property
+    def has_redis(self) -> bool:
+        """Check if a shared Redis-protocol backend is configured."""
+        return bool(self.redis_url)
+
 
 @lru_cache
 def get_settings() -> Settings:
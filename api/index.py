@@ -7,18 +7,26 @@ import os
 import time
 import uuid
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from openai import OpenAI
 from pydantic import BaseModel
 
-from agents import Runner, SQLiteSession
+from agents import Runner
 
 from api.agents import orchestrator_agent
-from api.config import configure_logging
+from api.agents.search import materialize_events
+from api.agents.temporal_context import (
+    TurnContext,
+    resolve_message_time,
+    search_resolved_time,
+    should_search_directly,
+)
+from api.config import configure_logging, get_settings
 from api.services import (
     register_eventbrite_source,
     register_exa_source,
@@ -33,13 +41,21 @@ from api.services.firecrawl import (
     register_river_source,
 )
 from api.services.firecrawl_agent import register_firecrawl_agent_source
-from api.services.calendar import CalendarEvent, create_ics_event, create_ics_multiple
+from api.services.calendar import CalendarEvent, iter_ics
+from api.services.calendar_feed import get_calendar_feed_service, is_not_modified
+from api.services.credential_store import get_credential_service
 from api.services.google_calendar import (
     GoogleCalendarEvent,
     get_google_calendar_service,
 )
-from api.services.session import get_session_manager
+from api.services.msgraph import register_outlook_credentials
+from api.services.result_store import get_result_store
+from api.services.session import Session, get_session_manager
+from api.services.background_tasks import get_background_task_manager
+from api.services.hot_windows import STALE_AFTER_INTERVALS, HotWindowRefresher, get_hot_window_store
 from api.services.sse_connections import get_sse_manager
+from api.services.sse_stream import follow_replay, multiplex_stream, start_resumable
+from api.services.state_backend import get_state_backend
 
 load_dotenv()
 
@@ -75,7 +91,47 @@ def _format_user_error(error: Exception) -> str:
         return "Something went wrong. Please try again."
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    """Application startup/shutdown hooks."""
+    sse_manager = get_sse_manager()
+    await sse_manager.start()
+    # Resume deep discovery jobs interrupted by the last shutdown
+    await get_background_task_manager().recover()
+
+    # Materialize common search windows so matching searches are local reads
+    refresher: HotWindowRefresher | None = None
+    refresh_seconds = get_settings().hot_window_refresh_seconds
+    if refresh_seconds > 0:
+        store = get_hot_window_store()
+        store.max_age_seconds = refresh_seconds * STALE_AFTER_INTERVALS
+        refresher = HotWindowRefresher(
+            materialize_events,
+            store,
+            interval_seconds=refresh_seconds,
+            backend=get_state_backend(),
+        )
+        await refresher.start()
+
+    # Refresh OAuth tokens ahead of expiry so requests rarely wait on one
+    credential_service = get_credential_service()
+    get_google_calendar_service()  # registers the Google refresher
+    register_outlook_credentials(credential_service)
+    await credential_service.start()
+
+    yield
+    await credential_service.stop()
+    if refresher is not None:
+        await refresher.stop()
+    await get_background_task_manager().stop()
+    await sse_manager.stop()
+    # Persist buffered conversation history before exit
+    await get_session_manager().close()
+    await get_state_backend().close()
+    await get_google_calendar_service().close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS configuration from environment
 ALLOWED_ORIGINS = os.getenv(
@@ -127,6 +183,13 @@ class ExportMultipleRequest(BaseModel):
     events: list[CalendarEvent]
 
 
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
 def sse_event(event_type: str, data: dict) -> str:
     """Format a Server-Sent Event with type included in payload."""
     # Include type in the JSON payload so frontend can access it
@@ -134,9 +197,15 @@ def sse_event(event_type: str, data: dict) -> str:
     return f"data: {json.dumps(payload)}\n\n"
 
 
+def _push_event_frame(event: dict) -> str:
+    """Format an event pushed by a background task as an SSE frame."""
+    data = {k: v for k, v in event.items() if k != "type"}
+    return sse_event(event.get("type", "message"), data)
+
+
 async def stream_chat_response(
     message: str,
-    session: SQLiteSession | None = None,
+    session: Session | None = None,
     session_id: str | None = None,
 ) -> AsyncGenerator[str, None]:
     """Stream chat response using orchestrator agent.
@@ -146,34 +215,86 @@ async def stream_chat_response(
     2. Search (finding events via tools)
     3. Refinement (filtering existing results)
     4. Similar events (finding related events)
+
+    The agent's frames are multiplexed with events pushed by background
+    tasks for the session (e.g. 'more_events' from Websets). The stream
+    sends heartbeats while idle and lingers after the answer while
+    background discovery is still running.
     """
     trace_id = str(uuid.uuid4())[:8]
     logger.info("🚀 [Chat] Start | trace=%s session=%s", trace_id, session_id)
 
+    settings = get_settings()
     sse_manager = get_sse_manager()
+    background = get_background_task_manager()
+    conn = None
 
     try:
         # Register SSE connection for background events
         if session_id:
-            await sse_manager.register(session_id)
+            conn = await sse_manager.register(session_id)
             logger.debug("📡 [SSE] Registered | session=%s", session_id)
 
-        # Run orchestrator agent
+        async for frame in multiplex_stream(
+            _orchestrator_frames(message, session, trace_id, session_id),
+            conn,
+            format_event=_push_event_frame,
+            heartbeat_seconds=settings.sse_heartbeat_seconds,
+            linger_seconds=settings.sse_linger_seconds,
+            should_linger=lambda: bool(session_id) and background.has_pending(session_id),
+        ):
+            yield frame
+
+        # Signal completion
+        yield sse_event("done", {})
+
+    finally:
+        if session_id:
+            await sse_manager.unregister(session_id, conn)
+            logger.debug("📡 [SSE] Unregistered | session=%s", session_id)
+
+
+async def _orchestrator_frames(
+    message: str,
+    session: Session | None,
+    trace_id: str,
+    session_id: str | None = None,
+) -> AsyncGenerator[str, None]:
+    """Run the orchestrator and yield its response as SSE frames."""
+    try:
+        # Resolve relative dates deterministically before the model runs
+        resolved = resolve_message_time(message)
         start_time = time.perf_counter()
-        result = await Runner.run(
-            orchestrator_agent,
-            message,
-            session=session,
-        )
-        duration = time.perf_counter() - start_time
-        logger.info(
-            "✅ [Orchestrator] Complete | trace=%s duration=%.2fs",
-            trace_id,
-            duration,
-        )
 
-        if result.final_output:
+        if (
+            resolved is not None
+            and session is not None
+            and await should_search_directly(resolved, session)
+        ):
+            # Pure time answer to a clarifying question: search right away
+            output = await search_resolved_time(message, resolved, session, session_id)
+            logger.info(
+                "⚡ [Chat] Direct time search | trace=%s phrase=%s duration=%.2fs",
+                trace_id,
+                resolved.phrase,
+                time.perf_counter() - start_time,
+            )
+        else:
+            # Run orchestrator agent
+            result = await Runner.run(
+                orchestrator_agent,
+                message,
+                session=session,
+                context=TurnContext(resolved_time=resolved, session_id=session_id),
+            )
             output = result.final_output
+            logger.info(
+                "✅ [Orchestrator] Complete | trace=%s duration=%.2fs",
+                trace_id,
+                time.perf_counter() - start_time,
+            )
+
+        if output:
 
             # Stream message content
             if output.message:
@@ -193,19 +314,34 @@ async def stream_chat_response(
             if output.placeholder:
                 yield sse_event("placeholder", {"placeholder": output.placeholder})
 
-            # Send events if present (from search or refinement)
-            if output.events:
+            # Send events if present (from search or refinement). A result
+            # handle is expanded server-side so the model doesn't echo events.
+            events = list(output.events)
+            if output.result_handle:
+                stored = get_result_store().page(
+                    output.result_handle, offset=output.result_offset, session_id=session_id
+                )
+                if stored is not None:
+                    events = stored
+                else:
+                    logger.warning(
+                        "⚠️ [Chat] Unknown result handle | trace=%s handle=%s",
+                        trace_id,
+                        output.result_handle,
+                    )
+
+            if events:
                 events_data = [
                     {
-                        "id": evt.id if hasattr(evt, "id") else evt.get("id"),
-                        "title": evt.title if hasattr(evt, "title") else evt.get("title"),
-                        "startTime": evt.date if hasattr(evt, "date") else evt.get("date"),
-                        "location": evt.location if hasattr(evt, "location") else evt.get("location"),
-                        "categories": [evt.category if hasattr(evt, "category") else evt.get("category", "other")],
-                        "url": evt.url if hasattr(evt, "url") else evt.get("url"),
+                        "id": evt.id,
+                        "title": evt.title,
+                        "startTime": evt.date,
+                        "location": evt.location,
+                        "categories": [evt.category],
+                        "url": evt.url,
                         "source": "orchestrator",
                     }
-                    for evt in output.events
+                    for evt in events
                 ]
                 yield sse_event("events", {"events": events_data, "trace_id": trace_id})
                 logger.debug(
@@ -214,9 +350,6 @@ async def stream_chat_response(
                     len(events_data),
                 )
 
-        # Signal completion
-        yield sse_event("done", {})
-
     except Exception as e:
         logger.error(
             "❌ [Chat] Error | trace=%s error=%s",
@@ -226,12 +359,6 @@ async def stream_chat_response(
         )
         error_msg = _format_user_error(e)
         yield sse_event("error", {"message": error_msg})
-        yield sse_event("done", {})
-
-    finally:
-        if session_id:
-            await sse_manager.unregister(session_id)
-            logger.debug("📡 [SSE] Unregistered | session=%s", session_id)
 
 
 @app.get("/")
@@ -246,6 +373,12 @@ def health():
     return {"status": "healthy"}
 
 
+@app.get("/api/sessions/metrics")
+def session_metrics():
+    """Session storage metrics (sizes and eviction counters)."""
+    return get_session_manager().metrics()
+
+
 @app.post("/api/chat")
 def chat(request: ChatRequest):
     """Non-streaming chat endpoint (legacy)."""
@@ -288,36 +421,59 @@ async def chat_stream(request: ChatStreamRequest):
         return StreamingResponse(
             _error_stream("OpenAI API key not configured. Please check server configuration."),
             media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no",
-            },
+            headers=SSE_HEADERS,
+        )
+
+    if not request.session_id:
+        return StreamingResponse(
+            stream_chat_response(request.message),
+            media_type="text/event-stream",
+            headers=SSE_HEADERS,
         )
 
     # Get session for conversation history persistence
-    session = None
-    if request.session_id:
-        session_manager = get_session_manager()
-        session = session_manager.get_session(request.session_id)
+    session = get_session_manager().get_session(request.session_id)
+
+    # Run the response in the background so a dropped client can resume
+    sse_manager = get_sse_manager()
+    buffer = await sse_manager.open_replay(request.session_id)
+    start_resumable(
+        buffer, stream_chat_response(request.message, session, request.session_id)
+    )
 
     return StreamingResponse(
-        stream_chat_response(request.message, session, request.session_id),
+        follow_replay(buffer, heartbeat_seconds=get_settings().sse_heartbeat_seconds),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        headers=SSE_HEADERS,
+    )
+
+
+@app.get("/api/chat/stream/{session_id}/resume")
+async def resume_chat_stream(
+    session_id: str,
+    last_event_id: str | None = Header(default=None),
+):
+    """Resume a session's chat stream, replaying frames after Last-Event-ID."""
+    buffer = get_sse_manager().get_replay(session_id)
+    if buffer is None:
+        raise HTTPException(status_code=404, detail="No stream to resume for this session")
+
+    return StreamingResponse(
+        follow_replay(
+            buffer,
+            last_event_id=last_event_id,
+            heartbeat_seconds=get_settings().sse_heartbeat_seconds,
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
     )
 
 
 @app.post("/api/calendar/export")
 def export_calendar(event: CalendarEvent):
     """Export a single event as ICS file."""
-    ics_content = create_ics_event(event)
     return StreamingResponse(
-        iter([ics_content]),
+        iter_ics([event]),
         media_type="text/calendar",
         headers={"Content-Disposition": "attachment; filename=event.ics"},
     )
@@ -329,14 +485,103 @@ def export_calendar_multiple(request: ExportMultipleRequest):
     if not request.events:
         raise HTTPException(status_code=400, detail="No events provided")
 
-    ics_content = create_ics_multiple(request.events)
+    # Streamed: the header goes out before the events are rendered
     return StreamingResponse(
-        iter([ics_content]),
+        iter_ics(request.events),
         media_type="text/calendar",
         headers={"Content-Disposition": "attachment; filename=events.ics"},
     )
 
 
+# Subscribable calendar feeds
+
+# Calendar apps poll subscriptions; let intermediaries revalidate via ETag
+FEED_CACHE_CONTROL = "private, max-age=300, must-revalidate"
+
+
+class FeedPicksRequest(BaseModel):
+    """Request body for saving a user's picked events to their feed."""
+
+    events: list[CalendarEvent]
+
+
+@app.put("/api/calendar/feeds/{user_id}")
+def save_calendar_feed(
+    user_id: str,
+    request: FeedPicksRequest,
+    http_request: Request,
+    x_feed_token: str | None = Header(default=None),
+):
+    """
+    Replace a user's picks and return the feed's subscription URLs.
+
+    The first save issues the feed token; replacing an existing feed
+    requires it in the X-Feed-Token header.
+    """
+    service = get_calendar_feed_service()
+    if not service.authorize(user_id, x_feed_token):
+        raise HTTPException(status_code=403, detail="Invalid feed token")
+    meta = service.set_picks(user_id, request.events)
+    feed_url = str(http_request.url_for("calendar_feed", token=meta.token))
+    return {
+        "token": meta.token,
+        "feed_url": feed_url,
+        "webcal_url": "webcal://" + feed_url.split("://", 1)[1],
+        "etag": meta.etag,
+        "event_count": meta.event_count,
+    }
+
+
+@app.get("/api/calendar/feeds/{token}.ics", name="calendar_feed")
+def calendar_feed(
+    token: str,
+    if_none_match: str | None = Header(default=None),
+    if_modified_since: str | None = Header(default=None),
+):
+    """Serve a feed by its token, answering unchanged polls with 304."""
+    service = get_calendar_feed_service()
+    user_id = service.find_user(token)
+    meta = service.get_meta(user_id) if user_id else None
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Feed not found")
+
+    if is_not_modified(meta, if_none_match, if_modified_since):
+        return Response(
+            status_code=304,
+            headers={
+                "ETag": meta.etag,
+                "Last-Modified": meta.last_modified,
+                "Cache-Control": FEED_CACHE_CONTROL,
+            },
+        )
+
+    rendered = service.render(user_id)
+    if rendered is None:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    meta, body = rendered
+    return Response(
+        content=body,
+        media_type="text/calendar",
+        headers={
+            "ETag": meta.etag,
+            "Last-Modified": meta.last_modified,
+            "Cache-Control": FEED_CACHE_CONTROL,
+        },
+    )
+
+
+@app.delete("/api/calendar/feeds/{user_id}")
+def delete_calendar_feed(user_id: str, x_feed_token: str | None = Header(default=None)):
+    """Delete a user's feed (requires the feed token in X-Feed-Token)."""
+    service = get_calendar_feed_service()
+    if service.get_meta(user_id) is None:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    if not service.authorize(user_id, x_feed_token):
+        raise HTTPException(status_code=403, detail="Invalid feed token")
+    service.delete(user_id)
+    return {"deleted": True}
+
+
 # Google Calendar OAuth endpoints
 
 
@@ -438,7 +683,7 @@ def google_auth_revoke(user_id: str):
 
 
 @app.post("/api/google/calendar/event")
-def create_google_event(request: GoogleEventRequest):
+async def create_google_event(request: GoogleEventRequest):
     """Create an event in the user's Google Calendar."""
     service = get_google_calendar_service()
 
@@ -455,7 +700,7 @@ def create_google_event(request: GoogleEventRequest):
         )
 
     try:
-        result = service.create_event(request.user_id, request.event)
+        result = await service.create_event(request.user_id, request.event)
         return {
             "success": True,
             "event_id": result.get("id"),
@@ -467,7 +712,7 @@ def create_google_event(request: GoogleEventRequest):
 
 
 @app.post("/api/google/calendar/events")
-def create_google_events(request: GoogleEventsRequest):
+async def create_google_events(request: GoogleEventsRequest):
     """Create multiple events in the user's Google Calendar."""
     service = get_google_calendar_service()
 
@@ -484,7 +729,7 @@ def create_google_events(request: GoogleEventsRequest):
         )
 
     try:
-        results = service.create_events_batch(request.user_id, request.events)
+        results = await service.create_events_batch(request.user_id, request.events)
         return {
             "success": True,
             "created": len([r for r in results if "id" in r]),
@@ -46,3 +46,10 @@ class SearchResult(BaseModel):
     message: str | None = Field(
         default=None, description="User-facing message about data source"
     )
+    result_handle: str | None = Field(
+        default=None,
+        description="Server-side handle for the full result set (pass to refine/page/similar tools)",
+    )
+    total_count: int | None = Field(
+        default=None, description="Total events in the result set (may exceed events shown)"
+    )
@@ -5,6 +5,7 @@ from __future__ import annotations
 from pydantic import BaseModel, Field
 
 from api.models.events import EventResult
+from api.models.search import SearchProfile
 
 
 class QuickPick(BaseModel):
@@ -28,6 +29,18 @@ class OrchestratorResponse(BaseModel):
         default_factory=list,
         description="Events to display (from search or refinement)",
     )
+    result_handle: str | None = Field(
+        default=None,
+        description="Handle of the result set to display; the server expands it into events",
+    )
+    result_offset: int = Field(
+        default=0,
+        description="Index of the first event of result_handle to display (offset from page_results)",
+    )
+    search_profile: SearchProfile | None = Field(
+        default=None,
+        description="Search criteria gathered so far (categories, keywords, constraints)",
+    )
     phase: str = Field(
         default="clarifying",
         description="Current phase: clarifying, searching, presenting, refining",
@@ -1,17 +1,38 @@
 """Services for Calendar Club backend."""
 
-from .background_tasks import BackgroundTaskManager, get_background_task_manager
+from .background_tasks import (
+    BackgroundTaskManager,
+    DiscoveryJob,
+    get_background_task_manager,
+    start_search_discovery,
+)
 from .base import (
     EventSource,
     EventSourceRegistry,
     get_event_source_registry,
     register_event_source,
 )
-from .calendar import CalendarEvent, create_ics_event, create_ics_multiple
+from .calendar import CalendarEvent, create_ics_event, create_ics_multiple, iter_ics
+from .calendar_feed import (
+    CalendarFeedService,
+    FeedMeta,
+    get_calendar_feed_service,
+    is_not_modified,
+)
+from .crawl_state import CrawlState, CrawlStateStore
+from .credential_store import (
+    CredentialService,
+    CredentialStore,
+    InMemoryCredentialStore,
+    StoredCredential,
+    get_credential_service,
+)
+from .date_parsing import parse_event_datetime, parse_iso_datetime
 from .event_cache import (
     CachedEvent,
     EventCache,
     EventCacheService,
+    RedisEventCache,
     get_event_cache,
     init_event_cache,
 )
@@ -34,6 +55,20 @@ from .exa_research import (
     get_exa_research_client,
     register_exa_research_source,
 )
+from .hot_windows import (
+    HotWindow,
+    HotWindowRefresher,
+    HotWindowStore,
+    MaterializedSet,
+    get_hot_window_store,
+)
+from .job_store import (
+    InMemoryJobStore,
+    JobRecord,
+    JobStore,
+    get_job_store,
+    init_job_store,
+)
 from .firecrawl_agent import (
     FirecrawlAgentClient,
     get_firecrawl_agent_client,
@@ -72,24 +107,70 @@ from .google_calendar import (
 from .msgraph import (
     MSGraphAuth,
     OutlookCalendarClient,
+    OutlookDeltaPage,
     OutlookEvent,
     TokenInfo,
     get_msgraph_auth,
     get_outlook_client,
+    get_outlook_client_for_user,
+    register_outlook_credentials,
+    store_outlook_tokens,
+)
+from .result_filter import CompiledFilter, ResultColumns, compile_filter
+from .result_store import ResultSet, ResultStore, get_result_store
+from .session import (
+    BackendSession,
+    SessionManager,
+    get_session_manager,
+    init_session_manager,
+)
+from .session_compaction import CompactingSession, compact_items
+from .session_memory import BoundedSessionStorage, SessionStorageMetrics
+from .session_store import PooledSQLiteSession, SQLiteSessionStore
+from .sse_connections import (
+    BoundedEventQueue,
+    OverflowPolicy,
+    ReplayBuffer,
+    SSEConnection,
+    SSEConnectionManager,
+    get_sse_manager,
+)
+from .sse_stream import follow_replay, multiplex_stream, start_resumable
+from .state_backend import (
+    LocalStateBackend,
+    RedisStateBackend,
+    StateBackend,
+    get_state_backend,
+    init_state_backend,
 )
-from .session import SessionManager, get_session_manager, init_session_manager
-from .sse_connections import SSEConnection, SSEConnectionManager, get_sse_manager
 from .temporal_parser import TemporalParser, TemporalResult
 
 __all__ = [
     "BackgroundTaskManager",
+    "DiscoveryJob",
     "get_background_task_manager",
+    "start_search_discovery",
     "CalendarEvent",
     "create_ics_event",
     "create_ics_multiple",
+    "iter_ics",
+    "CalendarFeedService",
+    "FeedMeta",
+    "get_calendar_feed_service",
+    "is_not_modified",
+    "CrawlState",
+    "CrawlStateStore",
+    "CredentialService",
+    "CredentialStore",
+    "InMemoryCredentialStore",
+    "StoredCredential",
+    "get_credential_service",
+    "parse_event_datetime",
+    "parse_iso_datetime",
     "CachedEvent",
     "EventCache",
     "EventCacheService",
+    "RedisEventCache",
     "get_event_cache",
     "init_event_cache",
     "EventbriteClient",
@@ -100,6 +181,16 @@ __all__ = [
     "EventSourceRegistry",
     "get_event_source_registry",
     "register_event_source",
+    "HotWindow",
+    "HotWindowRefresher",
+    "HotWindowStore",
+    "MaterializedSet",
+    "get_hot_window_store",
+    "InMemoryJobStore",
+    "JobRecord",
+    "JobStore",
+    "get_job_store",
+    "init_job_store",
     "ExaClient",
     "ExaSearchResult",
     "ExaWebset",
@@ -140,16 +231,44 @@ __all__ = [
     "get_google_calendar_service",
     "MSGraphAuth",
     "OutlookCalendarClient",
+    "OutlookDeltaPage",
     "OutlookEvent",
     "TokenInfo",
     "get_msgraph_auth",
     "get_outlook_client",
+    "get_outlook_client_for_user",
+    "register_outlook_credentials",
+    "store_outlook_tokens",
+    "CompiledFilter",
+    "ResultColumns",
+    "compile_filter",
+    "ResultSet",
+    "ResultStore",
+    "get_result_store",
+    "BackendSession",
     "SessionManager",
     "get_session_manager",
     "init_session_manager",
+    "CompactingSession",
+    "compact_items",
+    "BoundedSessionStorage",
+    "SessionStorageMetrics",
+    "PooledSQLiteSession",
+    "SQLiteSessionStore",
+    "BoundedEventQueue",
+    "OverflowPolicy",
+    "ReplayBuffer",
     "SSEConnection",
     "SSEConnectionManager",
     "get_sse_manager",
+    "multiplex_stream",
+    "follow_replay",
+    "start_resumable",
+    "StateBackend",
+    "LocalStateBackend",
+    "RedisStateBackend",
+    "get_state_backend",
+    "init_state_backend",
     "TemporalParser",
     "TemporalResult",
 ]
@@ -3,15 +3,42 @@ Background tasks for async operations like Websets polling.
 
 Handles long-running operations that push results via SSE
 when complete.
+
+Deep discovery runs through a job scheduler rather than one task per
+session:
+
+- A bounded pool of workers caps concurrent upstream Webset jobs
+- Queued jobs are picked by priority; ties are served round-robin across
+  tenants so one busy tenant cannot starve the others
+- Identical queries share a single job; its results fan out to every
+  subscribed session
+- Job state, the upstream Webset ID and the poll schedule are kept in
+  the job store; on startup, active jobs are recovered and polling
+  resumes. Results are written to the event cache so a Webset that was
+  already paid for is never wasted, even if every session has left
+- Workers sharing a job store lease each job before running it, so a
+  job is resumed (and its Webset created) by one worker only. A session
+  asking for a job another worker holds joins it through the store, and
+  the lease holder fans results out to it. Limits such as
+  MAX_CONCURRENT_JOBS apply per worker process
 """
 
 import asyncio
+import itertools
 import logging
+import os
+import socket
 import time
-from dataclasses import dataclass
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 
+from api.config import get_settings
 from api.models import SearchProfile
-from api.services.exa_client import get_exa_client
+from api.services.event_cache import CachedEvent, get_event_cache
+from api.services.exa_client import ExaWebset, get_exa_client
+from api.services.job_store import JobRecord, JobStoreType, get_job_store
 from api.services.sse_connections import get_sse_manager
 
 logger = logging.getLogger(__name__)
@@ -20,228 +47,686 @@ logger = logging.getLogger(__name__)
 WEBSET_POLL_INTERVAL = 5.0  # seconds between polls
 WEBSET_MAX_POLLS = 60  # max polls before giving up (5 min total)
 WEBSET_TARGET_COUNT = 25  # target number of results
+WEBSET_CRITERIA = "Must be an upcoming event with date, time, and location"
+WEBSET_CACHE_SOURCE = "webset"  # event cache source for Webset results
 
+# Scheduler limits
+MAX_CONCURRENT_JOBS = 4  # upstream Webset jobs running at once (per worker process)
+MAX_QUEUED_JOBS = 200  # jobs waiting for a worker before new ones are rejected
+JOB_LEASE_SECONDS = 60.0  # job lease, renewed on every poll
+
+# Lower value runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 10
+PRIORITY_BACKGROUND = 20
+
+
+def build_webset_query(profile: SearchProfile) -> str:
+    """Build the Webset query for a search profile."""
+    query_parts = ["events", "Columbus Ohio"]
+    if profile.categories:
+        query_parts.extend(profile.categories)
+    if profile.keywords:
+        query_parts.extend(profile.keywords)
+    return " ".join(query_parts)
+
+
+def job_key(query: str) -> str:
+    """Dedup key for a query (case and whitespace insensitive)."""
+    return " ".join(query.lower().split())
 
-@dataclass
-class WebsetTask:
-    """Tracks a running Webset task."""
 
-    session_id: str
-    webset_id: str
-    profile: SearchProfile
+@dataclass
+class DiscoveryJob:
+    """A deep discovery job shared by every session that asked for it."""
+
+    key: str
+    query: str
+    tenant_id: str
+    priority: int = PRIORITY_DEFAULT
+    subscribers: set[str] = field(default_factory=set)
+    webset_id: str | None = None
+    status: str = "queued"  # queued, running, completed, failed, cancelled, delegated
+    polls: int = 0
+    next_poll_at: datetime | None = None
+    result_ids: list[str] = field(default_factory=list)
+    seq: int = 0
     task: asyncio.Task[None] | None = None
 
+    def to_record(self, owner: str | None = None) -> JobRecord:
+        """Snapshot the job for the job store."""
+        return JobRecord(
+            key=self.key,
+            query=self.query,
+            tenant_id=self.tenant_id,
+            priority=self.priority,
+            subscribers=sorted(self.subscribers),
+            status=self.status,
+            webset_id=self.webset_id,
+            polls=self.polls,
+            next_poll_at=self.next_poll_at,
+            result_ids=self.result_ids,
+            owner=owner,
+        )
+
+    @classmethod
+    def from_record(cls, record: JobRecord, seq: int) -> "DiscoveryJob":
+        """Rebuild a job from the job store."""
+        return cls(
+            key=record.key,
+            query=record.query,
+            tenant_id=record.tenant_id,
+            priority=record.priority,
+            subscribers=set(record.subscribers),
+            webset_id=record.webset_id,
+            polls=record.polls,
+            next_poll_at=record.next_poll_at,
+            result_ids=list(record.result_ids),
+            seq=seq,
+        )
+
 
 class BackgroundTaskManager:
-    """Manages background tasks like Websets polling."""
+    """Schedules background discovery jobs on a bounded worker pool."""
+
+    def __init__(
+        self,
+        max_concurrent_jobs: int = MAX_CONCURRENT_JOBS,
+        job_store: JobStoreType | None = None,
+    ) -> None:
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self._store = job_store
+        self._jobs: dict[str, DiscoveryJob] = {}  # key -> queued/running job
+        self._session_jobs: dict[str, str] = {}  # session_id -> job key
+        # session_id -> (job key, monotonic deadline) for jobs run by another worker
+        self._remote_sessions: dict[str, tuple[str, float]] = {}
+        self._tenant_queues: dict[str, list[DiscoveryJob]] = {}
+        self._tenant_order: deque[str] = deque()
+        self._seq = itertools.count()
+        self._queued = 0
+        self._wakeup = asyncio.Condition()
+        self._workers: list[asyncio.Task[None]] = []
+        self._stopping = False
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    @property
+    def store(self) -> JobStoreType:
+        """Job store used for durability (global store by default)."""
+        if self._store is None:
+            self._store = get_job_store()
+        return self._store
+
+    async def _persist(self, job: DiscoveryJob) -> None:
+        """Write the job's current state to the job store."""
+        try:
+            # The store blocks (SQLite); keep it off the loop
+            saved = await asyncio.to_thread(self.store.save, job.to_record(self.owner_id))
+        except Exception as e:
+            logger.warning("Failed to persist job %s: %s", job.key, e)
+            return
+        if not saved:
+            logger.warning("Job %s is leased by another worker; state not saved", job.key)
+
+    async def _claim(self, key: str) -> bool:
+        """
+        Take or renew this worker's lease on a job.
+
+        Args:
+            key: Job key
+
+        Returns:
+            True if this worker may run the job
+        """
+        try:
+            return await asyncio.to_thread(
+                self.store.claim, key, self.owner_id, JOB_LEASE_SECONDS
+            )
+        except Exception as e:
+            # Without a lease another worker might run it too; don't risk a second Webset
+            logger.warning("Failed to claim job %s: %s", key, e)
+            return False
 
-    def __init__(self) -> None:
-        self._webset_tasks: dict[str, WebsetTask] = {}
-        self._lock = asyncio.Lock()
+    async def _join_remote(self, key: str, session_id: str) -> bool:
+        """
+        Subscribe a session to a job another worker holds the lease on.
+
+        Returns:
+            True if joined; the lease holder pushes the results
+        """
+        try:
+            joined = await asyncio.to_thread(
+                self.store.add_subscriber, key, session_id, self.owner_id
+            )
+        except Exception as e:
+            logger.warning("Failed to join job %s: %s", key, e)
+            return False
+        if joined:
+            # The job can't outlive its poll budget; stop lingering after that
+            deadline = time.monotonic() + WEBSET_MAX_POLLS * WEBSET_POLL_INTERVAL
+            self._remote_sessions[session_id] = (key, deadline)
+        return joined
+
+    async def _hand_off(self, job: DiscoveryJob) -> None:
+        """Move a job's sessions to the worker that holds its lease."""
+        job.status = "delegated"
+        for session_id in list(job.subscribers):
+            if not await self._join_remote(job.key, session_id):
+                logger.warning(
+                    "Session %s lost job %s: no live worker holds it", session_id, job.key
+                )
+        logger.info("Job %s is leased by another worker; handed off its sessions", job.key)
+
+    async def _all_subscribers(self, job: DiscoveryJob) -> set[str]:
+        """Local subscribers plus sessions that joined from other workers."""
+        try:
+            record = await asyncio.to_thread(self.store.get, job.key)
+        except Exception as e:
+            logger.warning("Failed to read subscribers of job %s: %s", job.key, e)
+            record = None
+        remote = set(record.remote_subscribers) if record is not None else set()
+        return job.subscribers | remote
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
 
     async def start_webset_discovery(
         self,
         session_id: str,
         profile: SearchProfile,
+        priority: int = PRIORITY_DEFAULT,
+        tenant_id: str | None = None,
     ) -> str | None:
-        """Start a Websets deep discovery for a session.
+        """Schedule a Websets deep discovery for a session.
+
+        If an identical query is already queued or running (on this worker
+        or, through the job store, on another), the session subscribes to
+        that job instead of starting a new one.
 
         Args:
             session_id: Session to push results to
             profile: Search profile for the query
+            priority: Scheduling priority (lower runs first)
+            tenant_id: Fairness group; defaults to the session
 
         Returns:
-            Webset ID if started, None if failed
+            Job key (not the Webset ID, which is created once a worker
+            runs the job) if scheduled, None if the queue is full
         """
-        client = get_exa_client()
+        query = build_webset_query(profile)
+        key = job_key(query)
 
-        # Build query from profile
-        query_parts = ["events", "Columbus Ohio"]
-        if profile.categories:
-            query_parts.extend(profile.categories)
-        if profile.keywords:
-            query_parts.extend(profile.keywords)
+        # A session follows one discovery at a time
+        await self._unsubscribe(session_id)
 
-        query = " ".join(query_parts)
+        job = self._jobs.get(key)
+        if job is not None:
+            job.subscribers.add(session_id)
+            self._session_jobs[session_id] = key
+            await self._persist(job)
+            logger.debug(
+                "🔗 [Background] Joined job | session=%s key=%s subscribers=%d",
+                session_id,
+                key,
+                len(job.subscribers),
+            )
+            return key
 
-        # Add criteria for events
-        criteria = "Must be an upcoming event with date, time, and location"
+        if await self._join_remote(key, session_id):
+            logger.debug(
+                "🔗 [Background] Joined job on another worker | session=%s key=%s",
+                session_id,
+                key,
+            )
+            return key
 
-        try:
+        if self._queued >= MAX_QUEUED_JOBS:
+            logger.warning("Discovery queue full, rejecting job for session %s", session_id)
+            return None
+
+        job = DiscoveryJob(
+            key=key,
+            query=query,
+            tenant_id=tenant_id or session_id,
+            priority=priority,
+            subscribers={session_id},
+            seq=next(self._seq),
+        )
+        self._jobs[key] = job
+        self._session_jobs[session_id] = key
+        await self._persist(job)
+        # Lease it now so other workers join this job instead of starting their own
+        await self._claim(key)
+        await self._enqueue(job)
+        logger.debug(
+            "📥 [Background] Job queued | session=%s key=%s priority=%d queued=%d",
+            session_id,
+            key,
+            priority,
+            self._queued,
+        )
+        return key
+
+    async def _enqueue(self, job: DiscoveryJob) -> None:
+        """Add a job to its tenant's queue and wake a worker."""
+        self._ensure_workers()
+        queue = self._tenant_queues.setdefault(job.tenant_id, [])
+        queue.append(job)
+        if job.tenant_id not in self._tenant_order:
+            self._tenant_order.append(job.tenant_id)
+        self._queued += 1
+        async with self._wakeup:
+            self._wakeup.notify()
+
+    def _pop_next(self) -> DiscoveryJob | None:
+        """
+        Take the next job to run.
+
+        The best priority across tenants wins; among tenants offering that
+        priority, the one served least recently goes first.
+        """
+        best: tuple[int, int, str] | None = None
+        for order, tenant in enumerate(self._tenant_order):
+            queue = self._tenant_queues.get(tenant)
+            if not queue:
+                continue
+            head = min(queue, key=lambda j: (j.priority, j.seq))
+            candidate = (head.priority, order, tenant)
+            if best is None or candidate < best:
+                best = candidate
+        if best is None:
+            return None
+
+        tenant = best[2]
+        queue = self._tenant_queues[tenant]
+        job = min(queue, key=lambda j: (j.priority, j.seq))
+        queue.remove(job)
+        self._queued -= 1
+
+        # Served tenant moves to the back of the rotation
+        self._tenant_order.remove(tenant)
+        if queue:
+            self._tenant_order.append(tenant)
+        else:
+            del self._tenant_queues[tenant]
+        return job
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _ensure_workers(self) -> None:
+        """Start the worker pool on first use."""
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.max_concurrent_jobs:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def _worker(self) -> None:
+        """Run queued jobs one at a time."""
+        while True:
+            async with self._wakeup:
+                while (job := self._pop_next()) is None:
+                    await self._wakeup.wait()
+
+            if job.status == "cancelled":
+                continue
+            job.status = "running"
+            job.task = asyncio.current_task()
+            try:
+                await self._run_job(job)
+            except asyncio.CancelledError:
+                # Only the job was cancelled (all subscribers left); keep serving
+                if job.status != "cancelled" or self._stopping:
+                    raise
+                task = asyncio.current_task()
+                if task is not None:
+                    task.uncancel()
+            finally:
+                await self._finish(job)
+
+    async def _finish(self, job: DiscoveryJob) -> None:
+        """Record a finished job's outcome and forget it."""
+        # On shutdown the job stays active in the store and is recovered;
+        # a delegated job's state belongs to the lease holder
+        if not self._stopping and job.status != "delegated":
+            await self._persist(job)
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+        for session_id in job.subscribers:
+            if self._session_jobs.get(session_id) == job.key:
+                del self._session_jobs[session_id]
+        job.task = None
+
+    async def _run_job(self, job: DiscoveryJob) -> None:
+        """Create the Webset for a job (unless recovered) and poll it to completion."""
+        if not await self._claim(job.key):
+            await self._hand_off(job)
+            return
+        await self._persist(job)
+        if job.webset_id is None:
+            client = get_exa_client()
             webset_id = await client.create_webset(
-                query=query,
+                query=job.query,
                 count=WEBSET_TARGET_COUNT,
-                criteria=criteria,
+                criteria=WEBSET_CRITERIA,
             )
-
             if not webset_id:
-                logger.warning("Failed to create Webset for session %s", session_id)
-                return None
+                logger.warning("Failed to create Webset for job %s", job.key)
+                job.status = "failed"
+                return
 
+            # Record the upstream ID before polling so a restart resumes it
+            job.webset_id = webset_id
+            await self._persist(job)
             logger.info(
-                "Created Webset %s for session %s with query: %s",
+                "Created Webset %s for %d session(s) with query: %s",
                 webset_id,
-                session_id,
-                query,
+                len(job.subscribers),
+                job.query,
             )
+        else:
+            logger.info("Resuming Webset %s for job %s", job.webset_id, job.key)
+        await self._poll_webset(job)
 
-            # Start polling task
-            task_info = WebsetTask(
-                session_id=session_id,
-                webset_id=webset_id,
-                profile=profile,
-            )
-
-            async with self._lock:
-                # Cancel existing task for this session if any
-                if session_id in self._webset_tasks:
-                    old_task = self._webset_tasks[session_id]
-                    if old_task.task and not old_task.task.done():
-                        old_task.task.cancel()
-
-                task_info.task = asyncio.create_task(
-                    self._poll_webset(task_info)
-                )
-                self._webset_tasks[session_id] = task_info
+    async def _cache_results(self, job: DiscoveryJob, webset: ExaWebset) -> list[dict]:
+        """
+        Write a completed Webset's results to the event cache.
 
-            return webset_id
+        Args:
+            job: Job the Webset belongs to
+            webset: Completed Webset
 
+        Returns:
+            Results converted to the 'more_events' event format
+        """
+        results = webset.results or []
+        job.result_ids = [result.id for result in results]
+        try:
+            # The cache client blocks (SQLite or Redis socket); keep it off the loop
+            await asyncio.to_thread(
+                get_event_cache().put_many,
+                WEBSET_CACHE_SOURCE,
+                [
+                    {
+                        "event_id": result.id,
+                        "title": result.title,
+                        "date": result.published_date.isoformat() if result.published_date else "",
+                        "location": "",
+                        "category": "community",
+                        "description": result.text[:200] if result.text else "",
+                        "url": result.url,
+                        "raw_data": {"job_key": job.key, "webset_id": job.webset_id},
+                    }
+                    for result in results
+                ],
+            )
         except Exception as e:
-            logger.error("Error starting Webset discovery: %s", e, exc_info=True)
-            return None
-
-    async def _poll_webset(self, task_info: WebsetTask) -> None:
-        """Poll a Webset until complete and push results."""
+            logger.warning("Failed to cache Webset %s results: %s", job.webset_id, e)
+
+        # Convert to event format
+        return [
+            {
+                "id": f"webset-{result.id}",
+                "title": result.title,
+                "url": result.url,
+                "description": result.text[:200] if result.text else "",
+                "source": "webset",
+            }
+            for result in results
+        ]
+
+    async def _poll_webset(self, job: DiscoveryJob) -> None:
+        """Poll a Webset until complete and push results to subscribers."""
         client = get_exa_client()
         sse_manager = get_sse_manager()
-        polls = 0
+        assert job.webset_id is not None
 
         logger.debug(
-            "🚀 [Background] Webset polling started | session=%s webset=%s",
-            task_info.session_id,
-            task_info.webset_id,
+            "🚀 [Background] Webset polling started | key=%s webset=%s",
+            job.key,
+            job.webset_id,
         )
         poll_start = time.perf_counter()
 
         try:
-            while polls < WEBSET_MAX_POLLS:
-                polls += 1
+            while job.polls < WEBSET_MAX_POLLS:
+                # Honour the persisted schedule when resuming after a restart
+                delay = WEBSET_POLL_INTERVAL
+                if job.next_poll_at is not None:
+                    delay = max(0.0, (job.next_poll_at - datetime.now(timezone.utc)).total_seconds())
+                else:
+                    job.next_poll_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                    await self._persist(job)
+                await asyncio.sleep(delay)
+
+                if not await self._claim(job.key):
+                    logger.warning("Lost the lease on job %s; another worker resumes it", job.key)
+                    await self._hand_off(job)
+                    return
+
+                job.polls += 1
+                job.next_poll_at = None
                 logger.debug(
                     "⏳ [Background] Polling | webset=%s poll=%d/%d",
-                    task_info.webset_id,
-                    polls,
+                    job.webset_id,
+                    job.polls,
                     WEBSET_MAX_POLLS,
                 )
-                await asyncio.sleep(WEBSET_POLL_INTERVAL)
-
-                # Check if session is still connected
-                if not sse_manager.has_connection(task_info.session_id):
-                    logger.info(
-                        "Session %s disconnected, stopping Webset poll",
-                        task_info.session_id,
-                    )
-                    return
 
-                webset = await client.get_webset(task_info.webset_id)
+                webset = await client.get_webset(job.webset_id)
                 if not webset:
-                    logger.warning("Failed to get Webset %s", task_info.webset_id)
+                    logger.warning("Failed to get Webset %s", job.webset_id)
                     continue
 
                 logger.debug(
                     "Webset %s status: %s, results: %s",
-                    task_info.webset_id,
+                    job.webset_id,
                     webset.status,
                     webset.num_results,
                 )
 
                 if webset.status == "completed":
+                    job.status = "completed"
                     poll_elapsed = time.perf_counter() - poll_start
-                    if webset.results:
-                        # Convert to event format
-                        events_data = [
-                            {
-                                "id": f"webset-{result.id}",
-                                "title": result.title,
-                                "url": result.url,
-                                "description": result.text[:200] if result.text else "",
-                                "source": "webset",
-                            }
-                            for result in webset.results
-                        ]
-
-                        # Push more_events to session
-                        await sse_manager.push_event(
-                            task_info.session_id,
-                            {
-                                "type": "more_events",
-                                "events": events_data,
-                                "source": "webset",
-                                "message": f"Found {len(events_data)} more events with deep search",
-                            },
-                        )
+                    events_data = await self._cache_results(job, webset)
+                    if events_data:
+                        # Fan out more_events to every subscribed session
+                        event = {
+                            "type": "more_events",
+                            "events": events_data,
+                            "source": "webset",
+                            "message": f"Found {len(events_data)} more events with deep search",
+                        }
+                        # Re-read: sessions on other workers may have joined
+                        for session_id in await self._all_subscribers(job):
+                            await sse_manager.push_event(session_id, event)
 
                         logger.debug(
-                            "🎉 [Background] Webset complete | session=%s events=%d duration=%.2fs",
-                            task_info.session_id,
+                            "🎉 [Background] Webset complete | key=%s sessions=%d events=%d duration=%.2fs",
+                            job.key,
+                            len(job.subscribers),
                             len(events_data),
                             poll_elapsed,
                         )
                     else:
                         logger.debug(
-                            "📭 [Background] Webset empty | session=%s duration=%.2fs",
-                            task_info.session_id,
+                            "📭 [Background] Webset empty | key=%s duration=%.2fs",
+                            job.key,
                             poll_elapsed,
                         )
                     return
 
                 elif webset.status == "failed":
+                    job.status = "failed"
                     poll_elapsed = time.perf_counter() - poll_start
                     logger.debug(
-                        "❌ [Background] Webset failed | session=%s duration=%.2fs",
-                        task_info.session_id,
+                        "❌ [Background] Webset failed | key=%s duration=%.2fs",
+                        job.key,
                         poll_elapsed,
                     )
-                    logger.warning(
-                        "Webset %s failed for session %s",
-                        task_info.webset_id,
-                        task_info.session_id,
-                    )
+                    logger.warning("Webset %s failed for job %s", job.webset_id, job.key)
                     return
 
             # Max polls reached
+            job.status = "failed"
             poll_elapsed = time.perf_counter() - poll_start
             logger.debug(
-                "⚠️ [Background] Polling timeout | session=%s polls=%d duration=%.2fs",
-                task_info.session_id,
-                polls,
+                "⚠️ [Background] Polling timeout | key=%s polls=%d duration=%.2fs",
+                job.key,
+                job.polls,
                 poll_elapsed,
             )
 
         except asyncio.CancelledError:
-            logger.info("Webset poll cancelled for session %s", task_info.session_id)
+            logger.info("Webset poll cancelled for job %s", job.key)
             raise
         except Exception as e:
+            job.status = "failed"
             logger.error(
                 "Error polling Webset %s: %s",
-                task_info.webset_id,
+                job.webset_id,
                 e,
                 exc_info=True,
             )
-        finally:
-            # Cleanup
-            async with self._lock:
-                if task_info.session_id in self._webset_tasks:
-                    del self._webset_tasks[task_info.session_id]
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    async def _unsubscribe(self, session_id: str) -> None:
+        """
+        Detach a session from its job, cancelling the job if unused.
+
+        A job whose Webset already exists, or that sessions on other
+        workers joined, keeps running without local subscribers so its
+        results still reach the event cache and those sessions.
+        """
+        self._remote_sessions.pop(session_id, None)
+        key = self._session_jobs.pop(session_id, None)
+        if key is None:
+            return
+        job = self._jobs.get(key)
+        if job is None:
+            return
+        job.subscribers.discard(session_id)
+        if job.subscribers or job.webset_id is not None or await self._all_subscribers(job):
+            await self._persist(job)
+            return
+
+        if job.status == "queued":
+            job.status = "cancelled"
+            queue = self._tenant_queues.get(job.tenant_id)
+            if queue and job in queue:
+                queue.remove(job)
+                self._queued -= 1
+            if self._jobs.get(key) is job:
+                del self._jobs[key]
+            await self._persist(job)
+        elif job.status == "running" and job.task is not None:
+            # Webset not created yet; the worker persists the outcome
+            job.status = "cancelled"
+            job.task.cancel()
+
+    def has_pending(self, session_id: str) -> bool:
+        """Check if a session has background work queued or running."""
+        if session_id in self._session_jobs:
+            return True
+        remote = self._remote_sessions.get(session_id)
+        if remote is None:
+            return False
+        if time.monotonic() >= remote[1]:
+            del self._remote_sessions[session_id]
+            return False
+        return True
+
+    async def recover(self) -> int:
+        """
+        Re-queue jobs that were queued or running when the process stopped.
+
+        Jobs that already have a Webset resume polling on their persisted
+        schedule instead of creating a new one. A job is only taken if this
+        worker wins its lease; jobs leased by a live worker are left alone.
+
+        Returns:
+            Number of jobs recovered
+        """
+        try:
+            records = await asyncio.to_thread(self.store.list_active)
+        except Exception as e:
+            logger.error("Failed to load background jobs: %s", e, exc_info=True)
+            return 0
+
+        recovered = 0
+        for record in records:
+            if record.key in self._jobs or not await self._claim(record.key):
+                continue
+            job = DiscoveryJob.from_record(record, seq=next(self._seq))
+            self._jobs[job.key] = job
+            for session_id in job.subscribers:
+                self._session_jobs.setdefault(session_id, job.key)
+            await self._enqueue(job)
+            recovered += 1
+
+        if recovered:
+            logger.info("Recovered %d background job(s)", recovered)
+        return recovered
+
+    def get_results(self, key: str) -> list[CachedEvent]:
+        """
+        Get cached results of a completed job.
+
+        Args:
+            key: Job key
+
+        Returns:
+            Cached events for the job (empty if unknown or expired)
+        """
+        record = self.store.get(key)
+        if record is None or not record.result_ids:
+            return []
+        return get_event_cache().get_many(WEBSET_CACHE_SOURCE, record.result_ids)
+
+    def get_job(self, key: str) -> DiscoveryJob | None:
+        """Get a queued or running job by key."""
+        return self._jobs.get(key)
+
+    @property
+    def queued_count(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queued
+
+    @property
+    def running_count(self) -> int:
+        """Number of jobs currently running."""
+        return sum(1 for job in self._jobs.values() if job.status == "running")
 
     async def cancel_session_tasks(self, session_id: str) -> None:
         """Cancel all background tasks for a session."""
-        async with self._lock:
-            if session_id in self._webset_tasks:
-                task_info = self._webset_tasks[session_id]
-                if task_info.task and not task_info.task.done():
-                    task_info.task.cancel()
-                del self._webset_tasks[session_id]
-                logger.debug("Cancelled background tasks for session %s", session_id)
+        if session_id in self._session_jobs:
+            await self._unsubscribe(session_id)
+            logger.debug("Cancelled background tasks for session %s", session_id)
+
+    async def stop(self) -> None:
+        """Cancel workers, release their leases and forget all jobs."""
+        self._stopping = True
+        keys = list(self._jobs)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        # Jobs stay active in the store; let the next worker resume them now
+        for key in keys:
+            try:
+                await asyncio.to_thread(self.store.release, key, self.owner_id)
+            except Exception as e:
+                logger.warning("Failed to release job %s: %s", key, e)
+        self._jobs.clear()
+        self._session_jobs.clear()
+        self._remote_sessions.clear()
+        self._tenant_queues.clear()
+        self._tenant_order.clear()
+        self._queued = 0
+        self._stopping = False
 
 
 # Singleton instance
@@ -254,3 +739,24 @@ def get_background_task_manager() -> BackgroundTaskManager:
     if _manager is None:
         _manager = BackgroundTaskManager()
     return _manager
+
+
+async def start_search_discovery(session_id: str | None, profile: SearchProfile) -> str | None:
+    """
+    Follow a chat search with a Websets deep discovery, when enabled.
+
+    Results arrive later as 'more_events' on the session's stream.
+
+    Args:
+        session_id: Chat session that searched (None outside a session)
+        profile: Search profile that was searched
+
+    Returns:
+        Job key if scheduled, None if disabled or the queue is full
+    """
+    settings = get_settings()
+    if not session_id or not settings.webset_discovery or not settings.exa_api_key:
+        return None
+    return await get_background_task_manager().start_webset_discovery(
+        session_id, profile, priority=PRIORITY_INTERACTIVE
+    )
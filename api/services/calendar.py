@@ -1,10 +1,22 @@
 """ICS calendar export service."""
 
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from icalendar import Calendar, Event
 from pydantic import BaseModel
 
+# Calendar-level properties, written ahead of the events
+ICS_CALENDAR_PROPERTIES = (
+    ("prodid", "-//Calendar Club//calendarclub.dev//"),
+    ("version", "2.0"),
+    ("calscale", "GREGORIAN"),
+    ("method", "PUBLISH"),
+)
+
+# Streamed exports group events into chunks of about this many bytes
+ICS_STREAM_CHUNK_BYTES = 16 * 1024
+
 
 class CalendarEvent(BaseModel):
     """Event data for calendar export."""
@@ -17,14 +29,16 @@ class CalendarEvent(BaseModel):
     url: Optional[str] = None
 
 
-def create_ics_event(event: CalendarEvent) -> str:
-    """Create an ICS string for a single event."""
+def _new_calendar() -> Calendar:
+    """Create an empty calendar with the standard properties."""
     cal = Calendar()
-    cal.add("prodid", "-//Calendar Club//calendarclub.dev//")
-    cal.add("version", "2.0")
-    cal.add("calscale", "GREGORIAN")
-    cal.add("method", "PUBLISH")
+    for name, value in ICS_CALENDAR_PROPERTIES:
+        cal.add(name, value)
+    return cal
+
 
+def _build_ics_event(event: CalendarEvent, dtstamp: datetime | None = None) -> Event:
+    """Build the VEVENT component for one event (DTSTAMP defaults to now)."""
     ics_event = Event()
     ics_event.add("summary", event.title)
     ics_event.add("dtstart", event.start)
@@ -49,43 +63,63 @@ def create_ics_event(event: CalendarEvent) -> str:
     ics_event.add("uid", uid)
 
     # Add timestamp
-    ics_event.add("dtstamp", datetime.now(timezone.utc))
+    ics_event.add("dtstamp", dtstamp or datetime.now(timezone.utc))
+    return ics_event
 
-    cal.add_component(ics_event)
-    return cal.to_ical().decode("utf-8")
 
+def _ics_header_footer() -> tuple[bytes, bytes]:
+    """Split an empty calendar into the bytes before and after its events."""
+    empty = _new_calendar().to_ical()
+    footer = b"END:VCALENDAR\r\n"
+    return empty[: -len(footer)], footer
 
-def create_ics_multiple(events: list[CalendarEvent]) -> str:
-    """Create an ICS string for multiple events."""
-    cal = Calendar()
-    cal.add("prodid", "-//Calendar Club//calendarclub.dev//")
-    cal.add("version", "2.0")
-    cal.add("calscale", "GREGORIAN")
-    cal.add("method", "PUBLISH")
 
-    for event in events:
-        ics_event = Event()
-        ics_event.add("summary", event.title)
-        ics_event.add("dtstart", event.start)
+_ICS_HEADER, _ICS_FOOTER = _ics_header_footer()
 
-        if event.end:
-            ics_event.add("dtend", event.end)
-        else:
-            ics_event.add("dtend", event.start + timedelta(hours=1))
 
-        if event.description:
-            ics_event.add("description", event.description)
+def iter_ics(
+    events: Iterable[CalendarEvent],
+    chunk_bytes: int = ICS_STREAM_CHUNK_BYTES,
+    dtstamp: datetime | None = None,
+) -> Iterator[bytes]:
+    """
+    Stream an ICS calendar without building it in memory.
 
-        if event.location:
-            ics_event.add("location", event.location)
+    The header is yielded first, then the folded VEVENTs (rendered one at
+    a time and grouped into chunks of about chunk_bytes), then the footer.
 
-        if event.url:
-            ics_event.add("url", event.url)
+    Args:
+        events: Events to export (may be a lazy iterable)
+        chunk_bytes: Target chunk size (0 = one chunk per event)
+        dtstamp: Fixed DTSTAMP for every event, for reproducible output
+            (None = the current time)
 
-        uid = f"{event.start.isoformat()}-{event.title.replace(' ', '-').lower()}@calendarclub.dev"
-        ics_event.add("uid", uid)
-        ics_event.add("dtstamp", datetime.now(timezone.utc))
+    Yields:
+        ICS bytes
+    """
+    yield _ICS_HEADER
+
+    buffer: list[bytes] = []
+    buffered = 0
+    for event in events:
+        rendered = _build_ics_event(event, dtstamp).to_ical()
+        buffer.append(rendered)
+        buffered += len(rendered)
+        if buffered >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer = []
+            buffered = 0
+
+    if buffer:
+        yield b"".join(buffer)
+    yield _ICS_FOOTER
 
-        cal.add_component(ics_event)
 
-    return cal.to_ical().decode("utf-8")
+def create_ics_event(event: CalendarEvent) -> str:
+    """Create an ICS string for a single event."""
+    return create_ics_multiple([event])
+
+
+def create_ics_multiple(events: list[CalendarEvent]) -> str:
+    """Create an ICS string for multiple events."""
+    return b"".join(iter_ics(events)).decode("utf-8")
@@ -0,0 +1,508 @@
+"""
+Subscribable ICS feeds of a user's picked events.
+
+A user's picks are stored once, and calendar apps subscribe (webcal) to
+the feed URL and poll it. Feeds are addressed by an unguessable per-feed
+token rather than the user ID, and the same token is required to replace
+or delete the picks. Each feed has a strong ETag derived from its
+events' content and a Last-Modified time that only moves when that
+content changes. Rendered bodies are cached per ETag, so a poll with
+If-None-Match / If-Modified-Since is answered with a 304 from one small
+row read, and a changed feed is rendered once, not once per poll.
+
+Supports both SQLite-based persistence (when DATABASE_URL is set) and
+in-memory storage (graceful fallback when no database is configured).
+"""
+
+import hashlib
+import json
+import logging
+import secrets
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from api.config import get_settings
+from api.services.calendar import CalendarEvent, iter_ics
+
+logger = logging.getLogger(__name__)
+
+# Default database path (relative to api root)
+DEFAULT_FEEDS_DB_PATH = Path(__file__).parent.parent / "calendar_feeds.db"
+
+# Rendered feed bodies kept in memory
+FEED_BODY_CACHE_SIZE = 256
+
+# Random bytes in a feed token (URL-safe base64 encoded)
+FEED_TOKEN_BYTES = 24
+
+
+class FeedMeta(BaseModel):
+    """Validators for a stored feed."""
+
+    user_id: str
+    token: str
+    etag: str
+    updated_at: datetime
+    event_count: int
+
+    @property
+    def last_modified(self) -> str:
+        """updated_at as an HTTP date."""
+        return format_datetime(self.updated_at, usegmt=True)
+
+
+def feed_etag(events: list[CalendarEvent]) -> str:
+    """
+    Compute a strong ETag from event content.
+
+    Args:
+        events: Feed events, in feed order
+
+    Returns:
+        Quoted entity tag
+    """
+    digest = hashlib.sha256()
+    for event in events:
+        digest.update(event.model_dump_json().encode())
+        digest.update(b"\n")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def is_not_modified(
+    meta: FeedMeta,
+    if_none_match: str | None,
+    if_modified_since: str | None,
+) -> bool:
+    """
+    Evaluate conditional GET headers against a feed.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+
+    Args:
+        meta: Current feed validators
+        if_none_match: If-None-Match header value
+        if_modified_since: If-Modified-Since header value
+
+    Returns:
+        True if the client's copy is current (respond 304)
+    """
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == meta.etag for tag in tags)
+
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return meta.updated_at <= since
+
+    return False
+
+
+class InMemoryFeedStore:
+    """
+    In-memory feed store for non-persisted mode.
+
+    Implements the same interface as FeedStore; feeds are lost when the
+    process restarts.
+
+    Thread-safe for concurrent access.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the in-memory store."""
+        self._lock = threading.Lock()
+        self._feeds: dict[str, tuple[FeedMeta, list[CalendarEvent]]] = {}
+
+    def save(self, meta: FeedMeta, events: list[CalendarEvent]) -> None:
+        """
+        Insert or replace a user's feed.
+
+        Args:
+            meta: Feed validators
+            events: Picked events
+        """
+        with self._lock:
+            self._feeds[meta.user_id] = (meta, list(events))
+
+    def get_meta(self, user_id: str) -> FeedMeta | None:
+        """
+        Get a feed's validators without loading its events.
+
+        Args:
+            user_id: Feed owner
+
+        Returns:
+            FeedMeta if the feed exists, None otherwise
+        """
+        with self._lock:
+            feed = self._feeds.get(user_id)
+            return feed[0] if feed else None
+
+    def load(self, user_id: str) -> tuple[FeedMeta, list[CalendarEvent]] | None:
+        """
+        Load a feed's validators and events together.
+
+        Args:
+            user_id: Feed owner
+
+        Returns:
+            (FeedMeta, events) if the feed exists, None otherwise
+        """
+        with self._lock:
+            feed = self._feeds.get(user_id)
+            return (feed[0], list(feed[1])) if feed else None
+
+    def delete(self, user_id: str) -> bool:
+        """
+        Delete a user's feed.
+
+        Args:
+            user_id: Feed owner
+
+        Returns:
+            True if a feed was deleted
+        """
+        with self._lock:
+            return self._feeds.pop(user_id, None) is not None
+
+    def find_user(self, token: str) -> str | None:
+        """
+        Look up the owner of a feed token.
+
+        Args:
+            token: Feed token
+
+        Returns:
+            The owner's user ID, None if no feed has this token
+        """
+        with self._lock:
+            for meta, _ in self._feeds.values():
+                if secrets.compare_digest(meta.token, token):
+                    return meta.user_id
+            return None
+
+
+class FeedStore:
+    """
+    SQLite-based feed store.
+
+    Thread-safe for concurrent access.
+    """
+
+    def __init__(self, db_path: str | Path | None = None):
+        """
+        Initialize the feed store.
+
+        Args:
+            db_path: Path to SQLite database file. Defaults to api/calendar_feeds.db
+        """
+        self.db_path = str(db_path or DEFAULT_FEEDS_DB_PATH)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Initialize the database schema."""
+        with self._get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS calendar_feeds (
+                    user_id TEXT PRIMARY KEY,
+                    token TEXT,
+                    etag TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    event_count INTEGER NOT NULL,
+                    events TEXT NOT NULL
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(calendar_feeds)")}
+            if "token" not in columns:
+                conn.execute("ALTER TABLE calendar_feeds ADD COLUMN token TEXT")
+            # Feeds saved before tokens existed have none; they are
+            # unreachable until their picks are saved again
+            conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_calendar_feeds_token
+                ON calendar_feeds (token)
+            """)
+            conn.commit()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get a database connection."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _row_to_meta(row: sqlite3.Row) -> FeedMeta:
+        """Convert a database row to FeedMeta."""
+        return FeedMeta(
+            user_id=row["user_id"],
+            token=row["token"] or "",
+            etag=row["etag"],
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+            event_count=row["event_count"],
+        )
+
+    def save(self, meta: FeedMeta, events: list[CalendarEvent]) -> None:
+        """
+        Insert or replace a user's feed.
+
+        Args:
+            meta: Feed validators
+            events: Picked events
+        """
+        payload = json.dumps([event.model_dump(mode="json") for event in events])
+        with self._lock:
+            with self._get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO calendar_feeds
+                    (user_id, token, etag, updated_at, event_count, events)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        meta.user_id,
+                        meta.token,
+                        meta.etag,
+                        meta.updated_at.isoformat(),
+                        meta.event_count,
+                        payload,
+                    ),
+                )
+                conn.commit()
+
+    def get_meta(self, user_id: str) -> FeedMeta | None:
+        """
+        Get a feed's validators without loading its events.
+
+        Args:
+            user_id: Feed owner
+
+        Returns:
+            FeedMeta if the feed exists, None otherwise
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT user_id, token, etag, updated_at, event_count FROM calendar_feeds "
+                    "WHERE user_id = ?",
+                    (user_id,),
+                ).fetchone()
+                return self._row_to_meta(row) if row else None
+
+    def load(self, user_id: str) -> tuple[FeedMeta, list[CalendarEvent]] | None:
+        """
+        Load a feed's validators and events together.
+
+        Args:
+            user_id: Feed owner
+
+        Returns:
+            (FeedMeta, events) if the feed exists, None otherwise
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT * FROM calendar_feeds WHERE user_id = ?", (user_id,)
+                ).fetchone()
+        if row is None:
+            return None
+        events = [CalendarEvent.model_validate(data) for data in json.loads(row["events"])]
+        return self._row_to_meta(row), events
+
+    def delete(self, user_id: str) -> bool:
+        """
+        Delete a user's feed.
+
+        Args:
+            user_id: Feed owner
+
+        Returns:
+            True if a feed was deleted
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                cursor = conn.execute("DELETE FROM calendar_feeds WHERE user_id = ?", (user_id,))
+                conn.commit()
+                return cursor.rowcount > 0
+
+    def find_user(self, token: str) -> str | None:
+        """
+        Look up the owner of a feed token.
+
+        Args:
+            token: Feed token
+
+        Returns:
+            The owner's user ID, None if no feed has this token
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT user_id FROM calendar_feeds WHERE token = ?", (token,)
+                ).fetchone()
+                return row["user_id"] if row else None
+
+
+# Type alias for store return type
+FeedStoreType = FeedStore | InMemoryFeedStore
+
+
+class CalendarFeedService:
+    """
+    Stores picks and serves rendered feeds with a bounded body cache.
+
+    Usage:
+        service = get_calendar_feed_service()
+        token = service.set_picks("user-123", events).token
+        ...
+        user_id = service.find_user(token)
+        meta = service.get_meta(user_id)
+        if not is_not_modified(meta, if_none_match, if_modified_since):
+            meta, body = service.render(user_id)
+    """
+
+    def __init__(self, store: FeedStoreType | None = None, cache_size: int = FEED_BODY_CACHE_SIZE):
+        """
+        Initialize the service.
+
+        Args:
+            store: Feed store. If None, SQLite when DATABASE_URL is set,
+                otherwise in-memory.
+            cache_size: Maximum rendered bodies kept in memory
+        """
+        if store is None:
+            store = FeedStore() if get_settings().has_database else InMemoryFeedStore()
+        self.store = store
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._bodies: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+
+    def set_picks(self, user_id: str, events: list[CalendarEvent]) -> FeedMeta:
+        """
+        Replace a user's picks.
+
+        Saving identical picks is a no-op, so validators only change when
+        the feed content does. A feed keeps its token across saves; one is
+        issued on first save. Callers must check authorize() before
+        replacing an existing feed.
+
+        Args:
+            user_id: Feed owner
+            events: Picked events, in feed order
+
+        Returns:
+            Current feed validators (including the feed token)
+        """
+        etag = feed_etag(events)
+        existing = self.store.get_meta(user_id)
+        if existing is not None and existing.token and existing.etag == etag:
+            return existing
+
+        token = existing.token if existing is not None and existing.token else None
+        meta = FeedMeta(
+            user_id=user_id,
+            token=token or secrets.token_urlsafe(FEED_TOKEN_BYTES),
+            etag=etag,
+            # HTTP dates have one-second resolution
+            updated_at=datetime.now(timezone.utc).replace(microsecond=0),
+            event_count=len(events),
+        )
+        self.store.save(meta, events)
+        logger.debug("📅 [Feed] Picks saved | user=%s events=%d", user_id, len(events))
+        return meta
+
+    def get_meta(self, user_id: str) -> FeedMeta | None:
+        """Get a feed's validators (cheap; no events are loaded)."""
+        return self.store.get_meta(user_id)
+
+    def find_user(self, token: str) -> str | None:
+        """Resolve a feed token to its owner, None if unknown."""
+        if not token:
+            return None
+        return self.store.find_user(token)
+
+    def authorize(self, user_id: str, token: str | None) -> bool:
+        """
+        Check that a caller may replace or delete a user's feed.
+
+        Args:
+            user_id: Feed owner
+            token: Feed token presented by the caller
+
+        Returns:
+            True if the user has no feed yet, or the token matches it
+        """
+        meta = self.store.get_meta(user_id)
+        if meta is None or not meta.token:
+            return True
+        return token is not None and secrets.compare_digest(meta.token, token)
+
+    def render(self, user_id: str) -> tuple[FeedMeta, bytes] | None:
+        """
+        Get a feed's ICS body, rendering it only on a cache miss.
+
+        Args:
+            user_id: Feed owner
+
+        Returns:
+            (FeedMeta, body) for the stored feed, None if there is no feed
+        """
+        meta = self.store.get_meta(user_id)
+        if meta is not None:
+            with self._lock:
+                body = self._bodies.get((user_id, meta.etag))
+                if body is not None:
+                    self._bodies.move_to_end((user_id, meta.etag))
+                    return meta, body
+
+        loaded = self.store.load(user_id)
+        if loaded is None:
+            return None
+        meta, events = loaded
+
+        # DTSTAMP is pinned to the feed's update time so the body is a pure
+        # function of the ETag
+        body = b"".join(iter_ics(events, dtstamp=meta.updated_at))
+        with self._lock:
+            self._bodies[(user_id, meta.etag)] = body
+            self._bodies.move_to_end((user_id, meta.etag))
+            while len(self._bodies) > self.cache_size:
+                self._bodies.popitem(last=False)
+        logger.debug("📅 [Feed] Rendered | user=%s bytes=%d", user_id, len(body))
+        return meta, body
+
+    def delete(self, user_id: str) -> bool:
+        """
+        Delete a user's feed and its cached bodies.
+
+        Args:
+            user_id: Feed owner
+
+        Returns:
+            True if a feed was deleted
+        """
+        with self._lock:
+            for key in [key for key in self._bodies if key[0] == user_id]:
+                del self._bodies[key]
+        return self.store.delete(user_id)
+
+
+# Global service instance
+_service: CalendarFeedService | None = None
+
+
+def get_calendar_feed_service() -> CalendarFeedService:
+    """Get the global calendar feed service."""
+    global _service
+    if _service is None:
+        _service = CalendarFeedService()
+    return _service
@@ -0,0 +1,272 @@
+"""
+Crawl state for incremental scraping.
+
+Remembers, per source, every crawled page URL with a hash of its content
+and the event last extracted from it. An incremental crawl compares
+fresh page hashes against this state and only re-extracts pages that are
+new or changed; unchanged pages reuse the stored event. Nightly
+refreshes then cost in proportion to churn, not catalog size.
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from api.services.firecrawl import ScrapedEvent
+
+logger = logging.getLogger(__name__)
+
+# Default database path (relative to api root)
+DEFAULT_CRAWL_DB_PATH = Path(__file__).parent.parent / "crawl_state.db"
+
+# Page content fields hashed for change detection, in order of preference
+CONTENT_FIELDS = ("markdown", "html", "rawHtml", "raw_html")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def content_hash(page: dict[str, Any] | Any) -> str | None:
+    """
+    Hash a crawled page's content for change detection.
+
+    Whitespace is collapsed so formatting-only changes don't count.
+
+    Args:
+        page: Crawled page (dict or SDK document)
+
+    Returns:
+        Hex digest, or None if the page has no content to hash
+    """
+    for name in CONTENT_FIELDS:
+        value = page.get(name) if isinstance(page, dict) else getattr(page, name, None)
+        if value:
+            normalized = _WHITESPACE_RE.sub(" ", str(value)).strip()
+            return hashlib.sha256(normalized.encode()).hexdigest()
+    return None
+
+
+@dataclass
+class CrawlPage:
+    """Stored state of one crawled page."""
+
+    url: str
+    content_hash: str
+    event: ScrapedEvent | None = None
+
+
+@dataclass
+class CrawlState:
+    """
+    Change detection for one incremental crawl of a source.
+
+    Load the previous pages with CrawlStateStore.load(), pass this object
+    to the extractor, then persist `updated` with CrawlStateStore.save_many()
+    once the results are committed.
+    """
+
+    source: str
+    previous: dict[str, CrawlPage] = field(default_factory=dict)
+    updated: list[CrawlPage] = field(default_factory=list)
+    new_count: int = 0
+    changed_count: int = 0
+    unchanged_count: int = 0
+
+    def unchanged(self, url: str, page_hash: str | None) -> CrawlPage | None:
+        """
+        Return the stored page if its content is unchanged.
+
+        Args:
+            url: Page URL
+            page_hash: Hash of the freshly crawled content
+
+        Returns:
+            Stored CrawlPage if the hash matches, None if the page must be extracted
+        """
+        stored = self.previous.get(url)
+        if stored is None or page_hash is None or stored.content_hash != page_hash:
+            return None
+        self.unchanged_count += 1
+        self.updated.append(stored)
+        return stored
+
+    def record(self, url: str, page_hash: str | None, event: ScrapedEvent | None) -> None:
+        """
+        Record a freshly extracted page.
+
+        Args:
+            url: Page URL
+            page_hash: Hash of the page content (None = not tracked)
+            event: Extracted event (None if the page had no event)
+        """
+        if url in self.previous:
+            self.changed_count += 1
+        else:
+            self.new_count += 1
+        if page_hash is not None:
+            self.updated.append(CrawlPage(url=url, content_hash=page_hash, event=event))
+
+    def summary(self) -> str:
+        """Human-readable change summary."""
+        return (
+            f"{self.new_count} new, {self.changed_count} changed, "
+            f"{self.unchanged_count} unchanged"
+        )
+
+
+class CrawlStateStore:
+    """
+    SQLite-based crawl state.
+
+    Thread-safe for concurrent access.
+
+    Usage:
+        store = CrawlStateStore()
+        state = store.load("posh")
+        events = await extractor.discover_events(city, crawl_state=state)
+        store.save_many(state)
+    """
+
+    def __init__(self, db_path: str | Path | None = None):
+        """
+        Initialize the crawl state store.
+
+        Args:
+            db_path: Path to SQLite database file. Defaults to api/crawl_state.db
+        """
+        self.db_path = str(db_path or DEFAULT_CRAWL_DB_PATH)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Initialize the database schema."""
+        with self._get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS crawl_pages (
+                    source TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    event TEXT,
+                    last_seen_at TEXT NOT NULL,
+                    PRIMARY KEY (source, url)
+                )
+            """)
+            conn.commit()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get a database connection."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def load(self, source: str) -> CrawlState:
+        """
+        Load the previous crawl of a source.
+
+        Args:
+            source: Event source (e.g., "posh")
+
+        Returns:
+            CrawlState seeded with the stored pages
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                rows = conn.execute(
+                    "SELECT url, content_hash, event FROM crawl_pages WHERE source = ?",
+                    (source,),
+                ).fetchall()
+
+        previous: dict[str, CrawlPage] = {}
+        for row in rows:
+            event = None
+            if row["event"]:
+                try:
+                    event = ScrapedEvent.model_validate_json(row["event"])
+                except ValueError:
+                    # Unreadable row: force re-extraction
+                    continue
+            previous[row["url"]] = CrawlPage(row["url"], row["content_hash"], event)
+        return CrawlState(source=source, previous=previous)
+
+    def save_many(self, state: CrawlState) -> int:
+        """
+        Persist the pages seen by a crawl in a single transaction.
+
+        Args:
+            state: Completed crawl state
+
+        Returns:
+            Number of pages saved
+        """
+        if not state.updated:
+            return 0
+
+        seen_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (
+                state.source,
+                page.url,
+                page.content_hash,
+                page.event.model_dump_json() if page.event else None,
+                seen_at,
+            )
+            for page in state.updated
+        ]
+        with self._lock:
+            with self._get_connection() as conn:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO crawl_pages
+                    (source, url, content_hash, event, last_seen_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+                conn.commit()
+        return len(rows)
+
+    def prune(self, source: str, older_than_days: int = 30) -> int:
+        """
+        Forget pages not seen recently (e.g. events taken down).
+
+        Args:
+            source: Event source
+            older_than_days: Pages unseen for this long are removed
+
+        Returns:
+            Number of pages removed
+        """
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=older_than_days)).isoformat()
+        with self._lock:
+            with self._get_connection() as conn:
+                cursor = conn.execute(
+                    "DELETE FROM crawl_pages WHERE source = ? AND last_seen_at < ?",
+                    (source, cutoff),
+                )
+                conn.commit()
+                return cursor.rowcount
+
+    def clear(self, source: str | None = None) -> int:
+        """
+        Clear crawl state so the next crawl re-extracts everything.
+
+        Args:
+            source: Only clear this source (None = all sources)
+
+        Returns:
+            Number of pages removed
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                if source:
+                    cursor = conn.execute("DELETE FROM crawl_pages WHERE source = ?", (source,))
+                else:
+                    cursor = conn.execute("DELETE FROM crawl_pages")
+                conn.commit()
+                return cursor.rowcount
+
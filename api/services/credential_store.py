@@ -0,0 +1,672 @@
+"""
+Unified OAuth credential store for Google and Microsoft tokens.
+
+Tokens are persisted in SQLite and served from an in-memory TTL cache,
+so status checks and API calls don't touch disk. Each provider registers
+an async refresher. Refreshes are coalesced per user behind a lock, and a
+background loop refreshes tokens shortly before they expire, so requests
+rarely wait on one. Refreshed tokens are written with a compare-and-set
+on the access token that was refreshed, so when workers sharing the
+database refresh the same user at once, only the first result is kept.
+
+Unlike the other stores, persistence doesn't depend on DATABASE_URL:
+tokens were always kept on disk, and an in-memory fallback would sign
+every user out on restart. InMemoryCredentialStore is used for tests.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# Provider names
+GOOGLE_PROVIDER = "google"
+MICROSOFT_PROVIDER = "microsoft"
+
+# Default database path (next to the legacy token files)
+DEFAULT_CREDENTIALS_DB_PATH = Path(__file__).parent.parent.parent / "data" / "credentials.db"
+
+# Cached lookups (including misses) are trusted this long
+CREDENTIAL_CACHE_TTL_SECONDS = 300.0
+CREDENTIAL_CACHE_SIZE = 4096
+
+# Access tokens this close to expiry are refreshed before use
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+
+# The background loop refreshes tokens expiring within this window
+REFRESH_AHEAD_SECONDS = 300
+REFRESH_INTERVAL_SECONDS = 60.0
+
+
+class StoredCredential(BaseModel):
+    """OAuth tokens for one user and provider."""
+
+    provider: str
+    user_id: str
+    access_token: str | None = None
+    refresh_token: str | None = None
+    expires_at: datetime | None = None  # UTC
+    scopes: list[str] = Field(default_factory=list)
+
+    @property
+    def can_refresh(self) -> bool:
+        """Check if a new access token can be obtained."""
+        return self.refresh_token is not None
+
+    def expires_within(self, seconds: float, now: datetime | None = None) -> bool:
+        """
+        Check if the access token expires within a margin.
+
+        Args:
+            seconds: Margin in seconds
+            now: Current time (defaults to now, UTC)
+
+        Returns:
+            True if expiring; tokens without an expiry never are
+        """
+        if self.expires_at is None:
+            return False
+        now = now or datetime.now(timezone.utc)
+        return self.expires_at - now <= timedelta(seconds=seconds)
+
+
+# Exchanges a credential's refresh token for new tokens
+RefreshFn = Callable[[StoredCredential], Awaitable[StoredCredential]]
+
+
+def _to_utc(value: datetime | None) -> datetime | None:
+    """Normalize an expiry to aware UTC (naive values are taken as UTC)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class InMemoryCredentialStore:
+    """
+    In-memory credential store.
+
+    Implements the same interface as CredentialStore; credentials are lost
+    when the process restarts.
+
+    Thread-safe for concurrent access.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the in-memory store."""
+        self._lock = threading.Lock()
+        self._credentials: dict[tuple[str, str], StoredCredential] = {}
+
+    def save(self, credential: StoredCredential) -> None:
+        """
+        Insert or replace a credential.
+
+        Args:
+            credential: Credential to persist
+        """
+        with self._lock:
+            self._credentials[(credential.provider, credential.user_id)] = credential.model_copy()
+
+    def replace(self, credential: StoredCredential, expected_access_token: str | None) -> bool:
+        """
+        Replace a credential only if its stored access token is unchanged.
+
+        Args:
+            credential: Credential to persist
+            expected_access_token: Access token the caller last read
+
+        Returns:
+            False if the credential is gone or was changed by someone else
+        """
+        key = (credential.provider, credential.user_id)
+        with self._lock:
+            current = self._credentials.get(key)
+            if current is None or current.access_token != expected_access_token:
+                return False
+            self._credentials[key] = credential.model_copy()
+            return True
+
+    def get(self, provider: str, user_id: str) -> StoredCredential | None:
+        """
+        Get a user's credential.
+
+        Args:
+            provider: Provider name
+            user_id: User identifier
+
+        Returns:
+            StoredCredential if found, None otherwise
+        """
+        with self._lock:
+            credential = self._credentials.get((provider, user_id))
+            return credential.model_copy() if credential else None
+
+    def delete(self, provider: str, user_id: str) -> bool:
+        """
+        Delete a user's credential.
+
+        Args:
+            provider: Provider name
+            user_id: User identifier
+
+        Returns:
+            True if a credential was deleted
+        """
+        with self._lock:
+            return self._credentials.pop((provider, user_id), None) is not None
+
+    def list_expiring(self, before: datetime) -> list[StoredCredential]:
+        """
+        List refreshable credentials whose access token expires before a time.
+
+        Args:
+            before: Expiry cutoff (UTC)
+
+        Returns:
+            Credentials, soonest expiry first
+        """
+        with self._lock:
+            expiring = [
+                credential.model_copy()
+                for credential in self._credentials.values()
+                if credential.can_refresh
+                and credential.expires_at is not None
+                and credential.expires_at <= before
+            ]
+        return sorted(expiring, key=lambda credential: credential.expires_at)
+
+
+class CredentialStore:
+    """
+    SQLite-based credential store.
+
+    Thread-safe for concurrent access.
+    """
+
+    def __init__(self, db_path: str | Path | None = None):
+        """
+        Initialize the credential store.
+
+        Args:
+            db_path: Path to SQLite database file. Defaults to data/credentials.db
+        """
+        path = Path(db_path or DEFAULT_CREDENTIALS_DB_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(path)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Initialize the database schema."""
+        with self._get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS oauth_credentials (
+                    provider TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    access_token TEXT,
+                    refresh_token TEXT,
+                    expires_at TEXT,
+                    scopes TEXT NOT NULL,
+                    PRIMARY KEY (provider, user_id)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_oauth_credentials_expires_at
+                ON oauth_credentials(expires_at)
+            """)
+            conn.commit()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get a database connection."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _row_to_credential(row: sqlite3.Row) -> StoredCredential:
+        """Convert a database row to StoredCredential."""
+        return StoredCredential(
+            provider=row["provider"],
+            user_id=row["user_id"],
+            access_token=row["access_token"],
+            refresh_token=row["refresh_token"],
+            expires_at=datetime.fromisoformat(row["expires_at"]) if row["expires_at"] else None,
+            scopes=json.loads(row["scopes"]),
+        )
+
+    def save(self, credential: StoredCredential) -> None:
+        """
+        Insert or replace a credential.
+
+        Args:
+            credential: Credential to persist
+        """
+        expires_at = _to_utc(credential.expires_at)
+        with self._lock:
+            with self._get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO oauth_credentials
+                    (provider, user_id, access_token, refresh_token, expires_at, scopes)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        credential.provider,
+                        credential.user_id,
+                        credential.access_token,
+                        credential.refresh_token,
+                        expires_at.isoformat() if expires_at else None,
+                        json.dumps(credential.scopes),
+                    ),
+                )
+                conn.commit()
+
+    def replace(self, credential: StoredCredential, expected_access_token: str | None) -> bool:
+        """
+        Replace a credential only if its stored access token is unchanged.
+
+        The check and write are one UPDATE, so it is atomic across workers
+        sharing the database.
+
+        Args:
+            credential: Credential to persist
+            expected_access_token: Access token the caller last read
+
+        Returns:
+            False if the credential is gone or was changed by someone else
+        """
+        expires_at = _to_utc(credential.expires_at)
+        with self._lock:
+            with self._get_connection() as conn:
+                cursor = conn.execute(
+                    """
+                    UPDATE oauth_credentials
+                    SET access_token = ?, refresh_token = ?, expires_at = ?, scopes = ?
+                    WHERE provider = ? AND user_id = ? AND access_token IS ?
+                    """,
+                    (
+                        credential.access_token,
+                        credential.refresh_token,
+                        expires_at.isoformat() if expires_at else None,
+                        json.dumps(credential.scopes),
+                        credential.provider,
+                        credential.user_id,
+                        expected_access_token,
+                    ),
+                )
+                conn.commit()
+                return cursor.rowcount == 1
+
+    def get(self, provider: str, user_id: str) -> StoredCredential | None:
+        """
+        Get a user's credential.
+
+        Args:
+            provider: Provider name
+            user_id: User identifier
+
+        Returns:
+            StoredCredential if found, None otherwise
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT * FROM oauth_credentials WHERE provider = ? AND user_id = ?",
+                    (provider, user_id),
+                ).fetchone()
+                return self._row_to_credential(row) if row else None
+
+    def delete(self, provider: str, user_id: str) -> bool:
+        """
+        Delete a user's credential.
+
+        Args:
+            provider: Provider name
+            user_id: User identifier
+
+        Returns:
+            True if a credential was deleted
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                cursor = conn.execute(
+                    "DELETE FROM oauth_credentials WHERE provider = ? AND user_id = ?",
+                    (provider, user_id),
+                )
+                conn.commit()
+                return cursor.rowcount > 0
+
+    def list_expiring(self, before: datetime) -> list[StoredCredential]:
+        """
+        List refreshable credentials whose access token expires before a time.
+
+        Args:
+            before: Expiry cutoff (UTC)
+
+        Returns:
+            Credentials, soonest expiry first
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                # Expiries are stored as UTC ISO strings, so they sort as text
+                rows = conn.execute(
+                    """
+                    SELECT * FROM oauth_credentials
+                    WHERE refresh_token IS NOT NULL
+                      AND expires_at IS NOT NULL
+                      AND expires_at <= ?
+                    ORDER BY expires_at
+                    """,
+                    (_to_utc(before).isoformat(),),
+                ).fetchall()
+                return [self._row_to_credential(row) for row in rows]
+
+
+# Type alias for store return type
+CredentialStoreType = CredentialStore | InMemoryCredentialStore
+
+
+class CredentialService:
+    """
+    Cached credential access with coalesced and proactive refresh.
+
+    Usage:
+        service = get_credential_service()
+        service.register_refresher(GOOGLE_PROVIDER, refresh_fn)
+        token = await service.get_access_token(GOOGLE_PROVIDER, "user-123")
+    """
+
+    def __init__(
+        self,
+        store: CredentialStoreType | None = None,
+        cache_ttl_seconds: float = CREDENTIAL_CACHE_TTL_SECONDS,
+        refresh_ahead_seconds: float = REFRESH_AHEAD_SECONDS,
+        refresh_interval_seconds: float = REFRESH_INTERVAL_SECONDS,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            store: Credential store. Defaults to SQLite at data/credentials.db
+            cache_ttl_seconds: Seconds a cached lookup is trusted
+            refresh_ahead_seconds: Background refresh window before expiry
+            refresh_interval_seconds: Seconds between background refresh sweeps
+        """
+        self.store = store if store is not None else CredentialStore()
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self._refreshers: dict[str, RefreshFn] = {}
+        self._cache_lock = threading.Lock()
+        self._cache: OrderedDict[tuple[str, str], tuple[StoredCredential | None, float]] = (
+            OrderedDict()
+        )
+        self._refresh_locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def register_refresher(self, provider: str, refresh_fn: RefreshFn) -> None:
+        """
+        Register the token refresher for a provider.
+
+        Args:
+            provider: Provider name
+            refresh_fn: Exchanges a credential's refresh token for new tokens
+        """
+        self._refreshers[provider] = refresh_fn
+
+    def _cache_put(self, key: tuple[str, str], credential: StoredCredential | None) -> None:
+        """Cache a lookup result, evicting the least recently used entries."""
+        with self._cache_lock:
+            self._cache[key] = (credential, time.monotonic())
+            self._cache.move_to_end(key)
+            while len(self._cache) > CREDENTIAL_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def get(self, provider: str, user_id: str) -> StoredCredential | None:
+        """
+        Get a user's credential, reading the store only on a cache miss.
+
+        Args:
+            provider: Provider name
+            user_id: User identifier
+
+        Returns:
+            StoredCredential if found, None otherwise
+        """
+        key = (provider, user_id)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() - cached[1] < self.cache_ttl_seconds:
+                self._cache.move_to_end(key)
+                return cached[0]
+
+        credential = self.store.get(provider, user_id)
+        self._cache_put(key, credential)
+        return credential
+
+    def save(self, credential: StoredCredential) -> None:
+        """
+        Persist a credential and update the cache.
+
+        Args:
+            credential: Credential to persist
+        """
+        credential = credential.model_copy(update={"expires_at": _to_utc(credential.expires_at)})
+        self.store.save(credential)
+        self._cache_put((credential.provider, credential.user_id), credential)
+
+    def replace(self, credential: StoredCredential, expected_access_token: str | None) -> bool:
+        """
+        Persist a credential if its stored access token is unchanged.
+
+        Args:
+            credential: Credential to persist
+            expected_access_token: Access token the caller last read
+
+        Returns:
+            True if written (and cached)
+        """
+        credential = credential.model_copy(update={"expires_at": _to_utc(credential.expires_at)})
+        if not self.store.replace(credential, expected_access_token):
+            return False
+        self._cache_put((credential.provider, credential.user_id), credential)
+        return True
+
+    def delete(self, provider: str, user_id: str) -> bool:
+        """
+        Delete a user's credential.
+
+        Args:
+            provider: Provider name
+            user_id: User identifier
+
+        Returns:
+            True if a credential was deleted
+        """
+        deleted = self.store.delete(provider, user_id)
+        self._cache_put((provider, user_id), None)
+        return deleted
+
+    @staticmethod
+    def _usable(
+        credential: StoredCredential,
+        rejected_token: str | None,
+        margin_seconds: float,
+    ) -> bool:
+        """Check if a credential's access token can be used as is."""
+        return (
+            credential.access_token is not None
+            and credential.access_token != rejected_token
+            and not credential.expires_within(margin_seconds)
+        )
+
+    async def refresh(
+        self,
+        provider: str,
+        user_id: str,
+        rejected_token: str | None = None,
+        margin_seconds: float = TOKEN_EXPIRY_MARGIN_SECONDS,
+    ) -> StoredCredential:
+        """
+        Refresh a user's access token, coalescing concurrent refreshes.
+
+        Callers wait on one per-user lock. The first refreshes; the rest
+        find a fresh token in the store and return it. If another worker
+        stored a new token while this one was refreshing, its token wins.
+
+        Args:
+            provider: Provider name
+            user_id: User identifier
+            rejected_token: Token the API just rejected, if any
+            margin_seconds: Tokens expiring within this margin are refreshed
+
+        Returns:
+            Refreshed (or already fresh) credential
+
+        Raises:
+            ValueError: If there is no refreshable credential or refresher
+        """
+        key = (provider, user_id)
+        lock = self._refresh_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Read through to the store: another worker may have refreshed
+            credential = await asyncio.to_thread(self.store.get, provider, user_id)
+            if credential is None:
+                self._cache_put(key, None)
+                raise ValueError(f"No {provider} credentials found for user: {user_id}")
+            if self._usable(credential, rejected_token, margin_seconds):
+                self._cache_put(key, credential)
+                return credential
+
+            refresh_fn = self._refreshers.get(provider)
+            if refresh_fn is None:
+                raise ValueError(f"No token refresher registered for {provider}")
+            if not credential.can_refresh:
+                raise ValueError(f"{provider} credentials for user {user_id} cannot be refreshed")
+
+            refreshed = await refresh_fn(credential)
+            if await asyncio.to_thread(self.replace, refreshed, credential.access_token):
+                logger.debug("🔑 [Credentials] Refreshed | provider=%s user=%s", provider, user_id)
+                return self.get(provider, user_id) or refreshed
+
+            # Lost the race to another worker (or the user signed out): use what's stored
+            current = await asyncio.to_thread(self.store.get, provider, user_id)
+            self._cache_put(key, current)
+            if current is None:
+                raise ValueError(f"No {provider} credentials found for user: {user_id}")
+            logger.debug(
+                "🔑 [Credentials] Kept concurrent refresh | provider=%s user=%s", provider, user_id
+            )
+            return current
+
+    async def get_access_token(
+        self,
+        provider: str,
+        user_id: str,
+        rejected_token: str | None = None,
+    ) -> str:
+        """
+        Get a usable access token, refreshing it only when needed.
+
+        Args:
+            provider: Provider name
+            user_id: User identifier
+            rejected_token: Token the API just answered 401 for, if any
+
+        Returns:
+            Access token
+
+        Raises:
+            ValueError: If the user has no usable credentials
+        """
+        credential = self.get(provider, user_id)
+        if credential is None:
+            raise ValueError(f"No {provider} credentials found for user: {user_id}")
+
+        if not self._usable(credential, rejected_token, TOKEN_EXPIRY_MARGIN_SECONDS):
+            credential = await self.refresh(provider, user_id, rejected_token=rejected_token)
+        if credential.access_token is None:
+            raise ValueError(f"No {provider} access token for user: {user_id}")
+        return credential.access_token
+
+    async def refresh_expiring(self, now: datetime | None = None) -> int:
+        """
+        Refresh every token expiring within refresh_ahead_seconds.
+
+        Args:
+            now: Current time (defaults to now, UTC)
+
+        Returns:
+            Number of credentials refreshed
+        """
+        now = now or datetime.now(timezone.utc)
+        before = now + timedelta(seconds=self.refresh_ahead_seconds)
+        expiring = await asyncio.to_thread(self.store.list_expiring, before)
+
+        refreshed = 0
+        for credential in expiring:
+            if credential.provider not in self._refreshers:
+                continue
+            try:
+                await self.refresh(
+                    credential.provider,
+                    credential.user_id,
+                    margin_seconds=self.refresh_ahead_seconds,
+                )
+            except Exception as e:
+                logger.warning(
+                    "Proactive token refresh failed | provider=%s user=%s error=%s",
+                    credential.provider,
+                    credential.user_id,
+                    e,
+                )
+                continue
+            refreshed += 1
+        return refreshed
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh_expiring()
+            except Exception as e:
+                # A store outage must not kill the loop; retry next sweep
+                logger.error("Proactive token refresh sweep failed: %s", e, exc_info=True)
+            await asyncio.sleep(self.refresh_interval_seconds)
+
+    async def start(self) -> None:
+        """Start the proactive refresh loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the refresh loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global service instance
+_service: CredentialService | None = None
+
+
+def get_credential_service() -> CredentialService:
+    """Get the global credential service."""
+    global _service
+    if _service is None:
+        _service = CredentialService()
+    return _service
@@ -0,0 +1,192 @@
+"""
+Shared date normalization for upstream event payloads.
+
+Sources hand us dates as ISO 8601 strings, as 'Month Day, Year' plus an
+'H:MM AM/PM TZ' time (the BASE_EVENT_SCHEMA extraction format), or as
+free text. Known shapes are sniffed and parsed with fast paths; dateutil
+is only the last fallback. Fast-path results are cached by input string,
+so a timestamp seen repeatedly in one pipeline (validation, time
+filtering, refinement columns) is parsed once. The fuzzy fallback is not
+cached: dateutil fills missing fields from today's date, so its answer
+for the same string changes over time.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+
+from dateutil import parser as dateutil_parser
+from zoneinfo import ZoneInfo
+
+# Naive timestamps are local Columbus time
+DEFAULT_TIMEZONE = ZoneInfo("America/New_York")
+
+# Distinct date strings kept in each parse cache
+DATE_CACHE_SIZE = 4096
+
+# US timezone abbreviations seen in event pages. Explicit standard and
+# daylight names are fixed offsets; generic names follow the zone's rules.
+TZ_ABBREVIATIONS: dict[str, tzinfo] = {
+    "UTC": timezone.utc,
+    "GMT": timezone.utc,
+    "Z": timezone.utc,
+    "EST": timezone(timedelta(hours=-5), "EST"),
+    "EDT": timezone(timedelta(hours=-4), "EDT"),
+    "CST": timezone(timedelta(hours=-6), "CST"),
+    "CDT": timezone(timedelta(hours=-5), "CDT"),
+    "MST": timezone(timedelta(hours=-7), "MST"),
+    "MDT": timezone(timedelta(hours=-6), "MDT"),
+    "PST": timezone(timedelta(hours=-8), "PST"),
+    "PDT": timezone(timedelta(hours=-7), "PDT"),
+    "ET": ZoneInfo("America/New_York"),
+    "CT": ZoneInfo("America/Chicago"),
+    "MT": ZoneInfo("America/Denver"),
+    "PT": ZoneInfo("America/Los_Angeles"),
+}
+
+_MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+
+_ISO_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# "January 15, 2026", "Sat, Jan 15 2026", "January 15th, 2026"
+_MONTH_DAY_YEAR_RE = re.compile(
+    r"(?:[a-z]+,?\s+)??(?P<month>[a-z]{3,9})\.?\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<year>\d{4})",
+    re.IGNORECASE,
+)
+
+# "7:00 PM EST", "7pm", "19:30", "7:30 p.m. ET"
+_TIME_RE = re.compile(
+    r"(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>[ap])?\.?(?:m\.?)?"
+    r"(?:\s*(?P<tz>[a-z]{1,4}))?",
+    re.IGNORECASE,
+)
+
+
+def to_aware(value: datetime, default_tz: tzinfo = DEFAULT_TIMEZONE) -> datetime:
+    """
+    Attach a timezone to a naive datetime.
+
+    Args:
+        value: Datetime (naive values are taken as local time)
+        default_tz: Zone for naive values
+
+    Returns:
+        Timezone-aware datetime
+    """
+    return value if value.tzinfo is not None else value.replace(tzinfo=default_tz)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_iso_datetime(value: str) -> datetime | None:
+    """
+    Parse an ISO 8601 timestamp (as stored in EventResult.date).
+
+    Args:
+        value: ISO 8601 string ("Z" suffix allowed)
+
+    Returns:
+        Datetime as written (naive if the string has no offset), or None
+    """
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+
+
+def _parse_date(value: str) -> datetime | None:
+    """Fast paths for the date part: ISO 8601 and 'Month Day, Year'."""
+    if _ISO_RE.match(value):
+        return parse_iso_datetime(value)
+
+    match = _MONTH_DAY_YEAR_RE.fullmatch(value)
+    if match:
+        month = _MONTHS.get(match.group("month")[:3].lower())
+        if month is not None:
+            try:
+                return datetime(int(match.group("year")), month, int(match.group("day")))
+            except ValueError:
+                return None
+    return None
+
+
+def _parse_time(value: str) -> tuple[int, int, tzinfo | None] | None:
+    """Fast path for 'H:MM AM/PM [TZ]'; returns (hour, minute, tz) or None."""
+    match = _TIME_RE.fullmatch(value)
+    if match is None:
+        return None
+
+    hour = int(match.group("hour"))
+    minute = int(match.group("minute") or 0)
+    ampm = (match.group("ampm") or "").lower()
+    if ampm:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if ampm == "p" else 0)
+    elif match.group("minute") is None:
+        # A bare number isn't a time
+        return None
+    if hour > 23 or minute > 59:
+        return None
+
+    tz = None
+    if match.group("tz"):
+        tz = TZ_ABBREVIATIONS.get(match.group("tz").upper())
+        if tz is None:
+            return None
+    return hour, minute, tz
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_known_formats(date_str: str, time_str: str | None) -> datetime | None:
+    """Deterministic fast paths (cached); None if the input isn't a known shape."""
+    parsed_date = _parse_date(date_str)
+    if parsed_date is None:
+        return None
+    if not time_str:
+        return parsed_date
+    parsed_time = _parse_time(time_str)
+    if parsed_time is None:
+        return None
+    hour, minute, tz = parsed_time
+    return parsed_date.replace(
+        hour=hour, minute=minute, second=0, microsecond=0, tzinfo=tz or parsed_date.tzinfo
+    )
+
+
+def parse_event_datetime(date_str: str, time_str: str | None = None) -> datetime | None:
+    """
+    Parse an upstream event date, optionally with a separate time.
+
+    Args:
+        date_str: Date ('January 15, 2026', ISO 8601 or free text)
+        time_str: Time ('7:00 PM EST'), if given separately
+
+    Returns:
+        Datetime (aware when the input names a zone), or None if unparseable
+    """
+    date_str = date_str.strip()
+    time_str = time_str.strip() if time_str else None
+
+    parsed = _parse_known_formats(date_str, time_str)
+    if parsed is not None:
+        return parsed
+
+    # Last resort: fuzzy dateutil with our timezone names (uncached, see above)
+    combined = f"{date_str} {time_str}" if time_str else date_str
+    try:
+        return dateutil_parser.parse(combined, fuzzy=True, tzinfos=TZ_ABBREVIATIONS)
+    except (ValueError, OverflowError):
+        return None
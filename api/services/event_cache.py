@@ -16,9 +16,11 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+import redis
 from pydantic import BaseModel
 
 from api.config import get_settings
+from api.services.state_backend import KEY_PREFIX, REDIS_CONNECT_TIMEOUT, REDIS_PROTOCOL
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,12 @@ DEFAULT_CACHE_DB_PATH = Path(__file__).parent.parent / "event_cache.db"
 # Default TTL: 24 hours
 DEFAULT_TTL_HOURS = 24
 
+# Redis hash listing sources with cached events
+REDIS_SOURCES_KEY = f"{KEY_PREFIX}events:sources"
+
+# Seconds a Redis cache command may block before failing
+REDIS_COMMAND_TIMEOUT = 5.0
+
 
 class CachedEvent(BaseModel):
     """Event data stored in cache."""
@@ -658,8 +666,257 @@ class EventCache:
                 return cursor.fetchone()[0]
 
 
+class RedisEventCache:
+    """
+    Event cache in a Redis-protocol server, shared across workers.
+
+    Implements the same interface as EventCache. Each source is a hash
+    "cc:events:<source>" of event_id -> CachedEvent JSON; known sources
+    are tracked in "cc:events:sources". Expiry is checked on read and the
+    whole source hash also carries a TTL refreshed on writes.
+
+    Thread-safe for concurrent access.
+    """
+
+    def __init__(self, url: str, ttl_hours: int = DEFAULT_TTL_HOURS):
+        """
+        Initialize the Redis cache.
+
+        Args:
+            url: redis:// connection URL
+            ttl_hours: Time-to-live for cached entries in hours. Defaults to 24.
+        """
+        self.ttl_hours = ttl_hours
+        self._client = redis.Redis.from_url(
+            url,
+            decode_responses=True,
+            protocol=REDIS_PROTOCOL,
+            socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+            socket_timeout=REDIS_COMMAND_TIMEOUT,
+        )
+        logger.info(
+            "Event cache initialized with Redis: %s",
+            self._client.connection_pool.connection_kwargs.get("host"),
+        )
+
+    @staticmethod
+    def _key(source: str) -> str:
+        return f"{KEY_PREFIX}events:{source}"
+
+    def _is_expired(self, cached_at: datetime) -> bool:
+        """Check if a cached entry has expired."""
+        expiry = cached_at + timedelta(hours=self.ttl_hours)
+        return datetime.now(timezone.utc) > expiry
+
+    def _sources(self) -> list[str]:
+        """List sources with cached events."""
+        return list(self._client.hkeys(REDIS_SOURCES_KEY))
+
+    def _decode(self, value: str | None) -> CachedEvent | None:
+        """Deserialize a stored event, skipping expired or corrupt entries."""
+        if value is None:
+            return None
+        try:
+            event = CachedEvent.model_validate_json(value)
+        except ValueError:
+            return None
+        if self._is_expired(event.cached_at):
+            return None
+        return event
+
+    def get(self, source: str, event_id: str) -> CachedEvent | None:
+        """
+        Get a cached event by source and event_id.
+
+        Args:
+            source: The event source (e.g., "exa", "firecrawl", "eventbrite")
+            event_id: The event's unique ID within the source
+
+        Returns:
+            CachedEvent if found and not expired, None otherwise
+        """
+        return self._decode(self._client.hget(self._key(source), event_id))
+
+    def get_many(self, source: str, event_ids: list[str]) -> list[CachedEvent]:
+        """
+        Get multiple cached events by source and event_ids.
+
+        Args:
+            source: The event source
+            event_ids: List of event IDs to retrieve
+
+        Returns:
+            List of cached events (excludes missing/expired entries)
+        """
+        if not event_ids:
+            return []
+        values = self._client.hmget(self._key(source), event_ids)
+        return [e for e in (self._decode(v) for v in values) if e is not None]
+
+    def put(
+        self,
+        source: str,
+        event_id: str,
+        title: str,
+        date: str,
+        location: str,
+        category: str,
+        description: str,
+        is_free: bool,
+        price_amount: int | None = None,
+        url: str | None = None,
+        logo_url: str | None = None,
+        raw_data: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Cache an event (upsert).
+
+        Args:
+            source: The event source (e.g., "exa", "firecrawl")
+            event_id: The event's unique ID
+            title: Event title
+            date: ISO 8601 datetime string
+            location: Venue/location string
+            category: Event category
+            description: Event description
+            is_free: Whether the event is free
+            price_amount: Price in cents (optional)
+            url: Event URL (optional)
+            logo_url: Event logo/image URL (optional)
+            raw_data: Original raw data dict for debugging (optional)
+        """
+        self.put_many(
+            source,
+            [
+                {
+                    "event_id": event_id,
+                    "title": title,
+                    "date": date,
+                    "location": location,
+                    "category": category,
+                    "description": description,
+                    "is_free": is_free,
+                    "price_amount": price_amount,
+                    "url": url,
+                    "logo_url": logo_url,
+                    "raw_data": raw_data,
+                }
+            ],
+        )
+
+    def put_event(self, source: str, event: CachedEvent) -> None:
+        """
+        Cache a CachedEvent object.
+
+        Args:
+            source: The event source
+            event: CachedEvent to cache
+        """
+        self.put_many(source, [event.model_dump(exclude={"source", "cached_at"})])
+
+    def put_many(self, source: str, events: list[dict[str, Any]]) -> int:
+        """
+        Cache multiple events in one round trip.
+
+        Args:
+            source: The event source
+            events: List of event dicts with keys matching put() parameters
+
+        Returns:
+            Number of events cached
+        """
+        if not events:
+            return 0
+
+        cached_at = datetime.now(timezone.utc)
+        mapping = {}
+        for event_dict in events:
+            event = CachedEvent(
+                source=source,
+                event_id=event_dict["event_id"],
+                title=event_dict["title"],
+                date=event_dict["date"],
+                location=event_dict["location"],
+                category=event_dict["category"],
+                description=event_dict["description"],
+                is_free=event_dict.get("is_free", True),
+                price_amount=event_dict.get("price_amount"),
+                url=event_dict.get("url"),
+                logo_url=event_dict.get("logo_url"),
+                raw_data=event_dict.get("raw_data"),
+                cached_at=cached_at,
+            )
+            mapping[event.event_id] = event.model_dump_json()
+
+        pipe = self._client.pipeline(transaction=False)
+        pipe.hset(self._key(source), mapping=mapping)
+        pipe.expire(self._key(source), self.ttl_hours * 3600)
+        pipe.hset(REDIS_SOURCES_KEY, source, "1")
+        pipe.execute()
+        return len(events)
+
+    def clear_expired(self) -> int:
+        """
+        Remove all expired entries from the cache.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for source in self._sources():
+            entries = self._client.hgetall(self._key(source))
+            expired = [
+                event_id for event_id, value in entries.items() if self._decode(value) is None
+            ]
+            if expired:
+                self._client.hdel(self._key(source), *expired)
+                removed += len(expired)
+        if removed:
+            logger.info("Cleared %d expired cache entries", removed)
+        return removed
+
+    def clear_source(self, source: str) -> int:
+        """
+        Clear all cached events from a specific source.
+
+        Args:
+            source: The event source to clear
+
+        Returns:
+            Number of entries removed
+        """
+        pipe = self._client.pipeline(transaction=False)
+        pipe.hlen(self._key(source))
+        pipe.delete(self._key(source))
+        pipe.hdel(REDIS_SOURCES_KEY, source)
+        count, _, _ = pipe.execute()
+        return count
+
+    def clear_all(self) -> int:
+        """
+        Clear all cached events.
+
+        Returns:
+            Number of entries removed
+        """
+        return sum(self.clear_source(source) for source in self._sources())
+
+    def count(self, source: str | None = None) -> int:
+        """
+        Count cached events.
+
+        Args:
+            source: Optional source to filter by
+
+        Returns:
+            Number of cached events
+        """
+        sources = [source] if source else self._sources()
+        return sum(self._client.hlen(self._key(s)) for s in sources)
+
+
 # Type alias for cache return type
-Cache = EventCache | InMemoryEventCache
+Cache = EventCache | InMemoryEventCache | RedisEventCache
 
 
 # Global cache instance
@@ -671,12 +928,15 @@ def get_event_cache() -> Cache:
     Get the global event cache instance.
 
     Returns a singleton cache for dependency injection in FastAPI.
-    Automatically uses in-memory cache if DATABASE_URL is not set.
+    Uses Redis when REDIS_URL is set, SQLite when DATABASE_URL is set,
+    otherwise an in-memory cache.
     """
     global _cache
     if _cache is None:
         settings = get_settings()
-        if settings.has_database:
+        if settings.has_redis:
+            _cache = RedisEventCache(settings.redis_url)
+        elif settings.has_database:
             _cache = EventCache()
         else:
             _cache = InMemoryEventCache()
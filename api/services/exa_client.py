@@ -1,10 +1,12 @@
 """
 Exa API client for event discovery.
 
-Uses official exa-py SDK for Search API (wrapped in thread pool for async),
-and raw HTTP for Websets API (not supported by SDK).
+Talks to the Search, Contents, findSimilar and Websets endpoints over one
+pooled httpx.AsyncClient, so Exa calls never occupy the shared threadpool
+and concurrency is bounded only by the connection pool.
 """
 
+import importlib.util
 import logging
 import os
 import time
@@ -12,12 +14,17 @@ from datetime import datetime
 from typing import Any
 
 import httpx
-from exa_py import Exa
 from pydantic import BaseModel
-from starlette.concurrency import run_in_threadpool
 
 logger = logging.getLogger(__name__)
 
+# Connection pool shared by all concurrent Exa requests
+EXA_MAX_CONNECTIONS = 50
+EXA_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 
 class ExaSearchResult(BaseModel):
     """Parsed search result from Exa API."""
@@ -46,27 +53,17 @@ class ExaClient:
     """
     Async client for Exa API.
 
-    Uses official SDK for Search API (sync SDK wrapped in thread pool).
-    Uses raw HTTP for Websets API (not supported by SDK).
+    All endpoints share one pooled HTTP client (HTTP/2 when available).
     """
 
     BASE_URL = "https://api.exa.ai"
 
     def __init__(self, api_key: str | None = None):
         self.api_key = api_key or os.getenv("EXA_API_KEY")
-        self._sdk_client: Exa | None = None
         self._http_client: httpx.AsyncClient | None = None
 
-    def _get_sdk_client(self) -> Exa:
-        """Get or create the SDK client (synchronous)."""
-        if self._sdk_client is None:
-            if not self.api_key:
-                raise ValueError("EXA_API_KEY not configured")
-            self._sdk_client = Exa(api_key=self.api_key)
-        return self._sdk_client
-
     async def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client for Websets (async)."""
+        """Get or create the pooled HTTP client."""
         if self._http_client is None:
             headers = {}
             if self.api_key:
@@ -75,6 +72,11 @@ class ExaClient:
                 base_url=self.BASE_URL,
                 headers=headers,
                 timeout=30.0,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=EXA_MAX_CONNECTIONS,
+                    max_keepalive_connections=EXA_MAX_KEEPALIVE_CONNECTIONS,
+                ),
             )
         return self._http_client
 
@@ -84,31 +86,6 @@ class ExaClient:
             await self._http_client.aclose()
             self._http_client = None
 
-    def _convert_sdk_result(self, result: Any) -> ExaSearchResult:
-        """Convert SDK result object to our model."""
-        published_date = None
-        if hasattr(result, 'published_date') and result.published_date:
-            try:
-                if isinstance(result.published_date, str):
-                    published_date = datetime.fromisoformat(
-                        result.published_date.replace("Z", "+00:00")
-                    )
-                else:
-                    published_date = result.published_date
-            except ValueError:
-                pass
-
-        return ExaSearchResult(
-            id=getattr(result, 'id', '') or getattr(result, 'url', ''),
-            title=getattr(result, 'title', 'Untitled'),
-            url=result.url,
-            score=getattr(result, 'score', None),
-            published_date=published_date,
-            author=getattr(result, 'author', None),
-            text=getattr(result, 'text', None),
-            highlights=getattr(result, 'highlights', None),
-        )
-
     async def _extract_event_from_text(
         self,
         title: str,
@@ -216,40 +193,38 @@ If this is NOT an event page or details cannot be extracted, return {"is_event":
 
         return enriched
 
-    def _sync_search(
-        self,
-        query: str,
-        num_results: int,
-        include_text: bool,
-        include_highlights: bool,
-        start_published_date: str | None,
-        end_published_date: str | None,
-        include_domains: list[str] | None,
-        exclude_domains: list[str] | None,
-    ) -> list[Any]:
-        """Synchronous search using SDK (called via run_in_threadpool)."""
-        client = self._get_sdk_client()
-
-        kwargs: dict[str, Any] = {
-            "num_results": num_results,
-        }
+    @staticmethod
+    def _contents_options(include_text: bool, include_highlights: bool) -> dict[str, Any] | None:
+        """Build the `contents` request option (None = no page contents)."""
+        contents: dict[str, Any] = {}
+        if include_text:
+            contents["text"] = True
+        if include_highlights:
+            contents["highlights"] = True
+        return contents or None
 
-        if start_published_date:
-            kwargs["start_published_date"] = start_published_date
-        if end_published_date:
-            kwargs["end_published_date"] = end_published_date
-        if include_domains:
-            kwargs["include_domains"] = include_domains
-        if exclude_domains:
-            kwargs["exclude_domains"] = exclude_domains
-
-        # Use search_and_contents if we need text/highlights
-        if include_text or include_highlights:
-            result = client.search_and_contents(query, **kwargs)
-        else:
-            result = client.search(query, **kwargs)
+    async def _post_results(self, path: str, payload: dict[str, Any]) -> list[ExaSearchResult]:
+        """
+        POST to a results endpoint and parse the returned results.
+
+        Args:
+            path: Endpoint path (e.g. "/search")
+            payload: JSON request body
+
+        Returns:
+            Parsed results (unparseable entries are skipped)
 
-        return result.results if hasattr(result, 'results') else []
+        Raises:
+            httpx.HTTPError: On transport errors or non-2xx responses
+        """
+        client = await self._get_http_client()
+        response = await client.post(path, json=payload)
+        response.raise_for_status()
+        return [
+            result
+            for result_data in response.json().get("results") or []
+            if (result := self._parse_result(result_data))
+        ]
 
     async def search(
         self,
@@ -266,8 +241,6 @@ If this is NOT an event page or details cannot be extracted, return {"is_event":
         """
         Search the web using Exa's neural search.
 
-        Uses SDK wrapped in thread pool for async compatibility.
-
         Args:
             extract_events: If True, use LLM to extract structured event data
                            from each result's text content
@@ -285,24 +258,19 @@ If this is NOT an event page or details cannot be extracted, return {"is_event":
             )
             start_time = time.perf_counter()
 
-            # Format dates for SDK
-            start_date_str = start_published_date.strftime("%Y-%m-%d") if start_published_date else None
-            end_date_str = end_published_date.strftime("%Y-%m-%d") if end_published_date else None
-
-            # Run sync SDK in thread pool
-            raw_results = await run_in_threadpool(
-                self._sync_search,
-                query,
-                num_results,
-                include_text,
-                include_highlights,
-                start_date_str,
-                end_date_str,
-                include_domains,
-                exclude_domains,
-            )
+            payload: dict[str, Any] = {"query": query, "numResults": num_results}
+            if start_published_date:
+                payload["startPublishedDate"] = start_published_date.strftime("%Y-%m-%d")
+            if end_published_date:
+                payload["endPublishedDate"] = end_published_date.strftime("%Y-%m-%d")
+            if include_domains:
+                payload["includeDomains"] = include_domains
+            if exclude_domains:
+                payload["excludeDomains"] = exclude_domains
+            if contents := self._contents_options(include_text, include_highlights):
+                payload["contents"] = contents
 
-            results = [self._convert_sdk_result(r) for r in raw_results]
+            results = await self._post_results("/search", payload)
 
             # Optionally extract event details from text
             if extract_events and results:
@@ -326,28 +294,6 @@ If this is NOT an event page or details cannot be extracted, return {"is_event":
             logger.warning("Exa search error: %s", e)
             return []
 
-    def _sync_find_similar(
-        self,
-        url: str,
-        num_results: int,
-        include_text: bool,
-        exclude_source_domain: bool,
-    ) -> list[Any]:
-        """Synchronous find_similar using SDK."""
-        client = self._get_sdk_client()
-
-        kwargs: dict[str, Any] = {
-            "num_results": num_results,
-            "exclude_source_domain": exclude_source_domain,
-        }
-
-        if include_text:
-            result = client.find_similar_and_contents(url, **kwargs)
-        else:
-            result = client.find_similar(url, **kwargs)
-
-        return result.results if hasattr(result, 'results') else []
-
     async def find_similar(
         self,
         url: str,
@@ -359,23 +305,56 @@ If this is NOT an event page or details cannot be extracted, return {"is_event":
         if not self.api_key:
             return []
 
-        try:
-            raw_results = await run_in_threadpool(
-                self._sync_find_similar,
-                url,
-                num_results,
-                include_text,
-                exclude_source_domain,
-            )
+        payload: dict[str, Any] = {
+            "url": url,
+            "numResults": num_results,
+            "excludeSourceDomain": exclude_source_domain,
+        }
+        if include_text:
+            payload["contents"] = {"text": True}
 
-            return [self._convert_sdk_result(r) for r in raw_results]
+        try:
+            return await self._post_results("/findSimilar", payload)
 
         except Exception as e:
             logger.warning("Exa findSimilar error: %s", e)
             return []
 
+    async def get_contents(
+        self,
+        urls: list[str],
+        include_text: bool = True,
+        include_highlights: bool = False,
+    ) -> list[ExaSearchResult]:
+        """
+        Fetch page contents for known URLs.
+
+        Args:
+            urls: Page URLs (or Exa result IDs)
+            include_text: Include full page text
+            include_highlights: Include relevant highlights
+
+        Returns:
+            One result per page Exa could fetch
+        """
+        if not self.api_key or not urls:
+            return []
+
+        payload: dict[str, Any] = {"urls": urls}
+        if include_text:
+            payload["text"] = True
+        if include_highlights:
+            payload["highlights"] = True
+
+        try:
+            return await self._post_results("/contents", payload)
+
+        except Exception as e:
+            logger.warning("Exa contents error: %s", e)
+            return []
+
     # ========================================
-    # Websets API (raw HTTP - SDK doesn't support)
+    # Websets API
     # ========================================
 
     async def create_webset(
@@ -384,11 +363,7 @@ If this is NOT an event page or details cannot be extracted, return {"is_event":
         count: int = 50,
         criteria: str | None = None,
     ) -> str | None:
-        """
-        Create a Webset for async deep discovery.
-
-        NOTE: Uses raw HTTP because SDK doesn't expose Websets API.
-        """
+        """Create a Webset for async deep discovery."""
         if not self.api_key:
             return None
 
@@ -423,11 +398,7 @@ If this is NOT an event page or details cannot be extracted, return {"is_event":
             return None
 
     async def get_webset(self, webset_id: str) -> ExaWebset | None:
-        """
-        Get the status and results of a Webset.
-
-        NOTE: Uses raw HTTP because SDK doesn't expose Websets API.
-        """
+        """Get the status and results of a Webset."""
         if not self.api_key:
             return None
 
@@ -444,7 +415,7 @@ If this is NOT an event page or details cannot be extracted, return {"is_event":
                 results = [
                     result
                     for result_data in data["results"]
-                    if (result := self._parse_webset_result(result_data))
+                    if (result := self._parse_result(result_data))
                 ]
 
             status = data.get("status", "unknown")
@@ -467,8 +438,8 @@ If this is NOT an event page or details cannot be extracted, return {"is_event":
             logger.warning("Exa get webset error: %s", e)
             return None
 
-    def _parse_webset_result(self, data: dict[str, Any]) -> ExaSearchResult | None:
-        """Parse raw Webset result into ExaSearchResult."""
+    def _parse_result(self, data: dict[str, Any]) -> ExaSearchResult | None:
+        """Parse a raw Search/Contents/Webset result into ExaSearchResult."""
         try:
             published_date = None
             if data.get("publishedDate"):
@@ -480,8 +451,8 @@ If this is NOT an event page or details cannot be extracted, return {"is_event":
                     pass
 
             return ExaSearchResult(
-                id=data.get("id", data.get("url", "")),
-                title=data.get("title", "Untitled"),
+                id=data.get("id") or data.get("url", ""),
+                title=data.get("title") or "Untitled",
                 url=data["url"],
                 score=data.get("score"),
                 published_date=published_date,
@@ -491,7 +462,7 @@ If this is NOT an event page or details cannot be extracted, return {"is_event":
             )
 
         except (KeyError, ValueError) as e:
-            logger.warning("Error parsing Exa webset result: %s", e)
+            logger.warning("Error parsing Exa result: %s", e)
             return None
 
 
@@ -9,13 +9,19 @@ import logging
 import os
 import re
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
 from firecrawl import AsyncFirecrawl
 from pydantic import BaseModel
 
+from api.services.date_parsing import parse_event_datetime
+
+if TYPE_CHECKING:
+    from api.services.crawl_state import CrawlState
+
 logger = logging.getLogger(__name__)
 
 
@@ -269,39 +275,27 @@ class BaseExtractor(ABC):
         if not start_date:
             return None, None
 
-        try:
-            from datetime import timedelta
-
-            from dateutil import parser as dateutil_parser
-
-            # Combine date and start time
-            combined = start_date
-            if start_time:
-                combined = f"{start_date} {start_time}"
-
-            start_dt = dateutil_parser.parse(combined, fuzzy=True)
-
-            # Parse end time if provided
-            end_dt = None
-            if end_time and start_dt:
-                end_combined = f"{start_date} {end_time}"
-                end_dt = dateutil_parser.parse(end_combined, fuzzy=True)
-                # Handle overnight events (end time before start time)
-                if end_dt and start_dt and end_dt < start_dt:
-                    end_dt = end_dt + timedelta(days=1)
-
-            return start_dt, end_dt
-
-        except Exception as e:
+        start_dt = parse_event_datetime(start_date, start_time)
+        if start_dt is None:
             logger.warning(
-                "Failed to parse datetime: date=%s start=%s end=%s error=%s",
+                "Failed to parse datetime: date=%s start=%s end=%s",
                 start_date,
                 start_time,
                 end_time,
-                e,
             )
             return None, None
 
+        # Parse end time if provided
+        end_dt = parse_event_datetime(start_date, end_time) if end_time else None
+        if end_dt is not None and (end_dt.tzinfo is None) != (start_dt.tzinfo is None):
+            # Only one of the times named a zone: assume they share it
+            end_dt = end_dt.replace(tzinfo=start_dt.tzinfo)
+        # Handle overnight events (end time before start time)
+        if end_dt is not None and end_dt < start_dt:
+            end_dt = end_dt + timedelta(days=1)
+
+        return start_dt, end_dt
+
     def _parse_price_from_schema(self, price_str: str | None) -> tuple[bool, int | None]:
         """
         Parse price string from BASE_EVENT_SCHEMA into (is_free, price_cents).
@@ -350,26 +344,31 @@ class BaseExtractor(ABC):
             logger.error("Failed to extract %s event from %s: %s", self.SOURCE_NAME, url, e)
             return None
 
-    async def _crawl_and_extract(
+    async def _iter_crawl_and_extract(
         self,
         discovery_url: str,
         limit: int = 20,
         include_patterns: list[str] | None = None,
-    ) -> list[ScrapedEvent]:
+        crawl_state: "CrawlState | None" = None,
+    ) -> AsyncIterator[ScrapedEvent]:
         """
-        Crawl a listing page and extract events.
-
-        This is the core discovery logic that can be called by subclasses
-        with platform-specific URLs and patterns.
+        Crawl a listing page and yield events as each extraction finishes.
 
         Args:
             discovery_url: URL to crawl for event links
-            limit: Maximum number of events to return
+            limit: Maximum number of events to yield
             include_patterns: URL patterns to include (e.g., ["/e/*"])
+            crawl_state: Previous crawl for incremental mode; pages whose
+                content is unchanged reuse their stored event instead of
+                being re-extracted
 
-        Returns:
-            List of discovered events
+        Yields:
+            Discovered events
         """
+        # Imported here; crawl_state depends on this module
+        from api.services.crawl_state import content_hash
+
+        count = 0
         try:
             pages = await self.client.crawl(
                 url=discovery_url,
@@ -377,24 +376,73 @@ class BaseExtractor(ABC):
                 include_patterns=include_patterns,
             )
 
-            events = []
             for page in pages:
                 url = page.get("url", "") if isinstance(page, dict) else getattr(page, 'url', '')
                 if not url:
                     continue
 
-                event = await self.extract_event(url)
+                page_hash = None
+                event: ScrapedEvent | None = None
+                if crawl_state is not None:
+                    page_hash = content_hash(page)
+                    stored = crawl_state.unchanged(url, page_hash)
+                    if stored is not None:
+                        if not stored.event:
+                            continue
+                        event = stored.event
+
+                if event is None:
+                    event = await self.extract_event(url)
+                    if crawl_state is not None and event is not None:
+                        crawl_state.record(url, page_hash, event)
                 if event:
-                    events.append(event)
-                    if len(events) >= limit:
+                    yield event
+                    count += 1
+                    if count >= limit:
                         break
 
-            logger.info("Discovered %d %s events", len(events), self.SOURCE_NAME)
-            return events
-
         except Exception as e:
             logger.error("Failed to discover %s events: %s", self.SOURCE_NAME, e)
-            return []
+            return
+
+        if crawl_state is not None:
+            logger.info(
+                "Discovered %d %s events (%s)",
+                count,
+                self.SOURCE_NAME,
+                crawl_state.summary(),
+            )
+        else:
+            logger.info("Discovered %d %s events", count, self.SOURCE_NAME)
+
+    async def _crawl_and_extract(
+        self,
+        discovery_url: str,
+        limit: int = 20,
+        include_patterns: list[str] | None = None,
+        crawl_state: "CrawlState | None" = None,
+    ) -> list[ScrapedEvent]:
+        """
+        Crawl a listing page and extract events.
+
+        This is the core discovery logic that can be called by subclasses
+        with platform-specific URLs and patterns.
+
+        Args:
+            discovery_url: URL to crawl for event links
+            limit: Maximum number of events to return
+            include_patterns: URL patterns to include (e.g., ["/e/*"])
+            crawl_state: Previous crawl for incremental mode (optional)
+
+        Returns:
+            List of discovered events
+        """
+        return [
+            event
+            async for event in self._iter_crawl_and_extract(
+                discovery_url, limit, include_patterns, crawl_state
+            )
+        ]
 
 
 class PoshExtractor(BaseExtractor):
@@ -452,6 +500,7 @@ class PoshExtractor(BaseExtractor):
         self,
         city: str = "columbus",
         limit: int = 20,
+        crawl_state: "CrawlState | None" = None,
     ) -> list[ScrapedEvent]:
         """
         Discover events from Posh for a given city.
@@ -459,19 +508,47 @@ class PoshExtractor(BaseExtractor):
         Args:
             city: City slug (e.g., "columbus", "new-york")
             limit: Maximum number of events to return
+            crawl_state: Previous crawl for incremental mode (optional)
 
         Returns:
             List of discovered events
         """
-        from urllib.parse import urljoin
-        city_url = urljoin(self.BASE_URL, f"/c/{city}")
-
         return await self._crawl_and_extract(
-            discovery_url=city_url,
+            discovery_url=self._city_url(city),
+            limit=limit,
+            include_patterns=["/e/*"],
+            crawl_state=crawl_state,
+        )
+
+    def iter_events(
+        self,
+        city: str = "columbus",
+        limit: int = 20,
+        crawl_state: "CrawlState | None" = None,
+    ) -> AsyncIterator[ScrapedEvent]:
+        """
+        Yield Posh events for a city as each extraction finishes.
+
+        Args:
+            city: City slug (e.g., "columbus", "new-york")
+            limit: Maximum number of events to yield
+            crawl_state: Previous crawl for incremental mode (optional)
+
+        Returns:
+            Async iterator of discovered events
+        """
+        return self._iter_crawl_and_extract(
+            discovery_url=self._city_url(city),
             limit=limit,
             include_patterns=["/e/*"],
+            crawl_state=crawl_state,
         )
 
+    def _city_url(self, city: str) -> str:
+        """Build the Posh listing URL for a city."""
+        from urllib.parse import urljoin
+        return urljoin(self.BASE_URL, f"/c/{city}")
+
 
 # Singleton instances
 _firecrawl_client: FirecrawlClient | None = None
@@ -16,6 +16,7 @@ from typing import Any
 from firecrawl import AsyncFirecrawl
 from pydantic import BaseModel, Field
 
+from api.services.date_parsing import parse_event_datetime
 from api.services.firecrawl import ScrapedEvent
 
 logger = logging.getLogger(__name__)
@@ -84,16 +85,7 @@ def _parse_datetime(
     if not date_str:
         return None
 
-    try:
-        from dateutil import parser as dateutil_parser
-
-        combined = date_str
-        if time_str:
-            combined = f"{date_str} {time_str}"
-
-        return dateutil_parser.parse(combined, fuzzy=True)
-    except Exception:
-        return None
+    return parse_event_datetime(date_str, time_str)
 
 
 class FirecrawlAgentClient:
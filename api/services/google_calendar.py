@@ -5,12 +5,20 @@ Provides OAuth flow for Google Calendar and methods to create events
 in user's Google Calendar.
 
 Uses direct REST API calls via httpx instead of google-api-python-client
-to reduce bundle size (~92MB savings).
+to reduce bundle size (~92MB savings). Event writes are async over one
+pooled httpx.AsyncClient. Tokens live in the shared credential store,
+which caches them and refreshes them ahead of expiry. Bulk inserts use
+the multipart batch endpoint, up to 50 events per HTTP request.
 """
 
+import asyncio
+import base64
+import hashlib
 import json
 import logging
-from datetime import datetime
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
@@ -20,18 +28,49 @@ from google_auth_oauthlib.flow import Flow
 from pydantic import BaseModel, Field
 
 from api.config import get_settings
+from api.services.credential_store import (
+    GOOGLE_PROVIDER,
+    CredentialService,
+    StoredCredential,
+    get_credential_service,
+)
 
 # Google Calendar API base URL
 CALENDAR_API_BASE = "https://www.googleapis.com/calendar/v3"
 
+# Batch endpoint: multipart/mixed, at most 50 calls per request
+CALENDAR_BATCH_URL = "https://www.googleapis.com/batch/calendar/v3"
+GOOGLE_BATCH_SIZE = 50
+
 logger = logging.getLogger(__name__)
 
 # Google Calendar API scopes
 SCOPES = ["https://www.googleapis.com/auth/calendar.events"]
 
-# Token storage directory
+# Legacy per-user token files, imported into the credential store on first use
 TOKEN_DIR = Path(__file__).parent.parent.parent / "data" / "google_tokens"
 
+# OAuth token endpoint (used for refresh_token grants)
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+# Connection pool shared by all Calendar API requests
+GOOGLE_MAX_CONNECTIONS = 20
+GOOGLE_MAX_KEEPALIVE_CONNECTIONS = 10
+
+# Requests in flight at once per bulk insert
+GOOGLE_INSERT_CONCURRENCY = 8
+
+# Batch parts worth retrying: rate limits and server errors
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRYABLE_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+
+# Attempts per batch (only unfinished parts are resent), with exponential backoff
+BATCH_MAX_ATTEMPTS = 3
+BATCH_RETRY_DELAY_SECONDS = 1.0
+
+_BOUNDARY_RE = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+_CONTENT_ID_RE = re.compile(r"^Content-ID:\s*<response-item-(\d+)>", re.IGNORECASE | re.MULTILINE)
+
 
 class GoogleCalendarEvent(BaseModel):
     """Event data for Google Calendar."""
@@ -50,6 +89,97 @@ class OAuthState(BaseModel):
     redirect_url: str | None = None
 
 
+def _build_batch_body(parts: dict[int, tuple[str, dict[str, Any]]], boundary: str) -> bytes:
+    """
+    Encode POST calls as a multipart/mixed batch body.
+
+    Args:
+        parts: Content-ID index -> (request path, JSON body)
+        boundary: Multipart boundary
+
+    Returns:
+        Request body
+    """
+    lines: list[str] = []
+    for index, (path, body) in parts.items():
+        lines += [
+            f"--{boundary}",
+            "Content-Type: application/http",
+            f"Content-ID: <item-{index}>",
+            "",
+            f"POST {path} HTTP/1.1",
+            "Content-Type: application/json",
+            "",
+            json.dumps(body),
+        ]
+    lines.append(f"--{boundary}--")
+    return ("\r\n".join(lines) + "\r\n").encode()
+
+
+def _parse_batch_response(response: httpx.Response) -> dict[int, tuple[int, dict[str, Any]]]:
+    """
+    Split a multipart/mixed batch response into per-call results.
+
+    Args:
+        response: Batch HTTP response
+
+    Returns:
+        Content-ID index -> (HTTP status, JSON body)
+
+    Raises:
+        ValueError: If the response is not a multipart batch
+    """
+    match = _BOUNDARY_RE.search(response.headers.get("content-type", ""))
+    if match is None:
+        raise ValueError("Batch response has no multipart boundary")
+
+    results: dict[int, tuple[int, dict[str, Any]]] = {}
+    for part in response.text.replace("\r\n", "\n").split(f"--{match.group(1)}"):
+        part_headers, _, message = part.strip().partition("\n\n")
+        content_id = _CONTENT_ID_RE.search(part_headers)
+        if content_id is None:
+            continue
+
+        status_line, _, rest = message.partition("\n")
+        _, _, body = rest.partition("\n\n")
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            continue
+        try:
+            payload = json.loads(body) if body.strip() else {}
+        except ValueError:
+            payload = {}
+        results[int(content_id.group(1))] = (status, payload)
+    return results
+
+
+def _event_id(nonce: str, index: int) -> str:
+    """
+    Client-supplied event ID, fixed for one export so a resent insert can't duplicate.
+
+    The nonce is drawn once per export, so exporting the same events again
+    (or re-adding one the user deleted, whose ID Google keeps) never
+    collides. Google accepts lowercase base32hex (a-v, 0-9), 5-1024 characters.
+    """
+    digest = hashlib.sha256(f"{nonce}:{index}".encode()).digest()
+    return base64.b32hexencode(digest).decode().rstrip("=").lower()
+
+
+def _is_retryable(status: int, payload: dict[str, Any]) -> bool:
+    """Check if a failed batch part is a transient error."""
+    if status in RETRYABLE_STATUSES:
+        return True
+    errors = payload.get("error", {}).get("errors") or [{}]
+    return status == 403 and errors[0].get("reason") in RETRYABLE_REASONS
+
+
+def _part_error(status: int, payload: dict[str, Any]) -> str:
+    """Describe a failed batch part."""
+    message = payload.get("error", {}).get("message")
+    return f"{status} {message}" if message else f"HTTP {status}"
+
+
 class GoogleCalendarService:
     """Service for Google Calendar OAuth and event creation.
 
@@ -57,14 +187,42 @@ class GoogleCalendarService:
     in a user's Google Calendar.
     """
 
-    def __init__(self):
-        """Initialize the Google Calendar service."""
+    def __init__(
+        self,
+        insert_concurrency: int = GOOGLE_INSERT_CONCURRENCY,
+        credentials: CredentialService | None = None,
+    ):
+        """Initialize the Google Calendar service.
+
+        Args:
+            insert_concurrency: Maximum concurrent requests per bulk insert
+            credentials: Credential service (defaults to the global one)
+        """
         self.settings = get_settings()
-        self._ensure_token_dir()
+        self.insert_concurrency = insert_concurrency
+        self.credentials = credentials or get_credential_service()
+        self.credentials.register_refresher(GOOGLE_PROVIDER, self._refresh_credentials)
+        self._http_client: httpx.AsyncClient | None = None
+        self._legacy_checked: set[str] = set()
+
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """Get or create the pooled HTTP client."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                base_url=CALENDAR_API_BASE,
+                timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=GOOGLE_MAX_CONNECTIONS,
+                    max_keepalive_connections=GOOGLE_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+            )
+        return self._http_client
 
-    def _ensure_token_dir(self) -> None:
-        """Ensure token storage directory exists."""
-        TOKEN_DIR.mkdir(parents=True, exist_ok=True)
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        if self._http_client:
+            await self._http_client.aclose()
+            self._http_client = None
 
     def _get_client_config(self) -> dict[str, Any]:
         """Get OAuth client configuration."""
@@ -79,7 +237,7 @@ class GoogleCalendarService:
         }
 
     def _get_token_path(self, user_id: str) -> Path:
-        """Get the token file path for a user."""
+        """Get the legacy token file path for a user."""
         # Sanitize user_id for filesystem
         safe_id = "".join(c if c.isalnum() else "_" for c in user_id)
         return TOKEN_DIR / f"{safe_id}_token.json"
@@ -157,45 +315,58 @@ class GoogleCalendarService:
         return user_id, state_data.redirect_url
 
     def _store_credentials(self, user_id: str, credentials: Credentials) -> None:
-        """Store user credentials to file."""
-        token_path = self._get_token_path(user_id)
-        token_data = {
-            "token": credentials.token,
-            "refresh_token": credentials.refresh_token,
-            "token_uri": credentials.token_uri,
-            "client_id": credentials.client_id,
-            "client_secret": credentials.client_secret,
-            "scopes": credentials.scopes,
-        }
-        token_path.write_text(json.dumps(token_data))
+        """Store user credentials in the credential store."""
+        self.credentials.save(
+            StoredCredential(
+                provider=GOOGLE_PROVIDER,
+                user_id=user_id,
+                access_token=credentials.token,
+                refresh_token=credentials.refresh_token,
+                # google-auth expiries are naive UTC
+                expires_at=credentials.expiry,
+                scopes=list(credentials.scopes or []),
+            )
+        )
 
-    def _load_credentials(self, user_id: str) -> Credentials | None:
-        """Load user credentials from file."""
+    def _import_legacy_token(self, user_id: str) -> StoredCredential | None:
+        """Move a user's legacy token file into the credential store."""
         token_path = self._get_token_path(user_id)
         if not token_path.exists():
             return None
 
         try:
             token_data = json.loads(token_path.read_text())
-            return Credentials(
-                token=token_data.get("token"),
+            expiry = token_data.get("expiry")
+            credential = StoredCredential(
+                provider=GOOGLE_PROVIDER,
+                user_id=user_id,
+                access_token=token_data.get("token"),
                 refresh_token=token_data.get("refresh_token"),
-                token_uri=token_data.get("token_uri"),
-                client_id=token_data.get("client_id"),
-                client_secret=token_data.get("client_secret"),
-                scopes=token_data.get("scopes"),
+                expires_at=datetime.fromisoformat(expiry) if expiry else None,
+                scopes=token_data.get("scopes") or [],
             )
-        except (json.JSONDecodeError, KeyError) as e:
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
             logger.warning("Failed to load credentials for user %s: %s", user_id, e)
             return None
 
+        self.credentials.save(credential)
+        token_path.unlink()
+        logger.info("Imported legacy Google token file for user: %s", user_id)
+        return credential
+
+    def _load_credentials(self, user_id: str) -> StoredCredential | None:
+        """Load user credentials from the (cached) credential store."""
+        credential = self.credentials.get(GOOGLE_PROVIDER, user_id)
+        if credential is None and user_id not in self._legacy_checked:
+            self._legacy_checked.add(user_id)
+            credential = self._import_legacy_token(user_id)
+        return credential
+
     def has_valid_credentials(self, user_id: str) -> bool:
         """Check if user has valid stored credentials."""
-        credentials = self._load_credentials(user_id)
-        if credentials is None:
-            return False
+        credential = self._load_credentials(user_id)
         # Credentials might be expired but can be refreshed
-        return credentials.refresh_token is not None
+        return credential is not None and credential.can_refresh
 
     def revoke_credentials(self, user_id: str) -> bool:
         """Revoke and delete user credentials.
@@ -206,71 +377,69 @@ class GoogleCalendarService:
         Returns:
             True if credentials were deleted, False if none existed
         """
-        token_path = self._get_token_path(user_id)
-        if token_path.exists():
-            token_path.unlink()
+        revoked = self._load_credentials(user_id) is not None
+        self.credentials.delete(GOOGLE_PROVIDER, user_id)
+        if revoked:
             logger.info("Revoked Google credentials for user: %s", user_id)
-            return True
-        return False
-
-    def _refresh_credentials_if_needed(self, credentials: Credentials) -> Credentials:
-        """Refresh credentials if expired."""
-        if credentials.expired and credentials.refresh_token:
-            import google.auth.transport.requests
-            request = google.auth.transport.requests.Request()
-            credentials.refresh(request)
-        return credentials
-
-    def create_event(
-        self,
-        user_id: str,
-        event: GoogleCalendarEvent,
-        calendar_id: str = "primary",
-    ) -> dict[str, Any]:
-        """Create an event in the user's Google Calendar.
+        return revoked
+
+    async def _refresh_credentials(self, credential: StoredCredential) -> StoredCredential:
+        """Exchange a refresh token for a new access token (credential store refresher)."""
+        client = await self._get_http_client()
+        response = await client.post(
+            TOKEN_URI,
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": credential.refresh_token,
+                "client_id": self.settings.google_client_id,
+                "client_secret": self.settings.google_client_secret,
+            },
+        )
+        response.raise_for_status()
+        token_data = response.json()
+
+        return credential.model_copy(
+            update={
+                "access_token": token_data["access_token"],
+                "expires_at": datetime.now(timezone.utc)
+                + timedelta(seconds=int(token_data.get("expires_in", 3600))),
+            }
+        )
+
+    async def _get_access_token(self, user_id: str, rejected_token: str | None = None) -> str:
+        """Get a usable access token from the credential store.
 
         Args:
             user_id: User identifier
-            event: Event data to create
-            calendar_id: Calendar ID (default: primary)
+            rejected_token: Token the API just answered 401 for, if any
 
         Returns:
-            Created event data from Google API
+            Access token
 
         Raises:
             ValueError: If user has no valid credentials
-            httpx.HTTPStatusError: If Google API call fails
+            httpx.HTTPStatusError: If the token refresh fails
         """
-        credentials = self._load_credentials(user_id)
-        if credentials is None:
+        if self._load_credentials(user_id) is None:
             raise ValueError(f"No credentials found for user: {user_id}")
+        return await self.credentials.get_access_token(GOOGLE_PROVIDER, user_id, rejected_token)
 
-        # Refresh token if needed
-        credentials = self._refresh_credentials_if_needed(credentials)
-
-        # Build event body
+    @staticmethod
+    def _event_body(event: GoogleCalendarEvent) -> dict[str, Any]:
+        """Convert a GoogleCalendarEvent to the Calendar API format."""
+        # Set end time (default to 1 hour after start)
+        end_time = event.end or event.start + timedelta(hours=1)
         event_body: dict[str, Any] = {
             "summary": event.summary,
             "start": {
                 "dateTime": event.start.isoformat(),
                 "timeZone": "UTC",
             },
-        }
-
-        # Set end time (default to 1 hour after start)
-        if event.end:
-            event_body["end"] = {
-                "dateTime": event.end.isoformat(),
-                "timeZone": "UTC",
-            }
-        else:
-            from datetime import timedelta
-
-            end_time = event.start + timedelta(hours=1)
-            event_body["end"] = {
+            "end": {
                 "dateTime": end_time.isoformat(),
                 "timeZone": "UTC",
-            }
+            },
+        }
 
         if event.description:
             event_body["description"] = event.description
@@ -278,22 +447,45 @@ class GoogleCalendarService:
         if event.location:
             event_body["location"] = event.location
 
-        # Use direct REST API call instead of google-api-python-client
-        url = f"{CALENDAR_API_BASE}/calendars/{calendar_id}/events"
-        headers = {"Authorization": f"Bearer {credentials.token}"}
+        return event_body
 
-        try:
-            with httpx.Client() as client:
-                response = client.post(url, headers=headers, json=event_body)
-                response.raise_for_status()
-                created_event = response.json()
-
-            logger.info(
-                "Created Google Calendar event '%s' for user %s",
-                event.summary,
-                user_id,
+    async def create_event(
+        self,
+        user_id: str,
+        event: GoogleCalendarEvent,
+        calendar_id: str = "primary",
+    ) -> dict[str, Any]:
+        """Create an event in the user's Google Calendar.
+
+        Args:
+            user_id: User identifier
+            event: Event data to create
+            calendar_id: Calendar ID (default: primary)
+
+        Returns:
+            Created event data from Google API
+
+        Raises:
+            ValueError: If user has no valid credentials
+            httpx.HTTPStatusError: If Google API call fails
+        """
+        client = await self._get_http_client()
+        path = f"/calendars/{calendar_id}/events"
+        event_body = self._event_body(event)
+
+        token = await self._get_access_token(user_id)
+        response = await client.post(
+            path, headers={"Authorization": f"Bearer {token}"}, json=event_body
+        )
+        if response.status_code == 401:
+            # Token revoked or expired early: refresh once and retry
+            token = await self._get_access_token(user_id, rejected_token=token)
+            response = await client.post(
+                path, headers={"Authorization": f"Bearer {token}"}, json=event_body
             )
-            return created_event
+
+        try:
+            response.raise_for_status()
         except httpx.HTTPStatusError as e:
             logger.error(
                 "Failed to create Google Calendar event for user %s: %s",
@@ -302,7 +494,115 @@ class GoogleCalendarService:
             )
             raise
 
-    def create_events_batch(
+        logger.info(
+            "Created Google Calendar event '%s' for user %s",
+            event.summary,
+            user_id,
+        )
+        return response.json()
+
+    async def _post_batch(self, user_id: str, body: bytes, boundary: str) -> httpx.Response:
+        """POST a batch body, refreshing the token once on 401."""
+        client = await self._get_http_client()
+        token = await self._get_access_token(user_id)
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": f"multipart/mixed; boundary={boundary}",
+        }
+        response = await client.post(CALENDAR_BATCH_URL, headers=headers, content=body)
+        if response.status_code == 401:
+            token = await self._get_access_token(user_id, rejected_token=token)
+            headers["Authorization"] = f"Bearer {token}"
+            response = await client.post(CALENDAR_BATCH_URL, headers=headers, content=body)
+        response.raise_for_status()
+        return response
+
+    async def _insert_batch(
+        self,
+        user_id: str,
+        events: dict[int, GoogleCalendarEvent],
+        calendar_id: str,
+        nonce: str,
+    ) -> dict[int, dict[str, Any]]:
+        """Insert up to GOOGLE_BATCH_SIZE events through the batch endpoint.
+
+        Parts that succeed or fail permanently are settled after the first
+        response; only transient failures are resent. Each event carries an
+        ID fixed for this export, so a resent insert that already landed
+        (whose response was lost) returns 409 and counts as created. A 409
+        on the first attempt is a genuine ID clash and is reported as an error.
+
+        Args:
+            user_id: User identifier
+            events: Result index -> event
+            calendar_id: Calendar ID
+            nonce: Per-export salt for event IDs
+
+        Returns:
+            Result index -> created event data or error
+        """
+        path = f"/calendar/v3/calendars/{calendar_id}/events"
+        results: dict[int, dict[str, Any]] = {}
+        errors: dict[int, str] = {}
+        pending = dict(events)
+        bodies = {
+            index: {**self._event_body(event), "id": _event_id(nonce, index)}
+            for index, event in events.items()
+        }
+
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(BATCH_RETRY_DELAY_SECONDS * 2 ** (attempt - 1))
+
+            boundary = f"batch_{uuid.uuid4().hex}"
+            body = _build_batch_body(
+                {index: (path, bodies[index]) for index in pending},
+                boundary,
+            )
+            try:
+                parts = _parse_batch_response(await self._post_batch(user_id, body, boundary))
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("⚠️ [Google] Batch request failed | user=%s error=%s", user_id, e)
+                errors.update(dict.fromkeys(pending, str(e)))
+                continue
+
+            for index, (status, payload) in parts.items():
+                if index not in pending:
+                    continue
+                if 200 <= status < 300:
+                    results[index] = payload
+                    del pending[index]
+                elif status == 409 and attempt:
+                    # Created by an earlier attempt whose response was lost
+                    event = pending.pop(index)
+                    results[index] = {"id": bodies[index]["id"], "summary": event.summary}
+                elif _is_retryable(status, payload):
+                    errors[index] = _part_error(status, payload)
+                else:
+                    results[index] = {
+                        "error": _part_error(status, payload),
+                        "summary": pending.pop(index).summary,
+                    }
+
+            logger.debug(
+                "📦 [Google] Batch sent | user=%s attempt=%d done=%d pending=%d",
+                user_id,
+                attempt + 1,
+                len(results),
+                len(pending),
+            )
+            if not pending:
+                break
+
+        for index, event in pending.items():
+            logger.warning("Failed to create event '%s': %s", event.summary, errors.get(index))
+            results[index] = {
+                "error": errors.get(index, "No response for batch part"),
+                "summary": event.summary,
+            }
+        return results
+
+    async def create_events_batch(
         self,
         user_id: str,
         events: list[GoogleCalendarEvent],
@@ -310,27 +610,37 @@ class GoogleCalendarService:
     ) -> list[dict[str, Any]]:
         """Create multiple events in the user's Google Calendar.
 
+        Events are sent through the batch endpoint in chunks of
+        GOOGLE_BATCH_SIZE (up to insert_concurrency chunks at a time), so a
+        week of picks is one or two HTTP requests. Each event's result is
+        mapped back from its batch part.
+
         Args:
             user_id: User identifier
             events: List of events to create
             calendar_id: Calendar ID (default: primary)
 
         Returns:
-            List of created event data from Google API
+            List of created event data from Google API, in input order
         """
-        results = []
-        for event in events:
-            try:
-                result = self.create_event(user_id, event, calendar_id)
-                results.append(result)
-            except httpx.HTTPStatusError as e:
-                logger.warning(
-                    "Failed to create event '%s': %s",
-                    event.summary,
-                    e,
-                )
-                results.append({"error": str(e), "summary": event.summary})
-        return results
+        # Fail fast on missing credentials and refresh once up front
+        await self._get_access_token(user_id)
+        semaphore = asyncio.Semaphore(self.insert_concurrency)
+        indexed = list(enumerate(events))
+        nonce = uuid.uuid4().hex
+
+        async def send(chunk: dict[int, GoogleCalendarEvent]) -> dict[int, dict[str, Any]]:
+            async with semaphore:
+                return await self._insert_batch(user_id, chunk, calendar_id, nonce)
+
+        chunks = [
+            dict(indexed[offset : offset + GOOGLE_BATCH_SIZE])
+            for offset in range(0, len(indexed), GOOGLE_BATCH_SIZE)
+        ]
+        results: dict[int, dict[str, Any]] = {}
+        for chunk_results in await asyncio.gather(*(send(chunk) for chunk in chunks)):
+            results.update(chunk_results)
+        return [results[index] for index in range(len(events))]
 
 
 # Singleton instance
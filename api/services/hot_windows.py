@@ -0,0 +1,387 @@
+"""
+Materialized "hot window" event sets.
+
+Most searches ask for the same few windows in Columbus ("tonight",
+"this weekend", "next week"), optionally narrowed to one category. A
+refresh worker periodically runs every source for those windows and
+categories and keeps the merged results here, so a matching search is a
+local read instead of a fan-out to every upstream API.
+
+With several workers, only the holder of a lease in the state backend
+refreshes; it publishes its sets to the backend and the other workers
+load them from there, so upstream sources are queried once per interval.
+
+A profile matches when:
+- Its time window lies inside a materialized window
+- It asks for no category, or a single materialized category
+- It has no keywords or distance constraint (those change what sources return)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from api.models import EventResult, SearchProfile
+from api.services.state_backend import StateBackend
+from api.services.temporal_parser import WEEKEND_START_HOUR
+
+logger = logging.getLogger(__name__)
+
+# Local timezone for window boundaries (Columbus, OH)
+HOT_WINDOW_TIMEZONE = ZoneInfo("America/New_York")
+
+# Categories materialized per window (None = no category filter)
+DEFAULT_HOT_CATEGORIES: tuple[str | None, ...] = (None, "ai", "startup", "community")
+
+# Default seconds between refreshes
+DEFAULT_REFRESH_SECONDS = 15 * 60
+
+# Sets older than this many refresh intervals are not served
+STALE_AFTER_INTERVALS = 2
+
+# State backend keys: the refresh lease and the published sets
+HOT_WINDOW_LEASE_KEY = "hot_windows:refresher"
+HOT_WINDOW_SETS_KEY = "hot_windows:sets"
+
+
+def _day_start(dt: datetime) -> datetime:
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _day_end(dt: datetime) -> datetime:
+    return dt.replace(hour=23, minute=59, second=59, microsecond=0)
+
+
+def _tonight(now: datetime) -> tuple[datetime, datetime]:
+    """All of today (covers "tonight" and "today")."""
+    return _day_start(now), _day_end(now)
+
+
+def _this_weekend(now: datetime) -> tuple[datetime, datetime]:
+    """Friday 4pm through Sunday of the current or upcoming weekend."""
+    # Negative offset on Saturday/Sunday keeps the weekend in progress
+    friday = _day_start(now + timedelta(days=4 - now.weekday()))
+    return friday.replace(hour=WEEKEND_START_HOUR), _day_end(friday + timedelta(days=2))
+
+
+def _next_week(now: datetime) -> tuple[datetime, datetime]:
+    """Monday through Sunday of next week."""
+    monday = _day_start(now + timedelta(days=7 - now.weekday()))
+    return monday, _day_end(monday + timedelta(days=6))
+
+
+@dataclass(frozen=True)
+class HotWindow:
+    """A commonly requested time window."""
+
+    name: str
+    bounds: Callable[[datetime], tuple[datetime, datetime]]
+
+    def resolve(self, now: datetime | None = None) -> tuple[datetime, datetime]:
+        """Compute the window's (start, end) in local time."""
+        return self.bounds(now or datetime.now(HOT_WINDOW_TIMEZONE))
+
+
+DEFAULT_HOT_WINDOWS: tuple[HotWindow, ...] = (
+    HotWindow("tonight", _tonight),
+    HotWindow("this_weekend", _this_weekend),
+    HotWindow("next_week", _next_week),
+)
+
+
+@dataclass
+class MaterializedSet:
+    """Merged results of every source for one window and category."""
+
+    window: str
+    category: str | None
+    start: datetime
+    end: datetime
+    events: list[EventResult]
+    source: str
+    refreshed_at: float  # Wall-clock time.time(), comparable across workers
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        """Check if [start, end] lies inside this set's window."""
+        return self.start <= start and end <= self.end
+
+    @property
+    def key(self) -> str:
+        """Field name of this set in the state backend."""
+        return f"{self.window}|{self.category or ''}"
+
+    def to_json(self) -> str:
+        """Serialize for the state backend."""
+        return json.dumps(
+            {
+                "window": self.window,
+                "category": self.category,
+                "start": self.start.isoformat(),
+                "end": self.end.isoformat(),
+                "events": [e.model_dump(mode="json") for e in self.events],
+                "source": self.source,
+                "refreshed_at": self.refreshed_at,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "MaterializedSet":
+        """Deserialize a set published by another worker."""
+        raw = json.loads(data)
+        return cls(
+            window=raw["window"],
+            category=raw["category"],
+            start=datetime.fromisoformat(raw["start"]),
+            end=datetime.fromisoformat(raw["end"]),
+            events=[EventResult.model_validate(e) for e in raw["events"]],
+            source=raw["source"],
+            refreshed_at=raw["refreshed_at"],
+        )
+
+
+def _localize(dt: datetime) -> datetime:
+    """Treat naive datetimes as local time."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=HOT_WINDOW_TIMEZONE)
+    return dt
+
+
+class HotWindowStore:
+    """
+    Materialized result sets keyed by (window, category).
+
+    Sets older than max_age_seconds are ignored so a stalled refresher
+    never serves stale results.
+    """
+
+    def __init__(self, max_age_seconds: float = DEFAULT_REFRESH_SECONDS * STALE_AFTER_INTERVALS):
+        """
+        Initialize the store.
+
+        Args:
+            max_age_seconds: Maximum age of a set before it is ignored
+        """
+        self.max_age_seconds = max_age_seconds
+        self._sets: dict[tuple[str, str | None], MaterializedSet] = {}
+
+    def put(self, materialized: MaterializedSet) -> None:
+        """Store (or replace) a materialized set."""
+        self._sets[(materialized.window, materialized.category)] = materialized
+
+    def get(self, window: str, category: str | None = None) -> MaterializedSet | None:
+        """Get a fresh materialized set by window name and category."""
+        materialized = self._sets.get((window, category))
+        if materialized is None or self._is_stale(materialized):
+            return None
+        return materialized
+
+    def _is_stale(self, materialized: MaterializedSet) -> bool:
+        return time.time() - materialized.refreshed_at > self.max_age_seconds
+
+    def sets(self) -> list[MaterializedSet]:
+        """All fresh materialized sets."""
+        return [m for m in self._sets.values() if not self._is_stale(m)]
+
+    def match(self, profile: SearchProfile) -> MaterializedSet | None:
+        """
+        Find a fresh materialized set that can answer a search profile.
+
+        Args:
+            profile: Search profile from the agent
+
+        Returns:
+            Narrowest matching set, or None if the profile must be searched live
+        """
+        if profile.keywords or profile.max_distance_miles is not None:
+            return None
+        if not profile.time_window or not profile.time_window.start or not profile.time_window.end:
+            return None
+        if len(profile.categories) > 1:
+            return None
+
+        category = profile.categories[0].lower() if profile.categories else None
+        start = _localize(profile.time_window.start)
+        end = _localize(profile.time_window.end)
+
+        candidates = [
+            m
+            for (_, cat), m in self._sets.items()
+            if cat == category and not self._is_stale(m) and m.covers(start, end)
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda m: m.end - m.start)
+
+    def clear(self) -> None:
+        """Drop all materialized sets."""
+        self._sets.clear()
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+
+# Refresh callback: materializes one window/category profile
+RefreshFn = Callable[[SearchProfile], Awaitable[tuple[list[EventResult], str]]]
+
+
+class HotWindowRefresher:
+    """
+    Periodically materializes hot windows into a HotWindowStore.
+
+    Usage:
+        refresher = HotWindowRefresher(fetch_fn, store)
+        await refresher.start()
+        ...
+        await refresher.stop()
+    """
+
+    def __init__(
+        self,
+        fetch_fn: RefreshFn,
+        store: HotWindowStore,
+        interval_seconds: float = DEFAULT_REFRESH_SECONDS,
+        windows: tuple[HotWindow, ...] = DEFAULT_HOT_WINDOWS,
+        categories: tuple[str | None, ...] = DEFAULT_HOT_CATEGORIES,
+        backend: StateBackend | None = None,
+    ):
+        """
+        Initialize the refresher.
+
+        Args:
+            fetch_fn: Runs all sources for a profile, returning (events, source)
+            store: Store receiving materialized sets
+            interval_seconds: Seconds between refresh rounds
+            windows: Windows to materialize
+            categories: Categories to materialize per window
+            backend: Shared state backend; when set, only the lease holder
+                refreshes and every other worker loads its published sets
+        """
+        self.fetch_fn = fetch_fn
+        self.store = store
+        self.interval_seconds = interval_seconds
+        self.windows = windows
+        self.categories = categories
+        self.backend = backend
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._task: asyncio.Task[None] | None = None
+
+    async def refresh_once(self, now: datetime | None = None) -> int:
+        """
+        Materialize every window/category combination once.
+
+        Combinations run one after another to keep upstream load flat.
+
+        Returns:
+            Number of sets refreshed
+        """
+        refreshed = 0
+        for window in self.windows:
+            start, end = window.resolve(now)
+            for category in self.categories:
+                profile = SearchProfile(
+                    time_window={"start": start, "end": end},
+                    categories=[category] if category else [],
+                )
+                started = time.perf_counter()
+                try:
+                    events, source = await self.fetch_fn(profile)
+                except Exception as e:
+                    logger.warning(
+                        "Hot window refresh failed | window=%s category=%s error=%s",
+                        window.name,
+                        category,
+                        e,
+                    )
+                    continue
+
+                self.store.put(
+                    MaterializedSet(
+                        window=window.name,
+                        category=category,
+                        start=start,
+                        end=end,
+                        events=events,
+                        source=source,
+                        refreshed_at=time.time(),
+                    )
+                )
+                refreshed += 1
+                logger.debug(
+                    "🔥 [HotWindow] Refreshed | window=%s category=%s events=%d duration=%.2fs",
+                    window.name,
+                    category,
+                    len(events),
+                    time.perf_counter() - started,
+                )
+        return refreshed
+
+    async def sync_once(self, now: datetime | None = None) -> int:
+        """
+        Run one round: refresh if this worker holds the lease, else load.
+
+        Without a backend this is just refresh_once.
+
+        Returns:
+            Number of sets refreshed or loaded
+        """
+        if self.backend is None:
+            return await self.refresh_once(now)
+
+        ttl = max(1, int(self.interval_seconds * STALE_AFTER_INTERVALS))
+        if await self.backend.acquire_lease(HOT_WINDOW_LEASE_KEY, self.owner, ttl):
+            refreshed = await self.refresh_once(now)
+            sets = self.store.sets()
+            await self.backend.hash_set(
+                HOT_WINDOW_SETS_KEY, {m.key: m.to_json() for m in sets}, ttl_seconds=ttl
+            )
+            return refreshed
+
+        loaded = 0
+        for data in (await self.backend.hash_get_all(HOT_WINDOW_SETS_KEY)).values():
+            self.store.put(MaterializedSet.from_json(data))
+            loaded += 1
+        logger.debug("🔥 [HotWindow] Loaded shared sets | sets=%d", loaded)
+        return loaded
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync_once()
+            except Exception as e:
+                logger.warning("Hot window sync failed | error=%s", e)
+            await asyncio.sleep(self.interval_seconds)
+
+    async def start(self) -> None:
+        """Start the periodic refresh loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the refresh loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global store instance
+_store: HotWindowStore | None = None
+
+
+def get_hot_window_store() -> HotWindowStore:
+    """Get the singleton hot window store."""
+    global _store
+    if _store is None:
+        _store = HotWindowStore()
+    return _store
@@ -0,0 +1,540 @@
+"""
+Durable store for background discovery jobs.
+
+Supports both SQLite-based persistence (when DATABASE_URL is set) and
+in-memory storage (graceful fallback when no database is configured).
+
+Each job records its state, the upstream Webset ID and its poll
+schedule, so a restart can resume polling work that was already paid
+for instead of losing it.
+
+With several workers sharing the database, a job is run by whichever
+worker holds its lease (owner, lease_until). claim() takes or renews the
+lease atomically, and save() never overwrites a job leased by another
+worker, so a job is never resumed twice. Sessions on other workers join
+a leased job with add_subscriber(), which needs no lease; save() leaves
+those remote subscribers alone so the lease holder can fan out to them.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from api.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Default database path (relative to api root)
+DEFAULT_JOBS_DB_PATH = Path(__file__).parent.parent / "background_jobs.db"
+
+# Jobs in these states are resumed on startup
+ACTIVE_STATUSES = ("queued", "running")
+
+# Finished jobs are kept this long so results can be picked up
+DEFAULT_RETENTION_HOURS = 24
+
+
+class JobRecord(BaseModel):
+    """Persisted state of a background discovery job."""
+
+    key: str
+    query: str
+    tenant_id: str
+    priority: int
+    subscribers: list[str] = Field(default_factory=list)
+    status: str = "queued"
+    webset_id: str | None = None
+    polls: int = 0
+    next_poll_at: datetime | None = None
+    result_ids: list[str] = Field(default_factory=list)
+    error: str | None = None
+    owner: str | None = None  # Worker holding the lease
+    lease_until: datetime | None = None
+    remote_subscribers: list[str] = Field(default_factory=list)  # Sessions on other workers
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def leased_by_other(self, owner: str | None, now: datetime) -> bool:
+        """Check if another worker holds a live lease on this job."""
+        return (
+            self.owner is not None
+            and self.owner != owner
+            and self.lease_until is not None
+            and self.lease_until > now
+        )
+
+
+class InMemoryJobStore:
+    """
+    In-memory job store for non-persisted mode.
+
+    Implements the same interface as JobStore; jobs are lost when the
+    process restarts.
+
+    Thread-safe for concurrent access.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the in-memory store."""
+        self._lock = threading.Lock()
+        self._jobs: dict[str, JobRecord] = {}
+
+    def save(self, record: JobRecord) -> bool:
+        """
+        Insert or update a job's state (the lease is left unchanged).
+
+        Args:
+            record: Job state to persist
+
+        Returns:
+            False if another worker holds the job's lease (nothing written)
+        """
+        now = datetime.now(timezone.utc)
+        record.updated_at = now
+        with self._lock:
+            existing = self._jobs.get(record.key)
+            if existing is not None and existing.leased_by_other(record.owner, now):
+                return False
+            stored = record.model_copy(deep=True)
+            stored.remote_subscribers = []
+            if existing is not None:
+                stored.owner, stored.lease_until = existing.owner, existing.lease_until
+                if existing.status in ACTIVE_STATUSES:
+                    stored.remote_subscribers = list(existing.remote_subscribers)
+            self._jobs[record.key] = stored
+            return True
+
+    def add_subscriber(self, key: str, session_id: str, owner: str) -> bool:
+        """
+        Subscribe a session to an active job leased by another worker.
+
+        Args:
+            key: Job key
+            session_id: Session to receive the job's results
+            owner: Worker ID of the caller (must not hold the lease)
+
+        Returns:
+            True if the session joined; False if no other live worker runs the job
+        """
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            record = self._jobs.get(key)
+            if record is None or record.status not in ACTIVE_STATUSES:
+                return False
+            if not record.leased_by_other(owner, now):
+                return False
+            if session_id not in record.remote_subscribers:
+                record.remote_subscribers.append(session_id)
+            return True
+
+    def claim(self, key: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Take or renew the lease on an active job.
+
+        Args:
+            key: Job key
+            owner: Worker ID
+            lease_seconds: Lease duration
+
+        Returns:
+            True if the caller now holds the lease
+        """
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            record = self._jobs.get(key)
+            if record is None or record.status not in ACTIVE_STATUSES:
+                return False
+            if record.leased_by_other(owner, now):
+                return False
+            record.owner = owner
+            record.lease_until = now + timedelta(seconds=lease_seconds)
+            return True
+
+    def release(self, key: str, owner: str) -> None:
+        """
+        Drop a lease held by owner so another worker can resume the job.
+
+        Args:
+            key: Job key
+            owner: Worker ID
+        """
+        with self._lock:
+            record = self._jobs.get(key)
+            if record is not None and record.owner == owner:
+                record.owner = None
+                record.lease_until = None
+
+    def get(self, key: str) -> JobRecord | None:
+        """
+        Get a job by key.
+
+        Args:
+            key: Job key
+
+        Returns:
+            JobRecord if found, None otherwise
+        """
+        with self._lock:
+            record = self._jobs.get(key)
+            return record.model_copy(deep=True) if record else None
+
+    def list_active(self) -> list[JobRecord]:
+        """
+        List jobs that were queued or running.
+
+        Returns:
+            Active jobs, oldest first
+        """
+        with self._lock:
+            records = [r.model_copy(deep=True) for r in self._jobs.values() if r.status in ACTIVE_STATUSES]
+        return sorted(records, key=lambda r: r.updated_at)
+
+    def clear_finished(self, older_than_hours: int = DEFAULT_RETENTION_HOURS) -> int:
+        """
+        Remove finished jobs last updated before the retention window.
+
+        Args:
+            older_than_hours: Retention window in hours
+
+        Returns:
+            Number of jobs removed
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=older_than_hours)
+        with self._lock:
+            stale = [
+                key for key, record in self._jobs.items()
+                if record.status not in ACTIVE_STATUSES and record.updated_at < cutoff
+            ]
+            for key in stale:
+                del self._jobs[key]
+            return len(stale)
+
+
+class JobStore:
+    """
+    SQLite-based background job store.
+
+    Thread-safe for concurrent access.
+
+    Usage:
+        store = JobStore()
+        store.save(JobRecord(key="events ai", query="events ai", tenant_id="s1", priority=10))
+        active = store.list_active()
+    """
+
+    def __init__(self, db_path: str | Path | None = None):
+        """
+        Initialize the job store.
+
+        Args:
+            db_path: Path to SQLite database file. Defaults to api/background_jobs.db
+        """
+        self.db_path = str(db_path or DEFAULT_JOBS_DB_PATH)
+        self._lock = threading.Lock()
+        self._init_db()
+        logger.info("Job store initialized with SQLite persistence: %s", self.db_path)
+
+    def _init_db(self) -> None:
+        """Initialize the database schema."""
+        with self._get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS background_jobs (
+                    key TEXT PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    tenant_id TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    subscribers TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    webset_id TEXT,
+                    polls INTEGER NOT NULL,
+                    next_poll_at TEXT,
+                    result_ids TEXT NOT NULL,
+                    error TEXT,
+                    owner TEXT,
+                    lease_until TEXT,
+                    remote_subscribers TEXT,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            # Databases created before leases were added
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(background_jobs)")}
+            for column in ("owner", "lease_until", "remote_subscribers"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE background_jobs ADD COLUMN {column} TEXT")
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_jobs_status
+                ON background_jobs (status)
+            """)
+            conn.commit()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get a database connection."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _row_to_record(self, row: sqlite3.Row) -> JobRecord:
+        """Convert a database row to JobRecord."""
+        return JobRecord(
+            key=row["key"],
+            query=row["query"],
+            tenant_id=row["tenant_id"],
+            priority=row["priority"],
+            subscribers=json.loads(row["subscribers"]),
+            status=row["status"],
+            webset_id=row["webset_id"],
+            polls=row["polls"],
+            next_poll_at=datetime.fromisoformat(row["next_poll_at"]) if row["next_poll_at"] else None,
+            result_ids=json.loads(row["result_ids"]),
+            error=row["error"],
+            owner=row["owner"],
+            lease_until=datetime.fromisoformat(row["lease_until"]) if row["lease_until"] else None,
+            remote_subscribers=json.loads(row["remote_subscribers"] or "[]"),
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+        )
+
+    def save(self, record: JobRecord) -> bool:
+        """
+        Insert or update a job's state (the lease is left unchanged).
+
+        Args:
+            record: Job state to persist
+
+        Returns:
+            False if another worker holds the job's lease (nothing written)
+        """
+        record.updated_at = datetime.now(timezone.utc)
+        placeholders = ",".join("?" * len(ACTIVE_STATUSES))
+        with self._lock:
+            with self._get_connection() as conn:
+                cursor = conn.execute(
+                    f"""
+                    INSERT INTO background_jobs
+                    (key, query, tenant_id, priority, subscribers, status,
+                     webset_id, polls, next_poll_at, result_ids, error, owner, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        query = excluded.query,
+                        tenant_id = excluded.tenant_id,
+                        priority = excluded.priority,
+                        subscribers = excluded.subscribers,
+                        status = excluded.status,
+                        webset_id = excluded.webset_id,
+                        polls = excluded.polls,
+                        next_poll_at = excluded.next_poll_at,
+                        result_ids = excluded.result_ids,
+                        error = excluded.error,
+                        remote_subscribers = CASE
+                            WHEN background_jobs.status IN ({placeholders})
+                            THEN background_jobs.remote_subscribers
+                        END,
+                        updated_at = excluded.updated_at
+                    WHERE background_jobs.owner IS NULL
+                        OR background_jobs.owner IS excluded.owner
+                        OR background_jobs.lease_until IS NULL
+                        OR background_jobs.lease_until < excluded.updated_at
+                    """,
+                    (
+                        record.key,
+                        record.query,
+                        record.tenant_id,
+                        record.priority,
+                        json.dumps(record.subscribers),
+                        record.status,
+                        record.webset_id,
+                        record.polls,
+                        record.next_poll_at.isoformat() if record.next_poll_at else None,
+                        json.dumps(record.result_ids),
+                        record.error,
+                        record.owner,
+                        record.updated_at.isoformat(),
+                        *ACTIVE_STATUSES,
+                    ),
+                )
+                conn.commit()
+                return cursor.rowcount > 0
+
+    def add_subscriber(self, key: str, session_id: str, owner: str) -> bool:
+        """
+        Subscribe a session to an active job leased by another worker.
+
+        One conditional UPDATE, so it is atomic across workers and needs
+        no lease.
+
+        Args:
+            key: Job key
+            session_id: Session to receive the job's results
+            owner: Worker ID of the caller (must not hold the lease)
+
+        Returns:
+            True if the session joined; False if no other live worker runs the job
+        """
+        now = datetime.now(timezone.utc)
+        placeholders = ",".join("?" * len(ACTIVE_STATUSES))
+        with self._lock:
+            with self._get_connection() as conn:
+                cursor = conn.execute(
+                    f"""
+                    UPDATE background_jobs SET remote_subscribers = (
+                        SELECT json_group_array(value) FROM (
+                            SELECT value FROM json_each(COALESCE(background_jobs.remote_subscribers, '[]'))
+                            UNION SELECT ?
+                        )
+                    )
+                    WHERE key = ? AND status IN ({placeholders})
+                        AND owner IS NOT NULL AND owner != ?
+                        AND lease_until IS NOT NULL AND lease_until > ?
+                    """,
+                    (session_id, key, *ACTIVE_STATUSES, owner, now.isoformat()),
+                )
+                conn.commit()
+                return cursor.rowcount == 1
+
+    def claim(self, key: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Take or renew the lease on an active job (atomic across workers).
+
+        Args:
+            key: Job key
+            owner: Worker ID
+            lease_seconds: Lease duration
+
+        Returns:
+            True if the caller now holds the lease
+        """
+        now = datetime.now(timezone.utc)
+        placeholders = ",".join("?" * len(ACTIVE_STATUSES))
+        with self._lock:
+            with self._get_connection() as conn:
+                cursor = conn.execute(
+                    f"""
+                    UPDATE background_jobs SET owner = ?, lease_until = ?
+                    WHERE key = ? AND status IN ({placeholders})
+                        AND (owner IS NULL OR owner = ? OR lease_until IS NULL OR lease_until < ?)
+                    """,
+                    (
+                        owner,
+                        (now + timedelta(seconds=lease_seconds)).isoformat(),
+                        key,
+                        *ACTIVE_STATUSES,
+                        owner,
+                        now.isoformat(),
+                    ),
+                )
+                conn.commit()
+                return cursor.rowcount == 1
+
+    def release(self, key: str, owner: str) -> None:
+        """
+        Drop a lease held by owner so another worker can resume the job.
+
+        Args:
+            key: Job key
+            owner: Worker ID
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                conn.execute(
+                    "UPDATE background_jobs SET owner = NULL, lease_until = NULL "
+                    "WHERE key = ? AND owner = ?",
+                    (key, owner),
+                )
+                conn.commit()
+
+    def get(self, key: str) -> JobRecord | None:
+        """
+        Get a job by key.
+
+        Args:
+            key: Job key
+
+        Returns:
+            JobRecord if found, None otherwise
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT * FROM background_jobs WHERE key = ?", (key,)
+                ).fetchone()
+                return self._row_to_record(row) if row else None
+
+    def list_active(self) -> list[JobRecord]:
+        """
+        List jobs that were queued or running.
+
+        Returns:
+            Active jobs, oldest first
+        """
+        placeholders = ",".join("?" * len(ACTIVE_STATUSES))
+        with self._lock:
+            with self._get_connection() as conn:
+                rows = conn.execute(
+                    f"SELECT * FROM background_jobs WHERE status IN ({placeholders}) "
+                    "ORDER BY updated_at",
+                    ACTIVE_STATUSES,
+                ).fetchall()
+                return [self._row_to_record(row) for row in rows]
+
+    def clear_finished(self, older_than_hours: int = DEFAULT_RETENTION_HOURS) -> int:
+        """
+        Remove finished jobs last updated before the retention window.
+
+        Args:
+            older_than_hours: Retention window in hours
+
+        Returns:
+            Number of jobs removed
+        """
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=older_than_hours)).isoformat()
+        placeholders = ",".join("?" * len(ACTIVE_STATUSES))
+        with self._lock:
+            with self._get_connection() as conn:
+                cursor = conn.execute(
+                    f"DELETE FROM background_jobs WHERE status NOT IN ({placeholders}) "
+                    "AND updated_at < ?",
+                    (*ACTIVE_STATUSES, cutoff),
+                )
+                conn.commit()
+                return cursor.rowcount
+
+
+# Type alias for store return type
+JobStoreType = JobStore | InMemoryJobStore
+
+
+# Global store instance
+_store: JobStoreType | None = None
+
+
+def get_job_store() -> JobStoreType:
+    """
+    Get the global job store instance.
+
+    Uses SQLite when DATABASE_URL is set, otherwise an in-memory store.
+    """
+    global _store
+    if _store is None:
+        if get_settings().has_database:
+            _store = JobStore()
+        else:
+            _store = InMemoryJobStore()
+    return _store
+
+
+def init_job_store(db_path: str | Path | None = None) -> JobStore:
+    """
+    Initialize the global job store with a SQLite database.
+
+    Args:
+        db_path: Custom path for the SQLite database
+
+    Returns:
+        The initialized store
+    """
+    global _store
+    _store = JobStore(db_path=db_path)
+    return _store
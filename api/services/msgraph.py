@@ -2,11 +2,16 @@
 Microsoft Graph Calendar integration for Outlook sync.
 
 Provides OAuth2 authentication via MSAL and calendar operations
-using the Microsoft Graph API.
+using the Microsoft Graph API. Bulk creates and deletes go through JSON
+$batch (20 requests per call); listing and delta sync stream pages by
+following @odata.nextLink.
 """
 
+import asyncio
 import logging
 import os
+import uuid
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from typing import Any
 
@@ -14,11 +19,34 @@ import httpx
 import msal
 from pydantic import BaseModel
 
+from api.services.credential_store import (
+    MICROSOFT_PROVIDER,
+    CredentialService,
+    StoredCredential,
+    get_credential_service,
+)
+
 logger = logging.getLogger(__name__)
 
 # Microsoft Graph API endpoints
 GRAPH_API_BASE = "https://graph.microsoft.com/v1.0"
 GRAPH_CALENDAR_ENDPOINT = f"{GRAPH_API_BASE}/me/calendar/events"
+GRAPH_CALENDAR_VIEW_DELTA_ENDPOINT = f"{GRAPH_API_BASE}/me/calendarView/delta"
+GRAPH_BATCH_ENDPOINT = f"{GRAPH_API_BASE}/$batch"
+
+# Paths inside a $batch are relative to the API version
+GRAPH_BATCH_EVENTS_PATH = "/me/calendar/events"
+
+# Graph accepts at most 20 requests per JSON batch
+GRAPH_BATCH_SIZE = 20
+
+# Events per page, requested with Prefer: odata.maxpagesize
+GRAPH_PAGE_SIZE = 100
+
+# Batch parts worth retrying (throttling and unavailability), with backoff
+GRAPH_RETRYABLE_STATUSES = frozenset({429, 503, 504})
+GRAPH_BATCH_MAX_ATTEMPTS = 3
+GRAPH_RETRY_DELAY_SECONDS = 1.0
 
 # Required scopes for calendar access
 CALENDAR_SCOPES = [
@@ -41,6 +69,14 @@ class OutlookEvent(BaseModel):
     time_zone: str = "UTC"
 
 
+class OutlookDeltaPage(BaseModel):
+    """One page of calendar changes from a delta query."""
+
+    events: list[OutlookEvent]
+    removed_ids: list[str]
+    delta_link: str | None = None  # Set on the final page; pass to the next sync
+
+
 class TokenInfo(BaseModel):
     """OAuth token information."""
 
@@ -328,49 +364,199 @@ class OutlookCalendarClient:
 
         return self._graph_to_event(created_data)
 
+    async def _send_batch(self, requests: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        """
+        Send up to GRAPH_BATCH_SIZE requests as one JSON $batch.
+
+        Throttled or unavailable parts are resent on their own, honoring
+        Retry-After; every other part is settled by the first response.
+        A resent request is identical to the first one, so POST creates must
+        carry a transactionId for Graph to recognise a create that already
+        landed (e.g. behind a 504).
+
+        Args:
+            requests: Batch requests, each with a unique "id"
+
+        Returns:
+            Request id -> part response ({"status", "headers", "body"})
+        """
+        client = await self._get_client()
+        results: dict[str, dict[str, Any]] = {}
+        pending = {request["id"]: request for request in requests}
+
+        for attempt in range(GRAPH_BATCH_MAX_ATTEMPTS):
+            response = await client.post(
+                GRAPH_BATCH_ENDPOINT, json={"requests": list(pending.values())}
+            )
+            if response.status_code == 401:
+                raise ValueError("Access token expired or invalid")
+            response.raise_for_status()
+
+            delay = GRAPH_RETRY_DELAY_SECONDS * 2**attempt
+            for part in response.json().get("responses", []):
+                part_id = str(part.get("id"))
+                if part_id not in pending:
+                    continue
+                results[part_id] = part
+                if part.get("status") in GRAPH_RETRYABLE_STATUSES:
+                    retry_after = (part.get("headers") or {}).get("Retry-After")
+                    if retry_after and retry_after.isdigit():
+                        delay = max(delay, float(retry_after))
+                else:
+                    del pending[part_id]
+
+            logger.debug(
+                "📦 [Graph] Batch sent | attempt=%d done=%d pending=%d",
+                attempt + 1,
+                len(requests) - len(pending),
+                len(pending),
+            )
+            if not pending or attempt == GRAPH_BATCH_MAX_ATTEMPTS - 1:
+                break
+            await asyncio.sleep(delay)
+
+        return results
+
     async def create_events(self, events: list[OutlookEvent]) -> list[OutlookEvent]:
         """
         Create multiple events in the user's Outlook calendar.
 
+        Events are sent through $batch, GRAPH_BATCH_SIZE per request.
+        Batches go out one at a time, since Outlook throttles concurrent
+        requests per mailbox. Each event gets a transactionId that stays
+        the same across resends, so Graph returns the existing event
+        instead of creating a duplicate.
+
         Args:
             events: List of events to create
 
         Returns:
-            List of created events with IDs populated
+            List of created events with IDs populated (failures are logged
+            and skipped), in input order
         """
         created = []
-        for event in events:
+        transaction = uuid.uuid4().hex
+        for offset in range(0, len(events), GRAPH_BATCH_SIZE):
+            chunk = events[offset : offset + GRAPH_BATCH_SIZE]
             try:
-                created_event = await self.create_event(event)
-                created.append(created_event)
-            except Exception as e:
-                logger.error("Failed to create event '%s': %s", event.title, e)
-
+                parts = await self._send_batch(
+                    [
+                        {
+                            "id": str(index),
+                            "method": "POST",
+                            "url": GRAPH_BATCH_EVENTS_PATH,
+                            "headers": {"Content-Type": "application/json"},
+                            "body": {
+                                **self._event_to_graph_format(event),
+                                "transactionId": f"{transaction}-{offset + index}",
+                            },
+                        }
+                        for index, event in enumerate(chunk)
+                    ]
+                )
+            except (httpx.HTTPError, ValueError) as e:
+                logger.error("Failed to create %d Outlook events: %s", len(chunk), e)
+                continue
+            for index, event in enumerate(chunk):
+                part = parts.get(str(index), {})
+                if part.get("status") == 201:
+                    created.append(self._graph_to_event(part["body"]))
+                else:
+                    logger.error(
+                        "Failed to create event '%s': %s %s",
+                        event.title,
+                        part.get("status"),
+                        (part.get("body") or {}).get("error", {}).get("message"),
+                    )
+
+        logger.info("Created %d/%d Outlook events", len(created), len(events))
         return created
 
-    async def list_events(
+    async def delete_events(self, event_ids: list[str]) -> dict[str, bool]:
+        """
+        Delete multiple events through $batch.
+
+        Args:
+            event_ids: Event IDs to delete
+
+        Returns:
+            Event ID -> True if deleted, False if not found or failed
+
+        Raises:
+            ValueError: If the access token is expired or invalid
+            httpx.HTTPStatusError: If a batch request fails
+        """
+        deleted: dict[str, bool] = {}
+        for offset in range(0, len(event_ids), GRAPH_BATCH_SIZE):
+            chunk = event_ids[offset : offset + GRAPH_BATCH_SIZE]
+            parts = await self._send_batch(
+                [
+                    {
+                        "id": str(index),
+                        "method": "DELETE",
+                        "url": f"{GRAPH_BATCH_EVENTS_PATH}/{event_id}",
+                    }
+                    for index, event_id in enumerate(chunk)
+                ]
+            )
+            for index, event_id in enumerate(chunk):
+                status = parts.get(str(index), {}).get("status")
+                deleted[event_id] = status == 204
+                if status not in (204, 404):
+                    logger.error("Failed to delete Outlook event %s: %s", event_id, status)
+
+        return deleted
+
+    async def _iter_pages(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        page_size: int,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream result pages, following @odata.nextLink.
+
+        Args:
+            url: First page URL
+            params: Query parameters for the first page (nextLink carries its own)
+            page_size: Preferred events per page
+
+        Yields:
+            Page JSON
+        """
+        client = await self._get_client()
+        headers = {"Prefer": f"odata.maxpagesize={page_size}"}
+        next_url: str | None = url
+
+        while next_url:
+            response = await client.get(next_url, params=params, headers=headers)
+            if response.status_code == 401:
+                raise ValueError("Access token expired or invalid")
+            response.raise_for_status()
+
+            page = response.json()
+            yield page
+            next_url = page.get("@odata.nextLink")
+            params = None
+
+    async def iter_events(
         self,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
-        limit: int = 50,
-    ) -> list[OutlookEvent]:
+        page_size: int = GRAPH_PAGE_SIZE,
+    ) -> AsyncIterator[OutlookEvent]:
         """
-        List events from the user's Outlook calendar.
+        Stream events from the user's Outlook calendar, page by page.
 
         Args:
             start_date: Filter events starting after this date
             end_date: Filter events ending before this date
-            limit: Maximum number of events to return
+            page_size: Preferred events per page
 
-        Returns:
-            List of calendar events
+        Yields:
+            Calendar events, ordered by start time
         """
-        client = await self._get_client()
-
-        params: dict[str, Any] = {
-            "$top": limit,
-            "$orderby": "start/dateTime",
-        }
+        params: dict[str, Any] = {"$orderby": "start/dateTime"}
 
         # Build filter for date range
         filters = []
@@ -384,19 +570,87 @@ class OutlookCalendarClient:
         if filters:
             params["$filter"] = " and ".join(filters)
 
-        response = await client.get(GRAPH_CALENDAR_ENDPOINT, params=params)
+        async for page in self._iter_pages(GRAPH_CALENDAR_ENDPOINT, params, page_size):
+            for item in page.get("value", []):
+                yield self._graph_to_event(item)
 
-        if response.status_code == 401:
-            raise ValueError("Access token expired or invalid")
+    async def list_events(
+        self,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        limit: int = 50,
+    ) -> list[OutlookEvent]:
+        """
+        List events from the user's Outlook calendar.
 
-        response.raise_for_status()
+        Args:
+            start_date: Filter events starting after this date
+            end_date: Filter events ending before this date
+            limit: Maximum number of events to return
 
-        data = response.json()
-        events = [self._graph_to_event(item) for item in data.get("value", [])]
+        Returns:
+            List of calendar events
+        """
+        events: list[OutlookEvent] = []
+        if limit <= 0:
+            return events
+
+        page_size = min(limit, GRAPH_PAGE_SIZE)
+        async for event in self.iter_events(start_date, end_date, page_size=page_size):
+            events.append(event)
+            if len(events) >= limit:
+                break
 
         logger.info("Retrieved %d Outlook events", len(events))
         return events
 
+    async def iter_event_changes(
+        self,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        delta_link: str | None = None,
+        page_size: int = GRAPH_PAGE_SIZE,
+    ) -> AsyncIterator[OutlookDeltaPage]:
+        """
+        Stream calendar changes with a calendarView delta query.
+
+        The first sync needs a date range and returns every event in it;
+        later syncs pass the previous delta_link and return only changes.
+
+        Args:
+            start_date: Range start (first sync only)
+            end_date: Range end (first sync only)
+            delta_link: delta_link from the previous sync's final page
+            page_size: Preferred events per page
+
+        Yields:
+            Pages of changed and removed events; the last carries delta_link
+        """
+        if delta_link:
+            url, params = delta_link, None
+        elif start_date and end_date:
+            url = GRAPH_CALENDAR_VIEW_DELTA_ENDPOINT
+            params = {
+                "startDateTime": start_date.isoformat(),
+                "endDateTime": end_date.isoformat(),
+            }
+        else:
+            raise ValueError("A delta sync needs a delta_link or a start and end date")
+
+        async for page in self._iter_pages(url, params, page_size):
+            events = []
+            removed_ids = []
+            for item in page.get("value", []):
+                if "@removed" in item:
+                    removed_ids.append(item["id"])
+                else:
+                    events.append(self._graph_to_event(item))
+            yield OutlookDeltaPage(
+                events=events,
+                removed_ids=removed_ids,
+                delta_link=page.get("@odata.deltaLink"),
+            )
+
     async def get_event(self, event_id: str) -> OutlookEvent | None:
         """
         Get a specific event by ID.
@@ -451,3 +705,72 @@ def get_msgraph_auth() -> MSGraphAuth:
 def get_outlook_client(access_token: str) -> OutlookCalendarClient:
     """Get an OutlookCalendarClient with the given access token."""
     return OutlookCalendarClient(access_token)
+
+
+def store_outlook_tokens(
+    user_id: str,
+    token: TokenInfo,
+    credentials: CredentialService | None = None,
+) -> None:
+    """
+    Persist a user's Microsoft tokens in the credential store.
+
+    Args:
+        user_id: User identifier
+        token: Tokens from exchange_code or refresh_token
+        credentials: Credential service (defaults to the global one)
+    """
+    (credentials or get_credential_service()).save(
+        StoredCredential(
+            provider=MICROSOFT_PROVIDER,
+            user_id=user_id,
+            access_token=token.access_token,
+            refresh_token=token.refresh_token,
+            expires_at=token.expires_at,
+            scopes=CALENDAR_SCOPES,
+        )
+    )
+
+
+async def refresh_outlook_credential(credential: StoredCredential) -> StoredCredential:
+    """Refresh a Microsoft credential via MSAL (credential store refresher)."""
+    # MSAL is synchronous; keep its token request off the event loop
+    token = await asyncio.to_thread(get_msgraph_auth().refresh_token, credential.refresh_token)
+    return credential.model_copy(
+        update={
+            "access_token": token.access_token,
+            # Microsoft may rotate the refresh token
+            "refresh_token": token.refresh_token or credential.refresh_token,
+            "expires_at": token.expires_at,
+        }
+    )
+
+
+def register_outlook_credentials(credentials: CredentialService | None = None) -> None:
+    """Register the Microsoft token refresher with the credential store."""
+    (credentials or get_credential_service()).register_refresher(
+        MICROSOFT_PROVIDER, refresh_outlook_credential
+    )
+
+
+async def get_outlook_client_for_user(
+    user_id: str,
+    credentials: CredentialService | None = None,
+) -> OutlookCalendarClient:
+    """
+    Get an OutlookCalendarClient using a user's stored tokens.
+
+    Args:
+        user_id: User identifier
+        credentials: Credential service (defaults to the global one)
+
+    Returns:
+        Client with a fresh access token
+
+    Raises:
+        ValueError: If the user has no usable Microsoft credentials
+    """
+    token = await (credentials or get_credential_service()).get_access_token(
+        MICROSOFT_PROVIDER, user_id
+    )
+    return OutlookCalendarClient(token)
@@ -0,0 +1,188 @@
+"""
+Compiled filter engine for stored result sets.
+
+Refinement criteria are compiled once into a single predicate that runs
+over a columnar view of a result set (pre-parsed epoch timestamps,
+lower-cased categories, free flags and search text). Filtering is then a
+single pass over the rows with numeric time comparisons, so timezone
+offsets in event dates are handled correctly.
+"""
+
+import math
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from api.models import EventResult
+from api.services.date_parsing import DEFAULT_TIMEZONE, parse_iso_datetime, to_aware
+
+# Words ignored when matching natural-language custom criteria
+_STOPWORDS = frozenset(
+    {
+        "a", "an", "and", "any", "are", "at", "be", "by", "events", "event",
+        "for", "from", "in", "is", "it", "just", "like", "me", "more", "of",
+        "on", "only", "or", "show", "something", "that", "the", "things",
+        "to", "with",
+    }
+)
+
+
+def parse_timestamp(value: str | None) -> float:
+    """
+    Parse an ISO 8601 datetime string into epoch seconds.
+
+    Naive values are interpreted in DEFAULT_TIMEZONE.
+
+    Returns:
+        Epoch seconds, or NaN if the value is missing or unparseable
+    """
+    if not value:
+        return math.nan
+    parsed = parse_iso_datetime(value)
+    if parsed is None:
+        return math.nan
+    return to_aware(parsed, DEFAULT_TIMEZONE).timestamp()
+
+
+@dataclass(frozen=True)
+class ResultColumns:
+    """Columnar, pre-parsed view of a list of events."""
+
+    timestamps: tuple[float, ...]
+    categories: tuple[str, ...]
+    is_free: tuple[bool, ...]
+    text: tuple[str, ...]
+
+    @classmethod
+    def from_events(cls, events: list[EventResult]) -> "ResultColumns":
+        """Build columns from events (parses each date exactly once)."""
+        return cls(
+            timestamps=tuple(parse_timestamp(e.date) for e in events),
+            categories=tuple(e.category.lower() for e in events),
+            is_free=tuple(e.is_free for e in events),
+            text=tuple(
+                f"{e.title} {e.description} {e.location}".lower() for e in events
+            ),
+        )
+
+    def __len__(self) -> int:
+        """Return number of rows."""
+        return len(self.timestamps)
+
+
+Predicate = Callable[[ResultColumns, int], bool]
+
+
+@lru_cache(maxsize=256)
+def keyword_matcher(criteria: str) -> re.Pattern[str] | None:
+    """
+    Compile natural-language criteria into a keyword regex (cached).
+
+    Stopwords are dropped; a row matches if any remaining keyword appears
+    as a whole word in its title, description or location.
+
+    Returns:
+        Compiled pattern, or None if the criteria has no usable keywords
+    """
+    words = re.findall(r"[\w'-]+", criteria.lower())
+    keywords = sorted({w for w in words if w not in _STOPWORDS and len(w) > 1})
+    if not keywords:
+        return None
+    alternation = "|".join(re.escape(k) for k in keywords)
+    return re.compile(rf"\b(?:{alternation})\b")
+
+
+@dataclass(frozen=True)
+class CompiledFilter:
+    """A compiled refinement: one predicate plus its explanation."""
+
+    predicate: Predicate
+    explanations: tuple[str, ...]
+
+    def indices(self, columns: ResultColumns) -> list[int]:
+        """Return indices of matching rows (single pass)."""
+        predicate = self.predicate
+        return [i for i in range(len(columns)) if predicate(columns, i)]
+
+    def apply(
+        self,
+        events: list[EventResult],
+        columns: ResultColumns | None = None,
+    ) -> list[EventResult]:
+        """
+        Filter events, preserving order.
+
+        Args:
+            events: Events to filter
+            columns: Pre-built columns for these events (built if omitted)
+
+        Returns:
+            Matching events
+        """
+        if columns is None:
+            columns = ResultColumns.from_events(events)
+        return [events[i] for i in self.indices(columns)]
+
+
+def compile_filter(
+    *,
+    free_only: bool | None = None,
+    categories: list[str] | None = None,
+    after_time: str | None = None,
+    before_time: str | None = None,
+    custom_criteria: str | None = None,
+) -> CompiledFilter:
+    """
+    Compile refinement criteria into a single predicate.
+
+    Args:
+        free_only: Keep only free events
+        categories: Keep only these categories (case-insensitive)
+        after_time: Keep events starting at or after this ISO datetime
+        before_time: Keep events starting at or before this ISO datetime
+        custom_criteria: Natural-language criteria matched by keyword
+
+    Returns:
+        CompiledFilter ready to run over ResultColumns
+    """
+    clauses: list[Predicate] = []
+    explanations: list[str] = []
+
+    if free_only:
+        clauses.append(lambda cols, i: cols.is_free[i])
+        explanations.append("free events only")
+
+    if categories:
+        category_set = frozenset(c.lower() for c in categories)
+        clauses.append(lambda cols, i: cols.categories[i] in category_set)
+        explanations.append(f"categories: {', '.join(categories)}")
+
+    if after_time:
+        after_ts = parse_timestamp(after_time)
+        if not math.isnan(after_ts):
+            clauses.append(lambda cols, i: cols.timestamps[i] >= after_ts)
+            explanations.append(f"after {after_time}")
+
+    if before_time:
+        before_ts = parse_timestamp(before_time)
+        if not math.isnan(before_ts):
+            clauses.append(lambda cols, i: cols.timestamps[i] <= before_ts)
+            explanations.append(f"before {before_time}")
+
+    if custom_criteria:
+        pattern = keyword_matcher(custom_criteria)
+        if pattern is not None:
+            search = pattern.search
+            clauses.append(lambda cols, i: search(cols.text[i]) is not None)
+            explanations.append(f'matching "{custom_criteria}"')
+
+    if not clauses:
+        predicate: Predicate = lambda cols, i: True  # noqa: E731
+    elif len(clauses) == 1:
+        predicate = clauses[0]
+    else:
+        frozen_clauses = tuple(clauses)
+        predicate = lambda cols, i: all(c(cols, i) for c in frozen_clauses)  # noqa: E731
+
+    return CompiledFilter(predicate=predicate, explanations=tuple(explanations))
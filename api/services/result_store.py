@@ -0,0 +1,268 @@
+"""
+Server-side result set store for orchestrator tools.
+
+Search results are stored under a short handle (e.g. "rs-3f9a1c2b") that
+is returned to the model alongside the events. Refinement, pagination and
+similarity tools accept the handle instead of a full event payload, so the
+model never has to re-emit events as tool arguments.
+
+Result sets are held in memory with a TTL and an LRU bound on the number
+of sets kept. The store is process-local and shared by every chat, so a
+set can be scoped to the session that created it; lookups from another
+session then miss, as if the handle did not exist.
+"""
+
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+
+from api.models import EventResult
+from api.services.result_filter import ResultColumns
+
+logger = logging.getLogger(__name__)
+
+# Default TTL: 1 hour (long enough for a discovery conversation)
+DEFAULT_TTL_SECONDS = 60 * 60
+
+# Maximum number of result sets kept before LRU eviction
+DEFAULT_MAX_SETS = 1000
+
+# Number of events shown per page (search, refine and display)
+DEFAULT_PAGE_SIZE = 15
+
+# Largest page a caller (e.g. the model via page_results) may request
+MAX_PAGE_SIZE = 50
+
+
+def clamp_page_limit(limit: int) -> int:
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE."""
+    return min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+@dataclass
+class ResultSet:
+    """A stored, ordered set of events addressable by handle."""
+
+    handle: str
+    events: list[EventResult]
+    source: str = ""
+    parent_handle: str | None = None
+    session_id: str | None = None  # Owning session; None = unscoped
+    created_at: float = field(default_factory=time.monotonic)
+
+    def get_event(self, event_id: str) -> EventResult | None:
+        """Find an event in this set by ID."""
+        for event in self.events:
+            if event.id == event_id:
+                return event
+        return None
+
+    @property
+    def event_ids(self) -> set[str]:
+        """IDs of all events in this set."""
+        return {event.id for event in self.events}
+
+    @cached_property
+    def columns(self) -> ResultColumns:
+        """Columnar view used by the filter engine (built once per set)."""
+        return ResultColumns.from_events(self.events)
+
+
+class ResultStore:
+    """
+    In-memory store of result sets keyed by short handles.
+
+    Thread-safe for concurrent access.
+
+    Usage:
+        store = ResultStore()
+        handle = store.put(events, source="eventbrite+exa")
+        result_set = store.get(handle)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_sets: int = DEFAULT_MAX_SETS,
+    ):
+        """
+        Initialize the result store.
+
+        Args:
+            ttl_seconds: Time-to-live for result sets in seconds
+            max_sets: Maximum number of result sets kept (LRU eviction)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_sets = max_sets
+        self._lock = threading.Lock()
+        self._sets: OrderedDict[str, ResultSet] = OrderedDict()
+
+    def _is_expired(self, result_set: ResultSet) -> bool:
+        """Check if a result set has expired."""
+        return time.monotonic() - result_set.created_at > self.ttl_seconds
+
+    def _new_handle(self) -> str:
+        """Generate a short handle that is not in use."""
+        while True:
+            handle = f"rs-{secrets.token_hex(4)}"
+            if handle not in self._sets:
+                return handle
+
+    def put(
+        self,
+        events: list[EventResult],
+        source: str = "",
+        parent_handle: str | None = None,
+        session_id: str | None = None,
+    ) -> str:
+        """
+        Store a result set and return its handle.
+
+        Args:
+            events: Ordered events to store
+            source: Source attribution (e.g. "eventbrite+exa")
+            parent_handle: Handle of the set this one was derived from
+            session_id: Session the set belongs to (None = unscoped)
+
+        Returns:
+            Short handle for the stored set
+        """
+        with self._lock:
+            handle = self._new_handle()
+            self._sets[handle] = ResultSet(
+                handle=handle,
+                events=list(events),
+                source=source,
+                parent_handle=parent_handle,
+                session_id=session_id,
+            )
+            while len(self._sets) > self.max_sets:
+                evicted, _ = self._sets.popitem(last=False)
+                logger.debug("🗑️ [ResultStore] Evicted | handle=%s", evicted)
+
+        logger.debug(
+            "💾 [ResultStore] Stored | handle=%s events=%d parent=%s",
+            handle,
+            len(events),
+            parent_handle,
+        )
+        return handle
+
+    def get(self, handle: str, session_id: str | None = None) -> ResultSet | None:
+        """
+        Get a result set by handle.
+
+        Args:
+            handle: Handle returned by put()
+            session_id: Session asking; must match a scoped set's owner
+
+        Returns:
+            ResultSet if found, not expired and visible to the session,
+            None otherwise
+        """
+        with self._lock:
+            result_set = self._sets.get(handle)
+            if result_set is None:
+                return None
+            if self._is_expired(result_set):
+                del self._sets[handle]
+                return None
+            if result_set.session_id is not None and result_set.session_id != session_id:
+                logger.warning(
+                    "⚠️ [ResultStore] Handle from another session | handle=%s", handle
+                )
+                return None
+            self._sets.move_to_end(handle)
+            return result_set
+
+    def claim(self, handle: str, session_id: str | None) -> bool:
+        """
+        Scope an unscoped result set to a session.
+
+        Used when a set is created by code that does not know the session
+        (e.g. the shared search pipeline).
+
+        Args:
+            handle: Handle of the result set
+            session_id: Session taking ownership (None leaves the set unscoped)
+
+        Returns:
+            True if the set now belongs to (or is visible to) the session
+        """
+        with self._lock:
+            result_set = self._sets.get(handle)
+            if result_set is None:
+                return False
+            if result_set.session_id is None:
+                result_set.session_id = session_id
+            return result_set.session_id == session_id
+
+    def page(
+        self,
+        handle: str,
+        offset: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+        session_id: str | None = None,
+    ) -> list[EventResult] | None:
+        """
+        Get a slice of a result set.
+
+        Args:
+            handle: Handle of the result set
+            offset: Index of the first event to return
+            limit: Maximum number of events to return (clamped to 1..MAX_PAGE_SIZE)
+            session_id: Session asking (see get())
+
+        Returns:
+            Events in the page, or None if the handle is unknown/expired
+        """
+        result_set = self.get(handle, session_id)
+        if result_set is None:
+            return None
+        offset = max(offset, 0)
+        return result_set.events[offset : offset + clamp_page_limit(limit)]
+
+    def clear_expired(self) -> int:
+        """
+        Remove all expired result sets.
+
+        Returns:
+            Number of result sets removed
+        """
+        with self._lock:
+            expired = [h for h, rs in self._sets.items() if self._is_expired(rs)]
+            for handle in expired:
+                del self._sets[handle]
+            return len(expired)
+
+    def clear_all(self) -> int:
+        """
+        Remove all result sets.
+
+        Returns:
+            Number of result sets removed
+        """
+        with self._lock:
+            count = len(self._sets)
+            self._sets.clear()
+            return count
+
+    def __len__(self) -> int:
+        """Return number of stored result sets."""
+        return len(self._sets)
+
+
+# Global store instance
+_store: ResultStore | None = None
+
+
+def get_result_store() -> ResultStore:
+    """Get the singleton result store."""
+    global _store
+    if _store is None:
+        _store = ResultStore()
+    return _store
@@ -3,34 +3,48 @@ Session management for multi-turn conversation persistence.
 
 Supports both SQLite-based persistence (when DATABASE_URL is set) and
 in-memory sessions (graceful fallback when no database is configured).
+
+Persistent sessions come from a long-lived SQLiteSessionStore (pooled
+WAL connections, hot-session LRU, write-behind batching) rather than a
+new SQLiteSession per request. When REDIS_URL is set, sessions live in
+the shared state backend so every worker sees the same history.
 """
 
+import json
 import logging
+from dataclasses import asdict
 from pathlib import Path
 from typing import Any, Union
 
-from agents import SQLiteSession
-
 from api.config import get_settings
+from api.services.session_compaction import CompactingSession
+from api.services.session_memory import BoundedSessionStorage, SessionStorageMetrics
+from api.services.session_store import PooledSQLiteSession, SQLiteSessionStore
+from api.services.state_backend import StateBackend, get_state_backend
 
 logger = logging.getLogger(__name__)
 
 # Default database path (relative to api root)
 DEFAULT_DB_PATH = Path(__file__).parent.parent / "conversations.db"
 
+# Backend sessions expire after this long without writes (7 days)
+BACKEND_SESSION_TTL_SECONDS = 7 * 24 * 60 * 60
+
 
 class InMemorySession:
     """
     In-memory session implementation for non-persisted mode.
 
-    Implements the same interface as SQLiteSession but stores data
+    Implements the same interface as PooledSQLiteSession but stores data
     in memory only. Data is lost when the process restarts.
 
-    This is the fallback when no database is configured.
+    This is the fallback when no database is configured. Storage is
+    shared across instances and bounded (idle eviction, per-session item
+    cap and a total memory cap) so it does not grow without limit.
     """
 
     # Class-level storage shared across all instances
-    _storage: dict[str, list[Any]] = {}
+    _storage: BoundedSessionStorage = BoundedSessionStorage()
 
     def __init__(self, session_id: str):
         """
@@ -40,41 +54,99 @@ class InMemorySession:
             session_id: Unique identifier for the session
         """
         self.session_id = session_id
-        if session_id not in self._storage:
-            self._storage[session_id] = []
 
     async def get_items(self, limit: int | None = None) -> list[Any]:
         """Retrieve conversation history for this session."""
-        items = self._storage.get(self.session_id, [])
-        if limit is not None:
-            return items[-limit:]
-        return items.copy()
+        return self._storage.get(self.session_id, limit)
 
     async def add_items(self, items: list[Any]) -> None:
         """Add new items to the conversation history."""
-        if self.session_id not in self._storage:
-            self._storage[self.session_id] = []
-        self._storage[self.session_id].extend(items)
+        if items:
+            self._storage.extend(self.session_id, items)
 
     async def pop_item(self) -> Any | None:
         """Remove and return the most recent item."""
-        items = self._storage.get(self.session_id, [])
-        if items:
-            return items.pop()
-        return None
+        return self._storage.pop(self.session_id)
 
     async def clear_session(self) -> None:
         """Clear all items for this session."""
-        self._storage[self.session_id] = []
+        self._storage.clear(self.session_id)
+
+    @classmethod
+    def configure(
+        cls,
+        idle_timeout_seconds: float,
+        max_items_per_session: int,
+        max_total_bytes: int,
+    ) -> None:
+        """Set the bounds of the shared storage (existing sessions are kept)."""
+        cls._storage.idle_timeout_seconds = idle_timeout_seconds
+        cls._storage.max_items_per_session = max_items_per_session
+        cls._storage.max_total_bytes = max_total_bytes
+
+    @classmethod
+    def metrics(cls) -> SessionStorageMetrics:
+        """Get counters for the shared storage."""
+        return cls._storage.metrics()
 
     @classmethod
     def clear_all(cls) -> None:
         """Clear all sessions (useful for testing)."""
-        cls._storage.clear()
+        cls._storage.clear_all()
+
+
+class BackendSession:
+    """
+    Session stored in the shared state backend.
+
+    History is a list of JSON items under "session:<id>", so any worker
+    can continue a conversation started on another.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        backend: StateBackend,
+        ttl_seconds: int = BACKEND_SESSION_TTL_SECONDS,
+    ):
+        """
+        Initialize a backend session.
+
+        Args:
+            session_id: Unique identifier for the session
+            backend: Shared state backend
+            ttl_seconds: Expiry refreshed on every write
+        """
+        self.session_id = session_id
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._key = f"session:{session_id}"
+
+    async def get_items(self, limit: int | None = None) -> list[Any]:
+        """Retrieve conversation history for this session."""
+        items = [json.loads(v) for v in await self.backend.list_get(self._key)]
+        if limit is not None:
+            return items[-limit:] if limit > 0 else []
+        return items
+
+    async def add_items(self, items: list[Any]) -> None:
+        """Add new items to the conversation history."""
+        await self.backend.list_append(
+            self._key, [json.dumps(item) for item in items], ttl_seconds=self.ttl_seconds
+        )
+
+    async def pop_item(self) -> Any | None:
+        """Remove and return the most recent item."""
+        value = await self.backend.list_pop(self._key)
+        return json.loads(value) if value is not None else None
+
+    async def clear_session(self) -> None:
+        """Clear all items for this session."""
+        await self.backend.delete(self._key)
 
 
 # Type alias for session return type
-Session = Union[SQLiteSession, InMemorySession]
+Session = Union[PooledSQLiteSession, InMemorySession, BackendSession, CompactingSession]
 
 
 class SessionManager:
@@ -91,15 +163,29 @@ class SessionManager:
         await manager.clear_session("user-123")
     """
 
-    def __init__(self, db_path: Union[str, Path, None] = None, use_persistence: bool | None = None):
+    def __init__(
+        self,
+        db_path: Union[str, Path, None] = None,
+        use_persistence: bool | None = None,
+        token_budget: int | None = None,
+        backend: StateBackend | None = None,
+    ):
         """
         Initialize the session manager.
 
         Args:
             db_path: Path to SQLite database file. Defaults to api/conversations.db
             use_persistence: Override persistence setting. If None, checks DATABASE_URL config.
+            token_budget: History token budget for compaction. If None, uses
+                SESSION_TOKEN_BUDGET config. 0 disables compaction.
+            backend: Shared state backend for sessions. If None and
+                use_persistence is None, used when REDIS_URL is set.
         """
         settings = get_settings()
+        self.token_budget = (
+            settings.session_token_budget if token_budget is None else token_budget
+        )
+        self.keep_recent_turns = settings.session_keep_recent_turns
 
         if use_persistence is None:
             self._use_persistence = settings.has_database
@@ -107,8 +193,24 @@ class SessionManager:
             self._use_persistence = use_persistence
 
         self.db_path = str(db_path or DEFAULT_DB_PATH)
-
-        if self._use_persistence:
+        self._store: SQLiteSessionStore | None = None
+
+        if backend is None and settings.has_redis and use_persistence is None:
+            backend = get_state_backend()
+        self._backend: StateBackend | None = backend
+
+        if self._backend is None and self._use_persistence:
+            self._store = SQLiteSessionStore(self.db_path)
+        elif self._backend is None:
+            InMemorySession.configure(
+                idle_timeout_seconds=settings.memory_session_idle_timeout,
+                max_items_per_session=settings.memory_session_max_items,
+                max_total_bytes=settings.memory_session_max_bytes,
+            )
+
+        if self._backend is not None:
+            logger.info("Session manager initialized with shared state backend")
+        elif self._use_persistence:
             logger.info("Session manager initialized with SQLite persistence: %s", self.db_path)
         else:
             logger.info("Session manager initialized in non-persisted (in-memory) mode")
@@ -116,13 +218,16 @@ class SessionManager:
     @property
     def is_persistent(self) -> bool:
         """Check if sessions are being persisted to database."""
-        return self._use_persistence
+        return self._use_persistence or self._backend is not None
 
     def get_session(self, session_id: str) -> Session:
         """
         Get or create a session for the given ID.
 
-        Returns SQLiteSession if database is configured, otherwise InMemorySession.
+        Returns a BackendSession if REDIS_URL is configured, a pooled SQLite
+        session if database is configured, otherwise InMemorySession.
+        When a token budget is set, the session is wrapped in a CompactingSession
+        so the model sees a compacted window while the full transcript is kept.
 
         Args:
             session_id: Unique identifier for the session (e.g., user ID, device ID)
@@ -130,9 +235,21 @@ class SessionManager:
         Returns:
             Session instance for use with agents
         """
-        if self._use_persistence:
-            return SQLiteSession(session_id, self.db_path)
-        return InMemorySession(session_id)
+        session: Session
+        if self._backend is not None:
+            session = BackendSession(session_id, self._backend)
+        elif self._store is not None:
+            session = self._store.get_session(session_id)
+        else:
+            session = InMemorySession(session_id)
+
+        if self.token_budget > 0:
+            return CompactingSession(
+                session,
+                token_budget=self.token_budget,
+                keep_recent_turns=self.keep_recent_turns,
+            )
+        return session
 
     async def clear_session(self, session_id: str) -> None:
         """
@@ -146,6 +263,29 @@ class SessionManager:
         session = self.get_session(session_id)
         await session.clear_session()
 
+    def metrics(self) -> dict[str, Any]:
+        """
+        Get session storage metrics.
+
+        Returns:
+            Dict with the backend name and, for in-memory mode, storage counters
+        """
+        if self._backend is not None:
+            return {"backend": "redis"}
+        if self._store is not None:
+            return {"backend": "sqlite", "hot_sessions": len(self._store)}
+        return {"backend": "memory", **asdict(InMemorySession.metrics())}
+
+    async def flush(self) -> None:
+        """Write any buffered session items to the database."""
+        if self._store is not None:
+            await self._store.flush_all()
+
+    async def close(self) -> None:
+        """Flush buffered items and release pooled connections."""
+        if self._store is not None:
+            await self._store.close()
+
 
 # Global session manager instance
 _session_manager: Union[SessionManager, None] = None
@@ -0,0 +1,240 @@
+"""
+Conversation history compaction for long discovery sessions.
+
+The underlying session (SQLite or in-memory) keeps the full transcript.
+CompactingSession wraps it and hands the model a windowed view:
+
+1. Tool outputs older than the most recent turns are replaced with compact
+   references (result handle, counts and a few titles) instead of whole
+   SearchResult payloads.
+2. The oldest whole turns are dropped until the view fits a token budget.
+
+Turns are dropped whole (from one user message up to the next), so
+function calls and their outputs always stay paired.
+"""
+
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Approximate token budget for history sent to the model
+DEFAULT_TOKEN_BUDGET = 12_000
+
+# Tool outputs from this many most recent user turns are kept verbatim
+DEFAULT_KEEP_RECENT_TURNS = 2
+
+# Rough characters-per-token ratio used for budgeting
+CHARS_PER_TOKEN = 4
+
+# Titles kept in a compacted result reference
+COMPACT_TITLE_COUNT = 5
+
+# Non-event tool outputs longer than this are truncated when compacted
+MAX_COMPACT_OUTPUT_CHARS = 500
+
+
+def estimate_tokens(item: Any) -> int:
+    """Estimate the token count of a history item."""
+    try:
+        text = json.dumps(item, default=str)
+    except (TypeError, ValueError):
+        text = str(item)
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def is_user_message(item: Any) -> bool:
+    """Check if an item is a user message (a turn boundary)."""
+    if not isinstance(item, dict) or item.get("role") != "user":
+        return False
+    return item.get("type", "message") == "message"
+
+
+def compact_tool_output(output: Any) -> str:
+    """
+    Replace a tool output with a compact reference.
+
+    Event result payloads become their handle, counts and first few titles.
+    Other outputs are truncated.
+
+    Args:
+        output: The original tool output (usually a JSON string)
+
+    Returns:
+        Compact string suitable for a function_call_output item
+    """
+    text = output if isinstance(output, str) else json.dumps(output, default=str)
+
+    try:
+        data = json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        data = None
+
+    if isinstance(data, dict) and isinstance(data.get("events"), list):
+        events = data["events"]
+        compact: dict[str, Any] = {"compacted": True}
+        for key in ("result_handle", "source", "total_count", "filtered_count"):
+            if data.get(key) is not None:
+                compact[key] = data[key]
+        compact["event_count"] = len(events)
+        compact["titles"] = [
+            str(event.get("title", ""))[:60]
+            for event in events[:COMPACT_TITLE_COUNT]
+            if isinstance(event, dict)
+        ]
+        if "result_handle" in compact:
+            compact["note"] = "Older result set; pass result_handle to tools to use it."
+        return json.dumps(compact)
+
+    if len(text) > MAX_COMPACT_OUTPUT_CHARS:
+        return text[:MAX_COMPACT_OUTPUT_CHARS] + "...[compacted]"
+    return text
+
+
+def compact_items(
+    items: list[Any],
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    keep_recent_turns: int = DEFAULT_KEEP_RECENT_TURNS,
+) -> list[Any]:
+    """
+    Build a compacted view of conversation history.
+
+    Args:
+        items: Full history, oldest first
+        token_budget: Approximate token cap for the returned view
+        keep_recent_turns: Number of recent turns whose tool outputs stay verbatim
+
+    Returns:
+        New list of items (input items are not mutated)
+    """
+    if not items:
+        return []
+
+    turn_starts = [i for i, item in enumerate(items) if is_user_message(item)]
+    if not turn_starts or turn_starts[0] != 0:
+        turn_starts.insert(0, 0)
+
+    # Everything before this index is old enough to compact
+    if keep_recent_turns <= 0:
+        keep_from = len(items)
+    elif len(turn_starts) >= keep_recent_turns:
+        keep_from = turn_starts[-keep_recent_turns]
+    else:
+        keep_from = 0
+
+    compacted: list[Any] = []
+    for i, item in enumerate(items):
+        if (
+            i < keep_from
+            and isinstance(item, dict)
+            and item.get("type") == "function_call_output"
+        ):
+            item = {**item, "output": compact_tool_output(item.get("output", ""))}
+        compacted.append(item)
+
+    # Drop whole turns from the front until within budget (keep the last turn)
+    sizes = [estimate_tokens(item) for item in compacted]
+    total = sum(sizes)
+    start = 0
+    turn_index = 0
+    while total > token_budget and turn_index < len(turn_starts) - 1:
+        next_start = turn_starts[turn_index + 1]
+        total -= sum(sizes[start:next_start])
+        start = next_start
+        turn_index += 1
+
+    if start > 0:
+        logger.debug(
+            "✂️ [Session] Compacted history | items=%d kept=%d tokens≈%d",
+            len(items),
+            len(compacted) - start,
+            total,
+        )
+
+    return compacted[start:]
+
+
+def tail_items(items: list[Any], limit: int) -> list[Any]:
+    """
+    Take at most the last `limit` items without orphaning tool outputs.
+
+    A function_call_output whose function_call falls before the window is
+    dropped, since the model rejects outputs for calls it hasn't seen.
+
+    Args:
+        items: History, oldest first
+        limit: Maximum items returned
+
+    Returns:
+        The window (possibly shorter than limit)
+    """
+    if limit <= 0:
+        return []
+    window = items[-limit:]
+    call_ids = {
+        item.get("call_id")
+        for item in window
+        if isinstance(item, dict) and item.get("type") == "function_call"
+    }
+    return [
+        item
+        for item in window
+        if not (
+            isinstance(item, dict)
+            and item.get("type") == "function_call_output"
+            and item.get("call_id") not in call_ids
+        )
+    ]
+
+
+class CompactingSession:
+    """
+    Session wrapper that returns a compacted, budgeted view of history.
+
+    Writes go straight to the wrapped session, which keeps the full
+    transcript. Reads return the compacted window sent to the model.
+    """
+
+    def __init__(
+        self,
+        inner: Any,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        keep_recent_turns: int = DEFAULT_KEEP_RECENT_TURNS,
+    ):
+        """
+        Initialize the compacting session.
+
+        Args:
+            inner: Session holding the full transcript (pooled SQLite or InMemorySession)
+            token_budget: Approximate token cap for history sent to the model
+            keep_recent_turns: Number of recent turns whose tool outputs stay verbatim
+        """
+        self.session_id = inner.session_id
+        self.inner = inner
+        self.token_budget = token_budget
+        self.keep_recent_turns = keep_recent_turns
+
+    async def get_items(self, limit: int | None = None) -> list[Any]:
+        """Retrieve the compacted conversation history."""
+        items = await self.inner.get_items()
+        view = compact_items(items, self.token_budget, self.keep_recent_turns)
+        if limit is not None:
+            return tail_items(view, limit)
+        return view
+
+    async def get_full_transcript(self) -> list[Any]:
+        """Retrieve the full, uncompacted conversation history."""
+        return await self.inner.get_items()
+
+    async def add_items(self, items: list[Any]) -> None:
+        """Add new items to the full transcript."""
+        await self.inner.add_items(items)
+
+    async def pop_item(self) -> Any | None:
+        """Remove and return the most recent item."""
+        return await self.inner.pop_item()
+
+    async def clear_session(self) -> None:
+        """Clear all items for this session."""
+        await self.inner.clear_session()
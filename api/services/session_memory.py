@@ -0,0 +1,278 @@
+"""
+Bounded in-memory storage for non-persisted sessions.
+
+Backs InMemorySession when no database is configured. Unlike a plain
+dict, storage is bounded so anonymous traffic cannot grow it forever:
+
+- Sessions idle longer than a timeout are evicted
+- Each session keeps at most a fixed number of items (oldest whole
+  turns are dropped first, so tool calls stay paired with outputs)
+- Total approximate memory is capped; least recently used sessions are
+  evicted to stay under it
+- Counters are exposed via metrics() for monitoring
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from api.services.session_compaction import is_user_message
+
+logger = logging.getLogger(__name__)
+
+# Sessions untouched for this long are evicted (1 hour)
+DEFAULT_IDLE_TIMEOUT_SECONDS = 60 * 60
+
+# Maximum history items kept per session
+DEFAULT_MAX_ITEMS_PER_SESSION = 200
+
+# Approximate cap on total stored bytes (64 MB)
+DEFAULT_MAX_TOTAL_BYTES = 64 * 1024 * 1024
+
+# Minimum seconds between idle sweeps triggered by writes
+IDLE_SWEEP_INTERVAL_SECONDS = 60
+
+
+def estimate_item_bytes(item: Any) -> int:
+    """Estimate the memory footprint of a history item."""
+    try:
+        return len(json.dumps(item, default=str))
+    except (TypeError, ValueError):
+        return len(str(item))
+
+
+@dataclass
+class _SessionEntry:
+    """Items and accounting for one session."""
+
+    items: list[Any] = field(default_factory=list)
+    sizes: list[int] = field(default_factory=list)
+    total_bytes: int = 0
+    last_access: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class SessionStorageMetrics:
+    """Snapshot of in-memory session storage counters."""
+
+    sessions: int
+    items: int
+    total_bytes: int
+    max_total_bytes: int
+    idle_evictions: int
+    memory_evictions: int
+    trimmed_items: int
+
+
+class BoundedSessionStorage:
+    """
+    Bounded, evicting store of per-session history lists.
+
+    Thread-safe for concurrent access.
+
+    Usage:
+        storage = BoundedSessionStorage(idle_timeout_seconds=600)
+        storage.extend("user-123", [item])
+        items = storage.get("user-123")
+    """
+
+    def __init__(
+        self,
+        idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+        max_items_per_session: int = DEFAULT_MAX_ITEMS_PER_SESSION,
+        max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+    ):
+        """
+        Initialize the storage.
+
+        Args:
+            idle_timeout_seconds: Evict sessions idle longer than this
+            max_items_per_session: Maximum items kept per session
+            max_total_bytes: Approximate cap on total stored bytes
+        """
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.max_items_per_session = max_items_per_session
+        self.max_total_bytes = max_total_bytes
+        self._lock = threading.Lock()
+        self._sessions: OrderedDict[str, _SessionEntry] = OrderedDict()
+        self._total_bytes = 0
+        self._idle_evictions = 0
+        self._memory_evictions = 0
+        self._trimmed_items = 0
+        self._last_sweep = time.monotonic()
+
+    def _touch(self, session_id: str) -> _SessionEntry | None:
+        """Get an entry and mark it most recently used (lock held)."""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.last_access > self.idle_timeout_seconds:
+            self._remove(session_id)
+            self._idle_evictions += 1
+            return None
+        entry.last_access = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return entry
+
+    def _remove(self, session_id: str) -> None:
+        """Remove a session and release its bytes (lock held)."""
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self._total_bytes -= entry.total_bytes
+
+    def _trim(self, entry: _SessionEntry) -> None:
+        """Drop oldest whole turns until within the item cap (lock held)."""
+        excess = len(entry.items) - self.max_items_per_session
+        if excess <= 0:
+            return
+
+        # Advance the cut to the next turn boundary so pairs stay intact
+        cut = excess
+        while cut < len(entry.items) and not is_user_message(entry.items[cut]):
+            cut += 1
+
+        keep = list(range(cut, len(entry.items)))
+        if cut == len(entry.items):
+            # No turn boundary left (one long tool loop): cut at the cap and
+            # drop outputs whose function_call was cut with it
+            call_ids = {
+                item.get("call_id")
+                for item in entry.items[excess:]
+                if isinstance(item, dict) and item.get("type") == "function_call"
+            }
+            keep = [
+                i
+                for i in range(excess, len(entry.items))
+                if not (
+                    isinstance(entry.items[i], dict)
+                    and entry.items[i].get("type") == "function_call_output"
+                    and entry.items[i].get("call_id") not in call_ids
+                )
+            ]
+
+        released = entry.total_bytes - sum(entry.sizes[i] for i in keep)
+        self._trimmed_items += len(entry.items) - len(keep)
+        entry.items = [entry.items[i] for i in keep]
+        entry.sizes = [entry.sizes[i] for i in keep]
+        entry.total_bytes -= released
+        self._total_bytes -= released
+
+    def _evict_idle_locked(self) -> int:
+        """Evict sessions idle longer than the timeout (lock held)."""
+        now = time.monotonic()
+        self._last_sweep = now
+        cutoff = now - self.idle_timeout_seconds
+        idle = [sid for sid, e in self._sessions.items() if e.last_access < cutoff]
+        for session_id in idle:
+            self._remove(session_id)
+        self._idle_evictions += len(idle)
+        return len(idle)
+
+    def _evict_for_memory(self) -> None:
+        """Evict least recently used sessions until under the byte cap (lock held)."""
+        # The session just written is most recent, so it is evicted last
+        while self._total_bytes > self.max_total_bytes and len(self._sessions) > 1:
+            oldest = next(iter(self._sessions))
+            self._remove(oldest)
+            self._memory_evictions += 1
+            logger.debug("🗑️ [MemorySession] Evicted for memory | session=%s", oldest)
+
+    def get(self, session_id: str, limit: int | None = None) -> list[Any]:
+        """
+        Get a copy of a session's items.
+
+        Args:
+            session_id: Session identifier
+            limit: Return only the most recent N items
+
+        Returns:
+            List of items (empty if unknown or evicted)
+        """
+        with self._lock:
+            entry = self._touch(session_id)
+            if entry is None:
+                return []
+            if limit is not None:
+                return entry.items[-limit:] if limit > 0 else []
+            return entry.items.copy()
+
+    def extend(self, session_id: str, items: list[Any]) -> None:
+        """
+        Append items to a session, enforcing item and memory bounds.
+
+        Args:
+            session_id: Session identifier
+            items: Items to append
+        """
+        sizes = [estimate_item_bytes(item) for item in items]
+        with self._lock:
+            entry = self._touch(session_id)
+            if entry is None:
+                if time.monotonic() - self._last_sweep > IDLE_SWEEP_INTERVAL_SECONDS:
+                    self._evict_idle_locked()
+                entry = _SessionEntry()
+                self._sessions[session_id] = entry
+            entry.items.extend(items)
+            entry.sizes.extend(sizes)
+            added = sum(sizes)
+            entry.total_bytes += added
+            self._total_bytes += added
+            self._trim(entry)
+            self._evict_for_memory()
+
+    def pop(self, session_id: str) -> Any | None:
+        """Remove and return a session's most recent item."""
+        with self._lock:
+            entry = self._touch(session_id)
+            if entry is None or not entry.items:
+                return None
+            size = entry.sizes.pop()
+            entry.total_bytes -= size
+            self._total_bytes -= size
+            return entry.items.pop()
+
+    def clear(self, session_id: str) -> None:
+        """Remove a session."""
+        with self._lock:
+            self._remove(session_id)
+
+    def clear_all(self) -> None:
+        """Remove all sessions."""
+        with self._lock:
+            self._sessions.clear()
+            self._total_bytes = 0
+
+    def evict_idle(self) -> int:
+        """
+        Evict all sessions idle longer than the timeout.
+
+        Returns:
+            Number of sessions evicted
+        """
+        with self._lock:
+            return self._evict_idle_locked()
+
+    def metrics(self) -> SessionStorageMetrics:
+        """Get a snapshot of storage counters."""
+        with self._lock:
+            return SessionStorageMetrics(
+                sessions=len(self._sessions),
+                items=sum(len(e.items) for e in self._sessions.values()),
+                total_bytes=self._total_bytes,
+                max_total_bytes=self.max_total_bytes,
+                idle_evictions=self._idle_evictions,
+                memory_evictions=self._memory_evictions,
+                trimmed_items=self._trimmed_items,
+            )
+
+    def __contains__(self, session_id: object) -> bool:
+        """Check if a session is stored (without touching it)."""
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        """Return number of stored sessions."""
+        return len(self._sessions)
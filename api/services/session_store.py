@@ -0,0 +1,520 @@
+"""
+Pooled, long-lived SQLite session storage.
+
+Replaces constructing a new SQLiteSession (new connection + schema check)
+on every chat request with a process-wide store that:
+
+- Opens a small pool of WAL-mode connections once and reuses them
+- Initializes the schema once per store
+- Keeps an LRU of hot session objects whose history is loaded once and
+  revalidated against the database on access
+- Buffers add_items() writes and flushes them in batches (write-behind)
+
+Hot history is checked against a cheap per-session version (row count and
+newest row ID) before it is served, so writes from another worker sharing
+the database are picked up instead of served stale. A session with
+buffered items trusts its cache until they are flushed; two workers
+writing the same session within one flush interval is not supported.
+
+An evicted session that still has buffered items, or is still held by a
+running request, stays reachable (dirty map / weak references) until it
+is flushed and released, so a later lookup never builds a second object
+over stale history.
+
+Uses the same agent_sessions / agent_messages tables as the agents SDK's
+SQLiteSession, so existing conversations.db files keep working.
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Table names shared with agents.SQLiteSession
+SESSIONS_TABLE = "agent_sessions"
+MESSAGES_TABLE = "agent_messages"
+
+# Connection pool size
+DEFAULT_POOL_SIZE = 4
+
+# Hot session objects kept in memory before LRU eviction
+DEFAULT_MAX_HOT_SESSIONS = 256
+
+# Write-behind: flush after this many seconds or this many buffered items
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_FLUSH_BATCH_SIZE = 20
+
+# Milliseconds SQLite waits on a locked database before failing
+BUSY_TIMEOUT_MS = 5000
+
+# Per-session version: (stored row count, newest row ID). Row IDs are
+# AUTOINCREMENT and never reused, so any append, pop or clear changes it.
+HistoryVersion = tuple[int, int | None]
+
+
+class SQLiteConnectionPool:
+    """
+    Fixed-size pool of SQLite connections in WAL mode.
+
+    Connections are created lazily up to the pool size and handed out one
+    caller at a time. Thread-safe.
+    """
+
+    def __init__(self, db_path: str, size: int = DEFAULT_POOL_SIZE):
+        """
+        Initialize the pool.
+
+        Args:
+            db_path: Path to the SQLite database file
+            size: Maximum number of open connections
+        """
+        self.db_path = db_path
+        self.size = size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._all: list[sqlite3.Connection] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, returning it to the pool afterwards."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                conn = self._connect()
+                with self._lock:
+                    self._all.append(conn)
+            else:
+                conn = self._idle.get()
+
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close all connections."""
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+            self._created = 0
+        self._idle = queue.LifoQueue()
+
+
+class PooledSQLiteSession:
+    """
+    Session backed by a shared SQLiteSessionStore.
+
+    History is loaded from the database once and then served from memory
+    while its version still matches the database. New items are buffered
+    and written by the store in batches.
+    """
+
+    def __init__(self, session_id: str, store: "SQLiteSessionStore"):
+        """
+        Initialize the session.
+
+        Args:
+            session_id: Unique identifier for the session
+            store: Store that owns the connection pool
+        """
+        self.session_id = session_id
+        self._store = store
+        self._items: list[Any] | None = None
+        # Database version the cached history matches (None: unknown)
+        self._version: HistoryVersion | None = None
+        self._pending: list[Any] = []
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def has_pending(self) -> bool:
+        """Check if there are buffered items not yet written."""
+        return bool(self._pending)
+
+    async def _ensure_loaded(self) -> list[Any]:
+        """Load history on first access, reloading it if another writer changed it."""
+        if self._items is not None and not self._pending:
+            version = await asyncio.to_thread(self._store._read_version, self.session_id)
+            # Items buffered while we waited keep the cache authoritative
+            if version != self._version and not self._pending:
+                logger.debug("🔄 [SessionStore] Stale history reloaded | session=%s", self.session_id)
+                self._items = None
+        if self._items is None:
+            loaded, version = await asyncio.to_thread(self._store._load_snapshot, self.session_id)
+            # Another coroutine may have loaded while we waited
+            if self._items is None:
+                self._items = loaded
+                self._version = version
+        return self._items
+
+    def _track_write(self, before: HistoryVersion, after: HistoryVersion) -> None:
+        """Advance the cached version past our own write, unless another writer got there first."""
+        self._version = after if before == self._version else None
+
+    async def get_items(self, limit: int | None = None) -> list[Any]:
+        """Retrieve conversation history for this session."""
+        items = await self._ensure_loaded()
+        if limit is not None:
+            return items[-limit:] if limit > 0 else []
+        return items.copy()
+
+    async def add_items(self, items: list[Any]) -> None:
+        """Add new items (buffered; written by the store's flusher)."""
+        if not items:
+            return
+        history = await self._ensure_loaded()
+        history.extend(items)
+        self._pending.extend(items)
+        self._store._schedule_flush(self)
+
+    async def pop_item(self) -> Any | None:
+        """Remove and return the most recent item."""
+        history = await self._ensure_loaded()
+        if not history:
+            return None
+        item = history.pop()
+        if self._pending:
+            self._pending.pop()
+        else:
+            async with self._flush_lock:
+                versions = await asyncio.to_thread(self._store._delete_last, self.session_id)
+                self._track_write(*versions)
+        return item
+
+    async def clear_session(self) -> None:
+        """Clear all items for this session."""
+        self._items = []
+        self._pending = []
+        async with self._flush_lock:
+            await asyncio.to_thread(self._store._delete_session, self.session_id)
+            self._version = (0, None)
+
+    async def flush(self) -> int:
+        """
+        Write buffered items to the database.
+
+        Returns:
+            Number of items written
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, []
+            try:
+                versions = await asyncio.to_thread(self._store._write_items, self.session_id, batch)
+            except Exception:
+                # Keep the batch so a later flush can retry it
+                self._pending = batch + self._pending
+                raise
+            self._track_write(*versions)
+            return len(batch)
+
+
+class SQLiteSessionStore:
+    """
+    Process-wide SQLite session store with pooling, LRU and write-behind.
+
+    Usage:
+        store = SQLiteSessionStore("conversations.db")
+        session = store.get_session("user-123")
+        await session.add_items([...])
+        await store.flush_all()  # e.g. on shutdown
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_hot_sessions: int = DEFAULT_MAX_HOT_SESSIONS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        flush_batch_size: int = DEFAULT_FLUSH_BATCH_SIZE,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: Path to the SQLite database file
+            pool_size: Number of pooled connections
+            max_hot_sessions: Session objects kept in memory (LRU)
+            flush_interval: Seconds to buffer writes before flushing
+            flush_batch_size: Buffered items that trigger an immediate flush
+        """
+        self.db_path = str(db_path)
+        self.max_hot_sessions = max_hot_sessions
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self._pool = SQLiteConnectionPool(self.db_path, size=pool_size)
+        self._sessions: OrderedDict[str, PooledSQLiteSession] = OrderedDict()
+        # Sessions with buffered items, held until flushed (even if evicted)
+        self._dirty: dict[str, PooledSQLiteSession] = {}
+        # Evicted sessions still referenced elsewhere (e.g. an in-flight request)
+        self._evicted: weakref.WeakValueDictionary[str, PooledSQLiteSession] = (
+            weakref.WeakValueDictionary()
+        )
+        self._flush_task: asyncio.Task[None] | None = None
+        self._flush_tasks: set[asyncio.Task[int]] = set()
+        self._init_db()
+        logger.info("Session store initialized: %s (pool=%d)", self.db_path, pool_size)
+
+    def _init_db(self) -> None:
+        """Initialize the database schema (once per store)."""
+        with self._pool.connection() as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {SESSIONS_TABLE} (
+                    session_id TEXT PRIMARY KEY,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {MESSAGES_TABLE} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    message_data TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (session_id) REFERENCES {SESSIONS_TABLE} (session_id)
+                        ON DELETE CASCADE
+                )
+            """)
+            conn.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{MESSAGES_TABLE}_session_id
+                ON {MESSAGES_TABLE} (session_id, id)
+            """)
+            conn.commit()
+
+    # ------------------------------------------------------------------
+    # Session objects
+    # ------------------------------------------------------------------
+
+    def get_session(self, session_id: str) -> PooledSQLiteSession:
+        """
+        Get the hot session object for an ID, creating it if needed.
+
+        Args:
+            session_id: Unique identifier for the session
+
+        Returns:
+            PooledSQLiteSession shared by all requests for this ID
+        """
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+            return session
+
+        # An evicted object still pending or in use is the live one; reuse it
+        session = self._dirty.get(session_id) or self._evicted.pop(session_id, None)
+        if session is None:
+            session = PooledSQLiteSession(session_id, self)
+        self._sessions[session_id] = session
+        while len(self._sessions) > self.max_hot_sessions:
+            evicted_id, evicted = self._sessions.popitem(last=False)
+            self._evicted[evicted_id] = evicted
+            if evicted.has_pending:
+                # Persist through the locked async path; _dirty keeps it alive
+                self._dirty[evicted_id] = evicted
+                self._start_flush(evicted)
+            logger.debug(
+                "🗑️ [SessionStore] Evicted | session=%s pending=%d",
+                evicted_id,
+                len(evicted._pending),
+            )
+        return session
+
+    def _start_flush(self, session: PooledSQLiteSession) -> None:
+        """Flush one session in a background task (reference kept until done)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called outside the loop: it stays dirty for the next flush_all
+            return
+        task = loop.create_task(self._flush_session(session))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush_session(self, session: PooledSQLiteSession) -> int:
+        """Flush one session, keeping it dirty if the write fails."""
+        try:
+            written = await session.flush()
+        except Exception as e:
+            self._dirty[session.session_id] = session
+            logger.error("Failed to flush session %s: %s", session.session_id, e)
+            return 0
+        if not session.has_pending and self._dirty.get(session.session_id) is session:
+            del self._dirty[session.session_id]
+        return written
+
+    def _schedule_flush(self, session: PooledSQLiteSession) -> None:
+        """Mark a session dirty and make sure a flush is scheduled."""
+        self._dirty[session.session_id] = session
+
+        if len(session._pending) >= self.flush_batch_size:
+            self._start_flush(session)
+            return
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._delayed_flush()
+            )
+
+    async def _delayed_flush(self) -> None:
+        """Flush all dirty sessions after the write-behind interval."""
+        await asyncio.sleep(self.flush_interval)
+        await self.flush_all()
+
+    async def flush_all(self) -> int:
+        """
+        Flush buffered items for every dirty session.
+
+        Returns:
+            Number of items written
+        """
+        dirty, self._dirty = self._dirty, {}
+        written = 0
+        for session in dirty.values():
+            written += await self._flush_session(session)
+        if written:
+            logger.debug(
+                "💾 [SessionStore] Flushed | sessions=%d items=%d",
+                len(dirty),
+                written,
+            )
+        return written
+
+    async def close(self) -> None:
+        """Flush all pending writes and close pooled connections."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        self._dirty.update({s.session_id: s for s in self._sessions.values() if s.has_pending})
+        await self.flush_all()
+        self._sessions.clear()
+        self._evicted.clear()
+        self._pool.close()
+
+    def __len__(self) -> int:
+        """Return number of hot session objects."""
+        return len(self._sessions)
+
+    # ------------------------------------------------------------------
+    # Database operations (run in worker threads)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _version_of(conn: sqlite3.Connection, session_id: str) -> HistoryVersion:
+        """Read a session's history version on an open connection."""
+        count, newest = conn.execute(
+            f"SELECT COUNT(*), MAX(id) FROM {MESSAGES_TABLE} WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        return count, newest
+
+    def _read_version(self, session_id: str) -> HistoryVersion:
+        """Read a session's history version (index-only query)."""
+        with self._pool.connection() as conn:
+            return self._version_of(conn, session_id)
+
+    def _load_snapshot(self, session_id: str) -> tuple[list[Any], HistoryVersion]:
+        """Load all items for a session, oldest first, with their version."""
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT id, message_data FROM {MESSAGES_TABLE} WHERE session_id = ? ORDER BY id ASC",
+                (session_id,),
+            ).fetchall()
+
+        items: list[Any] = []
+        for _, message_data in rows:
+            try:
+                items.append(json.loads(message_data))
+            except json.JSONDecodeError:
+                continue
+        return items, (len(rows), rows[-1][0] if rows else None)
+
+    def _load_items(self, session_id: str) -> list[Any]:
+        """Load all items for a session, oldest first."""
+        return self._load_snapshot(session_id)[0]
+
+    def _write_items(
+        self, session_id: str, items: list[Any]
+    ) -> tuple[HistoryVersion, HistoryVersion]:
+        """
+        Append items for a session in a single transaction.
+
+        Returns:
+            The session's version before and after the write
+        """
+        with self._pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            before = self._version_of(conn, session_id)
+            conn.execute(
+                f"INSERT OR IGNORE INTO {SESSIONS_TABLE} (session_id) VALUES (?)",
+                (session_id,),
+            )
+            conn.executemany(
+                f"INSERT INTO {MESSAGES_TABLE} (session_id, message_data) VALUES (?, ?)",
+                [(session_id, json.dumps(item)) for item in items],
+            )
+            conn.execute(
+                f"UPDATE {SESSIONS_TABLE} SET updated_at = CURRENT_TIMESTAMP WHERE session_id = ?",
+                (session_id,),
+            )
+            after = self._version_of(conn, session_id)
+            conn.commit()
+        return before, after
+
+    def _delete_last(self, session_id: str) -> tuple[HistoryVersion, HistoryVersion]:
+        """
+        Delete the most recent stored item for a session.
+
+        Returns:
+            The session's version before and after the delete
+        """
+        with self._pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            before = self._version_of(conn, session_id)
+            conn.execute(
+                f"""
+                DELETE FROM {MESSAGES_TABLE} WHERE id = (
+                    SELECT MAX(id) FROM {MESSAGES_TABLE} WHERE session_id = ?
+                )
+                """,
+                (session_id,),
+            )
+            after = self._version_of(conn, session_id)
+            conn.commit()
+        return before, after
+
+    def _delete_session(self, session_id: str) -> None:
+        """Delete all stored items for a session."""
+        with self._pool.connection() as conn:
+            conn.execute(f"DELETE FROM {MESSAGES_TABLE} WHERE session_id = ?", (session_id,))
+            conn.execute(f"DELETE FROM {SESSIONS_TABLE} WHERE session_id = ?", (session_id,))
+            conn.commit()
@@ -3,89 +3,549 @@ SSE Connection Manager for pushing events to active sessions.
 
 Tracks active streaming connections so background tasks can push
 events (like 'more_events' from Websets) to specific sessions.
+
+Also keeps a per-session ring buffer of recent frames, each tagged with
+an SSE event ID, so a client that drops mid-stream can reconnect with
+Last-Event-ID and replay what it missed.
+
+With a distributed state backend (REDIS_URL), connections are also
+recorded in shared per-session keys (with a TTL the owning worker keeps
+refreshing, so a crashed worker's entries expire) and pushes for
+sessions connected to another worker are published on a channel that
+every worker listens to.
 """
 
 import asyncio
+import json
 import logging
+import uuid
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
+from enum import Enum
+
+from api.config import get_settings
+from api.services.state_backend import StateBackend, get_state_backend
 
 logger = logging.getLogger(__name__)
 
+# Prefix of the shared per-session hash holding the owning worker_id
+CONNECTIONS_KEY = "sse:connections"
+
+# TTL of a shared connection entry, and how often open connections refresh it
+CONNECTION_TTL_SECONDS = 90
+CONNECTION_REFRESH_SECONDS = 30
+
+# Backoff after the fan-out listener fails (doubles up to the max)
+LISTEN_RETRY_SECONDS = 1.0
+LISTEN_RETRY_MAX_SECONDS = 30.0
+
+# Channel carrying pushes for sessions connected to another worker
+EVENTS_CHANNEL = "sse:events"
+
+# Default number of undelivered events buffered per connection
+DEFAULT_QUEUE_SIZE = 100
+
+# Frames retained per session for Last-Event-ID replay
+DEFAULT_REPLAY_SIZE = 1024
+
+# Sessions whose replay buffers are retained (LRU)
+DEFAULT_MAX_REPLAY_SESSIONS = 1000
+
+
+class OverflowPolicy(str, Enum):
+    """What to do when a connection's queue is full."""
+
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued event
+    COALESCE = "coalesce"  # Replace a queued event of the same type, else drop oldest
+    DISCONNECT = "disconnect"  # Close the slow connection
+
+
+class QueueClosed(Exception):
+    """Raised by BoundedEventQueue.get() once the queue is closed."""
+
+
+class BoundedEventQueue:
+    """
+    Bounded, non-blocking event queue for a single SSE consumer.
+
+    put_nowait() never waits; when the queue is full the overflow policy
+    decides which event is discarded.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize: Maximum buffered events
+            policy: Overflow policy when full
+        """
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._buffer: deque[dict] = deque()
+        self._ready = asyncio.Event()
+
+    def put_nowait(self, event: dict) -> bool:
+        """
+        Enqueue an event without waiting.
+
+        Returns:
+            False if the queue is closed or was full under the DISCONNECT
+            policy (the event is not enqueued), True otherwise
+        """
+        if self.closed:
+            return False
+        if len(self._buffer) >= self.maxsize:
+            if self.policy == OverflowPolicy.DISCONNECT:
+                self.dropped += 1
+                return False
+            if self.policy == OverflowPolicy.COALESCE and self._coalesce(event):
+                return True
+            self._buffer.popleft()
+            self.dropped += 1
+        self._buffer.append(event)
+        self._ready.set()
+        return True
+
+    def _coalesce(self, event: dict) -> bool:
+        """Replace the newest queued event of the same type (latest wins)."""
+        event_type = event.get("type")
+        for i in range(len(self._buffer) - 1, -1, -1):
+            if self._buffer[i].get("type") == event_type:
+                self._buffer[i] = event
+                self.dropped += 1
+                return True
+        return False
+
+    def get_nowait(self) -> dict:
+        """Dequeue an event, raising asyncio.QueueEmpty if none."""
+        if not self._buffer:
+            raise asyncio.QueueEmpty
+        event = self._buffer.popleft()
+        if not self._buffer:
+            self._ready.clear()
+        return event
+
+    async def get(self) -> dict:
+        """
+        Wait for and dequeue the next event.
+
+        Raises:
+            QueueClosed: If the queue is closed (pending events are discarded)
+        """
+        while not self._buffer:
+            if self.closed:
+                raise QueueClosed
+            await self._ready.wait()
+        if self.closed:
+            raise QueueClosed
+        return self.get_nowait()
+
+    def close(self) -> None:
+        """Discard buffered events and wake the consumer with QueueClosed."""
+        self.closed = True
+        self._buffer.clear()
+        self._ready.set()
+
+    def qsize(self) -> int:
+        """Number of buffered events."""
+        return len(self._buffer)
+
+    def empty(self) -> bool:
+        """Check if no events are buffered."""
+        return not self._buffer
+
+
+class ReplayBuffer:
+    """
+    Ring buffer of recent SSE frames for one session's stream.
+
+    Event IDs are "<stream_id>:<seq>", so an ID from an earlier stream
+    for the same session is recognised and replay starts from the top.
+    """
+
+    def __init__(self, session_id: str, maxlen: int = DEFAULT_REPLAY_SIZE):
+        """
+        Initialize the buffer.
+
+        Args:
+            session_id: Session the stream belongs to
+            maxlen: Maximum frames retained
+        """
+        self.session_id = session_id
+        self.stream_id = uuid.uuid4().hex[:8]
+        self.closed = False
+        self.producer: asyncio.Task[None] | None = None
+        self._frames: deque[tuple[int, str]] = deque(maxlen=maxlen)
+        self._seq = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest frame."""
+        return self._seq
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained frame (last_seq + 1 if none)."""
+        return self._frames[0][0] if self._frames else self._seq + 1
+
+    def _notify(self) -> None:
+        """Wake every waiter (each waits on the event current at the time)."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def append(self, frame: str) -> str:
+        """
+        Tag a frame with the next event ID and retain it.
+
+        Args:
+            frame: Formatted SSE frame ending in a blank line
+
+        Returns:
+            The frame with its "id:" line
+        """
+        self._seq += 1
+        framed = f"id: {self.stream_id}:{self._seq}\n{frame}"
+        self._frames.append((self._seq, framed))
+        self._notify()
+        return framed
+
+    def close(self) -> None:
+        """Mark the stream finished."""
+        self.closed = True
+        self._notify()
+
+    def resume_position(self, last_event_id: str | None) -> int:
+        """
+        Convert a Last-Event-ID into a sequence number to replay after.
+
+        Returns:
+            Sequence number, or 0 to replay everything retained
+        """
+        if not last_event_id:
+            return 0
+        stream_id, _, seq = last_event_id.partition(":")
+        if stream_id != self.stream_id or not seq.isdigit():
+            return 0
+        return int(seq)
+
+    def frames_after(self, seq: int) -> list[tuple[int, str]]:
+        """Retained frames with a sequence number above seq."""
+        return [(n, frame) for n, frame in self._frames if n > seq]
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait for a new frame or close.
+
+        Returns:
+            True if woken, False on timeout
+        """
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
 
 @dataclass
 class SSEConnection:
     """Represents an active SSE connection."""
 
     session_id: str
-    queue: asyncio.Queue[dict] = field(default_factory=asyncio.Queue)
+    queue: BoundedEventQueue = field(default_factory=BoundedEventQueue)
     active: bool = True
 
 
 class SSEConnectionManager:
-    """Manages active SSE connections for pushing background events."""
+    """
+    Manages active SSE connections for pushing background events.
 
-    def __init__(self) -> None:
+    Lookups and pushes are lock-free: connection state only changes
+    between awaits on the event loop, and pushes use put_nowait on a
+    bounded per-connection queue, so a slow consumer never blocks pushes
+    to other sessions.
+    """
+
+    def __init__(
+        self,
+        backend: StateBackend | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> None:
         self._connections: dict[str, SSEConnection] = {}
-        self._lock = asyncio.Lock()
+        self._backend = backend
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.worker_id = uuid.uuid4().hex[:12]
+        self._listener: asyncio.Task[None] | None = None
+        self._refresher: asyncio.Task[None] | None = None
+        self._replays: OrderedDict[str, ReplayBuffer] = OrderedDict()
 
-    async def register(self, session_id: str) -> SSEConnection:
-        """Register a new SSE connection for a session."""
-        async with self._lock:
-            # Close existing connection if any
-            if session_id in self._connections:
-                old_conn = self._connections[session_id]
-                old_conn.active = False
-
-            conn = SSEConnection(session_id=session_id)
-            self._connections[session_id] = conn
+    @property
+    def distributed(self) -> bool:
+        """Check if pushes fan out across workers."""
+        return self._backend is not None and self._backend.distributed
+
+    async def start(self) -> None:
+        """Start listening for pushes published by other workers."""
+        if self.distributed and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+            self._refresher = asyncio.create_task(self._refresh_connections())
+
+    async def stop(self) -> None:
+        """Stop the fan-out listener and any running stream producers."""
+        for buffer in self._replays.values():
+            if buffer.producer is not None and not buffer.producer.done():
+                buffer.producer.cancel()
+        for task in (self._listener, self._refresher):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._listener = None
+        self._refresher = None
+
+    async def _listen(self) -> None:
+        """
+        Deliver published pushes to sessions connected to this worker.
+
+        The subscription reconnects on its own; if subscribing fails
+        outright, retry with backoff rather than letting the task die.
+        """
+        assert self._backend is not None
+        delay = LISTEN_RETRY_SECONDS
+        while True:
+            try:
+                async for message in self._backend.subscribe(EVENTS_CHANNEL):
+                    delay = LISTEN_RETRY_SECONDS
+                    self._deliver_published(message)
+            except Exception as e:
+                logger.warning("SSE fan-out listener failed, retrying | error=%s", e)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, LISTEN_RETRY_MAX_SECONDS)
+
+    def _deliver_published(self, message: str) -> None:
+        """Deliver one fan-out message if its session is connected here."""
+        try:
+            payload = json.loads(message)
+            session_id = payload["session_id"]
+            event = payload["event"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            logger.warning("Ignoring malformed SSE fan-out message")
+            return
+        if self._push_local(session_id, event):
             logger.debug(
-                "🔌 [SSE] Connection registered | session=%s",
+                "📥 [SSE] Fan-out delivered | session=%s type=%s",
                 session_id,
+                event.get("type", "unknown"),
             )
-            return conn
-
-    async def unregister(self, session_id: str) -> None:
-        """Unregister an SSE connection."""
-        async with self._lock:
-            if session_id in self._connections:
-                self._connections[session_id].active = False
-                del self._connections[session_id]
-                logger.debug(
-                    "🔌 [SSE] Connection unregistered | session=%s",
-                    session_id,
-                )
+
+    @staticmethod
+    def _connection_key(session_id: str) -> str:
+        return f"{CONNECTIONS_KEY}:{session_id}"
+
+    async def _claim_shared(self, session_id: str) -> None:
+        """Record this worker as the session's owner, resetting the TTL."""
+        assert self._backend is not None
+        await self._backend.hash_set(
+            self._connection_key(session_id),
+            {"worker": self.worker_id},
+            ttl_seconds=CONNECTION_TTL_SECONDS,
+        )
+
+    async def _release_shared(self, session_id: str) -> None:
+        """Clear the session's shared entry if this worker still owns it."""
+        assert self._backend is not None
+        key = self._connection_key(session_id)
+        if await self._backend.hash_get(key, "worker") == self.worker_id:
+            await self._backend.delete(key)
+
+    async def _shared_owner(self, session_id: str) -> str | None:
+        """Worker holding the session's connection, if any."""
+        assert self._backend is not None
+        return await self._backend.hash_get(self._connection_key(session_id), "worker")
+
+    async def _refresh_connections(self) -> None:
+        """Keep shared entries of open connections from expiring."""
+        while True:
+            await asyncio.sleep(CONNECTION_REFRESH_SECONDS)
+            for session_id in list(self._connections):
+                try:
+                    owner = await self._shared_owner(session_id)
+                    # Another worker took over the session; leave its entry alone
+                    if owner is None or owner == self.worker_id:
+                        await self._claim_shared(session_id)
+                except Exception as e:
+                    logger.warning(
+                        "SSE connection refresh failed | session=%s error=%s", session_id, e
+                    )
+
+    async def register(self, session_id: str) -> SSEConnection:
+        """Register a new SSE connection for a session."""
+        # Close existing connection if any
+        old_conn = self._connections.get(session_id)
+        if old_conn is not None:
+            old_conn.active = False
+
+        conn = SSEConnection(
+            session_id=session_id,
+            queue=BoundedEventQueue(self.queue_size, self.overflow_policy),
+        )
+        self._connections[session_id] = conn
+        logger.debug(
+            "🔌 [SSE] Connection registered | session=%s",
+            session_id,
+        )
+
+        if self.distributed:
+            await self._claim_shared(session_id)
+        return conn
+
+    async def unregister(self, session_id: str, conn: SSEConnection | None = None) -> None:
+        """Unregister an SSE connection.
+
+        Args:
+            session_id: The session to unregister
+            conn: Only unregister if this is still the current connection
+                (so a finished stream does not drop a newer reconnect)
+        """
+        current = self._connections.get(session_id)
+        if current is None or (conn is not None and current is not conn):
+            return
+        current.active = False
+        del self._connections[session_id]
+        logger.debug(
+            "🔌 [SSE] Connection unregistered | session=%s",
+            session_id,
+        )
+
+        if self.distributed:
+            await self._release_shared(session_id)
+
+    def _push_local(self, session_id: str, event: dict) -> bool:
+        """Push an event to a connection held by this worker (never waits)."""
+        conn = self._connections.get(session_id)
+        if conn is None or not conn.active:
+            return False
+        if conn.queue.put_nowait(event):
+            return True
+
+        # Overflow under the DISCONNECT policy: drop the slow consumer
+        logger.warning(
+            "⚠️ [SSE] Queue full, disconnecting | session=%s size=%d",
+            session_id,
+            conn.queue.maxsize,
+        )
+        conn.active = False
+        conn.queue.close()
+        if self._connections.get(session_id) is conn:
+            del self._connections[session_id]
+        return False
 
     async def push_event(self, session_id: str, event: dict) -> bool:
         """Push an event to a session's queue.
 
+        Delivers locally when the session is connected to this worker,
+        otherwise publishes it for the worker that holds the connection.
+
         Args:
             session_id: The session to push to
             event: Event dict with 'type' and other fields
 
         Returns:
-            True if event was pushed, False if session not found
+            True if event was pushed (or published), False if the session
+            is not connected or its connection was dropped on overflow
         """
-        async with self._lock:
-            conn = self._connections.get(session_id)
-            if conn and conn.active:
-                await conn.queue.put(event)
+        if session_id in self._connections:
+            if self._push_local(session_id, event):
                 logger.debug(
                     "📤 [SSE] Event pushed | session=%s type=%s",
                     session_id,
                     event.get("type", "unknown"),
                 )
                 return True
+            # Disconnected under the DISCONNECT policy: the event is lost,
+            # and no other worker should be sent pushes for this stream
+            if self.distributed:
+                await self._release_shared(session_id)
             return False
 
+        if self.distributed:
+            assert self._backend is not None
+            if await self._shared_owner(session_id) is None:
+                return False
+            await self._backend.publish(
+                EVENTS_CHANNEL, json.dumps({"session_id": session_id, "event": event})
+            )
+            logger.debug(
+                "📡 [SSE] Event published | session=%s type=%s",
+                session_id,
+                event.get("type", "unknown"),
+            )
+            return True
+
+        return False
+
+    async def open_replay(self, session_id: str) -> ReplayBuffer:
+        """
+        Start a new replay buffer for a session's stream.
+
+        A turn still streaming for the session is cancelled first, so two
+        turns never run against the same session at once.
+
+        Args:
+            session_id: Session starting a new turn
+
+        Returns:
+            The new buffer
+        """
+        previous = self._replays.get(session_id)
+        if previous is not None and previous.producer is not None and not previous.producer.done():
+            previous.producer.cancel()
+            try:
+                await previous.producer
+            except asyncio.CancelledError:
+                pass
+            logger.debug("🛑 [SSE] Superseded stream cancelled | session=%s", session_id)
+
+        buffer = ReplayBuffer(session_id)
+        self._replays[session_id] = buffer
+        self._replays.move_to_end(session_id)
+        while len(self._replays) > DEFAULT_MAX_REPLAY_SESSIONS:
+            self._replays.popitem(last=False)
+        return buffer
+
+    def get_replay(self, session_id: str) -> ReplayBuffer | None:
+        """Get the most recent replay buffer for a session."""
+        return self._replays.get(session_id)
+
     def get_connection(self, session_id: str) -> SSEConnection | None:
         """Get a connection by session ID."""
         return self._connections.get(session_id)
 
     def has_connection(self, session_id: str) -> bool:
-        """Check if a session has an active connection."""
+        """Check if a session has an active connection on this worker."""
         conn = self._connections.get(session_id)
         return conn is not None and conn.active
 
+    async def is_connected(self, session_id: str) -> bool:
+        """Check if a session has an active connection on any worker."""
+        if self.has_connection(session_id):
+            return True
+        if self.distributed:
+            return await self._shared_owner(session_id) is not None
+        return False
+
 
 # Singleton instance
 _manager: SSEConnectionManager | None = None
@@ -95,5 +555,10 @@ def get_sse_manager() -> SSEConnectionManager:
     """Get the singleton SSE connection manager."""
     global _manager
     if _manager is None:
-        _manager = SSEConnectionManager()
+        settings = get_settings()
+        _manager = SSEConnectionManager(
+            backend=get_state_backend(),
+            queue_size=settings.sse_queue_size,
+            overflow_policy=OverflowPolicy(settings.sse_overflow_policy),
+        )
     return _manager
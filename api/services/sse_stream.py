@@ -0,0 +1,221 @@
+"""
+Multiplexed SSE streaming.
+
+Merges a primary stream of SSE frames (the agent's response) with the
+per-session push queue fed by background tasks, so events such as
+'more_events' from Websets reach the client on the same stream.
+
+- Heartbeat comments are sent while nothing else is flowing, keeping
+  proxies and mobile networks from closing an idle stream
+- After the primary stream ends, the stream lingers (bounded) while
+  background work for the session is still pending
+
+Resumable streams run the producer as a task that writes ID-tagged
+frames into the session's ReplayBuffer; clients follow the buffer, so a
+dropped client can reconnect with Last-Event-ID without re-running the
+agent. A follower that falls behind the buffer (or resumes from an
+evicted frame) gets a 'stream_gap' error frame and the stream ends, so
+the client restarts instead of silently missing frames.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+from typing import Any
+
+from api.services.sse_connections import QueueClosed, ReplayBuffer, SSEConnection
+
+logger = logging.getLogger(__name__)
+
+# SSE comment frame; ignored by EventSource clients
+HEARTBEAT_FRAME = ": heartbeat\n\n"
+
+# Sent (then the stream ends) when frames a follower needs were evicted
+GAP_FRAME = "data: " + json.dumps({
+    "type": "error",
+    "error": "stream_gap",
+    "message": "Lost part of the response. Please send your message again.",
+}) + "\n\n"
+
+# Default seconds between heartbeats while idle
+DEFAULT_HEARTBEAT_SECONDS = 15.0
+
+# Default maximum seconds to keep the stream open after the response
+DEFAULT_LINGER_SECONDS = 60.0
+
+
+def _never() -> bool:
+    return False
+
+
+async def multiplex_stream(
+    primary: AsyncIterator[str],
+    conn: SSEConnection | None,
+    format_event: Callable[[dict], str],
+    heartbeat_seconds: float = DEFAULT_HEARTBEAT_SECONDS,
+    linger_seconds: float = DEFAULT_LINGER_SECONDS,
+    should_linger: Callable[[], bool] = _never,
+) -> AsyncGenerator[str, None]:
+    """
+    Yield frames from the primary stream and the push queue as they arrive.
+
+    Args:
+        primary: SSE frames for the response (consumed to exhaustion)
+        conn: Registered connection whose queue receives background pushes
+        format_event: Turns a pushed event dict into an SSE frame
+        heartbeat_seconds: Idle interval before a heartbeat frame
+        linger_seconds: Maximum time to stay open after the primary stream ends
+        should_linger: Returns True while background work is still pending
+
+    Yields:
+        SSE frames (response, pushed events and heartbeats). The stream
+        ends at once if the connection is dropped (queue closed on overflow).
+    """
+    loop = asyncio.get_running_loop()
+    primary_iter = primary.__aiter__()
+    primary_task: asyncio.Task[Any] | None = asyncio.ensure_future(primary_iter.__anext__())
+    push_task: asyncio.Task[dict] | None = (
+        asyncio.ensure_future(conn.queue.get()) if conn is not None else None
+    )
+    linger_deadline: float | None = None
+
+    try:
+        while primary_task is not None or push_task is not None:
+            timeout = heartbeat_seconds
+            if linger_deadline is not None:
+                remaining = linger_deadline - loop.time()
+                if remaining <= 0:
+                    logger.debug("⏱️ [SSE] Linger expired | session=%s", conn and conn.session_id)
+                    break
+                timeout = min(timeout, remaining)
+
+            waiting = {t for t in (primary_task, push_task) if t is not None}
+            done, _ = await asyncio.wait(
+                waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                if linger_deadline is None or loop.time() < linger_deadline:
+                    yield HEARTBEAT_FRAME
+                continue
+
+            # Response frames first so pushes never reorder the answer
+            if primary_task is not None and primary_task in done:
+                try:
+                    frame = primary_task.result()
+                except StopAsyncIteration:
+                    primary_task = None
+                    linger_deadline = loop.time() + linger_seconds
+                else:
+                    yield frame
+                    primary_task = asyncio.ensure_future(primary_iter.__anext__())
+
+            if push_task is not None and push_task in done:
+                try:
+                    event = push_task.result()
+                except QueueClosed:
+                    # Slow consumer disconnected by the overflow policy
+                    logger.debug("🔌 [SSE] Connection dropped | session=%s", conn and conn.session_id)
+                    push_task = None
+                    break
+                yield format_event(event)
+                push_task = asyncio.ensure_future(conn.queue.get()) if conn else None
+
+            if primary_task is None:
+                if conn is None or not conn.active:
+                    break
+                if conn.queue.empty() and not should_linger():
+                    break
+    finally:
+        pending = [t for t in (primary_task, push_task) if t is not None and not t.done()]
+        for task in pending:
+            task.cancel()
+        # Let cancellations land before closing the primary generator
+        await asyncio.gather(*pending, return_exceptions=True)
+        aclose = getattr(primary_iter, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+def start_resumable(buffer: ReplayBuffer, frames: AsyncIterator[str]) -> asyncio.Task[None]:
+    """
+    Run a frame producer in the background, recording frames in a buffer.
+
+    The producer keeps running if the client disconnects. Heartbeats are
+    not recorded (followers send their own).
+
+    Args:
+        buffer: Replay buffer for the session's stream
+        frames: SSE frames to record
+
+    Returns:
+        The producer task (also stored on buffer.producer)
+    """
+
+    async def _produce() -> None:
+        try:
+            async for frame in frames:
+                if frame.startswith(":"):
+                    continue
+                buffer.append(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                "❌ [SSE] Stream producer failed | session=%s error=%s",
+                buffer.session_id,
+                e,
+                exc_info=True,
+            )
+        finally:
+            buffer.close()
+
+    buffer.producer = asyncio.create_task(_produce())
+    return buffer.producer
+
+
+async def follow_replay(
+    buffer: ReplayBuffer,
+    last_event_id: str | None = None,
+    heartbeat_seconds: float = DEFAULT_HEARTBEAT_SECONDS,
+) -> AsyncGenerator[str, None]:
+    """
+    Yield a stream's frames after Last-Event-ID, then follow new ones.
+
+    Args:
+        buffer: Replay buffer for the session's stream
+        last_event_id: Last event ID the client received (None = from start)
+        heartbeat_seconds: Idle interval before a heartbeat frame
+
+    Yields:
+        ID-tagged SSE frames and heartbeats, until the stream closes (or
+        GAP_FRAME, if frames after the client's position were evicted)
+    """
+    seq = buffer.resume_position(last_event_id)
+    if seq:
+        logger.debug(
+            "🔁 [SSE] Resuming | session=%s after=%d latest=%d",
+            buffer.session_id,
+            seq,
+            buffer.last_seq,
+        )
+
+    while True:
+        if seq < buffer.first_seq - 1:
+            logger.warning(
+                "⚠️ [SSE] Follower fell behind replay buffer | session=%s at=%d oldest=%d",
+                buffer.session_id,
+                seq,
+                buffer.first_seq,
+            )
+            yield GAP_FRAME
+            return
+        for n, frame in buffer.frames_after(seq):
+            yield frame
+            seq = n
+        if buffer.last_seq > seq:
+            continue
+        if buffer.closed:
+            return
+        if not await buffer.wait(heartbeat_seconds):
+            yield HEARTBEAT_FRAME
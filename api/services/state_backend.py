@@ -0,0 +1,318 @@
+"""
+Pluggable shared-state backend.
+
+Sessions and SSE fan-out store state through a StateBackend instead of
+process-local singletons:
+
+- LocalStateBackend keeps everything in this process (the default; one
+  uvicorn worker)
+- RedisStateBackend talks to any Redis-protocol server (REDIS_URL) through
+  redis-py's asyncio client, so several workers or nodes share sessions
+  and SSE pushes reach a client connected to any worker
+
+Keys are namespaced with KEY_PREFIX.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import AsyncIterator
+
+import redis.asyncio as aioredis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from api.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Namespace for all keys and channels
+KEY_PREFIX = "cc:"
+
+# Seconds to wait when connecting to the server
+REDIS_CONNECT_TIMEOUT = 5.0
+
+# RESP2 keeps older Redis-compatible servers (no HELLO command) working
+REDIS_PROTOCOL = 2
+
+# Backoff between pub/sub reconnect attempts (doubles up to the max)
+SUBSCRIBE_RETRY_SECONDS = 0.5
+SUBSCRIBE_RETRY_MAX_SECONDS = 30.0
+
+
+class StateBackend(ABC):
+    """Shared state primitives: lists, hashes, leases and pub/sub."""
+
+    # True when state is shared with other processes
+    distributed: bool = False
+
+    @abstractmethod
+    async def list_get(self, key: str) -> list[str]:
+        """Get all values of a list, oldest first."""
+
+    @abstractmethod
+    async def list_append(
+        self, key: str, values: list[str], ttl_seconds: int | None = None
+    ) -> None:
+        """Append values to a list, optionally refreshing its TTL."""
+
+    @abstractmethod
+    async def list_pop(self, key: str) -> str | None:
+        """Remove and return the last value of a list."""
+
+    @abstractmethod
+    async def hash_get(self, key: str, field_name: str) -> str | None:
+        """Get one field of a hash."""
+
+    @abstractmethod
+    async def hash_get_all(self, key: str) -> dict[str, str]:
+        """Get all fields of a hash."""
+
+    @abstractmethod
+    async def hash_set(
+        self, key: str, mapping: dict[str, str], ttl_seconds: int | None = None
+    ) -> None:
+        """Set fields of a hash, optionally refreshing its TTL."""
+
+    @abstractmethod
+    async def hash_delete(self, key: str, *fields: str) -> None:
+        """Delete fields of a hash."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete a key."""
+
+    @abstractmethod
+    async def acquire_lease(self, key: str, owner: str, ttl_seconds: int) -> bool:
+        """
+        Take or renew an expiring lease.
+
+        Args:
+            key: Lease name
+            owner: Unique id of the caller
+            ttl_seconds: Lease lifetime; the owner renews before it lapses
+
+        Returns:
+            True if the caller holds the lease
+        """
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        """Publish a message to every subscriber of a channel."""
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> AsyncIterator[str]:
+        """Iterate over messages published to a channel."""
+
+    async def close(self) -> None:
+        """Release connections."""
+
+
+class LocalStateBackend(StateBackend):
+    """
+    In-process backend (single worker).
+
+    TTLs are not enforced; callers that need bounds in this mode use
+    dedicated in-memory structures (see BoundedSessionStorage).
+    """
+
+    def __init__(self) -> None:
+        self._lists: dict[str, list[str]] = defaultdict(list)
+        self._hashes: dict[str, dict[str, str]] = defaultdict(dict)
+        self._subscribers: dict[str, set[asyncio.Queue[str]]] = defaultdict(set)
+        self._leases: dict[str, tuple[str, float]] = {}
+
+    async def list_get(self, key: str) -> list[str]:
+        return list(self._lists.get(key, []))
+
+    async def list_append(
+        self, key: str, values: list[str], ttl_seconds: int | None = None
+    ) -> None:
+        self._lists[key].extend(values)
+
+    async def list_pop(self, key: str) -> str | None:
+        values = self._lists.get(key)
+        return values.pop() if values else None
+
+    async def hash_get(self, key: str, field_name: str) -> str | None:
+        return self._hashes.get(key, {}).get(field_name)
+
+    async def hash_get_all(self, key: str) -> dict[str, str]:
+        return dict(self._hashes.get(key, {}))
+
+    async def hash_set(
+        self, key: str, mapping: dict[str, str], ttl_seconds: int | None = None
+    ) -> None:
+        self._hashes[key].update(mapping)
+
+    async def hash_delete(self, key: str, *fields: str) -> None:
+        values = self._hashes.get(key)
+        if values is not None:
+            for field_name in fields:
+                values.pop(field_name, None)
+
+    async def delete(self, key: str) -> None:
+        self._lists.pop(key, None)
+        self._hashes.pop(key, None)
+
+    async def acquire_lease(self, key: str, owner: str, ttl_seconds: int) -> bool:
+        holder = self._leases.get(key)
+        now = time.monotonic()
+        if holder is not None and holder[0] != owner and holder[1] > now:
+            return False
+        self._leases[key] = (owner, now + ttl_seconds)
+        return True
+
+    async def publish(self, channel: str, message: str) -> None:
+        for queue in self._subscribers.get(channel, ()):
+            queue.put_nowait(message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        self._subscribers[channel].add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[channel].discard(queue)
+
+
+class RedisStateBackend(StateBackend):
+    """Backend on a Redis-protocol server, shared across workers."""
+
+    distributed = True
+
+    def __init__(self, url: str):
+        """
+        Initialize the backend.
+
+        Args:
+            url: redis:// connection URL
+        """
+        self.url = url
+        self._client = aioredis.Redis.from_url(
+            url,
+            decode_responses=True,
+            protocol=REDIS_PROTOCOL,
+            socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        )
+        logger.info(
+            "State backend initialized with Redis: %s",
+            self._client.connection_pool.connection_kwargs.get("host"),
+        )
+
+    async def list_get(self, key: str) -> list[str]:
+        return await self._client.lrange(KEY_PREFIX + key, 0, -1)
+
+    async def list_append(
+        self, key: str, values: list[str], ttl_seconds: int | None = None
+    ) -> None:
+        if not values:
+            return
+        await self._client.rpush(KEY_PREFIX + key, *values)
+        if ttl_seconds:
+            await self._client.expire(KEY_PREFIX + key, ttl_seconds)
+
+    async def list_pop(self, key: str) -> str | None:
+        return await self._client.rpop(KEY_PREFIX + key)
+
+    async def hash_get(self, key: str, field_name: str) -> str | None:
+        return await self._client.hget(KEY_PREFIX + key, field_name)
+
+    async def hash_get_all(self, key: str) -> dict[str, str]:
+        return await self._client.hgetall(KEY_PREFIX + key)
+
+    async def hash_set(
+        self, key: str, mapping: dict[str, str], ttl_seconds: int | None = None
+    ) -> None:
+        if not mapping:
+            return
+        await self._client.hset(KEY_PREFIX + key, mapping=mapping)
+        if ttl_seconds:
+            await self._client.expire(KEY_PREFIX + key, ttl_seconds)
+
+    async def hash_delete(self, key: str, *fields: str) -> None:
+        if fields:
+            await self._client.hdel(KEY_PREFIX + key, *fields)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(KEY_PREFIX + key)
+
+    async def acquire_lease(self, key: str, owner: str, ttl_seconds: int) -> bool:
+        lease_key = KEY_PREFIX + "lease:" + key
+        if await self._client.set(lease_key, owner, ex=ttl_seconds, nx=True):
+            return True
+        if await self._client.get(lease_key) != owner:
+            return False
+        # Still ours: renew
+        await self._client.expire(lease_key, ttl_seconds)
+        return True
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._client.publish(KEY_PREFIX + channel, message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        """
+        Iterate over messages published to a channel.
+
+        If the connection drops, the pub/sub connection is reopened (and
+        resubscribed) with exponential backoff instead of ending iteration;
+        messages published while disconnected are lost.
+        """
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        delay = SUBSCRIBE_RETRY_SECONDS
+        try:
+            await pubsub.subscribe(KEY_PREFIX + channel)
+            while True:
+                try:
+                    message = await pubsub.get_message(timeout=None)
+                except (RedisConnectionError, RedisTimeoutError, OSError) as e:
+                    logger.warning("Redis subscription lost | channel=%s error=%s", channel, e)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, SUBSCRIBE_RETRY_MAX_SECONDS)
+                    continue
+                delay = SUBSCRIBE_RETRY_SECONDS
+                if message is not None and message["type"] == "message":
+                    yield message["data"]
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+# Global backend instance
+_backend: StateBackend | None = None
+
+
+def get_state_backend() -> StateBackend:
+    """
+    Get the global state backend.
+
+    Uses Redis when REDIS_URL is set, otherwise the in-process backend.
+    """
+    global _backend
+    if _backend is None:
+        settings = get_settings()
+        if settings.has_redis:
+            _backend = RedisStateBackend(settings.redis_url)
+        else:
+            _backend = LocalStateBackend()
+    return _backend
+
+
+def init_state_backend(url: str | None = None) -> StateBackend:
+    """
+    Initialize the global state backend explicitly.
+
+    Args:
+        url: redis:// URL, or None for the in-process backend
+
+    Returns:
+        The initialized backend
+    """
+    global _backend
+    _backend = RedisStateBackend(url) if url else LocalStateBackend()
+    return _backend
@@ -3,14 +3,19 @@ Temporal Parser for natural language date expressions.
 
 Parses expressions like 'next Thursday', 'this weekend', 'tomorrow night'
 into structured date ranges for discovery queries.
+
+All supported phrases are matched by one compiled alternation regex built
+from a table of grammar rules, so a message is scanned once no matter how
+many phrases exist. Resolved phrases are memoized per (phrase, timezone,
+hour), since the same few phrases make up most chat messages.
 """
 
 from __future__ import annotations
 
 import re
 from collections.abc import Callable
-from datetime import datetime, timedelta
-from typing import Any
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 
 from dateutil import parser as dateutil_parser
 from dateutil.parser import ParserError
@@ -28,6 +33,97 @@ _DAY_NAMES = {
     "sunday": 6,
 }
 
+# Short day names accepted after next/this/last
+_DAY_ABBREVIATIONS = {
+    "mon": 0,
+    "tue": 1,
+    "tues": 1,
+    "wed": 2,
+    "thu": 3,
+    "thur": 3,
+    "thurs": 3,
+    "fri": 4,
+    "sat": 5,
+    "sun": 6,
+}
+
+_MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+
+_NUMBER_WORDS = {
+    "a": 1,
+    "an": 1,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+}
+
+# Resolved phrases kept in the memo
+MEMO_SIZE = 1024
+
+# "The weekend" starts Friday at this hour (shared with hot windows)
+WEEKEND_START_HOUR = 16
+
+# The fuzzy dateutil fallback only runs on inputs up to this long; it is
+# slow on free text and rarely right about it
+FUZZY_FALLBACK_MAX_CHARS = 40
+
+_DAY_PATTERN = (
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+    r"|mon|tues?|wed|thu(?:rs?)?|fri|sat|sun"
+)
+_MONTH_PATTERN = (
+    r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+)
+_ORDINAL = r"(?:st|nd|rd|th)?"
+
+# Grammar rules in priority order: (rule name, pattern). Earlier rules win
+# when two phrases start at the same position ("tomorrow night" before
+# "tomorrow").
+_GRAMMAR: tuple[tuple[str, str], ...] = (
+    ("tomorrow_night", r"tomorrow\s+night"),
+    ("tonight", r"tonight|this\s+evening"),
+    ("weekend", r"(?:(?P<weekend_mod>this|the|next)\s+)?weekend"),
+    ("week", r"(?P<week_mod>this|next)\s+week"),
+    ("relative_day", rf"(?P<day_mod>next|this|last|coming)\s+(?P<rel_day>{_DAY_PATTERN})"),
+    ("in_n", r"in\s+(?P<count>\d{1,3}|an?|one|two|three|four|five|six|seven|eight|nine|ten)\s+(?P<unit>days?|weeks?)"),
+    ("tomorrow", r"tomorrow"),
+    ("today", r"today"),
+    (
+        "month_day",
+        rf"(?P<month1>{_MONTH_PATTERN})\.?\s+(?P<day1>\d{{1,2}}){_ORDINAL}"
+        rf"(?:\s*(?:-|–|to|through|thru)\s*(?:(?P<month2>{_MONTH_PATTERN})\.?\s+)?(?P<day2>\d{{1,2}}){_ORDINAL})?"
+        r"(?:,?\s+(?P<year>\d{4}))?",
+    ),
+    ("weekday", r"monday|tuesday|wednesday|thursday|friday|saturday|sunday"),
+)
+
+_PHRASE_RE = re.compile(
+    r"\b(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in _GRAMMAR) + r")\b"
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 class TemporalResult(BaseModel):
     """Result of parsing a temporal expression."""
@@ -39,33 +135,253 @@ class TemporalResult(BaseModel):
     original_phrase: str
     needs_clarification: bool = False
     question: str | None = None
+    matched_text: str | None = None  # Phrase as it appeared in the input
+
+
+def _day_start(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _day_end(moment: datetime) -> datetime:
+    return moment.replace(hour=23, minute=59, second=59, microsecond=0)
+
+
+def _range(start: datetime, end: datetime, explanation: str, phrase: str) -> TemporalResult:
+    return TemporalResult(
+        success=True,
+        start=start.isoformat(),
+        end=end.isoformat(),
+        explanation=explanation,
+        original_phrase=phrase,
+    )
+
+
+def _weekday(name: str) -> int:
+    return _DAY_NAMES.get(name, _DAY_ABBREVIATIONS.get(name, -1))
+
+
+def _resolve_tomorrow_night(m: re.Match[str], now: datetime) -> TemporalResult:
+    """Tomorrow 6pm - midnight."""
+    tomorrow = (now + timedelta(days=1)).replace(hour=18, minute=0, second=0, microsecond=0)
+    return _range(
+        tomorrow,
+        _day_end(tomorrow),
+        f"Interpreted 'tomorrow night' as {tomorrow.strftime('%A')} 6:00 PM to midnight",
+        "tomorrow night",
+    )
+
+
+def _resolve_tonight(m: re.Match[str], now: datetime) -> TemporalResult:
+    """Today 6pm - midnight (from now if it's already evening)."""
+    start = now.replace(hour=18, minute=0, second=0, microsecond=0)
+    if now.hour >= 18:
+        start = now.replace(second=0, microsecond=0)
+    return _range(
+        start,
+        _day_end(now),
+        f"Interpreted 'tonight' as {start.strftime('%I:%M %p')} to midnight",
+        "tonight",
+    )
+
+
+def _resolve_weekend(m: re.Match[str], now: datetime) -> TemporalResult:
+    """Friday 4pm - Sunday 11:59pm ('next weekend' = the one after)."""
+    days_until_friday = (4 - now.weekday()) % 7
+    if days_until_friday == 0 and now.hour >= WEEKEND_START_HOUR:
+        # It's Friday after 4pm, use next weekend
+        days_until_friday = 7
+
+    phrase = "this weekend"
+    if m.group("weekend_mod") == "next":
+        days_until_friday += 7
+        phrase = "next weekend"
+
+    friday = (now + timedelta(days=days_until_friday)).replace(
+        hour=WEEKEND_START_HOUR, minute=0, second=0, microsecond=0
+    )
+    sunday = _day_end(friday + timedelta(days=2))
+    return _range(
+        friday,
+        sunday,
+        f"Interpreted '{phrase}' as {friday.strftime('%A %I:%M %p')} through {sunday.strftime('%A %I:%M %p')}",
+        phrase,
+    )
+
+
+def _resolve_week(m: re.Match[str], now: datetime) -> TemporalResult:
+    """'this week' = now - Sunday; 'next week' = Monday - Sunday of next week."""
+    if m.group("week_mod") == "next":
+        start = _day_start(now + timedelta(days=7 - now.weekday()))
+        phrase = "next week"
+    else:
+        start = now.replace(second=0, microsecond=0)
+        phrase = "this week"
+    end = _day_end(start + timedelta(days=6 - start.weekday()))
+    return _range(
+        start,
+        end,
+        f"Interpreted '{phrase}' as {start.strftime('%A, %B %d')} through {end.strftime('%A, %B %d')}",
+        phrase,
+    )
+
+
+def _resolve_relative_day(m: re.Match[str], now: datetime) -> TemporalResult:
+    """next/this/coming/last <day>."""
+    modifier = m.group("day_mod")
+    target_weekday = _weekday(m.group("rel_day"))
+    current_weekday = now.weekday()
+    days_until = (target_weekday - current_weekday) % 7
+
+    if modifier == "next":
+        # "next <day>" always means the occurrence in the next week
+        if days_until == 0:
+            days_until = 7
+        elif days_until <= (6 - current_weekday):
+            days_until += 7
+    elif modifier == "last":
+        days_until = -((current_weekday - target_weekday) % 7 or 7)
+
+    target = _day_start(now + timedelta(days=days_until))
+    day_name = target.strftime("%A")
+    return _range(
+        target,
+        _day_end(target),
+        f"Interpreted '{modifier} {day_name}' as {target.strftime('%A, %B %d')}",
+        f"{modifier} {day_name.lower()}",
+    )
+
+
+def _resolve_in_n(m: re.Match[str], now: datetime) -> TemporalResult:
+    """in N days/weeks."""
+    count_text = m.group("count")
+    count = int(count_text) if count_text.isdigit() else _NUMBER_WORDS[count_text]
+    unit = "week" if m.group("unit").startswith("week") else "day"
+    target = _day_start(now + timedelta(days=count * (7 if unit == "week" else 1)))
+    phrase = f"in {count} {unit}{'s' if count != 1 else ''}"
+    return _range(
+        target,
+        _day_end(target),
+        f"Interpreted '{phrase}' as {target.strftime('%A, %B %d')}",
+        phrase,
+    )
+
+
+def _resolve_tomorrow(m: re.Match[str], now: datetime) -> TemporalResult:
+    """All of tomorrow."""
+    tomorrow = _day_start(now + timedelta(days=1))
+    return _range(
+        tomorrow,
+        _day_end(tomorrow),
+        f"Interpreted 'tomorrow' as {tomorrow.strftime('%A, %B %d')}",
+        "tomorrow",
+    )
+
+
+def _resolve_today(m: re.Match[str], now: datetime) -> TemporalResult:
+    """The rest of today."""
+    start = now.replace(second=0, microsecond=0)
+    return _range(
+        start,
+        _day_end(now),
+        f"Interpreted 'today' as {start.strftime('%I:%M %p')} to midnight",
+        "today",
+    )
+
+
+def _resolve_month_day(m: re.Match[str], now: datetime) -> TemporalResult | None:
+    """Month D[-D2][, YYYY], e.g. 'January 15-20' or 'Jan 30 to Feb 2, 2027'."""
+    month1 = _MONTHS[m.group("month1")[:3]]
+    month2 = _MONTHS[m.group("month2")[:3]] if m.group("month2") else month1
+    day1 = int(m.group("day1"))
+    day2 = int(m.group("day2")) if m.group("day2") else day1
+    wraps = month2 < month1
+    if m.group("year"):
+        # A trailing year belongs to the end date ('Dec 31 - Jan 2, 2026')
+        last_year = int(m.group("year"))
+        first_year = last_year - 1 if wraps else last_year
+    else:
+        first_year = now.year
+        last_year = first_year + 1 if wraps else first_year
+
+    try:
+        first = date(first_year, month1, day1)
+        last = date(last_year, month2, day2)
+        if not m.group("year") and last < now.date():
+            # Prefer future dates when no year is given
+            first = first.replace(year=first.year + 1)
+            last = last.replace(year=last.year + 1)
+    except ValueError:
+        return None
+    if last < first:
+        return None
+
+    start = datetime.combine(first, datetime.min.time(), tzinfo=now.tzinfo)
+    end = _day_end(datetime.combine(last, datetime.min.time(), tzinfo=now.tzinfo))
+    if first == last:
+        explanation = f"Interpreted as {start.strftime('%A, %B %d, %Y')}"
+    else:
+        explanation = f"Interpreted as {start.strftime('%B %d')} through {end.strftime('%B %d, %Y')}"
+    return _range(start, end, explanation, _WHITESPACE_RE.sub(" ", m.group(0)))
+
+
+def _resolve_weekday(m: re.Match[str], now: datetime) -> TemporalResult:
+    """A bare day name means its next occurrence (today counts)."""
+    target = _day_start(now + timedelta(days=(_weekday(m.group(0)) - now.weekday()) % 7))
+    return _range(
+        target,
+        _day_end(target),
+        f"Interpreted '{m.group(0).title()}' as {target.strftime('%A, %B %d')}",
+        m.group(0),
+    )
+
+
+_RESOLVERS: dict[str, Callable[[re.Match[str], datetime], TemporalResult | None]] = {
+    "tomorrow_night": _resolve_tomorrow_night,
+    "tonight": _resolve_tonight,
+    "weekend": _resolve_weekend,
+    "week": _resolve_week,
+    "relative_day": _resolve_relative_day,
+    "in_n": _resolve_in_n,
+    "tomorrow": _resolve_tomorrow,
+    "today": _resolve_today,
+    "month_day": _resolve_month_day,
+    "weekday": _resolve_weekday,
+}
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def _resolve_phrase(phrase: str, timezone: str, hour_bucket: datetime) -> TemporalResult | None:
+    """
+    Resolve one normalized phrase relative to the start of an hour.
+
+    Args:
+        phrase: Lowercased phrase with whitespace collapsed
+        timezone: IANA timezone name (part of the memo key)
+        hour_bucket: Current time truncated to the hour, in `timezone`
+
+    Returns:
+        TemporalResult, or None if the phrase names an impossible date
+    """
+    m = _PHRASE_RE.fullmatch(phrase)
+    if m is None or m.lastgroup is None:
+        return None
+    rule = next(name for name, _ in _GRAMMAR if m.group(name) is not None)
+    return _RESOLVERS[rule](m, hour_bucket)
 
 
 class TemporalParser:
     """
     Parse natural language temporal expressions into structured date ranges.
 
-    Uses dateparser library with custom handlers for common range expressions
-    like 'this weekend', 'tomorrow night', 'tonight'.
+    Known phrases are resolved by a table-driven grammar; python-dateutil
+    is only a fallback for short inputs the grammar doesn't cover.
+    Relative times resolve from the start of the current hour, which is
+    what lets results be memoized.
     """
 
     def __init__(self, user_timezone: str = "America/New_York") -> None:
+        self.timezone = user_timezone
         self.tz = ZoneInfo(user_timezone)
-        self.settings: dict[str, Any] = {
-            "PREFER_DATES_FROM": "future",
-            "TIMEZONE": user_timezone,
-            "RETURN_AS_TIMEZONE_AWARE": True,
-        }
-
-        # Custom handlers for range expressions
-        self._range_handlers: dict[str, Callable[[], TemporalResult]] = {
-            "this weekend": self._parse_weekend,
-            "the weekend": self._parse_weekend,
-            "weekend": self._parse_weekend,
-            "tomorrow night": self._parse_tomorrow_night,
-            "tonight": self._parse_tonight,
-            "this evening": self._parse_tonight,
-        }
 
     def parse(self, user_input: str) -> TemporalResult:
         """
@@ -77,26 +393,20 @@ class TemporalParser:
         Returns:
             TemporalResult with parsed dates and human-readable explanation
         """
-        user_input_lower = user_input.lower().strip()
-
-        # Try custom range handlers first
-        for phrase, handler in self._range_handlers.items():
-            if phrase in user_input_lower:
-                return handler()
-
-        # Try "next <day>" pattern
-        next_day_result = self._parse_next_day(user_input_lower)
-        if next_day_result:
-            return next_day_result
-
-        # Fall back to python-dateutil for other expressions
-        try:
-            result = dateutil_parser.parse(user_input, fuzzy=True)
-            # Make timezone-aware if not already
-            if result.tzinfo is None:
-                result = result.replace(tzinfo=self.tz)
-        except (ParserError, ValueError):
-            result = None
+        phrase_result = self.match(user_input)
+        if phrase_result:
+            return phrase_result
+
+        # Fall back to python-dateutil for other short expressions
+        result = None
+        if len(user_input.strip()) <= FUZZY_FALLBACK_MAX_CHARS:
+            try:
+                result = dateutil_parser.parse(user_input, fuzzy=True)
+                # Make timezone-aware if not already
+                if result.tzinfo is None:
+                    result = result.replace(tzinfo=self.tz)
+            except (ParserError, ValueError, OverflowError):
+                result = None
 
         if result:
             return TemporalResult(
@@ -116,94 +426,28 @@ class TemporalParser:
             question=f'Could you be more specific about "{user_input}"? For example, "this Saturday" or "tomorrow at 7pm".',
         )
 
-    def _parse_weekend(self) -> TemporalResult:
-        """Parse 'this weekend' as Friday 4pm - Sunday 11:59pm."""
-        now = datetime.now(self.tz)
-        days_until_friday = (4 - now.weekday()) % 7
-        if days_until_friday == 0 and now.hour >= 16:
-            # It's Friday after 4pm, use next weekend
-            days_until_friday = 7
-
-        friday = (now + timedelta(days=days_until_friday)).replace(
-            hour=16, minute=0, second=0, microsecond=0
-        )
-        sunday = friday + timedelta(days=2)
-        sunday = sunday.replace(hour=23, minute=59, second=59)
-
-        return TemporalResult(
-            success=True,
-            start=friday.isoformat(),
-            end=sunday.isoformat(),
-            explanation=f"Interpreted 'this weekend' as {friday.strftime('%A %I:%M %p')} through {sunday.strftime('%A %I:%M %p')}",
-            original_phrase="this weekend",
-        )
-
-    def _parse_tomorrow_night(self) -> TemporalResult:
-        """Parse 'tomorrow night' as tomorrow 6pm - midnight."""
-        now = datetime.now(self.tz)
-        tomorrow = (now + timedelta(days=1)).replace(
-            hour=18, minute=0, second=0, microsecond=0
-        )
-        midnight = tomorrow.replace(hour=23, minute=59, second=59)
-
-        return TemporalResult(
-            success=True,
-            start=tomorrow.isoformat(),
-            end=midnight.isoformat(),
-            explanation=f"Interpreted 'tomorrow night' as {tomorrow.strftime('%A')} 6:00 PM to midnight",
-            original_phrase="tomorrow night",
-        )
-
-    def _parse_tonight(self) -> TemporalResult:
-        """Parse 'tonight' as today 6pm - midnight."""
-        now = datetime.now(self.tz)
-        start = now.replace(hour=18, minute=0, second=0, microsecond=0)
-        if now.hour >= 18:
-            # Already evening, start from now
-            start = now.replace(second=0, microsecond=0)
-        end = now.replace(hour=23, minute=59, second=59, microsecond=0)
-
-        return TemporalResult(
-            success=True,
-            start=start.isoformat(),
-            end=end.isoformat(),
-            explanation=f"Interpreted 'tonight' as {start.strftime('%I:%M %p')} to midnight",
-            original_phrase="tonight",
-        )
-
-    def _parse_next_day(self, user_input: str) -> TemporalResult | None:
-        """Parse 'next <day>' pattern, e.g., 'next Thursday'."""
-        # Match "next <day>" pattern
-        match = re.search(r"\bnext\s+(\w+)", user_input)
-        if not match:
-            return None
-
-        day_name = match.group(1).lower()
-        if day_name not in _DAY_NAMES:
-            return None
+    def match(self, user_input: str, now: datetime | None = None) -> TemporalResult | None:
+        """
+        Resolve a known relative phrase without the fuzzy fallback.
 
-        target_weekday = _DAY_NAMES[day_name]
-        now = datetime.now(self.tz)
-        current_weekday = now.weekday()
+        Only the grammar runs, so free text that merely contains a number
+        is never misread as a date.
 
-        # Calculate days until the target day
-        # "next <day>" always means the occurrence in the next week
-        days_until = (target_weekday - current_weekday) % 7
-        if days_until == 0:
-            # Same day, go to next week
-            days_until = 7
-        elif days_until <= (6 - current_weekday):
-            # Target is later this week, add 7 for "next"
-            days_until += 7
+        Args:
+            user_input: Natural language text (e.g. a whole chat message)
+            now: Reference time (defaults to the current time)
 
-        target_date = (now + timedelta(days=days_until)).replace(
-            hour=0, minute=0, second=0, microsecond=0
+        Returns:
+            TemporalResult with matched_text set, or None if no phrase matched
+        """
+        text = user_input.lower()
+        bucket = (now or datetime.now(self.tz)).astimezone(self.tz).replace(
+            minute=0, second=0, microsecond=0
         )
 
-        return TemporalResult(
-            success=True,
-            start=target_date.isoformat(),
-            end=target_date.replace(hour=23, minute=59, second=59).isoformat(),
-            explanation=f"Interpreted 'next {day_name.title()}' as {target_date.strftime('%A, %B %d')}",
-            original_phrase=f"next {day_name}",
-        )
+        for m in _PHRASE_RE.finditer(text):
+            phrase = _WHITESPACE_RE.sub(" ", m.group(0))
+            result = _resolve_phrase(phrase, self.timezone, bucket)
+            if result is not None:
+                return result.model_copy(update={"matched_text": m.group(0)})
+        return None
@@ -0,0 +1,206 @@
+"""
+In-process fake Redis server for tests.
+
+Speaks RESP2 over a real TCP socket and implements the subset of
+commands the redis-py clients send for the state backend and event cache
+(hashes, lists, strings, EXPIRE, DEL, pub/sub, connection setup).
+Runs its own event loop in a background thread so both the blocking and
+asyncio clients can talk to it from tests.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+
+async def _read_command(reader: asyncio.StreamReader) -> list[bytes]:
+    """Read one command (a RESP array of bulk strings) from a client."""
+    line = await reader.readline()
+    if not line.startswith(b"*"):
+        raise ConnectionError("Connection closed or not a command")
+    args = []
+    for _ in range(int(line[1:-2])):
+        length = int((await reader.readline())[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+def _bulk(value: bytes | None) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _array(values: list[bytes | None]) -> bytes:
+    return b"*%d\r\n" % len(values) + b"".join(_bulk(v) for v in values)
+
+
+def _int(value: int) -> bytes:
+    return b":%d\r\n" % value
+
+
+OK = b"+OK\r\n"
+
+
+class FakeRedisServer:
+    """Minimal Redis-compatible server bound to 127.0.0.1 on a free port."""
+
+    def __init__(self) -> None:
+        self.data: dict[bytes, Any] = {}
+        self.expiry: dict[bytes, float] = {}
+        self.subscribers: dict[bytes, set[asyncio.StreamWriter]] = {}
+        self.port = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._server: asyncio.AbstractServer | None = None
+        self._handlers: set[asyncio.Task[None]] = set()
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    def start(self) -> "FakeRedisServer":
+        self._thread.start()
+        future = asyncio.run_coroutine_threadsafe(self._start(), self._loop)
+        future.result(timeout=5)
+        return self
+
+    async def _start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def stop(self) -> None:
+        async def _stop() -> None:
+            assert self._server is not None
+            self._server.close()
+            for task in self._handlers:
+                task.cancel()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(_stop(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def drop_subscribers(self) -> None:
+        """Close every subscriber connection (simulates a server restart)."""
+
+        def _drop() -> None:
+            for writers in self.subscribers.values():
+                for writer in writers:
+                    writer.close()
+                writers.clear()
+
+        self._loop.call_soon_threadsafe(_drop)
+
+    def _get(self, key: bytes) -> Any:
+        deadline = self.expiry.get(key)
+        if deadline is not None and time.monotonic() >= deadline:
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+        return self.data.get(key)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        self._handlers.add(task)
+        try:
+            while True:
+                try:
+                    command = await _read_command(reader)
+                except Exception:
+                    return
+                name = command[0].upper()
+                if name == b"SUBSCRIBE":
+                    for i, channel in enumerate(command[1:], start=1):
+                        self.subscribers.setdefault(channel, set()).add(writer)
+                        writer.write(
+                            b"*3\r\n" + _bulk(b"subscribe") + _bulk(channel) + _int(i)
+                        )
+                    await writer.drain()
+                    continue
+                writer.write(self._execute(name, command[1:]))
+                await writer.drain()
+        finally:
+            self._handlers.discard(task)
+            for writers in self.subscribers.values():
+                writers.discard(writer)
+            writer.close()
+
+    def _execute(self, name: bytes, args: list[bytes]) -> bytes:
+        if name in (b"PING",):
+            return b"+PONG\r\n"
+        if name in (b"AUTH", b"SELECT", b"CLIENT"):
+            return OK
+        if name == b"HSET":
+            h = self._get(args[0])
+            if h is None:
+                h = self.data[args[0]] = {}
+            added = 0
+            for field, value in zip(args[1::2], args[2::2]):
+                added += field not in h
+                h[field] = value
+            return _int(added)
+        if name == b"HGET":
+            return _bulk((self._get(args[0]) or {}).get(args[1]))
+        if name == b"HMGET":
+            h = self._get(args[0]) or {}
+            return _array([h.get(f) for f in args[1:]])
+        if name == b"HGETALL":
+            h = self._get(args[0]) or {}
+            flat: list[bytes | None] = []
+            for field, value in h.items():
+                flat.extend((field, value))
+            return _array(flat)
+        if name == b"HKEYS":
+            return _array(list((self._get(args[0]) or {}).keys()))
+        if name == b"HDEL":
+            h = self._get(args[0]) or {}
+            return _int(sum(h.pop(f, None) is not None for f in args[1:]))
+        if name == b"HLEN":
+            return _int(len(self._get(args[0]) or {}))
+        if name == b"RPUSH":
+            lst = self._get(args[0])
+            if lst is None:
+                lst = self.data[args[0]] = []
+            lst.extend(args[1:])
+            return _int(len(lst))
+        if name == b"LRANGE":
+            lst = self._get(args[0]) or []
+            start, stop = int(args[1]), int(args[2])
+            stop = len(lst) if stop == -1 else stop + 1
+            return _array(lst[start:stop])
+        if name == b"RPOP":
+            lst = self._get(args[0]) or []
+            return _bulk(lst.pop() if lst else None)
+        if name == b"DEL":
+            removed = 0
+            for key in args:
+                removed += self._get(key) is not None
+                self.data.pop(key, None)
+                self.expiry.pop(key, None)
+            return _int(removed)
+        if name == b"EXPIRE":
+            if self._get(args[0]) is None:
+                return _int(0)
+            self.expiry[args[0]] = time.monotonic() + int(args[1])
+            return _int(1)
+        if name == b"GET":
+            return _bulk(self._get(args[0]))
+        if name == b"SET":
+            options = [a.upper() for a in args[2:]]
+            if b"NX" in options and self._get(args[0]) is not None:
+                return b"$-1\r\n"
+            self.data[args[0]] = args[1]
+            self.expiry.pop(args[0], None)
+            if b"EX" in options:
+                seconds = int(args[2 + options.index(b"EX") + 1])
+                self.expiry[args[0]] = time.monotonic() + seconds
+            return OK
+        if name == b"PUBLISH":
+            writers = self.subscribers.get(args[0], set())
+            frame = b"*3\r\n" + _bulk(b"message") + _bulk(args[0]) + _bulk(args[1])
+            for writer in writers:
+                writer.write(frame)
+            return _int(len(writers))
+        return b"-ERR unknown command '%s'\r\n" % name
@@ -0,0 +1,404 @@
+"""Tests for the Webset discovery job scheduler."""
+
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+
+from api.config import get_settings
+from api.models import SearchProfile
+from api.services import background_tasks
+from api.services.background_tasks import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    BackgroundTaskManager,
+    start_search_discovery,
+)
+from api.services.event_cache import InMemoryEventCache
+from api.services.exa_client import ExaSearchResult, ExaWebset
+from api.services.job_store import InMemoryJobStore, JobRecord, JobStore
+from api.services.sse_connections import SSEConnectionManager
+
+
+class FakeExaClient:
+    """Exa client whose Websets complete when released."""
+
+    def __init__(self) -> None:
+        self.created: list[str] = []
+        self.polled: list[str] = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.create_gate = asyncio.Event()
+        self.create_gate.set()
+
+    async def create_webset(self, query: str, count: int, criteria: str) -> str:
+        await self.create_gate.wait()
+        self.created.append(query)
+        return f"ws{len(self.created)}"
+
+    async def get_webset(self, webset_id: str) -> ExaWebset:
+        self.polled.append(webset_id)
+        if not self.release.is_set():
+            return ExaWebset(id=webset_id, status="running")
+        return ExaWebset(
+            id=webset_id,
+            status="completed",
+            num_results=1,
+            results=[ExaSearchResult(id="r1", title="Meetup", url="https://example.com", text="x")],
+        )
+
+
+@pytest.fixture
+def exa(monkeypatch: pytest.MonkeyPatch) -> FakeExaClient:
+    client = FakeExaClient()
+    monkeypatch.setattr(background_tasks, "get_exa_client", lambda: client)
+    monkeypatch.setattr(background_tasks, "WEBSET_POLL_INTERVAL", 0.01)
+    return client
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> InMemoryEventCache:
+    event_cache = InMemoryEventCache()
+    monkeypatch.setattr(background_tasks, "get_event_cache", lambda: event_cache)
+    return event_cache
+
+
+@pytest.fixture
+def sse(monkeypatch: pytest.MonkeyPatch) -> SSEConnectionManager:
+    manager = SSEConnectionManager()
+    monkeypatch.setattr(background_tasks, "get_sse_manager", lambda: manager)
+    return manager
+
+
+def _profile(*categories: str) -> SearchProfile:
+    return SearchProfile(categories=list(categories))
+
+
+async def _wait_idle(manager: BackgroundTaskManager, *session_ids: str) -> None:
+    for _ in range(200):
+        if not any(manager.has_pending(s) for s in session_ids):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("jobs did not finish")
+
+
+class TestDiscoveryScheduler:
+    """Test dedup, fan-out, fairness and cancellation."""
+
+    async def test_identical_queries_share_a_job(
+        self, exa: FakeExaClient, sse: SSEConnectionManager, cache: InMemoryEventCache
+    ) -> None:
+        """Two sessions with the same query get one Webset and both get results."""
+        manager = BackgroundTaskManager(job_store=InMemoryJobStore())
+        a = await sse.register("a")
+        b = await sse.register("b")
+
+        key_a = await manager.start_webset_discovery("a", _profile("ai"))
+        key_b = await manager.start_webset_discovery("b", _profile("AI"))
+        await _wait_idle(manager, "a", "b")
+        await manager.stop()
+
+        assert key_a == key_b
+        assert len(exa.created) == 1
+        assert a.queue.get_nowait()["type"] == "more_events"
+        assert b.queue.get_nowait()["type"] == "more_events"
+
+    async def test_concurrency_is_bounded(
+        self, exa: FakeExaClient, sse: SSEConnectionManager, cache: InMemoryEventCache
+    ) -> None:
+        """No more than max_concurrent_jobs run at once."""
+        exa.release.clear()
+        manager = BackgroundTaskManager(max_concurrent_jobs=2, job_store=InMemoryJobStore())
+        for i in range(5):
+            await sse.register(f"s{i}")
+            await manager.start_webset_discovery(f"s{i}", _profile(f"c{i}"))
+        await asyncio.sleep(0.05)
+
+        assert manager.running_count == 2
+        assert manager.queued_count == 3
+
+        exa.release.set()
+        await _wait_idle(manager, *(f"s{i}" for i in range(5)))
+        await manager.stop()
+        assert len(exa.created) == 5
+
+    async def test_priority_and_tenant_fairness(
+        self, exa: FakeExaClient, sse: SSEConnectionManager, cache: InMemoryEventCache
+    ) -> None:
+        """Higher priority runs first; equal priority alternates tenants."""
+        exa.release.clear()
+        manager = BackgroundTaskManager(max_concurrent_jobs=1, job_store=InMemoryJobStore())
+        await sse.register("blocker")
+        await manager.start_webset_discovery("blocker", _profile("first"))
+        await asyncio.sleep(0.02)
+
+        for i in range(3):
+            await sse.register(f"busy{i}")
+            await manager.start_webset_discovery(f"busy{i}", _profile(f"busy{i}"), tenant_id="busy")
+        await sse.register("quiet")
+        await manager.start_webset_discovery("quiet", _profile("quiet"), tenant_id="quiet")
+        await sse.register("low")
+        await manager.start_webset_discovery("low", _profile("low"), priority=PRIORITY_BACKGROUND)
+        await sse.register("urgent")
+        await manager.start_webset_discovery(
+            "urgent", _profile("urgent"), priority=PRIORITY_INTERACTIVE
+        )
+
+        exa.release.set()
+        await _wait_idle(manager, "blocker", "busy0", "busy1", "busy2", "quiet", "low", "urgent")
+        await manager.stop()
+
+        order = [q.split()[-1] for q in exa.created]
+        assert order == ["first", "urgent", "busy0", "quiet", "busy1", "busy2", "low"]
+
+    async def test_leaving_drops_queued_job(
+        self, exa: FakeExaClient, sse: SSEConnectionManager, cache: InMemoryEventCache
+    ) -> None:
+        """A queued job is dropped once its last subscriber leaves."""
+        exa.release.clear()
+        manager = BackgroundTaskManager(max_concurrent_jobs=1, job_store=InMemoryJobStore())
+        await sse.register("a")
+        await sse.register("b")
+        await manager.start_webset_discovery("a", _profile("x"))
+        await manager.start_webset_discovery("b", _profile("y"))
+        await asyncio.sleep(0.02)
+
+        await manager.cancel_session_tasks("b")
+        assert manager.queued_count == 0
+        assert not manager.has_pending("b")
+
+        exa.release.set()
+        await _wait_idle(manager, "a")
+        await manager.stop()
+        assert exa.created == ["events Columbus Ohio x"]
+
+    async def test_leaving_cancels_job_before_webset_exists(
+        self, exa: FakeExaClient, sse: SSEConnectionManager, cache: InMemoryEventCache
+    ) -> None:
+        """A running job without a Webset is cancelled; the worker keeps serving."""
+        exa.create_gate.clear()
+        store = InMemoryJobStore()
+        manager = BackgroundTaskManager(max_concurrent_jobs=1, job_store=store)
+        await manager.start_webset_discovery("a", _profile("x"))
+        await asyncio.sleep(0.02)
+
+        await manager.cancel_session_tasks("a")
+        await asyncio.sleep(0.02)
+        record = store.get("events columbus ohio x")
+        assert record is not None
+        assert record.status == "cancelled"
+
+        exa.create_gate.set()
+        await manager.start_webset_discovery("a", _profile("z"))
+        await _wait_idle(manager, "a")
+        await manager.stop()
+        assert exa.created == ["events Columbus Ohio z"]
+
+    async def test_new_discovery_replaces_previous(
+        self, exa: FakeExaClient, sse: SSEConnectionManager, cache: InMemoryEventCache
+    ) -> None:
+        """A session follows only its latest discovery."""
+        exa.release.clear()
+        manager = BackgroundTaskManager(max_concurrent_jobs=1, job_store=InMemoryJobStore())
+        await sse.register("a")
+        await sse.register("b")
+        await manager.start_webset_discovery("a", _profile("x"))
+        shared = await manager.start_webset_discovery("b", _profile("x"))
+        await manager.start_webset_discovery("a", _profile("y"))
+
+        job = manager.get_job(shared)
+        assert job is not None
+        assert job.subscribers == {"b"}
+        await manager.stop()
+
+
+class TestSearchDiscovery:
+    """Test deep discovery started after chat searches."""
+
+    @pytest.fixture(autouse=True)
+    def manager(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[BackgroundTaskManager]:
+        manager = BackgroundTaskManager(job_store=InMemoryJobStore())
+        monkeypatch.setattr(background_tasks, "_manager", manager)
+        monkeypatch.setenv("EXA_API_KEY", "test-key")
+        get_settings.cache_clear()
+        yield manager
+        get_settings.cache_clear()
+
+    async def test_disabled_by_default(self, exa: FakeExaClient) -> None:
+        """Paid discovery only runs when enabled."""
+        assert await start_search_discovery("s1", _profile("ai")) is None
+        assert exa.created == []
+
+    async def test_enabled_search_schedules_job(
+        self,
+        manager: BackgroundTaskManager,
+        monkeypatch: pytest.MonkeyPatch,
+        exa: FakeExaClient,
+        sse: SSEConnectionManager,
+        cache: InMemoryEventCache,
+    ) -> None:
+        """A chat search subscribes its session to an interactive job."""
+        monkeypatch.setenv("WEBSET_DISCOVERY", "true")
+        get_settings.cache_clear()
+
+        assert await start_search_discovery(None, _profile("ai")) is None
+        key = await start_search_discovery("s1", _profile("ai"))
+        assert key == "events columbus ohio ai"
+        assert manager.get_job(key).priority == PRIORITY_INTERACTIVE
+        await _wait_idle(manager, "s1")
+        await manager.stop()
+        assert exa.created == ["events Columbus Ohio ai"]
+
+
+class TestDurableJobs:
+    """Test job persistence, recovery and result caching."""
+
+    async def test_results_cached_without_listeners(
+        self, exa: FakeExaClient, sse: SSEConnectionManager, cache: InMemoryEventCache
+    ) -> None:
+        """A paid-for Webset finishes and is cached after every session leaves."""
+        exa.release.clear()
+        store = InMemoryJobStore()
+        manager = BackgroundTaskManager(job_store=store)
+        key = await manager.start_webset_discovery("gone", _profile("x"))
+        await asyncio.sleep(0.03)
+        await manager.cancel_session_tasks("gone")
+
+        exa.release.set()
+        for _ in range(100):
+            if manager.get_job(key) is None:
+                break
+            await asyncio.sleep(0.01)
+        await manager.stop()
+
+        record = store.get(key)
+        assert record is not None
+        assert record.status == "completed"
+        assert [e.title for e in manager.get_results(key)] == ["Meetup"]
+        assert cache.count("webset") == 1
+
+    async def test_recover_resumes_polling(
+        self, exa: FakeExaClient, sse: SSEConnectionManager, cache: InMemoryEventCache, tmp_path
+    ) -> None:
+        """Jobs left running by a previous process resume without a new Webset."""
+        store = JobStore(db_path=tmp_path / "jobs.db")
+        store.save(
+            JobRecord(
+                key="events columbus ohio ai",
+                query="events Columbus Ohio ai",
+                tenant_id="s1",
+                priority=10,
+                subscribers=["s1"],
+                status="running",
+                webset_id="ws-old",
+                polls=3,
+            )
+        )
+        conn = await sse.register("s1")
+
+        manager = BackgroundTaskManager(job_store=store)
+        assert await manager.recover() == 1
+        assert manager.has_pending("s1")
+        await _wait_idle(manager, "s1")
+        await manager.stop()
+
+        assert exa.created == []
+        assert exa.polled == ["ws-old"]
+        assert conn.queue.get_nowait()["type"] == "more_events"
+        assert store.list_active() == []
+        assert store.get("events columbus ohio ai").result_ids == ["r1"]
+
+    async def test_shutdown_keeps_jobs_active(
+        self, exa: FakeExaClient, sse: SSEConnectionManager, cache: InMemoryEventCache, tmp_path
+    ) -> None:
+        """Stopping mid-poll leaves the job and its schedule in the store."""
+        exa.release.clear()
+        store = JobStore(db_path=tmp_path / "jobs.db")
+        manager = BackgroundTaskManager(job_store=store)
+        await manager.start_webset_discovery("s1", _profile("x"))
+        await asyncio.sleep(0.03)
+        await manager.stop()
+
+        (record,) = store.list_active()
+        assert record.status == "running"
+        assert record.webset_id == "ws1"
+        assert record.next_poll_at is not None
+        assert record.lease_until is None  # Released for the next worker
+
+    async def test_recover_claims_job_once(
+        self, exa: FakeExaClient, sse: SSEConnectionManager, cache: InMemoryEventCache, tmp_path
+    ) -> None:
+        """Workers sharing a store resume a job (and create its Webset) only once."""
+        store = JobStore(db_path=tmp_path / "jobs.db")
+        store.save(
+            JobRecord(
+                key="events columbus ohio ai",
+                query="events Columbus Ohio ai",
+                tenant_id="s1",
+                priority=10,
+                subscribers=["s1"],
+                status="queued",
+            )
+        )
+        first = BackgroundTaskManager(job_store=store)
+        second = BackgroundTaskManager(job_store=store)
+
+        assert await first.recover() == 1
+        assert await second.recover() == 0
+        await _wait_idle(first, "s1")
+        await first.stop()
+        await second.stop()
+
+        assert exa.created == ["events Columbus Ohio ai"]
+        assert store.get("events columbus ohio ai").status == "completed"
+
+    async def test_session_joins_job_on_other_worker(
+        self, exa: FakeExaClient, sse: SSEConnectionManager, cache: InMemoryEventCache, tmp_path
+    ) -> None:
+        """A session on another worker joins the leased job and gets its results."""
+        exa.release.clear()
+        store = JobStore(db_path=tmp_path / "jobs.db")
+        first = BackgroundTaskManager(job_store=store)
+        second = BackgroundTaskManager(job_store=store)
+        conn = await sse.register("s2")
+
+        key = await first.start_webset_discovery("s1", _profile("ai"))
+        assert await second.start_webset_discovery("s2", _profile("ai")) == key
+        assert second.get_job(key) is None
+        assert second.has_pending("s2")
+        assert store.get(key).remote_subscribers == ["s2"]
+
+        exa.release.set()
+        await _wait_idle(first, "s1")
+        await first.stop()
+        await second.stop()
+
+        assert len(exa.created) == 1
+        assert conn.queue.get_nowait()["type"] == "more_events"
+
+    def test_claim_respects_live_lease(self, tmp_path) -> None:
+        """A live lease blocks other workers' claims and saves until it expires."""
+        store = JobStore(db_path=tmp_path / "jobs.db")
+        store.save(JobRecord(key="a", query="a", tenant_id="t", priority=0, status="running"))
+
+        assert store.claim("a", "w1", lease_seconds=60)
+        assert store.claim("a", "w1", lease_seconds=60)  # Renewal
+        assert not store.claim("a", "w2", lease_seconds=60)
+        assert not store.save(
+            JobRecord(key="a", query="a", tenant_id="t", priority=0, status="failed", owner="w2")
+        )
+        assert store.get("a").status == "running"
+
+        assert store.claim("a", "w1", lease_seconds=-1)  # Expired
+        assert store.claim("a", "w2", lease_seconds=60)
+        assert store.get("a").owner == "w2"
+
+    def test_clear_finished(self, tmp_path) -> None:
+        """Finished jobs past retention are removed; active ones stay."""
+        store = JobStore(db_path=tmp_path / "jobs.db")
+        store.save(JobRecord(key="a", query="a", tenant_id="t", priority=0, status="completed"))
+        store.save(JobRecord(key="b", query="b", tenant_id="t", priority=0, status="queued"))
+
+        assert store.clear_finished(older_than_hours=-1) == 1
+        assert store.get("a") is None
+        assert store.get("b") is not None
@@ -0,0 +1,53 @@
+"""Tests for ICS export."""
+
+from collections.abc import Iterator
+from datetime import datetime
+
+from icalendar import Calendar
+
+from api.services.calendar import CalendarEvent, create_ics_multiple, iter_ics
+
+
+def _events(count: int) -> Iterator[CalendarEvent]:
+    for i in range(count):
+        yield CalendarEvent(
+            title=f"Event {i}: a long enough title to need line folding in the ICS output",
+            start=datetime(2026, 1, 10, 18, 0),
+            description="Bring a laptop; snacks, drinks\nand friends",
+            location="Columbus, OH",
+        )
+
+
+class TestStreamingIcs:
+    """Test the streaming ICS writer."""
+
+    def test_header_first_and_footer_last(self) -> None:
+        """The header is yielded before any event is rendered."""
+        chunks = iter_ics(_events(3), chunk_bytes=0)
+
+        assert next(chunks).startswith(b"BEGIN:VCALENDAR\r\n")
+        rest = list(chunks)
+        assert rest[-1] == b"END:VCALENDAR\r\n"
+        assert len(rest) == 4  # one chunk per event + footer
+
+    def test_chunks_group_events(self) -> None:
+        """Events are grouped into chunks of about chunk_bytes."""
+        chunks = list(iter_ics(_events(100), chunk_bytes=4096))
+
+        assert 3 < len(chunks) < 100
+        assert all(len(chunk) < 4096 + 1024 for chunk in chunks)
+
+    def test_output_parses(self) -> None:
+        """The streamed output is a valid calendar with folded, escaped events."""
+        calendar = Calendar.from_ical(b"".join(iter_ics(_events(5))))
+        events = calendar.walk("VEVENT")
+
+        assert len(events) == 5
+        assert str(events[0]["summary"]).startswith("Event 0: a long enough title")
+        assert str(events[0]["description"]) == "Bring a laptop; snacks, drinks\nand friends"
+        assert str(calendar["prodid"]) == "-//Calendar Club//calendarclub.dev//"
+
+    def test_string_api(self) -> None:
+        """create_ics_multiple joins the same stream."""
+        content = create_ics_multiple(list(_events(2)))
+        assert content.count("BEGIN:VEVENT") == 2
@@ -0,0 +1,155 @@
+"""Tests for subscribable calendar feeds."""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from api.services.calendar import CalendarEvent
+from api.services.calendar_feed import (
+    CalendarFeedService,
+    FeedStore,
+    InMemoryFeedStore,
+    feed_etag,
+    is_not_modified,
+)
+
+
+def _picks(*titles: str) -> list[CalendarEvent]:
+    return [
+        CalendarEvent(title=title, start=datetime(2026, 1, 10 + i, 18, 0), location="Columbus, OH")
+        for i, title in enumerate(titles)
+    ]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def service(request, tmp_path) -> CalendarFeedService:
+    store = InMemoryFeedStore() if request.param == "memory" else FeedStore(tmp_path / "feeds.db")
+    return CalendarFeedService(store=store)
+
+
+class TestFeedService:
+    """Test picks storage and rendering."""
+
+    def test_etag_tracks_content(self) -> None:
+        """Same events give the same ETag; any change gives a new one."""
+        assert feed_etag(_picks("A", "B")) == feed_etag(_picks("A", "B"))
+        assert feed_etag(_picks("A", "B")) != feed_etag(_picks("A", "C"))
+        assert feed_etag(_picks("A")).startswith('"')
+
+    def test_unchanged_picks_keep_validators(self, service) -> None:
+        """Re-saving identical picks doesn't move ETag or Last-Modified."""
+        first = service.set_picks("u1", _picks("A", "B"))
+        again = service.set_picks("u1", _picks("A", "B"))
+        changed = service.set_picks("u1", _picks("A"))
+
+        assert again == first
+        assert changed.etag != first.etag
+        assert changed.event_count == 1
+
+    def test_render_is_cached_and_deterministic(self, service, monkeypatch) -> None:
+        """A feed is rendered once per ETag, byte-identically."""
+        service.set_picks("u1", _picks("A", "B"))
+        meta, body = service.render("u1")
+
+        monkeypatch.setattr(service.store, "load", lambda user_id: pytest.fail("re-rendered"))
+        assert service.render("u1") == (meta, body)
+        assert body.count(b"BEGIN:VEVENT") == 2
+        assert f"DTSTAMP:{meta.updated_at:%Y%m%dT%H%M%SZ}".encode() in body
+
+    def test_cache_is_bounded(self) -> None:
+        """Least recently used bodies are evicted."""
+        service = CalendarFeedService(store=InMemoryFeedStore(), cache_size=2)
+        for user_id in ("u1", "u2", "u3"):
+            service.set_picks(user_id, _picks(user_id))
+            service.render(user_id)
+
+        assert [key[0] for key in service._bodies] == ["u2", "u3"]
+
+    def test_token_is_stable_and_resolves(self, service) -> None:
+        """A feed keeps its token across saves; tokens resolve to the owner."""
+        first = service.set_picks("u1", _picks("A"))
+        changed = service.set_picks("u1", _picks("B"))
+        other = service.set_picks("u2", _picks("A"))
+
+        assert changed.token == first.token
+        assert other.token != first.token
+        assert len(first.token) >= 32
+        assert service.find_user(first.token) == "u1"
+        assert service.find_user("u1") is None
+        assert service.find_user("") is None
+
+    def test_authorize(self, service) -> None:
+        """New feeds are open; existing ones require their token."""
+        assert service.authorize("u1", None)
+        token = service.set_picks("u1", _picks("A")).token
+
+        assert service.authorize("u1", token)
+        assert not service.authorize("u1", None)
+        assert not service.authorize("u1", "wrong")
+
+    def test_legacy_rows_get_a_token(self, tmp_path) -> None:
+        """Feeds stored before tokens existed are migrated and issued one on save."""
+        db_path = tmp_path / "feeds.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE calendar_feeds (user_id TEXT PRIMARY KEY, etag TEXT NOT NULL, "
+                "updated_at TEXT NOT NULL, event_count INTEGER NOT NULL, events TEXT NOT NULL)"
+            )
+            conn.execute(
+                "INSERT INTO calendar_feeds VALUES ('u1', ?, '2026-01-01T00:00:00+00:00', 1, '[]')",
+                (feed_etag(_picks("A")),),
+            )
+
+        service = CalendarFeedService(store=FeedStore(db_path))
+        assert service.get_meta("u1").token == ""
+        meta = service.set_picks("u1", _picks("A"))
+        assert meta.token
+        assert service.find_user(meta.token) == "u1"
+
+    def test_delete(self, service) -> None:
+        """Deleted feeds are gone from the store and cache."""
+        service.set_picks("u1", _picks("A"))
+        service.render("u1")
+
+        assert service.delete("u1") is True
+        assert service.render("u1") is None
+        assert service.delete("u1") is False
+
+
+class TestConditionalGet:
+    """Test If-None-Match / If-Modified-Since evaluation."""
+
+    @pytest.fixture
+    def meta(self):
+        return CalendarFeedService(store=InMemoryFeedStore()).set_picks("u1", _picks("A"))
+
+    def test_if_none_match(self, meta) -> None:
+        """Matching, listed, weak and wildcard tags are not modified."""
+        assert is_not_modified(meta, meta.etag, None)
+        assert is_not_modified(meta, f'"other", {meta.etag}', None)
+        assert is_not_modified(meta, f"W/{meta.etag}", None)
+        assert is_not_modified(meta, "*", None)
+        assert not is_not_modified(meta, '"other"', None)
+
+    def test_if_none_match_takes_precedence(self, meta) -> None:
+        """A stale ETag wins over a current If-Modified-Since."""
+        assert not is_not_modified(meta, '"other"', meta.last_modified)
+
+    def test_if_modified_since(self, meta) -> None:
+        """Dates at or after Last-Modified are not modified."""
+        earlier = format_datetime(meta.updated_at - timedelta(seconds=1), usegmt=True)
+        later = format_datetime(meta.updated_at + timedelta(hours=1), usegmt=True)
+
+        assert is_not_modified(meta, None, meta.last_modified)
+        assert is_not_modified(meta, None, later)
+        assert not is_not_modified(meta, None, earlier)
+        assert not is_not_modified(meta, None, "not a date")
+        assert not is_not_modified(meta, None, None)
+
+    def test_last_modified_is_http_date(self, meta) -> None:
+        """Last-Modified is a GMT HTTP date at second precision."""
+        assert meta.last_modified.endswith(" GMT")
+        assert meta.updated_at.tzinfo == timezone.utc
+        assert meta.updated_at.microsecond == 0
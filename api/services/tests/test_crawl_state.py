@@ -0,0 +1,94 @@
+"""Tests for incremental crawl state."""
+
+from typing import Any
+
+from api.services.crawl_state import CrawlStateStore, content_hash
+from api.services.firecrawl import PoshExtractor
+
+
+class FakeFirecrawlClient:
+    """Firecrawl client serving fixed crawl pages and counting extractions."""
+
+    def __init__(self, pages: dict[str, str]) -> None:
+        self.pages = pages
+        self.scraped: list[str] = []
+
+    async def crawl(self, url: str, limit: int = 10, include_patterns: Any = None) -> list[dict]:
+        return [{"url": u, "markdown": md} for u, md in self.pages.items()]
+
+    async def scrape(self, url: str, formats: Any = None, extract_schema: Any = None) -> dict:
+        self.scraped.append(url)
+        return {
+            "extract": {
+                "title": self.pages[url].splitlines()[0],
+                "start_date": "January 15, 2030",
+                "start_time": "7:00 PM",
+            }
+        }
+
+    async def close(self) -> None:
+        pass
+
+
+class TestContentHash:
+    """Test page hashing."""
+
+    def test_whitespace_insensitive(self) -> None:
+        """Formatting-only changes keep the same hash."""
+        assert content_hash({"markdown": "# Party\n\nTonight"}) == content_hash(
+            {"markdown": "# Party Tonight  "}
+        )
+        assert content_hash({"markdown": "a"}) != content_hash({"markdown": "b"})
+
+    def test_no_content(self) -> None:
+        """Pages without content can't be compared."""
+        assert content_hash({"url": "https://posh.vip/e/x"}) is None
+
+
+class TestIncrementalCrawl:
+    """Test skipping unchanged pages."""
+
+    async def test_only_new_or_changed_pages_are_extracted(self, tmp_path) -> None:
+        """A second crawl re-extracts only the changed page."""
+        store = CrawlStateStore(tmp_path / "crawl.db")
+        client = FakeFirecrawlClient(
+            {
+                "https://posh.vip/e/a": "Party A\nDetails",
+                "https://posh.vip/e/b": "Party B\nDetails",
+            }
+        )
+        extractor = PoshExtractor(client=client)
+
+        state = store.load("posh")
+        first = await extractor.discover_events(crawl_state=state)
+        store.save_many(state)
+        assert len(first) == 2
+        assert state.new_count == 2
+
+        client.scraped.clear()
+        client.pages["https://posh.vip/e/b"] = "Party B Moved\nNew venue"
+        state = store.load("posh")
+        second = await extractor.discover_events(crawl_state=state)
+        store.save_many(state)
+
+        assert client.scraped == ["https://posh.vip/e/b"]
+        assert sorted(e.title for e in second) == ["Party A", "Party B Moved"]
+        assert (state.new_count, state.changed_count, state.unchanged_count) == (0, 1, 1)
+
+    async def test_without_state_extracts_everything(self) -> None:
+        """Full crawls behave as before."""
+        client = FakeFirecrawlClient({"https://posh.vip/e/a": "Party A"})
+        events = await PoshExtractor(client=client).discover_events()
+        assert len(events) == 1
+        assert client.scraped == ["https://posh.vip/e/a"]
+
+    def test_clear(self, tmp_path) -> None:
+        """Clearing state forces a full re-extraction."""
+        store = CrawlStateStore(tmp_path / "crawl.db")
+        state = store.load("posh")
+        state.record("https://posh.vip/e/a", "hash", None)
+        store.save_many(state)
+
+        assert "https://posh.vip/e/a" in store.load("posh").previous
+        assert store.clear("posh") == 1
+        assert store.load("posh").previous == {}
@@ -0,0 +1,219 @@
+"""Tests for the unified OAuth credential store."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.services.credential_store import (
+    GOOGLE_PROVIDER,
+    MICROSOFT_PROVIDER,
+    CredentialService,
+    CredentialStore,
+    InMemoryCredentialStore,
+    StoredCredential,
+)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _credential(user_id: str = "user-1", expires_in: float = 3600, **kwargs) -> StoredCredential:
+    return StoredCredential(
+        provider=kwargs.pop("provider", GOOGLE_PROVIDER),
+        user_id=user_id,
+        access_token=kwargs.pop("access_token", "token-0"),
+        refresh_token=kwargs.pop("refresh_token", "refresh"),
+        expires_at=_now() + timedelta(seconds=expires_in),
+        scopes=["calendar"],
+    )
+
+
+class CountingRefresher:
+    """Refresher issuing token-1, token-2, ..."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self, credential: StoredCredential) -> StoredCredential:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return credential.model_copy(
+            update={
+                "access_token": f"token-{self.calls}",
+                "expires_at": _now() + timedelta(hours=1),
+            }
+        )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryCredentialStore()
+    return CredentialStore(tmp_path / "nested" / "credentials.db")
+
+
+@pytest.fixture
+def refresher() -> CountingRefresher:
+    return CountingRefresher()
+
+
+@pytest.fixture
+def service(store, refresher) -> CredentialService:
+    service = CredentialService(store=store)
+    service.register_refresher(GOOGLE_PROVIDER, refresher)
+    return service
+
+
+class TestStore:
+    """Test persistence backends."""
+
+    def test_round_trip(self, store) -> None:
+        """Credentials are keyed by provider and user."""
+        store.save(_credential())
+        store.save(_credential(provider=MICROSOFT_PROVIDER, access_token="ms"))
+
+        assert store.get(GOOGLE_PROVIDER, "user-1").access_token == "token-0"
+        assert store.get(MICROSOFT_PROVIDER, "user-1").access_token == "ms"
+        assert store.get(GOOGLE_PROVIDER, "other") is None
+        assert store.delete(GOOGLE_PROVIDER, "user-1") is True
+        assert store.delete(GOOGLE_PROVIDER, "user-1") is False
+
+    def test_list_expiring(self, store) -> None:
+        """Only refreshable credentials expiring before the cutoff are listed."""
+        store.save(_credential("soon", expires_in=60))
+        store.save(_credential("sooner", expires_in=10))
+        store.save(_credential("later", expires_in=3600))
+        store.save(_credential("stuck", expires_in=10, refresh_token=None))
+
+        expiring = store.list_expiring(_now() + timedelta(minutes=5))
+
+        assert [c.user_id for c in expiring] == ["sooner", "soon"]
+
+    def test_replace_is_compare_and_set(self, store) -> None:
+        """A replace only lands if the stored access token is the expected one."""
+        store.save(_credential())
+
+        assert store.replace(_credential(access_token="token-1"), "token-0") is True
+        assert store.replace(_credential(access_token="token-2"), "token-0") is False
+        assert store.get(GOOGLE_PROVIDER, "user-1").access_token == "token-1"
+        assert store.replace(_credential("nobody"), "token-0") is False
+
+
+class TestService:
+    """Test caching and refresh coordination."""
+
+    def test_lookups_cached_with_ttl(self, service, store, monkeypatch) -> None:
+        """Hits and misses are served from cache until the TTL lapses."""
+        service.save(_credential())
+        assert service.get(GOOGLE_PROVIDER, "nobody") is None
+
+        reads = []
+        original_get = store.get
+        monkeypatch.setattr(store, "get", lambda *key: reads.append(key) or original_get(*key))
+        assert service.get(GOOGLE_PROVIDER, "user-1").access_token == "token-0"
+        assert service.get(GOOGLE_PROVIDER, "nobody") is None
+        assert reads == []
+
+        service.cache_ttl_seconds = 0
+        service.get(GOOGLE_PROVIDER, "user-1")
+        assert reads == [(GOOGLE_PROVIDER, "user-1")]
+
+    async def test_fresh_token_not_refreshed(self, service, refresher) -> None:
+        """A valid token is returned as is."""
+        service.save(_credential())
+
+        assert await service.get_access_token(GOOGLE_PROVIDER, "user-1") == "token-0"
+        assert refresher.calls == 0
+
+    async def test_concurrent_refreshes_coalesce(self, service, refresher) -> None:
+        """Many callers with an expired token share one refresh."""
+        service.save(_credential(expires_in=-60))
+
+        tokens = await asyncio.gather(
+            *(service.get_access_token(GOOGLE_PROVIDER, "user-1") for _ in range(10))
+        )
+
+        assert refresher.calls == 1
+        assert set(tokens) == {"token-1"}
+
+    async def test_rejected_token_refreshed(self, service, refresher) -> None:
+        """A token the API rejected is replaced even before it expires."""
+        service.save(_credential())
+
+        token = await service.get_access_token(GOOGLE_PROVIDER, "user-1", rejected_token="token-0")
+
+        assert token == "token-1"
+
+    async def test_missing_or_unrefreshable(self, service) -> None:
+        """Unknown users and unrefreshable tokens raise ValueError."""
+        with pytest.raises(ValueError):
+            await service.get_access_token(GOOGLE_PROVIDER, "nobody")
+
+        service.save(_credential(expires_in=-60, refresh_token=None))
+        with pytest.raises(ValueError):
+            await service.get_access_token(GOOGLE_PROVIDER, "user-1")
+
+    async def test_proactive_refresh(self, service, refresher) -> None:
+        """Tokens near expiry are refreshed in the background sweep."""
+        service.save(_credential("soon", expires_in=120))
+        service.save(_credential("later", expires_in=3600))
+        service.save(_credential("ms", expires_in=60, provider=MICROSOFT_PROVIDER))
+
+        assert await service.refresh_expiring() == 1
+        assert service.get(GOOGLE_PROVIDER, "soon").access_token == "token-1"
+        assert service.get(GOOGLE_PROVIDER, "later").access_token == "token-0"
+
+    async def test_proactive_refresh_survives_failures(self, store) -> None:
+        """A failing refresher doesn't stop the sweep."""
+
+        async def failing(credential: StoredCredential) -> StoredCredential:
+            raise RuntimeError("token endpoint down")
+
+        service = CredentialService(store=store)
+        service.register_refresher(GOOGLE_PROVIDER, failing)
+        service.save(_credential(expires_in=60))
+
+        assert await service.refresh_expiring() == 0
+
+    async def test_concurrent_worker_refresh_kept(self, service, store) -> None:
+        """A token stored by another worker mid-refresh wins over ours."""
+
+        async def racing(credential: StoredCredential) -> StoredCredential:
+            store.save(_credential(access_token="other-worker"))
+            return credential.model_copy(update={"access_token": "ours"})
+
+        service.register_refresher(GOOGLE_PROVIDER, racing)
+        service.save(_credential(expires_in=-60))
+
+        assert await service.get_access_token(GOOGLE_PROVIDER, "user-1") == "other-worker"
+        assert store.get(GOOGLE_PROVIDER, "user-1").access_token == "other-worker"
+
+    async def test_loop_survives_store_errors(self, service, monkeypatch) -> None:
+        """A failing sweep is logged and the loop keeps running."""
+        calls = 0
+
+        def broken(before: datetime) -> list[StoredCredential]:
+            nonlocal calls
+            calls += 1
+            raise OSError("database is locked")
+
+        monkeypatch.setattr(service.store, "list_expiring", broken)
+        service.refresh_interval_seconds = 0.01
+
+        await service.start()
+        await asyncio.sleep(0.05)
+        assert not service._task.done()
+        await service.stop()
+        assert calls > 1
+
+    async def test_start_stop(self, service, refresher) -> None:
+        """The background loop refreshes on start and stops cleanly."""
+        service.save(_credential(expires_in=60))
+
+        await service.start()
+        await asyncio.sleep(0.05)
+        await service.stop()
+
+        assert refresher.calls == 1
@@ -0,0 +1,94 @@
+"""Tests for shared date normalization."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.services import date_parsing
+from api.services.date_parsing import (
+    DEFAULT_TIMEZONE,
+    TZ_ABBREVIATIONS,
+    _parse_known_formats,
+    parse_event_datetime,
+    parse_iso_datetime,
+    to_aware,
+)
+
+
+class TestParseEventDatetime:
+    """Test fast paths and the dateutil fallback."""
+
+    @pytest.mark.parametrize(
+        ("date_str", "time_str", "expected"),
+        [
+            ("January 15, 2026", None, datetime(2026, 1, 15)),
+            ("Jan 15th 2026", "7:00 PM", datetime(2026, 1, 15, 19, 0)),
+            ("Saturday, January 17, 2026", "11:30 am", datetime(2026, 1, 17, 11, 30)),
+            ("2026-01-15", "19:30", datetime(2026, 1, 15, 19, 30)),
+            ("January 15, 2026", "12 AM", datetime(2026, 1, 15, 0, 0)),
+        ],
+    )
+    def test_fast_paths(self, date_str: str, time_str: str | None, expected: datetime) -> None:
+        """Schema-format dates and times parse without dateutil."""
+        assert parse_event_datetime(date_str, time_str) == expected
+
+    def test_timezone_abbreviation(self) -> None:
+        """US zone abbreviations become real offsets."""
+        parsed = parse_event_datetime("January 15, 2026", "7:00 PM EST")
+
+        assert parsed == datetime(2026, 1, 15, 19, 0, tzinfo=TZ_ABBREVIATIONS["EST"])
+        assert parsed.utcoffset() == timedelta(hours=-5)
+
+    def test_generic_zone_follows_dst(self) -> None:
+        """'ET' is Eastern time with daylight saving."""
+        parsed = parse_event_datetime("July 4, 2026", "9 pm ET")
+        assert parsed.utcoffset() == timedelta(hours=-4)
+
+    def test_iso_with_offset(self) -> None:
+        """ISO timestamps keep their offset."""
+        parsed = parse_event_datetime("2026-01-15T19:00:00Z")
+        assert parsed is not None and parsed.utcoffset() == timedelta(0)
+
+    def test_fallback(self) -> None:
+        """Free text still parses through dateutil, with zone names."""
+        parsed = parse_event_datetime("Doors open Thu 15 Jan 2026 at 6pm", "CST")
+        assert parsed == datetime(2026, 1, 15, 18, 0, tzinfo=TZ_ABBREVIATIONS["CST"])
+
+    def test_unparseable(self) -> None:
+        """Garbage and impossible dates return None."""
+        assert parse_event_datetime("someday soon") is None
+        assert parse_event_datetime("February 30, 2026") is None
+
+    def test_cached(self) -> None:
+        """Repeated strings are served from the cache."""
+        _parse_known_formats.cache_clear()
+        parse_event_datetime("March 3, 2026", "8:00 PM")
+        parse_event_datetime("March 3, 2026", "8:00 PM")
+        assert _parse_known_formats.cache_info().hits == 1
+
+    def test_fallback_not_cached(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Fuzzy results depend on today's date, so they are re-parsed each time."""
+        defaults = iter([datetime(2026, 1, 1), datetime(2027, 1, 1)])
+        real_parse = date_parsing.dateutil_parser.parse
+
+        def parse(value: str, **kwargs: object) -> datetime:
+            return real_parse(value, default=next(defaults), **kwargs)
+
+        monkeypatch.setattr(date_parsing.dateutil_parser, "parse", parse)
+        assert parse_event_datetime("Friday March 5th").year == 2026
+        assert parse_event_datetime("Friday March 5th").year == 2027
+
+
+class TestIsoHelpers:
+    """Test ISO parsing and zone defaults."""
+
+    def test_parse_iso(self) -> None:
+        """Invalid values return None instead of raising."""
+        assert parse_iso_datetime("2026-01-15T19:00:00") == datetime(2026, 1, 15, 19, 0)
+        assert parse_iso_datetime("January 15") is None
+
+    def test_to_aware(self) -> None:
+        """Naive values are taken as local time."""
+        assert to_aware(datetime(2026, 1, 15)).tzinfo is DEFAULT_TIMEZONE
+        aware = datetime(2026, 1, 15, tzinfo=TZ_ABBREVIATIONS["UTC"])
+        assert to_aware(aware) is aware
@@ -0,0 +1,101 @@
+"""Tests for the async Exa transport."""
+
+import asyncio
+import json
+from datetime import datetime
+
+import httpx
+import pytest
+
+from api.services.exa_client import ExaClient
+
+
+def _result(index: int) -> dict:
+    return {
+        "id": f"r{index}",
+        "url": f"https://example.com/events/{index}",
+        "title": f"Event {index}",
+        "publishedDate": "2026-10-01T12:00:00.000Z",
+        "text": "Join us downtown",
+        "highlights": ["Free entry"],
+    }
+
+
+@pytest.fixture
+def requests_seen() -> list[httpx.Request]:
+    return []
+
+
+@pytest.fixture
+def client(requests_seen: list[httpx.Request]) -> ExaClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(request)
+        if request.url.path == "/search":
+            await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"results": [_result(0), {"title": "no url"}, _result(1)]})
+
+    exa = ExaClient(api_key="test-key")
+    exa._http_client = httpx.AsyncClient(
+        base_url=ExaClient.BASE_URL,
+        headers={"x-api-key": "test-key"},
+        transport=httpx.MockTransport(handler),
+    )
+    return exa
+
+
+class TestExaTransport:
+    """Test Search, findSimilar and Contents over HTTP."""
+
+    async def test_search_payload_and_parsing(self, client, requests_seen) -> None:
+        """Search options map to the REST payload; bad results are skipped."""
+        results = await client.search(
+            "events in Columbus",
+            num_results=5,
+            start_published_date=datetime(2026, 4, 1),
+            include_domains=["lu.ma"],
+        )
+
+        request = requests_seen[0]
+        assert request.headers["x-api-key"] == "test-key"
+        assert json.loads(request.content) == {
+            "query": "events in Columbus",
+            "numResults": 5,
+            "startPublishedDate": "2026-04-01",
+            "includeDomains": ["lu.ma"],
+            "contents": {"text": True, "highlights": True},
+        }
+        assert [r.id for r in results] == ["r0", "r1"]
+        assert results[0].published_date is not None
+        assert results[0].highlights == ["Free entry"]
+
+    async def test_find_similar_and_contents(self, client, requests_seen) -> None:
+        """findSimilar and Contents use their own endpoints."""
+        similar = await client.find_similar("https://example.com/events/0", num_results=3)
+        contents = await client.get_contents(["https://example.com/events/1"])
+
+        assert [r.url.path for r in requests_seen] == ["/findSimilar", "/contents"]
+        assert json.loads(requests_seen[0].content)["excludeSourceDomain"] is True
+        assert json.loads(requests_seen[1].content) == {
+            "urls": ["https://example.com/events/1"],
+            "text": True,
+        }
+        assert len(similar) == len(contents) == 2
+
+    async def test_concurrent_searches_share_client(self, client, requests_seen) -> None:
+        """Concurrent searches run on the event loop without a thread per call."""
+        results = await asyncio.gather(*[client.search(f"q{i}") for i in range(20)])
+
+        assert len(requests_seen) == 20
+        assert all(len(r) == 2 for r in results)
+
+    async def test_http_errors_return_empty(self, requests_seen) -> None:
+        """Upstream failures degrade to no results."""
+        exa = ExaClient(api_key="test-key")
+        exa._http_client = httpx.AsyncClient(
+            base_url=ExaClient.BASE_URL,
+            transport=httpx.MockTransport(lambda request: httpx.Response(429)),
+        )
+
+        assert await exa.search("q") == []
+        assert await exa.find_similar("https://example.com") == []
+        assert await exa.get_contents(["https://example.com"]) == []
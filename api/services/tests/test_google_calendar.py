@@ -0,0 +1,292 @@
+"""Tests for async Google Calendar writes."""
+
+import asyncio
+import json
+import re
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from google.oauth2.credentials import Credentials
+
+from api.services import google_calendar
+from api.services.credential_store import (
+    GOOGLE_PROVIDER,
+    CredentialService,
+    InMemoryCredentialStore,
+)
+from api.services.google_calendar import GoogleCalendarEvent, GoogleCalendarService
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _events(count: int) -> list[GoogleCalendarEvent]:
+    return [
+        GoogleCalendarEvent(summary=f"Event {i}", start=datetime(2026, 1, 10, 18, 0))
+        for i in range(count)
+    ]
+
+
+class FakeGoogle:
+    """Calendar API and token endpoint over MockTransport."""
+
+    def __init__(self) -> None:
+        self.valid_token = "fresh-token"
+        self.refreshes = 0
+        self.batch_sizes: list[int] = []
+        self.fail_summaries: set[str] = set()
+        self.flaky_summaries: set[str] = set()  # 503 on first attempt
+        self.lose_batch_responses = 0  # Batches applied but answered with 503
+        self.inserted: list[str] = []
+        self.ids: set[str] = set()
+
+    def insert(self, body: dict) -> tuple[int, dict]:
+        summary = body["summary"]
+        if summary in self.fail_summaries:
+            return 400, {"error": {"code": 400, "message": "Invalid start time"}}
+        if summary in self.flaky_summaries:
+            self.flaky_summaries.discard(summary)
+            return 503, {"error": {"code": 503, "message": "Backend Error"}}
+        event_id = body.get("id", f"id-{summary}")
+        if event_id in self.ids:
+            return 409, {"error": {"code": 409, "message": "The requested identifier already exists."}}
+        self.ids.add(event_id)
+        self.inserted.append(summary)
+        return 200, {"id": event_id, "summary": summary}
+
+    def batch(self, request: httpx.Request) -> httpx.Response:
+        boundary = re.search(r"boundary=(\S+)", request.headers["content-type"]).group(1)
+        parts = []
+        for part in request.content.decode().split(f"--{boundary}"):
+            content_id = re.search(r"Content-ID: <item-(\d+)>", part)
+            if content_id is None:
+                continue
+            status, payload = self.insert(json.loads(part.strip().split("\r\n\r\n")[-1]))
+            parts.append(
+                f"--resp\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-item-{content_id.group(1)}>\r\n\r\n"
+                f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n\r\n"
+                f"{json.dumps(payload)}\r\n"
+            )
+        self.batch_sizes.append(len(parts))
+        if self.lose_batch_responses:
+            self.lose_batch_responses -= 1
+            return httpx.Response(503)
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "multipart/mixed; boundary=resp"},
+            content="".join(parts) + "--resp--\r\n",
+        )
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host == "oauth2.googleapis.com":
+            self.refreshes += 1
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"access_token": self.valid_token, "expires_in": 3600})
+
+        if request.headers["authorization"] != f"Bearer {self.valid_token}":
+            return httpx.Response(401)
+
+        await asyncio.sleep(0.01)
+        if request.url.path == "/batch/calendar/v3":
+            return self.batch(request)
+        status, payload = self.insert(json.loads(request.content))
+        return httpx.Response(status, json=payload)
+
+
+@pytest.fixture
+def google() -> FakeGoogle:
+    return FakeGoogle()
+
+
+@pytest.fixture
+def service(google, tmp_path, monkeypatch) -> GoogleCalendarService:
+    monkeypatch.setattr(google_calendar, "TOKEN_DIR", tmp_path)
+    monkeypatch.setattr(google_calendar, "BATCH_RETRY_DELAY_SECONDS", 0)
+    credentials = CredentialService(store=InMemoryCredentialStore())
+    service = GoogleCalendarService(insert_concurrency=4, credentials=credentials)
+    service._http_client = httpx.AsyncClient(
+        base_url=google_calendar.CALENDAR_API_BASE,
+        transport=httpx.MockTransport(google.handler),
+    )
+    return service
+
+
+def _store(service: GoogleCalendarService, token: str, expiry: datetime) -> None:
+    service._store_credentials(
+        "user-1",
+        Credentials(
+            token=token,
+            refresh_token="refresh",
+            token_uri=google_calendar.TOKEN_URI,
+            client_id="client",
+            client_secret="secret",
+            expiry=expiry,
+        ),
+    )
+
+
+class TestCredentials:
+    """Test credential store integration and coalesced refresh."""
+
+    def test_status_served_from_cache(self, service, monkeypatch) -> None:
+        """Repeated status checks don't read the store."""
+        _store(service, "fresh-token", _utcnow() + timedelta(hours=1))
+        monkeypatch.setattr(service.credentials.store, "get", lambda *args: pytest.fail("read"))
+
+        assert all(service.has_valid_credentials("user-1") for _ in range(5))
+
+    def test_legacy_token_file_imported(self, service, tmp_path) -> None:
+        """A legacy token file is moved into the store on first use."""
+        token_path = service._get_token_path("user@example.com")
+        token_path.write_text(
+            json.dumps({"token": "legacy", "refresh_token": "refresh", "scopes": ["s"]})
+        )
+
+        assert service.has_valid_credentials("user@example.com")
+        assert not token_path.exists()
+        stored = service.credentials.store.get(GOOGLE_PROVIDER, "user@example.com")
+        assert stored.access_token == "legacy"
+
+    def test_revoke(self, service) -> None:
+        """Revoked credentials are gone from store and cache."""
+        _store(service, "fresh-token", _utcnow() + timedelta(hours=1))
+
+        assert service.revoke_credentials("user-1") is True
+        assert not service.has_valid_credentials("user-1")
+        assert service.revoke_credentials("user-1") is False
+
+    async def test_expired_token_refreshed_once(self, service, google) -> None:
+        """Concurrent inserts share one refresh of an expired token."""
+        _store(service, "old-token", _utcnow() - timedelta(minutes=5))
+
+        await asyncio.gather(*(service.create_event("user-1", e) for e in _events(10)))
+
+        assert google.refreshes == 1
+        stored = service.credentials.store.get(GOOGLE_PROVIDER, "user-1")
+        assert stored.access_token == "fresh-token"
+        assert stored.expires_at > datetime.now(timezone.utc)
+
+    async def test_rejected_token_refreshed_once(self, service, google) -> None:
+        """A 401 on an unexpired token triggers one refresh and a retry."""
+        _store(service, "revoked-token", _utcnow() + timedelta(hours=1))
+
+        results = await service.create_events_batch("user-1", _events(6))
+
+        assert google.refreshes == 1
+        assert all("id" in r for r in results)
+
+    async def test_missing_credentials(self, service) -> None:
+        """Users without credentials get a ValueError."""
+        with pytest.raises(ValueError):
+            await service.create_events_batch("nobody", _events(1))
+
+
+class TestBatchInsert:
+    """Test bulk inserts through the multipart batch endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def credentials(self, service) -> None:
+        _store(service, "fresh-token", _utcnow() + timedelta(hours=1))
+
+    async def test_chunks_of_fifty(self, service, google) -> None:
+        """Large exports are split into batches of 50, results in input order."""
+        results = await service.create_events_batch("user-1", _events(120))
+
+        assert sorted(google.batch_sizes) == [20, 50, 50]
+        assert [r["summary"] for r in results] == [f"Event {i}" for i in range(120)]
+        assert len({r["id"] for r in results}) == 120
+
+    async def test_partial_failure(self, service, google) -> None:
+        """A failed part is reported without failing the batch."""
+        google.fail_summaries = {"Event 1"}
+
+        results = await service.create_events_batch("user-1", _events(3))
+
+        assert google.batch_sizes == [3]
+        assert "id" in results[0] and "id" in results[2]
+        assert results[1] == {"error": "400 Invalid start time", "summary": "Event 1"}
+
+    async def test_transient_parts_retried_alone(self, service, google) -> None:
+        """Only transiently failed parts are resent; successes aren't repeated."""
+        google.flaky_summaries = {"Event 2", "Event 4"}
+
+        results = await service.create_events_batch("user-1", _events(5))
+
+        assert google.batch_sizes == [5, 2]
+        assert sorted(google.inserted) == [f"Event {i}" for i in range(5)]
+        assert all("id" in r for r in results)
+
+    async def test_lost_response_not_duplicated(self, service, google) -> None:
+        """A resent batch that already landed reports created, not duplicated."""
+        google.lose_batch_responses = 1
+
+        results = await service.create_events_batch("user-1", _events(3))
+
+        assert google.batch_sizes == [3, 3]
+        assert google.inserted == ["Event 0", "Event 1", "Event 2"]
+        assert [r["summary"] for r in results] == ["Event 0", "Event 1", "Event 2"]
+        assert all(re.fullmatch(r"[0-9a-v]{5,1024}", r["id"]) for r in results)
+
+    async def test_reexport_creates_again(self, service, google) -> None:
+        """Exporting the same picks twice creates them twice (IDs are per export)."""
+        first = await service.create_events_batch("user-1", _events(2))
+        second = await service.create_events_batch("user-1", _events(2))
+
+        assert google.inserted == ["Event 0", "Event 1"] * 2
+        assert all("id" in r for r in first + second)
+        assert {r["id"] for r in first}.isdisjoint(r["id"] for r in second)
+
+    async def test_first_attempt_conflict_is_error(self, service, google, monkeypatch) -> None:
+        """A 409 on the first attempt is an ID clash, reported as a failure."""
+        monkeypatch.setattr(google_calendar, "_event_id", lambda nonce, index: f"fixed{index}")
+        await service.create_events_batch("user-1", _events(1))
+
+        (result,) = await service.create_events_batch("user-1", _events(1))
+
+        assert result == {
+            "error": "409 The requested identifier already exists.",
+            "summary": "Event 0",
+        }
+        assert google.batch_sizes == [1, 1]
+
+    async def test_batch_request_failure(self, service) -> None:
+        """A batch that never succeeds reports every event as failed."""
+        service._http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(500))
+        )
+
+        results = await service.create_events_batch("user-1", _events(2))
+
+        assert [r["summary"] for r in results] == ["Event 0", "Event 1"]
+        assert all("500" in r["error"] for r in results)
+
+
+class TestBatchEncoding:
+    """Test multipart encoding and parsing."""
+
+    def test_round_trip(self) -> None:
+        """Parts are addressed by Content-ID in both directions."""
+        body = google_calendar._build_batch_body(
+            {7: ("/calendar/v3/calendars/primary/events", {"summary": "A"})}, "b1"
+        ).decode()
+        assert "Content-ID: <item-7>" in body
+        assert "POST /calendar/v3/calendars/primary/events HTTP/1.1" in body
+        assert body.endswith("--b1--\r\n")
+
+        response = httpx.Response(
+            200,
+            headers={"Content-Type": 'multipart/mixed; boundary="r1"'},
+            content=(
+                "--r1\r\nContent-Type: application/http\r\nContent-ID: <response-item-7>\r\n\r\n"
+                "HTTP/1.1 204 No Content\r\n\r\n\r\n--r1--\r\n"
+            ),
+        )
+        assert google_calendar._parse_batch_response(response) == {7: (204, {})}
+
+    def test_not_multipart(self) -> None:
+        """Non-multipart responses are rejected."""
+        with pytest.raises(ValueError):
+            google_calendar._parse_batch_response(httpx.Response(200, json={}))
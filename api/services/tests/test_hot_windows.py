@@ -0,0 +1,219 @@
+"""Tests for hot window materialization."""
+
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from api.models import EventResult, SearchProfile
+from api.models.search import TimeWindow
+from api.services.hot_windows import (
+    DEFAULT_HOT_WINDOWS,
+    HOT_WINDOW_TIMEZONE,
+    HotWindowRefresher,
+    HotWindowStore,
+    MaterializedSet,
+)
+from api.services.state_backend import LocalStateBackend
+
+# Wednesday
+NOW = datetime(2026, 10, 14, 12, 0, tzinfo=HOT_WINDOW_TIMEZONE)
+
+
+def _event(event_id: str, date: datetime, is_free: bool = True) -> EventResult:
+    return EventResult(
+        id=event_id,
+        title=f"Event {event_id}",
+        date=date.isoformat(),
+        location="Columbus, OH",
+        category="ai",
+        description="",
+        is_free=is_free,
+        distance_miles=1.0,
+    )
+
+
+def _windows() -> dict[str, tuple[datetime, datetime]]:
+    return {w.name: w.resolve(NOW) for w in DEFAULT_HOT_WINDOWS}
+
+
+def _set(window: str, category: str | None, events: list[EventResult], age: float = 0) -> MaterializedSet:
+    start, end = _windows()[window]
+    return MaterializedSet(
+        window=window,
+        category=category,
+        start=start,
+        end=end,
+        events=events,
+        source="exa",
+        refreshed_at=time.time() - age,
+    )
+
+
+def _profile(start: datetime, end: datetime, **kwargs) -> SearchProfile:
+    return SearchProfile(time_window=TimeWindow(start=start, end=end), **kwargs)
+
+
+class TestHotWindows:
+    """Test window boundaries."""
+
+    def test_window_bounds(self) -> None:
+        """Windows resolve to today, the coming weekend and next week."""
+        windows = _windows()
+        assert windows["tonight"][0].date() == NOW.date()
+        assert windows["this_weekend"][0].strftime("%A %H:%M") == "Friday 16:00"
+        assert windows["this_weekend"][1].strftime("%A %H:%M") == "Sunday 23:59"
+        assert windows["next_week"][0] == datetime(2026, 10, 19, tzinfo=HOT_WINDOW_TIMEZONE)
+
+    def test_weekend_in_progress(self) -> None:
+        """On Sunday the current weekend is still the hot window."""
+        sunday = NOW + timedelta(days=4)
+        start, _ = DEFAULT_HOT_WINDOWS[1].resolve(sunday)
+        assert start.date() == (NOW + timedelta(days=2)).date()
+
+
+class TestHotWindowStore:
+    """Test profile matching."""
+
+    def test_match_contained_window(self) -> None:
+        """A narrower window inside a materialized one matches the narrowest set."""
+        store = HotWindowStore()
+        store.put(_set("this_weekend", None, []))
+        store.put(_set("next_week", None, []))
+        start, _ = _windows()["this_weekend"]
+
+        saturday = start + timedelta(days=1)
+        match = store.match(_profile(saturday, saturday + timedelta(hours=12)))
+        assert match is not None
+        assert match.window == "this_weekend"
+
+    def test_naive_profile_times_are_local(self) -> None:
+        """Naive datetimes from the agent are read as Columbus time."""
+        store = HotWindowStore()
+        store.put(_set("tonight", None, []))
+        today = NOW.replace(tzinfo=None)
+        assert store.match(_profile(today.replace(hour=18), today.replace(hour=23))) is not None
+
+    def test_misses(self) -> None:
+        """Keywords, several categories, distance, stale sets and wide windows miss."""
+        store = HotWindowStore(max_age_seconds=60)
+        store.put(_set("tonight", None, []))
+        store.put(_set("tonight", "ai", [], age=120))
+        start, end = _windows()["tonight"]
+
+        assert store.match(_profile(start, end)) is not None
+        assert store.match(_profile(start, end, keywords=["python"])) is None
+        assert store.match(_profile(start, end, categories=["ai", "startup"])) is None
+        assert store.match(_profile(start, end, max_distance_miles=5)) is None
+        assert store.match(_profile(start, end, categories=["ai"])) is None
+        assert store.match(_profile(start, end + timedelta(days=1))) is None
+        assert store.match(SearchProfile()) is None
+
+
+class TestHotWindowRefresher:
+    """Test the refresh worker."""
+
+    async def test_refresh_once_materializes_each_combination(self) -> None:
+        """Every window/category pair is fetched and stored."""
+        calls: list[SearchProfile] = []
+
+        async def fetch(profile: SearchProfile) -> tuple[list[EventResult], str]:
+            calls.append(profile)
+            return [_event("e1", profile.time_window.start)], "exa"
+
+        store = HotWindowStore()
+        refresher = HotWindowRefresher(fetch, store, categories=(None, "ai"))
+        assert await refresher.refresh_once(NOW) == 6
+
+        assert len(calls) == 6
+        assert len(store) == 6
+        assert store.get("next_week", "ai") is not None
+
+    async def test_failed_fetch_keeps_previous_set(self) -> None:
+        """A failing refresh leaves the last good set in place."""
+
+        async def fetch(profile: SearchProfile) -> tuple[list[EventResult], str]:
+            raise RuntimeError("upstream down")
+
+        store = HotWindowStore()
+        previous = _set("tonight", None, [])
+        store.put(previous)
+        refresher = HotWindowRefresher(fetch, store, windows=DEFAULT_HOT_WINDOWS[:1], categories=(None,))
+
+        assert await refresher.refresh_once(NOW) == 0
+        assert store.get("tonight") is previous
+
+    async def test_only_lease_holder_refreshes(self) -> None:
+        """A second worker loads the leader's published sets instead of fetching."""
+        calls: list[SearchProfile] = []
+
+        async def fetch(profile: SearchProfile) -> tuple[list[EventResult], str]:
+            calls.append(profile)
+            return [_event("e1", profile.time_window.start)], "exa"
+
+        backend = LocalStateBackend()
+        leader_store, follower_store = HotWindowStore(), HotWindowStore()
+        leader = HotWindowRefresher(fetch, leader_store, categories=(None,), backend=backend)
+        follower = HotWindowRefresher(fetch, follower_store, categories=(None,), backend=backend)
+
+        assert await leader.sync_once(NOW) == 3
+        assert await follower.sync_once(NOW) == 3
+
+        assert len(calls) == 3
+        loaded = follower_store.get("this_weekend")
+        assert loaded is not None
+        assert loaded.start == leader_store.get("this_weekend").start
+        assert [e.id for e in loaded.events] == ["e1"]
+
+
+class TestSearchFromHotWindow:
+    """Test search_events answering from materialized sets."""
+
+    async def test_hot_hit_skips_sources(self) -> None:
+        """A matching profile is answered locally and narrowed to its window."""
+        from api.agents.search import search_events
+
+        weekend_start, _ = _windows()["this_weekend"]
+        saturday = (weekend_start + timedelta(days=1)).replace(hour=19)
+        events = [
+            _event("fri", weekend_start.replace(hour=19)),
+            _event("sat", saturday),
+            _event("sat-paid", saturday, is_free=False),
+        ]
+        store = HotWindowStore()
+        store.put(_set("this_weekend", None, events))
+
+        profile = _profile(
+            saturday.replace(hour=0), saturday.replace(hour=23, minute=59), free_only=True
+        )
+        with (
+            patch("api.agents.search.get_hot_window_store", return_value=store),
+            patch("api.agents.search.get_event_source_registry") as registry,
+        ):
+            result = await search_events(profile)
+
+        registry.assert_not_called()
+        assert [e.id for e in result.events] == ["sat"]
+        assert result.source == "exa"
+        assert result.result_handle is not None
+
+    async def test_hot_hit_trims_events_outside_window(self) -> None:
+        """Events a source returned outside the materialized window are dropped."""
+        from api.agents.search import search_events
+
+        weekend_start, weekend_end = _windows()["this_weekend"]
+        events = [
+            _event("fri-morning", weekend_start.replace(hour=9)),
+            _event("fri-night", weekend_start.replace(hour=20)),
+            _event("monday", weekend_end + timedelta(hours=10)),
+        ]
+        store = HotWindowStore()
+        store.put(_set("this_weekend", None, events))
+
+        with (
+            patch("api.agents.search.get_hot_window_store", return_value=store),
+            patch("api.agents.search.get_event_source_registry") as registry,
+        ):
+            result = await search_events(_profile(weekend_start, weekend_end))
+
+        registry.assert_not_called()
+        assert [e.id for e in result.events] == ["fri-night"]
@@ -0,0 +1,219 @@
+"""Tests for Microsoft Graph batching and paging."""
+
+import json
+from datetime import datetime
+
+import httpx
+import pytest
+
+from api.services import msgraph
+from api.services.msgraph import OutlookCalendarClient, OutlookEvent
+
+
+def _graph_event(event_id: str, title: str = "Event") -> dict:
+    return {
+        "id": event_id,
+        "subject": title,
+        "start": {"dateTime": "2026-01-10T18:00:00.0000000", "timeZone": "UTC"},
+        "end": {"dateTime": "2026-01-10T19:00:00.0000000", "timeZone": "UTC"},
+    }
+
+
+def _events(count: int) -> list[OutlookEvent]:
+    return [OutlookEvent(title=f"Event {i}", start=datetime(2026, 1, 10, 18, 0)) for i in range(count)]
+
+
+class FakeGraph:
+    """Graph $batch and paged event endpoints over MockTransport."""
+
+    def __init__(self, total_events: int = 0) -> None:
+        self.requests: list[httpx.Request] = []
+        self.batch_sizes: list[int] = []
+        self.total_events = total_events
+        self.fail_titles: set[str] = set()
+        self.throttled_titles: set[str] = set()  # 429 on first attempt
+        self.timeout_titles: set[str] = set()  # Created, but 504 on first attempt
+        self.transactions: dict[str, dict] = {}
+        self.inserted: list[str] = []
+
+    def batch_part(self, request: dict) -> dict:
+        if request["method"] == "DELETE":
+            status = 404 if request["url"].endswith("/missing") else 204
+            return {"id": request["id"], "status": status}
+
+        title = request["body"]["subject"]
+        if title in self.fail_titles:
+            return {"id": request["id"], "status": 400, "body": {"error": {"message": "Bad"}}}
+        if title in self.throttled_titles:
+            self.throttled_titles.discard(title)
+            return {"id": request["id"], "status": 429, "headers": {"Retry-After": "0"}}
+        transaction = request["body"].get("transactionId")
+        if transaction in self.transactions:
+            # Graph returns the event already created for this transactionId
+            return {"id": request["id"], "status": 201, "body": self.transactions[transaction]}
+        event = _graph_event(f"id-{title}", title)
+        self.inserted.append(title)
+        if transaction:
+            self.transactions[transaction] = event
+        if title in self.timeout_titles:
+            self.timeout_titles.discard(title)
+            return {"id": request["id"], "status": 504}
+        return {"id": request["id"], "status": 201, "body": event}
+
+    def page(self, request: httpx.Request) -> httpx.Response:
+        page_size = int(request.headers["prefer"].split("=")[1])
+        skip = int(request.url.params.get("$skip", 0))
+        items = [_graph_event(f"e{i}") for i in range(skip, min(skip + page_size, self.total_events))]
+        body: dict = {"value": items}
+        if skip + page_size < self.total_events:
+            link = "calendarView/delta" if "delta" in request.url.path else "calendar/events"
+            body["@odata.nextLink"] = f"{msgraph.GRAPH_API_BASE}/me/{link}?$skip={skip + page_size}"
+        elif "delta" in request.url.path:
+            body["value"].append({"id": "gone", "@removed": {"reason": "deleted"}})
+            body["@odata.deltaLink"] = f"{msgraph.GRAPH_API_BASE}/me/calendarView/delta?token=abc"
+        return httpx.Response(200, json=body)
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path.endswith("/$batch"):
+            parts = json.loads(request.content)["requests"]
+            self.batch_sizes.append(len(parts))
+            return httpx.Response(200, json={"responses": [self.batch_part(p) for p in reversed(parts)]})
+        return self.page(request)
+
+
+@pytest.fixture
+def graph() -> FakeGraph:
+    return FakeGraph(total_events=250)
+
+
+@pytest.fixture
+def client(graph, monkeypatch) -> OutlookCalendarClient:
+    monkeypatch.setattr(msgraph, "GRAPH_RETRY_DELAY_SECONDS", 0)
+    client = OutlookCalendarClient("token")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(graph.handler))
+    return client
+
+
+class TestBatch:
+    """Test JSON $batch creates and deletes."""
+
+    async def test_creates_in_batches_of_twenty(self, client, graph) -> None:
+        """45 creates take three batch requests; results keep input order."""
+        created = await client.create_events(_events(45))
+
+        assert graph.batch_sizes == [20, 20, 5]
+        assert [e.id for e in created] == [f"id-Event {i}" for i in range(45)]
+
+    async def test_failed_parts_skipped(self, client, graph) -> None:
+        """Failed creates are dropped without failing the batch."""
+        graph.fail_titles = {"Event 1"}
+
+        created = await client.create_events(_events(3))
+
+        assert [e.title for e in created] == ["Event 0", "Event 2"]
+
+    async def test_throttled_parts_retried_alone(self, client, graph) -> None:
+        """Only throttled parts are resent."""
+        graph.throttled_titles = {"Event 3"}
+
+        created = await client.create_events(_events(5))
+
+        assert graph.batch_sizes == [5, 1]
+        assert len(created) == 5
+
+    async def test_timed_out_create_not_duplicated(self, client, graph) -> None:
+        """A create that landed behind a 504 is resent with the same transactionId."""
+        graph.timeout_titles = {"Event 1"}
+
+        created = await client.create_events(_events(3))
+
+        assert graph.batch_sizes == [3, 1]
+        assert graph.inserted == ["Event 2", "Event 1", "Event 0"]
+        assert [e.title for e in created] == ["Event 0", "Event 1", "Event 2"]
+
+    async def test_delete_events(self, client, graph) -> None:
+        """Deletes report per-event outcomes."""
+        deleted = await client.delete_events(["a", "missing"])
+
+        assert deleted == {"a": True, "missing": False}
+        assert graph.batch_sizes == [2]
+
+
+class TestPaging:
+    """Test paged listing and delta sync."""
+
+    async def test_iter_events_follows_next_link(self, client, graph) -> None:
+        """All pages are streamed with the preferred page size."""
+        events = [event async for event in client.iter_events(page_size=100)]
+
+        assert len(events) == 250
+        assert len(graph.requests) == 3
+        assert graph.requests[0].headers["prefer"] == "odata.maxpagesize=100"
+        assert graph.requests[0].url.params["$orderby"] == "start/dateTime"
+
+    async def test_list_events_stops_at_limit(self, client, graph) -> None:
+        """list_events reads only the pages it needs."""
+        events = await client.list_events(limit=150)
+
+        assert len(events) == 150
+        assert len(graph.requests) == 2
+
+    async def test_delta_sync(self, client, graph) -> None:
+        """Delta pages carry changes, removals and a final delta link."""
+        pages = [
+            page
+            async for page in client.iter_event_changes(
+                datetime(2026, 1, 1), datetime(2026, 2, 1), page_size=200
+            )
+        ]
+
+        assert sum(len(page.events) for page in pages) == 250
+        assert pages[-1].removed_ids == ["gone"]
+        assert pages[0].delta_link is None
+        assert pages[-1].delta_link.endswith("token=abc")
+        assert graph.requests[0].url.params["startDateTime"] == "2026-01-01T00:00:00"
+
+    async def test_delta_requires_range_or_link(self, client) -> None:
+        """A first delta sync needs a date range."""
+        with pytest.raises(ValueError):
+            async for _ in client.iter_event_changes():
+                pass
+
+
+class TestStoredTokens:
+    """Test Microsoft tokens in the credential store."""
+
+    async def test_store_refresh_and_client(self, monkeypatch) -> None:
+        """Stored tokens are refreshed through MSAL and rotated."""
+        from datetime import timedelta, timezone
+
+        from api.services.credential_store import CredentialService, InMemoryCredentialStore
+
+        class FakeAuth:
+            def refresh_token(self, refresh_token: str) -> msgraph.TokenInfo:
+                assert refresh_token == "refresh-1"
+                return msgraph.TokenInfo(
+                    access_token="access-2",
+                    refresh_token="refresh-2",
+                    expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+                )
+
+        monkeypatch.setattr(msgraph, "get_msgraph_auth", FakeAuth)
+        credentials = CredentialService(store=InMemoryCredentialStore())
+        msgraph.register_outlook_credentials(credentials)
+        msgraph.store_outlook_tokens(
+            "user-1",
+            msgraph.TokenInfo(
+                access_token="access-1",
+                refresh_token="refresh-1",
+                expires_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+            ),
+            credentials,
+        )
+
+        client = await msgraph.get_outlook_client_for_user("user-1", credentials)
+
+        assert client.access_token == "access-2"
+        stored = credentials.get(msgraph.MICROSOFT_PROVIDER, "user-1")
+        assert stored.refresh_token == "refresh-2"
@@ -0,0 +1,123 @@
+"""Tests for the compiled result filter engine."""
+
+import math
+
+from api.models import EventResult
+from api.services.result_filter import (
+    ResultColumns,
+    compile_filter,
+    keyword_matcher,
+    parse_timestamp,
+)
+
+
+def _event(
+    event_id: str,
+    date: str,
+    category: str = "ai",
+    is_free: bool = True,
+    title: str = "Event",
+    description: str = "",
+) -> EventResult:
+    return EventResult(
+        id=event_id,
+        title=title,
+        date=date,
+        location="Columbus, OH",
+        category=category,
+        description=description,
+        is_free=is_free,
+        distance_miles=1.0,
+    )
+
+
+class TestParseTimestamp:
+    """Test timestamp parsing."""
+
+    def test_offsets_are_respected(self) -> None:
+        """Same instant with different offsets parses to the same value."""
+        assert parse_timestamp("2026-01-15T23:00:00+00:00") == parse_timestamp(
+            "2026-01-15T18:00:00-05:00"
+        )
+
+    def test_z_suffix(self) -> None:
+        """Trailing Z is treated as UTC."""
+        assert parse_timestamp("2026-01-15T23:00:00Z") == parse_timestamp(
+            "2026-01-15T23:00:00+00:00"
+        )
+
+    def test_unparseable_is_nan(self) -> None:
+        """Missing or invalid dates become NaN."""
+        assert math.isnan(parse_timestamp("sometime soon"))
+        assert math.isnan(parse_timestamp(None))
+
+
+class TestCompileFilter:
+    """Test compiled refinement predicates."""
+
+    def test_time_filter_compares_instants_not_strings(self) -> None:
+        """An event at 23:30 UTC is after 18:00 Eastern even though the string sorts lower."""
+        events = [
+            _event("utc", "2026-01-15T23:30:00+00:00"),
+            _event("early", "2026-01-15T12:00:00-05:00"),
+        ]
+        compiled = compile_filter(after_time="2026-01-15T18:00:00-05:00")
+
+        assert [e.id for e in compiled.apply(events)] == ["utc"]
+
+    def test_naive_bounds_use_default_timezone(self) -> None:
+        """Naive bounds are interpreted in Eastern time."""
+        events = [_event("evening", "2026-01-15T19:00:00-05:00")]
+        compiled = compile_filter(before_time="2026-01-15T20:00:00")
+
+        assert len(compiled.apply(events)) == 1
+
+    def test_combined_filters_single_pass(self) -> None:
+        """All clauses must match."""
+        events = [
+            _event("a", "2026-01-15T19:00:00-05:00", category="AI", is_free=True),
+            _event("b", "2026-01-15T19:00:00-05:00", category="music", is_free=True),
+            _event("c", "2026-01-15T19:00:00-05:00", category="ai", is_free=False),
+        ]
+        compiled = compile_filter(free_only=True, categories=["ai"])
+        columns = ResultColumns.from_events(events)
+
+        assert compiled.indices(columns) == [0]
+        assert compiled.explanations == ("free events only", "categories: ai")
+
+    def test_unparseable_dates_fail_time_filters(self) -> None:
+        """Events with bad dates never satisfy a time bound."""
+        events = [_event("bad", "TBD")]
+        compiled = compile_filter(after_time="2026-01-01T00:00:00")
+
+        assert compiled.apply(events) == []
+
+    def test_custom_criteria_keywords(self) -> None:
+        """Custom criteria match whole keywords in title/description."""
+        events = [
+            _event("jazz", "2026-01-15T19:00:00", title="Jazz Night"),
+            _event("talk", "2026-01-15T19:00:00", title="AI Talk"),
+        ]
+        compiled = compile_filter(custom_criteria="show me jazz events")
+
+        assert [e.id for e in compiled.apply(events)] == ["jazz"]
+
+    def test_no_criteria_keeps_everything(self) -> None:
+        """An empty refinement passes every event."""
+        events = [_event("a", "2026-01-15T19:00:00")]
+        compiled = compile_filter()
+
+        assert compiled.apply(events) == events
+        assert compiled.explanations == ()
+
+
+class TestKeywordMatcher:
+    """Test the cached keyword matcher."""
+
+    def test_stopwords_only_returns_none(self) -> None:
+        """Criteria without keywords produce no matcher."""
+        assert keyword_matcher("show me the events") is None
+
+    def test_matcher_is_cached(self) -> None:
+        """Repeated criteria reuse the compiled pattern."""
+        assert keyword_matcher("outdoor music") is keyword_matcher("outdoor music")
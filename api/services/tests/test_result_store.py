@@ -0,0 +1,106 @@
+"""Tests for ResultStore."""
+
+import pytest
+
+from api.models import EventResult
+from api.services.result_store import MAX_PAGE_SIZE, ResultStore
+
+
+def _event(i: int) -> EventResult:
+    return EventResult(
+        id=f"evt-{i}",
+        title=f"Event {i}",
+        date=f"2026-01-{10 + i:02d}T18:00:00",
+        location="Venue",
+        category="ai",
+        description="Description",
+        is_free=i % 2 == 0,
+        distance_miles=1.0,
+    )
+
+
+class TestResultStore:
+    """Test cases for ResultStore."""
+
+    @pytest.fixture
+    def store(self) -> ResultStore:
+        """Create an empty store."""
+        return ResultStore(ttl_seconds=60, max_sets=3)
+
+    def test_put_and_get(self, store: ResultStore) -> None:
+        """Stored events are returned by handle in order."""
+        events = [_event(i) for i in range(3)]
+        handle = store.put(events, source="exa")
+
+        assert handle.startswith("rs-")
+        result_set = store.get(handle)
+        assert result_set is not None
+        assert [e.id for e in result_set.events] == ["evt-0", "evt-1", "evt-2"]
+        assert result_set.source == "exa"
+
+    def test_get_unknown_handle(self, store: ResultStore) -> None:
+        """Unknown handles return None."""
+        assert store.get("rs-missing") is None
+
+    def test_page(self, store: ResultStore) -> None:
+        """Pages slice the stored set."""
+        handle = store.put([_event(i) for i in range(10)])
+
+        page = store.page(handle, offset=4, limit=3)
+
+        assert page is not None
+        assert [e.id for e in page] == ["evt-4", "evt-5", "evt-6"]
+        assert store.page("rs-missing") is None
+
+    def test_page_limit_is_clamped(self, store: ResultStore) -> None:
+        """Page sizes are clamped to 1..MAX_PAGE_SIZE."""
+        handle = store.put([_event(i) for i in range(MAX_PAGE_SIZE + 10)])
+
+        assert len(store.page(handle, limit=10_000)) == MAX_PAGE_SIZE
+        assert len(store.page(handle, limit=0)) == 1
+        assert len(store.page(handle, limit=-5)) == 1
+
+    def test_session_scope(self, store: ResultStore) -> None:
+        """A scoped set is invisible to other sessions; claim scopes an unscoped set."""
+        scoped = store.put([_event(1)], session_id="s1")
+        assert store.get(scoped, "s1") is not None
+        assert store.get(scoped, "s2") is None
+        assert store.page(scoped, session_id="s2") is None
+
+        unscoped = store.put([_event(2)])
+        assert store.claim(unscoped, "s1")
+        assert not store.claim(unscoped, "s2")
+        assert store.get(unscoped) is None
+        assert store.get(unscoped, "s1") is not None
+
+    def test_get_event_and_ids(self, store: ResultStore) -> None:
+        """Result sets expose lookup by event ID."""
+        handle = store.put([_event(1), _event(2)])
+        result_set = store.get(handle)
+
+        assert result_set is not None
+        assert result_set.get_event("evt-2") is not None
+        assert result_set.get_event("evt-9") is None
+        assert result_set.event_ids == {"evt-1", "evt-2"}
+
+    def test_lru_eviction(self, store: ResultStore) -> None:
+        """Least recently used sets are evicted past max_sets."""
+        first = store.put([_event(0)])
+        second = store.put([_event(1)])
+        store.put([_event(2)])
+
+        # Touch the first set so the second becomes least recently used
+        assert store.get(first) is not None
+        store.put([_event(3)])
+
+        assert len(store) == 3
+        assert store.get(first) is not None
+        assert store.get(second) is None
+
+    def test_expired_sets_are_dropped(self) -> None:
+        """Sets older than the TTL are not returned."""
+        store = ResultStore(ttl_seconds=-1)
+        handle = store.put([_event(0)])
+
+        assert store.get(handle) is None
+        assert store.clear_expired() == 0
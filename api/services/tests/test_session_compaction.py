@@ -0,0 +1,131 @@
+"""Tests for conversation history compaction."""
+
+import json
+
+import pytest
+
+from api.services.session import InMemorySession
+from api.services.session_compaction import (
+    CompactingSession,
+    compact_items,
+    compact_tool_output,
+    estimate_tokens,
+)
+
+
+def _search_output(handle: str, count: int) -> str:
+    events = [
+        {"id": f"evt-{i}", "title": f"Event {i}", "description": "x" * 200}
+        for i in range(count)
+    ]
+    return json.dumps(
+        {"events": events, "source": "exa", "result_handle": handle, "total_count": count}
+    )
+
+
+def _turn(n: int, handle: str, count: int = 10) -> list[dict]:
+    return [
+        {"role": "user", "content": f"question {n}"},
+        {"type": "function_call", "call_id": f"call-{n}", "name": "search_events", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": f"call-{n}", "output": _search_output(handle, count)},
+        {"type": "message", "role": "assistant", "content": [{"type": "output_text", "text": f"answer {n}"}]},
+    ]
+
+
+class TestCompactToolOutput:
+    """Test tool output compaction."""
+
+    def test_search_result_becomes_reference(self) -> None:
+        """Event payloads are replaced with handle, counts and titles."""
+        compact = json.loads(compact_tool_output(_search_output("rs-abc", 12)))
+
+        assert compact["result_handle"] == "rs-abc"
+        assert compact["event_count"] == 12
+        assert compact["total_count"] == 12
+        assert len(compact["titles"]) == 5
+        assert "events" not in compact
+
+    def test_long_text_is_truncated(self) -> None:
+        """Non-event outputs are truncated."""
+        assert compact_tool_output("y" * 2000).endswith("[compacted]")
+
+    def test_short_text_unchanged(self) -> None:
+        """Short non-JSON outputs pass through."""
+        assert compact_tool_output("ok") == "ok"
+
+
+class TestCompactItems:
+    """Test history windowing."""
+
+    def test_recent_turns_kept_verbatim(self) -> None:
+        """Only tool outputs before the recent turns are compacted."""
+        items = _turn(1, "rs-1") + _turn(2, "rs-2") + _turn(3, "rs-3")
+
+        view = compact_items(items, token_budget=100_000, keep_recent_turns=2)
+
+        assert len(view) == len(items)
+        assert json.loads(view[2]["output"])["compacted"] is True
+        assert view[6]["output"] == items[6]["output"]
+        assert view[10]["output"] == items[10]["output"]
+        # Input items are not mutated
+        assert "events" in json.loads(items[2]["output"])
+
+    def test_budget_drops_whole_oldest_turns(self) -> None:
+        """Oldest turns are dropped whole so calls and outputs stay paired."""
+        items = _turn(1, "rs-1", 40) + _turn(2, "rs-2", 40) + _turn(3, "rs-3", 40)
+        last_turn_tokens = sum(estimate_tokens(i) for i in items[8:])
+
+        view = compact_items(items, token_budget=last_turn_tokens, keep_recent_turns=1)
+
+        assert view[0] == {"role": "user", "content": "question 3"}
+        call_ids = {i["call_id"] for i in view if i.get("type") == "function_call"}
+        output_ids = {i["call_id"] for i in view if i.get("type") == "function_call_output"}
+        assert call_ids == output_ids
+
+    def test_last_turn_always_kept(self) -> None:
+        """Even an oversized final turn is returned."""
+        items = _turn(1, "rs-1", 40)
+
+        assert compact_items(items, token_budget=1) == items
+
+    def test_empty_history(self) -> None:
+        """Empty history stays empty."""
+        assert compact_items([]) == []
+
+
+class TestCompactingSession:
+    """Test the session wrapper."""
+
+    @pytest.fixture(autouse=True)
+    def clear_sessions(self):
+        """Reset in-memory session storage."""
+        InMemorySession.clear_all()
+        yield
+        InMemorySession.clear_all()
+
+    async def test_full_transcript_kept(self) -> None:
+        """Reads are compacted while the full transcript is preserved."""
+        session = CompactingSession(
+            InMemorySession("compact-test"), token_budget=100_000, keep_recent_turns=1
+        )
+        items = _turn(1, "rs-1") + _turn(2, "rs-2")
+        await session.add_items(items)
+
+        view = await session.get_items()
+        full = await session.get_full_transcript()
+
+        assert json.loads(view[2]["output"])["compacted"] is True
+        assert full == items
+        assert len(await session.get_items(limit=3)) == 3
+
+    async def test_limit_keeps_calls_paired(self) -> None:
+        """A limited window never starts with an orphaned tool output."""
+        session = CompactingSession(InMemorySession("compact-limit"), token_budget=100_000)
+        await session.add_items(_turn(1, "rs-1") + _turn(2, "rs-2"))
+
+        assert await session.get_items(limit=0) == []
+        window = await session.get_items(limit=6)
+        assert len(window) == 5
+        assert window[0]["role"] == "assistant"
+        assert window[-2]["type"] == "function_call_output"
+        assert len(await session.get_items(limit=7)) == 7
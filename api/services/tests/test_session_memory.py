@@ -0,0 +1,138 @@
+"""Tests for bounded in-memory session storage."""
+
+import pytest
+
+from api.services.session import InMemorySession
+from api.services.session_memory import BoundedSessionStorage, estimate_item_bytes
+
+
+def _turn(n: int) -> list[dict]:
+    return [
+        {"role": "user", "content": f"question {n}"},
+        {"type": "function_call", "call_id": f"call-{n}", "name": "search_events"},
+        {"type": "function_call_output", "call_id": f"call-{n}", "output": "{}"},
+        {"type": "message", "role": "assistant", "content": f"answer {n}"},
+    ]
+
+
+class TestBoundedSessionStorage:
+    """Test storage bounds and accounting."""
+
+    def test_extend_and_get(self) -> None:
+        """Items round-trip and get returns a copy."""
+        storage = BoundedSessionStorage()
+        storage.extend("s1", _turn(1))
+
+        items = storage.get("s1")
+        items.clear()
+        assert len(storage.get("s1")) == 4
+        assert storage.get("s1", limit=1) == [_turn(1)[-1]]
+        assert storage.get("unknown") == []
+
+    def test_item_cap_drops_whole_turns(self) -> None:
+        """Trimming cuts at a user message so tool pairs stay intact."""
+        storage = BoundedSessionStorage(max_items_per_session=6)
+        storage.extend("s1", _turn(1))
+        storage.extend("s1", _turn(2))
+
+        items = storage.get("s1")
+        assert items == _turn(2)
+        assert storage.metrics().trimmed_items == 4
+
+    def test_trim_without_turn_boundary_keeps_pairs(self) -> None:
+        """A long tool loop is cut at the cap without orphaning outputs."""
+        storage = BoundedSessionStorage(max_items_per_session=4)
+        calls = []
+        for n in range(3):
+            calls += _turn(n)[1:3]
+        storage.extend("s1", [{"role": "user", "content": "go"}, *calls])
+
+        items = storage.get("s1")
+        call_ids = {i["call_id"] for i in items if i["type"] == "function_call"}
+        assert items == calls[2:]
+        assert all(i["call_id"] in call_ids for i in items)
+        assert storage.metrics().trimmed_items == 3
+
+        storage.extend("s1", [{"type": "function_call_output", "call_id": "call-1", "output": "{}"}])
+        items = storage.get("s1")
+        assert items == [calls[4], calls[5]]
+        assert storage.metrics().total_bytes == sum(estimate_item_bytes(i) for i in items)
+
+    def test_byte_accounting(self) -> None:
+        """Total bytes track adds, pops and clears."""
+        storage = BoundedSessionStorage()
+        items = _turn(1)
+        storage.extend("s1", items)
+        expected = sum(estimate_item_bytes(i) for i in items)
+        assert storage.metrics().total_bytes == expected
+
+        last = storage.pop("s1")
+        assert storage.metrics().total_bytes == expected - estimate_item_bytes(last)
+
+        storage.clear("s1")
+        assert storage.metrics().total_bytes == 0
+        assert "s1" not in storage
+
+    def test_memory_cap_evicts_lru(self) -> None:
+        """Least recently used sessions are evicted to fit the byte cap."""
+        one_turn = sum(estimate_item_bytes(i) for i in _turn(1))
+        storage = BoundedSessionStorage(max_total_bytes=one_turn * 2 + 10)
+        storage.extend("s1", _turn(1))
+        storage.extend("s2", _turn(1))
+        storage.get("s1")  # s2 is now least recently used
+        storage.extend("s3", _turn(1))
+
+        assert "s1" in storage
+        assert "s2" not in storage
+        assert "s3" in storage
+        assert storage.metrics().memory_evictions == 1
+
+    def test_idle_sessions_evicted(self) -> None:
+        """Sessions idle past the timeout are dropped."""
+        storage = BoundedSessionStorage(idle_timeout_seconds=-1)
+        storage.extend("s1", _turn(1))
+
+        assert storage.get("s1") == []
+        assert storage.metrics().idle_evictions == 1
+
+    def test_evict_idle_sweep(self) -> None:
+        """evict_idle removes every idle session."""
+        storage = BoundedSessionStorage(idle_timeout_seconds=-1)
+        storage.extend("s1", _turn(1))
+        storage.extend("s2", _turn(1))
+
+        assert storage.evict_idle() == 2
+        assert len(storage) == 0
+        assert storage.metrics().total_bytes == 0
+
+
+class TestInMemorySession:
+    """Test InMemorySession on top of the bounded storage."""
+
+    @pytest.fixture(autouse=True)
+    def _clear(self):
+        InMemorySession.clear_all()
+        yield
+        InMemorySession.clear_all()
+
+    async def test_shared_across_instances(self) -> None:
+        """Instances with the same ID see the same history."""
+        await InMemorySession("s1").add_items(_turn(1))
+        assert len(await InMemorySession("s1").get_items()) == 4
+
+    async def test_pop_and_clear(self) -> None:
+        """pop_item and clear_session update storage."""
+        session = InMemorySession("s1")
+        await session.add_items(_turn(1))
+
+        assert (await session.pop_item())["content"] == "answer 1"
+        await session.clear_session()
+        assert await session.get_items() == []
+        assert await session.pop_item() is None
+
+    async def test_metrics(self) -> None:
+        """Class-level metrics reflect stored sessions."""
+        await InMemorySession("s1").add_items(_turn(1))
+        metrics = InMemorySession.metrics()
+        assert metrics.sessions == 1
+        assert metrics.items == 4
@@ -0,0 +1,196 @@
+"""Tests for the pooled SQLite session store."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from agents import SQLiteSession
+
+from api.services.session import SessionManager
+from api.services.session_store import SQLiteSessionStore
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    return tmp_path / "sessions.db"
+
+
+def _msg(text: str) -> dict:
+    return {"role": "user", "content": text}
+
+
+class TestPooledSession:
+    """Test session reads and writes through the store."""
+
+    async def test_items_round_trip_after_flush(self, db_path: Path) -> None:
+        """Flushed items are visible to a fresh store."""
+        store = SQLiteSessionStore(db_path)
+        session = store.get_session("s1")
+        await session.add_items([_msg("a"), _msg("b")])
+        await store.close()
+
+        reopened = SQLiteSessionStore(db_path)
+        assert await reopened.get_session("s1").get_items() == [_msg("a"), _msg("b")]
+        await reopened.close()
+
+    async def test_writes_are_buffered(self, db_path: Path) -> None:
+        """add_items does not hit the database until a flush."""
+        store = SQLiteSessionStore(db_path, flush_interval=60)
+        session = store.get_session("s1")
+        await session.add_items([_msg("a")])
+
+        assert session.has_pending
+        assert store._load_items("s1") == []
+        assert await session.get_items() == [_msg("a")]
+
+        await store.flush_all()
+        assert not session.has_pending
+        assert store._load_items("s1") == [_msg("a")]
+        await store.close()
+
+    async def test_batch_size_triggers_flush(self, db_path: Path) -> None:
+        """Reaching the batch size flushes without waiting for the interval."""
+        store = SQLiteSessionStore(db_path, flush_interval=60, flush_batch_size=2)
+        session = store.get_session("s1")
+        await session.add_items([_msg("a"), _msg("b")])
+        await asyncio.sleep(0.05)
+
+        assert store._load_items("s1") == [_msg("a"), _msg("b")]
+        await store.close()
+
+    async def test_delayed_flush(self, db_path: Path) -> None:
+        """Buffered items are written after the flush interval."""
+        store = SQLiteSessionStore(db_path, flush_interval=0.01)
+        await store.get_session("s1").add_items([_msg("a")])
+        await asyncio.sleep(0.1)
+
+        assert store._load_items("s1") == [_msg("a")]
+        await store.close()
+
+    async def test_pop_item(self, db_path: Path) -> None:
+        """pop_item removes pending and persisted items."""
+        store = SQLiteSessionStore(db_path)
+        session = store.get_session("s1")
+        await session.add_items([_msg("a"), _msg("b")])
+        await store.flush_all()
+        await session.add_items([_msg("c")])
+
+        assert await session.pop_item() == _msg("c")
+        assert await session.pop_item() == _msg("b")
+        await store.flush_all()
+        assert store._load_items("s1") == [_msg("a")]
+        await store.close()
+
+    async def test_clear_session(self, db_path: Path) -> None:
+        """clear_session drops memory, buffer and rows."""
+        store = SQLiteSessionStore(db_path)
+        session = store.get_session("s1")
+        await session.add_items([_msg("a")])
+        await store.flush_all()
+        await session.add_items([_msg("b")])
+        await session.clear_session()
+
+        assert await session.get_items() == []
+        await store.flush_all()
+        assert store._load_items("s1") == []
+        await store.close()
+
+    async def test_compatible_with_sdk_session(self, db_path: Path) -> None:
+        """Rows are readable by the agents SDK SQLiteSession."""
+        store = SQLiteSessionStore(db_path)
+        await store.get_session("s1").add_items([_msg("a")])
+        await store.close()
+
+        sdk_session = SQLiteSession("s1", str(db_path))
+        assert await sdk_session.get_items() == [_msg("a")]
+        sdk_session.close()
+
+
+class TestStoreLRU:
+    """Test hot session caching."""
+
+    def test_same_object_for_same_id(self, db_path: Path) -> None:
+        """Repeated lookups reuse the hot session object."""
+        store = SQLiteSessionStore(db_path)
+        assert store.get_session("s1") is store.get_session("s1")
+
+    async def test_eviction_flushes_pending(self, db_path: Path) -> None:
+        """Evicted sessions persist their buffered items."""
+        store = SQLiteSessionStore(db_path, max_hot_sessions=1, flush_interval=60)
+        await store.get_session("s1").add_items([_msg("a")])
+        store.get_session("s2")
+        await asyncio.gather(*store._flush_tasks)
+
+        assert "s1" not in store._sessions
+        assert store._load_items("s1") == [_msg("a")]
+        assert await store.get_session("s1").get_items() == [_msg("a")]
+        await store.close()
+
+    async def test_hot_history_sees_other_workers(self, db_path: Path) -> None:
+        """A cached session reloads after another store writes the same database."""
+        worker_a = SQLiteSessionStore(db_path)
+        worker_b = SQLiteSessionStore(db_path)
+        session_a = worker_a.get_session("s1")
+        session_b = worker_b.get_session("s1")
+
+        await session_a.add_items([_msg("a")])
+        await worker_a.flush_all()
+        assert await session_b.get_items() == [_msg("a")]
+
+        await session_b.add_items([_msg("b")])
+        await worker_b.flush_all()
+        assert await session_a.get_items() == [_msg("a"), _msg("b")]
+
+        assert await session_b.pop_item() == _msg("b")
+        assert await session_a.get_items() == [_msg("a")]
+
+        await session_a.clear_session()
+        assert await session_b.get_items() == []
+        await worker_a.close()
+        await worker_b.close()
+
+    async def test_own_writes_keep_cache(self, db_path: Path, monkeypatch) -> None:
+        """Flushing our own items doesn't force a reload."""
+        store = SQLiteSessionStore(db_path)
+        session = store.get_session("s1")
+        await session.add_items([_msg("a")])
+        await store.flush_all()
+
+        monkeypatch.setattr(store, "_load_snapshot", lambda session_id: pytest.fail("reloaded"))
+        await session.add_items([_msg("b")])
+        await store.flush_all()
+        assert await session.get_items() == [_msg("a"), _msg("b")]
+        await store.close()
+
+    async def test_evicted_session_in_use_is_reused(self, db_path: Path) -> None:
+        """A session evicted mid-request keeps its later writes and stays the live object."""
+        store = SQLiteSessionStore(db_path, max_hot_sessions=1, flush_interval=60)
+        in_use = store.get_session("s1")
+        await in_use.add_items([_msg("a")])
+        store.get_session("s2")
+
+        # The request still holding the evicted object keeps writing
+        await in_use.add_items([_msg("b")])
+        assert store.get_session("s1") is in_use
+        assert await store.get_session("s1").get_items() == [_msg("a"), _msg("b")]
+
+        await store.flush_all()
+        assert store._load_items("s1") == [_msg("a"), _msg("b")]
+        await store.close()
+
+
+class TestSessionManagerPersistence:
+    """Test SessionManager uses the pooled store."""
+
+    async def test_manager_reuses_store_sessions(self, db_path: Path) -> None:
+        """Persistent managers hand out pooled sessions."""
+        manager = SessionManager(db_path=db_path, use_persistence=True, token_budget=0)
+        session = manager.get_session("s1")
+        assert session is manager.get_session("s1")
+
+        await session.add_items([_msg("a")])
+        await manager.close()
+
+        fresh = SessionManager(db_path=db_path, use_persistence=True, token_budget=0)
+        assert await fresh.get_session("s1").get_items() == [_msg("a")]
+        await fresh.close()
@@ -0,0 +1,137 @@
+"""Tests for SSE connection management and bounded push queues."""
+
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from api.config import Settings
+from api.services.sse_connections import (
+    BoundedEventQueue,
+    OverflowPolicy,
+    QueueClosed,
+    SSEConnectionManager,
+)
+
+
+def _drain(queue: BoundedEventQueue) -> list[dict]:
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+class TestBoundedEventQueue:
+    """Test overflow policies."""
+
+    def test_unknown_policy_fails_settings_validation(self) -> None:
+        """A misspelled SSE_OVERFLOW_POLICY is rejected at startup."""
+        with pytest.raises(ValidationError):
+            Settings(sse_overflow_policy="drop-oldest")
+
+    def test_drop_oldest(self) -> None:
+        """A full queue discards its oldest event."""
+        queue = BoundedEventQueue(maxsize=2, policy=OverflowPolicy.DROP_OLDEST)
+        for i in range(3):
+            assert queue.put_nowait({"type": "e", "n": i})
+
+        assert [e["n"] for e in _drain(queue)] == [1, 2]
+        assert queue.dropped == 1
+
+    def test_coalesce_replaces_same_type(self) -> None:
+        """A full queue replaces the newest event of the same type."""
+        queue = BoundedEventQueue(maxsize=2, policy=OverflowPolicy.COALESCE)
+        queue.put_nowait({"type": "status", "n": 0})
+        queue.put_nowait({"type": "more_events", "n": 1})
+        queue.put_nowait({"type": "status", "n": 2})
+
+        assert _drain(queue) == [{"type": "status", "n": 2}, {"type": "more_events", "n": 1}]
+
+    def test_coalesce_falls_back_to_drop_oldest(self) -> None:
+        """Without a same-type event, coalesce drops the oldest."""
+        queue = BoundedEventQueue(maxsize=1, policy=OverflowPolicy.COALESCE)
+        queue.put_nowait({"type": "a"})
+        queue.put_nowait({"type": "b"})
+
+        assert _drain(queue) == [{"type": "b"}]
+
+    def test_disconnect_rejects(self) -> None:
+        """A full queue under DISCONNECT rejects the event."""
+        queue = BoundedEventQueue(maxsize=1, policy=OverflowPolicy.DISCONNECT)
+        assert queue.put_nowait({"type": "a"})
+        assert not queue.put_nowait({"type": "b"})
+        assert _drain(queue) == [{"type": "a"}]
+
+    async def test_get_waits_for_event(self) -> None:
+        """get() resolves when an event is pushed."""
+        queue = BoundedEventQueue()
+        waiter = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        queue.put_nowait({"type": "a"})
+        assert await asyncio.wait_for(waiter, timeout=1) == {"type": "a"}
+
+    def test_get_nowait_empty(self) -> None:
+        """get_nowait raises QueueEmpty when empty."""
+        with pytest.raises(asyncio.QueueEmpty):
+            BoundedEventQueue().get_nowait()
+
+
+class TestSSEConnectionManager:
+    """Test registration and pushes."""
+
+    async def test_push_to_registered(self) -> None:
+        """Pushes reach the registered connection."""
+        manager = SSEConnectionManager()
+        conn = await manager.register("s1")
+
+        assert await manager.push_event("s1", {"type": "more_events"})
+        assert conn.queue.get_nowait() == {"type": "more_events"}
+        assert not await manager.push_event("s2", {"type": "more_events"})
+
+    async def test_slow_consumer_does_not_block(self) -> None:
+        """Pushing to a full queue returns immediately."""
+        manager = SSEConnectionManager(queue_size=1)
+        await manager.register("slow")
+        fast = await manager.register("fast")
+
+        for _ in range(10):
+            assert await asyncio.wait_for(manager.push_event("slow", {"type": "x"}), 0.1)
+        assert await manager.push_event("fast", {"type": "y"})
+        assert fast.queue.get_nowait() == {"type": "y"}
+
+    async def test_disconnect_policy_drops_connection(self) -> None:
+        """Overflow under DISCONNECT unregisters the connection."""
+        manager = SSEConnectionManager(queue_size=1, overflow_policy=OverflowPolicy.DISCONNECT)
+        conn = await manager.register("s1")
+        await manager.push_event("s1", {"type": "a"})
+
+        assert not await manager.push_event("s1", {"type": "b"})
+        assert not conn.active
+        assert conn.queue.closed
+        assert not manager.has_connection("s1")
+
+    async def test_close_wakes_waiting_consumer(self) -> None:
+        """Closing the queue raises QueueClosed in a pending get()."""
+        queue = BoundedEventQueue()
+        waiter = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        queue.close()
+
+        with pytest.raises(QueueClosed):
+            await waiter
+        assert not queue.put_nowait({"type": "a"})
+
+    async def test_stale_unregister_keeps_reconnect(self) -> None:
+        """Unregistering an old connection leaves a newer one in place."""
+        manager = SSEConnectionManager()
+        old = await manager.register("s1")
+        new = await manager.register("s1")
+
+        await manager.unregister("s1", old)
+        assert manager.get_connection("s1") is new
+        assert not old.active
+
+        await manager.unregister("s1", new)
+        assert not manager.has_connection("s1")
@@ -0,0 +1,253 @@
+"""Tests for multiplexed SSE streaming."""
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+
+from api.services.sse_connections import OverflowPolicy, ReplayBuffer, SSEConnectionManager
+from api.services.sse_stream import (
+    GAP_FRAME,
+    HEARTBEAT_FRAME,
+    follow_replay,
+    multiplex_stream,
+    start_resumable,
+)
+
+
+def _format(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+
+async def _frames(*frames: str, delay: float = 0.0) -> AsyncGenerator[str, None]:
+    for frame in frames:
+        if delay:
+            await asyncio.sleep(delay)
+        yield frame
+
+
+async def _collect(stream: AsyncGenerator[str, None]) -> list[str]:
+    return [frame async for frame in stream]
+
+
+class TestMultiplexStream:
+    """Test merging agent frames with pushed events."""
+
+    async def test_primary_only(self) -> None:
+        """Without a connection, the primary stream passes through."""
+        frames = await _collect(multiplex_stream(_frames("a", "b"), None, _format))
+        assert frames == ["a", "b"]
+
+    async def test_pushed_events_interleave(self) -> None:
+        """Events pushed during the response are delivered on the stream."""
+        manager = SSEConnectionManager()
+        conn = await manager.register("s1")
+
+        async def primary() -> AsyncGenerator[str, None]:
+            yield "a"
+            await manager.push_event("s1", {"type": "more_events", "n": 1})
+            await asyncio.sleep(0.01)
+            yield "b"
+
+        frames = await _collect(multiplex_stream(primary(), conn, _format))
+        assert frames == ["a", _format({"type": "more_events", "n": 1}), "b"]
+
+    async def test_heartbeat_while_idle(self) -> None:
+        """Heartbeats are sent while the primary stream is slow."""
+        manager = SSEConnectionManager()
+        conn = await manager.register("s1")
+
+        frames = await _collect(
+            multiplex_stream(_frames("a", delay=0.05), conn, _format, heartbeat_seconds=0.01)
+        )
+        assert HEARTBEAT_FRAME in frames
+        assert frames[-1] == "a"
+
+    async def test_lingers_for_background_work(self) -> None:
+        """After the response, pushes arrive while background work is pending."""
+        manager = SSEConnectionManager()
+        conn = await manager.register("s1")
+        pending = {"value": True}
+
+        async def background() -> None:
+            await asyncio.sleep(0.05)
+            await manager.push_event("s1", {"type": "more_events"})
+            pending["value"] = False
+
+        task = asyncio.create_task(background())
+        frames = await _collect(
+            multiplex_stream(
+                _frames("a"),
+                conn,
+                _format,
+                heartbeat_seconds=0.02,
+                linger_seconds=1.0,
+                should_linger=lambda: pending["value"],
+            )
+        )
+        await task
+        assert frames[0] == "a"
+        assert frames[-1] == _format({"type": "more_events"})
+
+    async def test_linger_is_bounded(self) -> None:
+        """The stream closes after the linger period even if work is pending."""
+        manager = SSEConnectionManager()
+        conn = await manager.register("s1")
+
+        frames = await asyncio.wait_for(
+            _collect(
+                multiplex_stream(
+                    _frames("a"),
+                    conn,
+                    _format,
+                    heartbeat_seconds=0.01,
+                    linger_seconds=0.05,
+                    should_linger=lambda: True,
+                )
+            ),
+            timeout=1,
+        )
+        assert frames[0] == "a"
+
+    async def test_no_linger_without_background_work(self) -> None:
+        """The stream ends right after the response when nothing is pending."""
+        manager = SSEConnectionManager()
+        conn = await manager.register("s1")
+
+        frames = await asyncio.wait_for(
+            _collect(multiplex_stream(_frames("a"), conn, _format, linger_seconds=60)),
+            timeout=1,
+        )
+        assert frames == ["a"]
+
+    async def test_disconnect_ends_stream(self) -> None:
+        """An overflow under DISCONNECT ends the stream and closes the primary."""
+        manager = SSEConnectionManager(queue_size=1, overflow_policy=OverflowPolicy.DISCONNECT)
+        conn = await manager.register("s1")
+        closed = asyncio.Event()
+
+        async def primary() -> AsyncGenerator[str, None]:
+            try:
+                yield "a"
+                await manager.push_event("s1", {"type": "x"})
+                await manager.push_event("s1", {"type": "y"})
+                await asyncio.sleep(3600)
+                yield "never"
+            finally:
+                closed.set()
+
+        frames = await asyncio.wait_for(_collect(multiplex_stream(primary(), conn, _format)), timeout=1)
+        assert frames == ["a"]
+        assert closed.is_set()
+
+
+class TestResumableStream:
+    """Test replay buffers and Last-Event-ID resume."""
+
+    async def test_frames_are_tagged_with_ids(self) -> None:
+        """Recorded frames carry stream-scoped event IDs."""
+        buffer = ReplayBuffer("s1")
+        await start_resumable(buffer, _frames("data: a\n\n", HEARTBEAT_FRAME, "data: b\n\n"))
+
+        frames = await _collect(follow_replay(buffer))
+        assert frames == [
+            f"id: {buffer.stream_id}:1\ndata: a\n\n",
+            f"id: {buffer.stream_id}:2\ndata: b\n\n",
+        ]
+
+    async def test_resume_after_last_event_id(self) -> None:
+        """Only frames after Last-Event-ID are replayed."""
+        buffer = ReplayBuffer("s1")
+        await start_resumable(buffer, _frames("data: a\n\n", "data: b\n\n", "data: c\n\n"))
+
+        frames = await _collect(follow_replay(buffer, f"{buffer.stream_id}:1"))
+        assert [f.split("\n")[1] for f in frames] == ["data: b", "data: c"]
+
+    async def test_foreign_event_id_replays_everything(self) -> None:
+        """An ID from another stream replays from the start."""
+        buffer = ReplayBuffer("s1")
+        await start_resumable(buffer, _frames("data: a\n\n"))
+
+        assert len(await _collect(follow_replay(buffer, "other:5"))) == 1
+
+    async def test_follow_live_stream(self) -> None:
+        """A follower receives frames produced after it attached."""
+        buffer = ReplayBuffer("s1")
+        start_resumable(buffer, _frames("data: a\n\n", "data: b\n\n", delay=0.02))
+
+        frames = await asyncio.wait_for(
+            _collect(follow_replay(buffer, heartbeat_seconds=0.01)), timeout=1
+        )
+        data = [f for f in frames if f != HEARTBEAT_FRAME]
+        assert [f.split("\n")[1] for f in data] == ["data: a", "data: b"]
+
+    async def test_producer_survives_client_disconnect(self) -> None:
+        """Closing a follower does not stop the producer."""
+        buffer = ReplayBuffer("s1")
+        producer = start_resumable(buffer, _frames("data: a\n\n", "data: b\n\n", delay=0.01))
+
+        follower = follow_replay(buffer)
+        assert "data: a" in await follower.__anext__()
+        await follower.aclose()
+
+        await producer
+        assert buffer.closed
+        assert buffer.last_seq == 2
+
+    async def test_ring_buffer_is_bounded(self) -> None:
+        """Only the most recent frames are retained."""
+        buffer = ReplayBuffer("s1", maxlen=2)
+        for i in range(5):
+            buffer.append(f"data: {i}\n\n")
+
+        assert [n for n, _ in buffer.frames_after(0)] == [4, 5]
+
+    async def test_resume_past_evicted_frames_signals_gap(self) -> None:
+        """A Last-Event-ID older than the retained frames ends with a gap frame."""
+        buffer = ReplayBuffer("s1", maxlen=2)
+        for i in range(5):
+            buffer.append(f"data: {i}\n\n")
+        buffer.close()
+
+        assert await _collect(follow_replay(buffer, f"{buffer.stream_id}:1")) == [GAP_FRAME]
+        assert len(await _collect(follow_replay(buffer, f"{buffer.stream_id}:3"))) == 2
+
+    async def test_slow_follower_signals_gap(self) -> None:
+        """A follower overtaken by the buffer stops instead of skipping frames."""
+        buffer = ReplayBuffer("s1", maxlen=2)
+        buffer.append("data: 0\n\n")
+        follower = follow_replay(buffer)
+        assert "data: 0" in await follower.__anext__()
+
+        for i in range(1, 5):
+            buffer.append(f"data: {i}\n\n")
+
+        assert await follower.__anext__() == GAP_FRAME
+        assert await _collect(follower) == []
+
+    async def test_manager_tracks_latest_buffer(self) -> None:
+        """open_replay replaces a session's buffer."""
+        manager = SSEConnectionManager()
+        first = await manager.open_replay("s1")
+        second = await manager.open_replay("s1")
+
+        assert manager.get_replay("s1") is second
+        assert first.stream_id != second.stream_id
+        assert manager.get_replay("missing") is None
+
+    async def test_new_turn_cancels_running_producer(self) -> None:
+        """A new turn stops the session's previous producer before it starts."""
+        manager = SSEConnectionManager()
+        first = await manager.open_replay("s1")
+        started = asyncio.Event()
+
+        async def endless() -> AsyncGenerator[str, None]:
+            started.set()
+            await asyncio.sleep(3600)
+            yield "data: never\n\n"
+
+        producer = start_resumable(first, endless())
+        await started.wait()
+        await manager.open_replay("s1")
+
+        assert producer.cancelled()
+        assert first.closed
@@ -0,0 +1,201 @@
+"""Tests for the Redis backends against an in-process fake server."""
+
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+
+from api.services.event_cache import RedisEventCache
+from api.services.session import BackendSession, SessionManager
+from api.services.sse_connections import CONNECTIONS_KEY, OverflowPolicy, SSEConnectionManager
+from api.services.state_backend import LocalStateBackend, RedisStateBackend
+from api.services.tests.fake_redis import FakeRedisServer
+
+
+@pytest.fixture
+def redis_server() -> Iterator[FakeRedisServer]:
+    server = FakeRedisServer().start()
+    yield server
+    server.stop()
+
+
+def _event(event_id: str) -> dict:
+    return {
+        "event_id": event_id,
+        "title": f"Event {event_id}",
+        "date": "2026-01-10T19:00:00",
+        "location": "Columbus",
+        "category": "tech",
+        "description": "desc",
+        "is_free": True,
+    }
+
+
+class TestRedisStateBackend:
+    """Test backend primitives over the wire."""
+
+    async def test_lists_and_hashes(self, redis_server: FakeRedisServer) -> None:
+        """List and hash operations round-trip."""
+        backend = RedisStateBackend(redis_server.url)
+        await backend.list_append("l", ["a", "b"], ttl_seconds=60)
+        assert await backend.list_get("l") == ["a", "b"]
+        assert await backend.list_pop("l") == "b"
+
+        await backend.hash_set("h", {"x": "1"})
+        assert await backend.hash_get("h", "x") == "1"
+        assert await backend.hash_get_all("h") == {"x": "1"}
+        await backend.hash_delete("h", "x")
+        assert await backend.hash_get("h", "x") is None
+        await backend.close()
+
+    async def test_lease(self, redis_server: FakeRedisServer) -> None:
+        """Only one owner holds a lease; the holder can renew it."""
+        backend = RedisStateBackend(redis_server.url)
+        assert await backend.acquire_lease("job", "worker-1", 60)
+        assert not await backend.acquire_lease("job", "worker-2", 60)
+        assert await backend.acquire_lease("job", "worker-1", 60)
+        await backend.close()
+
+    async def test_pub_sub(self, redis_server: FakeRedisServer) -> None:
+        """Published messages reach subscribers."""
+        backend = RedisStateBackend(redis_server.url)
+        messages = backend.subscribe("chan")
+        first = asyncio.ensure_future(messages.__anext__())
+        await asyncio.sleep(0.1)
+
+        await backend.publish("chan", "hello")
+        assert await asyncio.wait_for(first, timeout=2) == "hello"
+        await messages.aclose()
+        await backend.close()
+
+    async def test_subscription_resubscribes_after_disconnect(
+        self, redis_server: FakeRedisServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A dropped pub/sub connection is reopened instead of ending iteration."""
+        monkeypatch.setattr("api.services.state_backend.SUBSCRIBE_RETRY_SECONDS", 0.01)
+        backend = RedisStateBackend(redis_server.url)
+        messages = backend.subscribe("chan")
+        first = asyncio.ensure_future(messages.__anext__())
+        await asyncio.sleep(0.1)
+
+        redis_server.drop_subscribers()
+        # Messages published while disconnected are lost; publish until one lands
+        for _ in range(50):
+            await backend.publish("chan", "after")
+            await asyncio.wait([first], timeout=0.05)
+            if first.done():
+                break
+        assert first.result() == "after"
+        await messages.aclose()
+        await backend.close()
+
+
+class TestBackendSession:
+    """Test sessions stored in the backend."""
+
+    async def test_shared_across_managers(self, redis_server: FakeRedisServer) -> None:
+        """Two managers (workers) see the same history."""
+        worker_a = SessionManager(backend=RedisStateBackend(redis_server.url), token_budget=0)
+        worker_b = SessionManager(backend=RedisStateBackend(redis_server.url), token_budget=0)
+
+        session = worker_a.get_session("s1")
+        assert isinstance(session, BackendSession)
+        await session.add_items([{"role": "user", "content": "hi"}])
+
+        other = worker_b.get_session("s1")
+        assert await other.get_items() == [{"role": "user", "content": "hi"}]
+        assert await other.pop_item() == {"role": "user", "content": "hi"}
+        await other.add_items([{"role": "user", "content": "again"}])
+        await worker_a.clear_session("s1")
+        assert await other.get_items() == []
+
+
+class TestSSEFanOut:
+    """Test SSE pushes across workers."""
+
+    async def test_push_reaches_other_worker(self, redis_server: FakeRedisServer) -> None:
+        """A push on worker A is delivered to a connection on worker B."""
+        worker_a = SSEConnectionManager(backend=RedisStateBackend(redis_server.url))
+        worker_b = SSEConnectionManager(backend=RedisStateBackend(redis_server.url))
+        await worker_b.start()
+        await asyncio.sleep(0.1)
+
+        conn = await worker_b.register("s1")
+        assert await worker_a.is_connected("s1")
+        assert not worker_a.has_connection("s1")
+
+        assert await worker_a.push_event("s1", {"type": "more_events"})
+        event = await asyncio.wait_for(conn.queue.get(), timeout=2)
+        assert event == {"type": "more_events"}
+
+        await worker_b.unregister("s1")
+        assert not await worker_a.is_connected("s1")
+        assert not await worker_a.push_event("s1", {"type": "more_events"})
+        await worker_b.stop()
+
+    async def test_connection_entries_expire(self, redis_server: FakeRedisServer) -> None:
+        """Shared connection entries carry a TTL so a dead worker's entries lapse."""
+        manager = SSEConnectionManager(backend=RedisStateBackend(redis_server.url))
+        await manager.register("s1")
+        assert f"cc:{CONNECTIONS_KEY}:s1".encode() in redis_server.expiry
+
+    async def test_disconnect_policy_reports_undelivered(
+        self, redis_server: FakeRedisServer
+    ) -> None:
+        """An overflowing DISCONNECT push returns False and clears the shared entry."""
+        worker_a = SSEConnectionManager(
+            backend=RedisStateBackend(redis_server.url),
+            queue_size=1,
+            overflow_policy=OverflowPolicy.DISCONNECT,
+        )
+        worker_b = SSEConnectionManager(backend=RedisStateBackend(redis_server.url))
+        await worker_a.register("s1")
+        assert await worker_a.push_event("s1", {"type": "a"})
+
+        assert not await worker_a.push_event("s1", {"type": "b"})
+        assert not await worker_b.is_connected("s1")
+        assert not await worker_b.push_event("s1", {"type": "c"})
+
+    async def test_local_backend_is_not_distributed(self) -> None:
+        """With the local backend, pushes only reach this process."""
+        manager = SSEConnectionManager(backend=LocalStateBackend())
+        await manager.start()
+        assert not manager.distributed
+        assert not await manager.push_event("missing", {"type": "x"})
+        await manager.register("s1")
+        assert await manager.push_event("s1", {"type": "x"})
+        await manager.stop()
+
+
+class TestRedisEventCache:
+    """Test the Redis event cache."""
+
+    def test_put_and_get(self, redis_server: FakeRedisServer) -> None:
+        """Events round-trip and are counted per source."""
+        cache = RedisEventCache(redis_server.url)
+        assert cache.put_many("exa", [_event("1"), _event("2")]) == 2
+
+        cached = cache.get("exa", "1")
+        assert cached is not None and cached.title == "Event 1"
+        assert [e.event_id for e in cache.get_many("exa", ["1", "2", "3"])] == ["1", "2"]
+        assert cache.count("exa") == 2
+        assert cache.count() == 2
+
+    def test_expired_entries(self, redis_server: FakeRedisServer) -> None:
+        """Expired entries are hidden and cleared."""
+        cache = RedisEventCache(redis_server.url)
+        cache.put_many("exa", [_event("1")])
+        cache.ttl_hours = -1
+
+        assert cache.get("exa", "1") is None
+        assert cache.clear_expired() == 1
+
+    def test_clear(self, redis_server: FakeRedisServer) -> None:
+        """clear_source and clear_all remove entries."""
+        cache = RedisEventCache(redis_server.url)
+        cache.put_many("exa", [_event("1")])
+        cache.put_many("posh", [_event("2"), _event("3")])
+
+        assert cache.clear_source("exa") == 1
+        assert cache.clear_all() == 2
+        assert cache.count() == 0
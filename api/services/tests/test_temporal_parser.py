@@ -1,10 +1,37 @@
 """Tests for TemporalParser."""
 
+import time
 from datetime import datetime
 
 import pytest
-
-from api.services.temporal_parser import TemporalParser, TemporalResult
+from zoneinfo import ZoneInfo
+
+from api.services.temporal_parser import TemporalParser, TemporalResult, _resolve_phrase
+
+# Wednesday noon in Columbus
+NOW = datetime(2026, 10, 14, 12, 30, tzinfo=ZoneInfo("America/New_York"))
+
+# Representative chat messages (time phrases in context, plus misses)
+USER_MESSAGES = [
+    "What's happening this weekend?",
+    "any ai meetups tonight",
+    "This weekend",
+    "Tonight",
+    "Next week",
+    "Find me something fun to do tomorrow night",
+    "startup events next thursday?",
+    "Are there any free concerts on Saturday",
+    "I'm looking for networking events in 2 days",
+    "what about jan 15-20",
+    "Anything going on Oct 30th to Nov 2",
+    "tech talks this friday or next friday",
+    "I want to do something fun",
+    "show me more like the first one",
+    "only free events please",
+    "hackathons in a week",
+    "what's on today in the short north",
+    "comedy shows this week",
+]
 
 
 class TestTemporalParser:
@@ -176,3 +203,94 @@ class TestTemporalParser:
         assert result.success is False
         assert result.needs_clarification is True
         assert result.question is not None
+
+    def test_match_finds_phrase_in_sentence(self, parser: TemporalParser) -> None:
+        """match() resolves a phrase inside a longer message."""
+        result = parser.match("Any AI meetups next Friday?")
+
+        assert result is not None
+        assert result.matched_text == "next friday"
+        assert "Friday" in result.explanation
+
+    def test_match_skips_fuzzy_fallback(self, parser: TemporalParser) -> None:
+        """match() never guesses dates from unrelated numbers."""
+        assert parser.match("something fun for 5 friends") is None
+
+
+class TestGrammar:
+    """Test the table-driven phrase grammar at a fixed time."""
+
+    @pytest.fixture
+    def parser(self) -> TemporalParser:
+        return TemporalParser(user_timezone="America/New_York")
+
+    @pytest.mark.parametrize(
+        ("text", "start", "end"),
+        [
+            ("next week", "2026-10-19T00:00", "2026-10-25T23:59"),
+            ("this week", "2026-10-14T12:00", "2026-10-18T23:59"),
+            ("next weekend", "2026-10-23T16:00", "2026-10-25T23:59"),
+            ("this fri", "2026-10-16T00:00", "2026-10-16T23:59"),
+            ("last monday", "2026-10-12T00:00", "2026-10-12T23:59"),
+            ("in 3 days", "2026-10-17T00:00", "2026-10-17T23:59"),
+            ("in two weeks", "2026-10-28T00:00", "2026-10-28T23:59"),
+            ("tomorrow", "2026-10-15T00:00", "2026-10-15T23:59"),
+            ("saturday", "2026-10-17T00:00", "2026-10-17T23:59"),
+            ("Oct 30th to Nov 2", "2026-10-30T00:00", "2026-11-02T23:59"),
+            ("january 15-20", "2027-01-15T00:00", "2027-01-20T23:59"),
+            ("Dec 31 - Jan 2, 2026", "2025-12-31T00:00", "2026-01-02T23:59"),
+            ("Dec 20 - 22, 2027", "2027-12-20T00:00", "2027-12-22T23:59"),
+        ],
+    )
+    def test_phrases(self, parser: TemporalParser, text: str, start: str, end: str) -> None:
+        """Each rule resolves to the expected window."""
+        result = parser.match(text, now=NOW)
+
+        assert result is not None
+        assert result.start is not None and result.start.startswith(start)
+        assert result.end is not None and result.end.startswith(end)
+
+    def test_impossible_date_is_skipped(self, parser: TemporalParser) -> None:
+        """Invalid dates don't match; later phrases still can."""
+        assert parser.match("feb 30", now=NOW) is None
+        result = parser.match("feb 30 or tomorrow", now=NOW)
+        assert result is not None and result.original_phrase == "tomorrow"
+
+    def test_leftmost_phrase_wins(self, parser: TemporalParser) -> None:
+        """The first phrase in the message is used."""
+        result = parser.match("tech talks this friday or next friday", now=NOW)
+        assert result is not None and result.matched_text == "this friday"
+
+    def test_no_false_positives(self, parser: TemporalParser) -> None:
+        """Words that merely contain a phrase don't match."""
+        assert parser.match("sundays are for saturnalia", now=NOW) is None
+        assert parser.match("may I bring a friend", now=NOW) is None
+
+    def test_memoized_per_hour(self, parser: TemporalParser) -> None:
+        """Repeated phrases in the same hour are served from the memo."""
+        _resolve_phrase.cache_clear()
+        first = parser.match("This  Weekend please", now=NOW)
+        second = parser.match("this weekend", now=NOW.replace(minute=59))
+
+        assert first == second.model_copy(update={"matched_text": "this  weekend"})
+        assert _resolve_phrase.cache_info().hits == 1
+
+    @pytest.mark.slow
+    def test_benchmark_user_messages(self, parser: TemporalParser, record_property) -> None:
+        """Micro-benchmark: cold vs memoized parsing of a chat corpus."""
+        _resolve_phrase.cache_clear()
+        start = time.perf_counter()
+        cold = [parser.parse(message) for message in USER_MESSAGES]
+        cold_elapsed = time.perf_counter() - start
+
+        rounds = 200
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for message in USER_MESSAGES:
+                parser.parse(message)
+        warm_per_message = (time.perf_counter() - start) / (rounds * len(USER_MESSAGES))
+
+        record_property("cold_us_per_message", cold_elapsed / len(USER_MESSAGES) * 1e6)
+        record_property("warm_us_per_message", warm_per_message * 1e6)
+        assert sum(r.success for r in cold) == 15
+        assert _resolve_phrase.cache_info().hits > 0
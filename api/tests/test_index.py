@@ -1,12 +1,19 @@
 """Tests for FastAPI endpoints."""
 
+import asyncio
+import json
 import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from api.config import get_settings
-from api.index import app
+from api.index import _orchestrator_frames, app
+from api.models import EventResult
+from api.models.orchestrator import OrchestratorResponse
+from api.services.result_store import get_result_store
 
 
 def _clear_settings_cache() -> None:
@@ -66,10 +73,75 @@ class TestChatStreamEndpoint:
         assert response.status_code == 200
 
 
+class TestResultHandleExpansion:
+    """Test expanding the orchestrator's result handle into events."""
+
+    @staticmethod
+    async def _streamed_ids(output: OrchestratorResponse, session_id: str) -> list[str]:
+        run = AsyncMock(return_value=SimpleNamespace(final_output=output))
+        with patch("api.index.Runner.run", run):
+            frames = [f async for f in _orchestrator_frames("show me more", None, "t", session_id)]
+        for frame in frames:
+            payload = json.loads(frame.removeprefix("data: "))
+            if payload["type"] == "events":
+                return [e["id"] for e in payload["events"]]
+        return []
+
+    async def test_result_offset_selects_page(self):
+        """"Show me more" displays the page at result_offset, not page 1."""
+        events = [
+            EventResult(
+                id=f"evt-{i}",
+                title=f"Event {i}",
+                date="2026-01-10T18:00:00",
+                location="Venue",
+                category="ai",
+                description="",
+                is_free=True,
+                distance_miles=1.0,
+            )
+            for i in range(20)
+        ]
+        handle = get_result_store().put(events, session_id="s1")
+        output = OrchestratorResponse(message="More!", result_handle=handle, result_offset=15)
+
+        assert await self._streamed_ids(output, "s1") == [f"evt-{i}" for i in range(15, 20)]
+        # The handle is scoped to s1
+        assert await self._streamed_ids(output, "s2") == []
+
+
+class TestChatStreamResume:
+    """Test resuming a chat stream."""
+
+    def test_resume_unknown_session_returns_404(self, client):
+        """Resuming without a recorded stream should 404."""
+        response = client.get(
+            "/api/chat/stream/no-such-session/resume",
+            headers={"Last-Event-ID": "abc:1"},
+        )
+        assert response.status_code == 404
+
+    def test_resume_replays_after_last_event_id(self, client):
+        """Frames after Last-Event-ID are replayed for a finished stream."""
+        from api.services.sse_connections import get_sse_manager
+
+        buffer = asyncio.run(get_sse_manager().open_replay("resume-test"))
+        buffer.append('data: {"type": "content", "content": "a"}\n\n')
+        buffer.append('data: {"type": "done"}\n\n')
+        buffer.close()
+
+        response = client.get(
+            "/api/chat/stream/resume-test/resume",
+            headers={"Last-Event-ID": f"{buffer.stream_id}:1"},
+        )
+        assert response.status_code == 200
+        assert f"id: {buffer.stream_id}:2" in response.text
+        assert '"content": "a"' not in response.text
+
+
 class TestCalendarExport:
     """Test calendar export endpoints."""
 
-    @pytest.mark.skip(reason="Calendar export endpoints not yet implemented")
     def test_export_single_event(self, client):
         """Export single event should return ICS file."""
         response = client.post(
@@ -86,7 +158,6 @@ class TestCalendarExport:
         assert response.headers["content-type"].startswith("text/calendar")
         assert "BEGIN:VCALENDAR" in response.content.decode()
 
-    @pytest.mark.skip(reason="Calendar export endpoints not yet implemented")
     def test_export_multiple_events(self, client):
         """Export multiple events should return combined ICS file."""
         response = client.post(
@@ -107,8 +178,9 @@ class TestCalendarExport:
         assert response.status_code == 200
         content = response.content.decode()
         assert content.count("BEGIN:VEVENT") == 2
+        assert content.startswith("BEGIN:VCALENDAR")
+        assert content.endswith("END:VCALENDAR\r\n")
 
-    @pytest.mark.skip(reason="Calendar export endpoints not yet implemented")
     def test_export_empty_events_fails(self, client):
         """Export with no events should return 400."""
         response = client.post(
@@ -116,3 +188,87 @@ class TestCalendarExport:
             json={"events": []},
         )
         assert response.status_code == 400
+
+
+class TestCalendarFeed:
+    """Test subscribable calendar feed endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def feed_service(self, monkeypatch):
+        from api import index
+        from api.services.calendar_feed import CalendarFeedService, InMemoryFeedStore
+
+        service = CalendarFeedService(store=InMemoryFeedStore())
+        monkeypatch.setattr(index, "get_calendar_feed_service", lambda: service)
+        return service
+
+    def _save(self, client, *titles, token=None):
+        return client.put(
+            "/api/calendar/feeds/user-1",
+            json={"events": [{"title": t, "start": "2026-01-10T18:00:00"} for t in titles]},
+            headers={"X-Feed-Token": token} if token else {},
+        )
+
+    def test_save_returns_subscription_urls(self, client):
+        """Saving picks returns http and webcal feed URLs addressed by token."""
+        response = self._save(client, "Event 1")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["feed_url"].endswith(f"/api/calendar/feeds/{data['token']}.ics")
+        assert "user-1" not in data["feed_url"]
+        assert data["webcal_url"].startswith("webcal://")
+        assert data["event_count"] == 1
+
+    def test_replace_requires_token(self, client):
+        """Replacing an existing feed needs its token; the token is kept."""
+        token = self._save(client, "Event 1").json()["token"]
+
+        assert self._save(client, "Event 2").status_code == 403
+        assert self._save(client, "Event 2", token="wrong").status_code == 403
+        response = self._save(client, "Event 2", token=token)
+        assert response.status_code == 200
+        assert response.json()["token"] == token
+
+    def test_feed_not_served_by_user_id(self, client):
+        """The raw user ID does not address the feed."""
+        self._save(client, "Event 1")
+        assert client.get("/api/calendar/feeds/user-1.ics").status_code == 404
+
+    def test_conditional_get(self, client):
+        """Unchanged feeds answer 304; changed feeds get a new ETag."""
+        token = self._save(client, "Event 1", "Event 2").json()["token"]
+        url = f"/api/calendar/feeds/{token}.ics"
+
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/calendar")
+        assert response.content.count(b"BEGIN:VEVENT") == 2
+        etag = response.headers["etag"]
+        last_modified = response.headers["last-modified"]
+
+        not_modified = client.get(url, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
+        assert not_modified.content == b""
+
+        by_date = client.get(url, headers={"If-Modified-Since": last_modified})
+        assert by_date.status_code == 304
+
+        self._save(client, "Event 1", token=token)
+        changed = client.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    def test_unknown_feed_404(self, client):
+        """Unknown feeds return 404."""
+        assert client.get("/api/calendar/feeds/nobody.ics").status_code == 404
+        assert client.delete("/api/calendar/feeds/nobody").status_code == 404
+
+    def test_delete_feed(self, client):
+        """Deleting needs the feed token; deleted feeds stop being served."""
+        token = self._save(client, "Event 1").json()["token"]
+
+        assert client.delete("/api/calendar/feeds/user-1").status_code == 403
+        response = client.delete("/api/calendar/feeds/user-1", headers={"X-Feed-Token": token})
+        assert response.status_code == 200
+        assert client.get(f"/api/calendar/feeds/{token}.ics").status_code == 404